@@ -36,7 +36,7 @@ try:
     src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
     if src_path not in sys.path:
         sys.path.insert(0, src_path)
-    from src.utils.json_generation_utils import get_json_optimized_hyperparameters
+    from src.utils.json_generation_utils import parse_llm_json_response
     JSON_UTILS_AVAILABLE = True
 except ImportError:
     JSON_UTILS_AVAILABLE = False
@@ -141,6 +141,26 @@ class EvaluationLLMClient:
             return self._fallback_evaluation(prompt)
         
         try:
+            from src.services.llm_response_cache import build_llm_cache_key, llm_response_cache
+            
+            # Use the same model as survey generation for consistency; audited and
+            # unaudited calls share parameters so they share cache entries
+            run_params = {
+                "max_tokens": max_tokens,
+                "temperature": 0.3,  # Lower temperature for more consistent evaluation
+                "top_p": 0.9,
+                "frequency_penalty": 0.0,
+                "presence_penalty": 0.0
+            }
+            cache_key = build_llm_cache_key(self.model, prompt, hyperparameters=run_params)
+            
+            def run_cached():
+                # Only evaluations the evaluators can parse are cached
+                return llm_response_cache.get_or_generate(
+                    "evaluation", cache_key, lambda: self._run_replicate(prompt, run_params),
+                    validate=self._is_parseable_evaluation
+                )
+            
             # Create audit context for this LLM interaction
             interaction_id = f"evaluation_{uuid.uuid4().hex[:8]}"
             audit_service = None
@@ -183,17 +203,7 @@ class EvaluationLLMClient:
                     context_type="survey_data",
                     parent_survey_id=parent_survey_id,
                     parent_rfq_id=parent_rfq_id,
-                    hyperparameters=(
-                        {"max_tokens": max_tokens, **get_json_optimized_hyperparameters("evaluation")} 
-                        if JSON_UTILS_AVAILABLE 
-                        else {
-                            "max_tokens": max_tokens,
-                            "temperature": 0.3,
-                            "top_p": 0.9,
-                            "frequency_penalty": 0.0,
-                            "presence_penalty": 0.0
-                        }
-                    ),
+                    hyperparameters=run_params,
                     metadata={
                         "prompt_length": len(prompt),
                         "max_tokens": max_tokens
@@ -201,31 +211,13 @@ class EvaluationLLMClient:
                     tags=["evaluation", "survey_analysis"]
                 ) as audit_context:
                     start_time = time.time()
-                    # Use the same model as survey generation for consistency
-                    response = await asyncio.to_thread(
-                        self.replicate_client.run,
-                        self.model,
-                        input={
-                            "prompt": prompt,
-                            "max_tokens": max_tokens,
-                            "temperature": 0.3,  # Lower temperature for more consistent evaluation
-                            "top_p": 0.9,
-                            "frequency_penalty": 0.0,
-                            "presence_penalty": 0.0
-                        }
-                    )
-                    
-                    # Extract content from response
-                    if isinstance(response, list):
-                        content = ''.join(response)
-                    else:
-                        content = str(response)
+                    content, cache_hit = await run_cached()
                     
                     # Process the output and set audit context
                     response_time_ms = int((time.time() - start_time) * 1000)
                     
                     # Set the raw response before processing
-                    audit_context.set_raw_response(str(response))
+                    audit_context.set_raw_response(content)
                     
                     # Set the processed output
                     audit_context.set_output(
@@ -233,6 +225,7 @@ class EvaluationLLMClient:
                     )
                     # Store response time in metadata
                     audit_context.metadata['response_time_ms'] = response_time_ms
+                    audit_context.record_cache_hit({"cache_hit": cache_hit, "cache_key": cache_key})
                     
                     print(f"✅ [EvaluationLLMClient] LLM Response received, length: {len(content)}")
                     print(f"🔍 [EvaluationLLMClient] Response preview: {content[:200]}...")
@@ -246,27 +239,7 @@ class EvaluationLLMClient:
             else:
                 # Fallback without auditing - but still make the API call
                 print(f"⚠️ [EvaluationLLMClient] Proceeding without audit context")
-                # Use the same model as survey generation for consistency
-                response = await asyncio.to_thread(
-                    self.replicate_client.run,
-                    self.model,
-                    input={
-                        "prompt": prompt,
-                        "max_tokens": max_tokens,
-                        **(get_json_optimized_hyperparameters("evaluation") if JSON_UTILS_AVAILABLE else {
-                            "temperature": 0.3,
-                            "top_p": 0.9,
-                            "frequency_penalty": 0.0,
-                            "presence_penalty": 0.0
-                        })
-                    }
-                )
-                
-                # Extract content from response
-                if isinstance(response, list):
-                    content = ''.join(response)
-                else:
-                    content = str(response)
+                content, cache_hit = await run_cached()
                 
                 print(f"🔍 LLM Response content length (no audit): {len(content)}")
                 print(f"🔍 LLM Response content preview (no audit): {content[:200]}...")
@@ -280,6 +253,31 @@ class EvaluationLLMClient:
             print(f"🔴 LLM evaluation failed: {e}")
             return self._fallback_evaluation(prompt, error=str(e))
     
+    @staticmethod
+    def _is_parseable_evaluation(content: str) -> bool:
+        """Whether evaluation output parses as the JSON the evaluators expect"""
+        if not JSON_UTILS_AVAILABLE:
+            return bool(content.strip())
+        return parse_llm_json_response(content, service_name="EvaluationLLMClient") is not None
+    
+    async def _run_replicate(self, prompt: str, run_params: Dict[str, Any]) -> str:
+        """Run the evaluation model and join streamed output into a single string"""
+        from src.services.llm_gateway import estimate_tokens, llm_gateway
+
+        response = await llm_gateway.call(
+            lambda: asyncio.to_thread(
+                self.replicate_client.run,
+                self.model,
+                input={"prompt": prompt, **run_params}
+            ),
+            provider="replicate",
+            model=self.model,
+            estimated_tokens=estimate_tokens(prompt) + run_params.get("max_tokens", 0),
+        )
+        if isinstance(response, list):
+            return ''.join(response)
+        return str(response)
+    
     def _fallback_evaluation(self, prompt: str, error: Optional[str] = None) -> LLMResponse:
         """
         Provide fallback evaluation when LLM unavailable
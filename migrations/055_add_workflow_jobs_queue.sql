@@ -0,0 +1,29 @@
+-- Durable workflow job queue
+-- API processes enqueue survey generation runs here; workers claim them with
+-- SELECT ... FOR UPDATE SKIP LOCKED so in-flight generations survive restarts
+-- Migration is idempotent - safe to run multiple times
+
+CREATE TABLE IF NOT EXISTS workflow_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    workflow_id VARCHAR(255) NOT NULL UNIQUE,
+    survey_id VARCHAR(255),
+    job_type VARCHAR(50) NOT NULL,
+    payload JSONB NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    worker_id VARCHAR(255),
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT check_workflow_job_status CHECK (status IN ('queued', 'running', 'completed', 'failed'))
+);
+
+-- Claim order and queue-depth metrics both filter on status and sort by age
+CREATE INDEX IF NOT EXISTS idx_workflow_jobs_status_created_at ON workflow_jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_workflow_jobs_survey_id ON workflow_jobs (survey_id);
+
+COMMENT ON TABLE workflow_jobs IS 'Durable queue of survey generation workflows claimed by workflow workers';
+COMMENT ON COLUMN workflow_jobs.heartbeat_at IS 'Refreshed by the owning worker; running jobs with a stale heartbeat are reclaimed';
@@ -0,0 +1,23 @@
+-- Per-node workflow checkpoints
+-- Each generation workflow keeps its latest checkpoint so a failed or timed-out
+-- run can resume from the last completed node instead of starting over
+-- Migration is idempotent - safe to run multiple times
+
+CREATE TABLE IF NOT EXISTS workflow_checkpoints (
+    id SERIAL PRIMARY KEY,
+    workflow_id VARCHAR(255) NOT NULL UNIQUE,
+    survey_id VARCHAR(255),
+    last_node VARCHAR(100) NOT NULL,
+    completed_nodes JSONB NOT NULL DEFAULT '[]'::jsonb,
+    state_data JSONB NOT NULL,
+    rfq_embedding BYTEA,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_workflow_checkpoints_survey_id ON workflow_checkpoints (survey_id);
+CREATE INDEX IF NOT EXISTS idx_workflow_checkpoints_updated_at ON workflow_checkpoints (updated_at);
+
+COMMENT ON TABLE workflow_checkpoints IS 'Latest per-node checkpoint of each survey generation workflow';
+COMMENT ON COLUMN workflow_checkpoints.state_data IS 'Workflow state with golden example content replaced by IDs';
+COMMENT ON COLUMN workflow_checkpoints.rfq_embedding IS 'RFQ embedding packed as little-endian float32';
@@ -0,0 +1,6 @@
+-- Keyset pagination index for the LLM audit summary listing
+-- Pages are ordered by (created_at DESC, id DESC) and resume after the last row seen,
+-- so each page is an index range scan regardless of depth
+-- Migration is idempotent - safe to run multiple times
+
+CREATE INDEX IF NOT EXISTS idx_llm_audit_created_at_id ON llm_audit (created_at DESC, id DESC);
@@ -0,0 +1,30 @@
+-- Unique upsert keys for annotation-synced golden questions and sections
+-- AnnotationRAGSyncService.sync_annotations_batch upserts with
+-- INSERT ... ON CONFLICT (survey_id, question_id) / (survey_id, section_id),
+-- which needs a unique index on each key. Rows sharing a key are removed
+-- first, keeping the most recently updated one. Besides duplicates left by
+-- concurrent single syncs, this also discards rows that came from distinct
+-- survey questions/sections which happened to reuse the same id within a
+-- survey (e.g. repeated "q1" ids in a golden pair's survey_json, or re-runs of
+-- scripts/populate_rule_based_multi_level_rag.py); only the newest survives.
+-- Migration is idempotent - safe to run multiple times
+
+DELETE FROM golden_questions gq
+USING golden_questions newer
+WHERE gq.survey_id = newer.survey_id
+  AND gq.question_id = newer.question_id
+  AND (COALESCE(gq.updated_at, gq.created_at, 'epoch'), gq.id)
+    < (COALESCE(newer.updated_at, newer.created_at, 'epoch'), newer.id);
+
+DELETE FROM golden_sections gs
+USING golden_sections newer
+WHERE gs.survey_id = newer.survey_id
+  AND gs.section_id = newer.section_id
+  AND (COALESCE(gs.updated_at, gs.created_at, 'epoch'), gs.id)
+    < (COALESCE(newer.updated_at, newer.created_at, 'epoch'), newer.id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_golden_questions_survey_question
+    ON golden_questions (survey_id, question_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_golden_sections_survey_section
+    ON golden_sections (survey_id, section_id);
@@ -0,0 +1,39 @@
+-- Incremental survey-to-golden similarity
+-- Survey and golden survey embeddings are stored once instead of being
+-- recomputed for every analysis. A survey embedding records the hash of the
+-- final_output it was computed from, so edited surveys are re-embedded (and
+-- their cached matches rebuilt) on the next refresh. golden_set_changes is an append-only log
+-- whose highest version is the current golden-set version; each survey's
+-- cached top-k golden matches records the version it reflects, so a refresh
+-- only scores the golden pairs changed since then.
+-- Migration is idempotent - safe to run multiple times
+
+ALTER TABLE golden_rfq_survey_pairs
+    ADD COLUMN IF NOT EXISTS survey_embedding VECTOR(384);
+
+CREATE TABLE IF NOT EXISTS survey_embeddings (
+    survey_id UUID PRIMARY KEY REFERENCES surveys(id) ON DELETE CASCADE,
+    embedding VECTOR(384) NOT NULL,
+    content_hash TEXT,  -- md5(surveys.final_output::text) at embedding time
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+ALTER TABLE survey_embeddings
+    ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE TABLE IF NOT EXISTS golden_set_changes (
+    version BIGSERIAL PRIMARY KEY,
+    golden_pair_id UUID NOT NULL,  -- No FK: deleted pairs keep their change rows
+    change_type TEXT NOT NULL CHECK (change_type IN ('upsert', 'delete')),
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS survey_golden_top_matches (
+    survey_id UUID PRIMARY KEY REFERENCES surveys(id) ON DELETE CASCADE,
+    golden_set_version BIGINT NOT NULL,
+    matches JSONB NOT NULL,  -- [{"golden_id": ..., "similarity": ...}], highest first
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_survey_golden_top_matches_version
+    ON survey_golden_top_matches (golden_set_version);
@@ -0,0 +1,18 @@
+-- One active quality baseline per metric
+-- QualityRegressionService seeds a metric's first baseline with
+-- INSERT ... ON CONFLICT (metric_name) WHERE is_active DO NOTHING, which needs
+-- a partial unique index so concurrent recorders cannot both create one.
+-- Extra active rows are deactivated first, keeping the most recent one.
+-- Migration is idempotent - safe to run multiple times
+
+UPDATE quality_baselines qb
+SET is_active = FALSE
+FROM quality_baselines newer
+WHERE qb.is_active
+  AND newer.is_active
+  AND qb.metric_name = newer.metric_name
+  AND (COALESCE(qb.created_at, 'epoch'), qb.id) < (COALESCE(newer.created_at, 'epoch'), newer.id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_quality_baselines_active_metric
+    ON quality_baselines (metric_name)
+    WHERE is_active;
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for refreshing cached survey-to-golden top-k matches.
+
+Builds random unit embeddings for a survey corpus and a golden set, caches the
+top-k matches, then edits one golden pair. Compares recomputing every survey
+against every golden pair with the incremental path (one surveys x changed
+goldens product merged into the cached lists, falling back to a full row only
+where the merge cannot be exact). Both paths are checked for identical results
+before timing.
+
+Usage:
+    python scripts/benchmark_golden_similarity_refresh.py --surveys 20000 --goldens 500
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.benchmark_utils import print_speedup, report, time_calls
+from src.services.golden_similarity_index_service import (
+    GOLDEN_SIMILARITY_TOP_K,
+    merge_top_matches,
+    normalize_rows,
+    top_matches,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark golden similarity cache refresh")
+    parser.add_argument("--surveys", type=int, default=20000)
+    parser.add_argument("--goldens", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=GOLDEN_SIMILARITY_TOP_K)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    surveys = normalize_rows(rng.standard_normal((args.surveys, args.dim)))
+    goldens = normalize_rows(rng.standard_normal((args.goldens, args.dim)))
+    golden_ids = [f"golden-{i}" for i in range(args.goldens)]
+    cached = top_matches(surveys @ goldens.T, golden_ids, args.top_k)
+
+    # Edit one golden pair
+    edited = args.goldens // 2
+    goldens[edited] = normalize_rows(rng.standard_normal((1, args.dim)))[0]
+    touched = {golden_ids[edited]}
+
+    def full_refresh() -> List[list]:
+        return top_matches(surveys @ goldens.T, golden_ids, args.top_k)
+
+    def incremental_refresh() -> List[list]:
+        scores = surveys @ goldens[[edited]].T
+        results, fallback = [], []
+        for row, (matches, score) in enumerate(zip(cached, scores[:, 0])):
+            merged = merge_top_matches(matches, touched, {golden_ids[edited]: score}, args.top_k)
+            if merged is None:
+                fallback.append(row)
+            results.append(merged)
+        if fallback:
+            for row, matches in zip(fallback, top_matches(surveys[fallback] @ goldens.T, golden_ids, args.top_k)):
+                results[row] = matches
+        return results
+
+    expected = full_refresh()
+    actual = incremental_refresh()
+    for full, incremental in zip(expected, actual):
+        assert [m["similarity"] for m in full] == [m["similarity"] for m in incremental]
+
+    before = time_calls(full_refresh, args.iterations)
+    after = time_calls(incremental_refresh, args.iterations)
+
+    print(f"Refreshing {args.surveys} surveys x {args.goldens} goldens (top-{args.top_k}) after one golden edit")
+    report("before: full recompute", before)
+    report("after: incremental merge", after)
+    print_speedup(before, after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the LLM audit interaction listing.
+
+Seeds synthetic ``llm_audit`` rows inside a transaction that is rolled back at
+the end, then compares the full listing (every column, OFFSET paging, bodies
+serialized into ``LLMAuditResponse``) with the summary listing (metadata
+projection, keyset paging on ``(created_at, id)``) at increasing page depths.
+Reports query + serialization latency and response size per page.
+
+Requires a PostgreSQL database (DATABASE_URL) with migration 057 applied.
+
+Usage:
+    python scripts/benchmark_llm_audit_listing.py --rows 100000 --page-size 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+
+from scripts.benchmark_utils import time_async_calls
+from src.api.llm_audit import (
+    LLMAuditListResponse,
+    LLMAuditSummaryListResponse,
+    _to_audit_response,
+    _to_audit_summary,
+)
+from src.database.connection import SessionLocal
+from src.database.models import LLMAudit
+from src.services.llm_audit_service import LLMAuditService, encode_audit_cursor
+
+PURPOSES = ["survey_generation", "evaluation", "field_extraction", "golden_example_fields"]
+
+
+def _seed(db, rows: int, prompt_chars: int, output_chars: int, batch_size: int = 5000) -> None:
+    now = datetime.now(timezone.utc)
+    for start in range(0, rows, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, rows)):
+            batch.append({
+                "id": uuid.uuid4(),
+                "interaction_id": f"bench-{i}",
+                "model_name": "openai/gpt-4o",
+                "model_provider": "openai",
+                "purpose": PURPOSES[i % len(PURPOSES)],
+                "context_type": "generation",
+                # Random hex keeps TOAST compression from hiding the body size
+                "input_prompt": os.urandom(prompt_chars // 2).hex(),
+                "output_content": os.urandom(output_chars // 2).hex(),
+                "raw_response": json.dumps({"content": "ok", "index": i}),
+                "input_tokens": prompt_chars // 4,
+                "output_tokens": output_chars // 4,
+                "response_time_ms": 500 + i % 5000,
+                "success": True,
+                "interaction_metadata": {"benchmark": True},
+                "tags": ["benchmark"],
+                "created_at": now - timedelta(seconds=i),
+            })
+        db.execute(insert(LLMAudit), batch)
+    db.flush()
+
+
+async def _timed(fn: Callable[[], Awaitable[bytes]], iterations: int) -> Tuple[float, int]:
+    size = len(await fn())  # Untimed warm-up call
+    return statistics.median(await time_async_calls(fn, iterations)), size
+
+
+async def _run(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        print(f"Seeding {args.rows} synthetic audit rows ({args.prompt_chars}+{args.output_chars} body chars each)...")
+        start = time.perf_counter()
+        _seed(db, args.rows, args.prompt_chars, args.output_chars)
+        print(f"seeded in {time.perf_counter() - start:.1f}s")
+
+        service = LLMAuditService(db)
+        print(f"\npage_size={args.page_size}, median of {args.iterations} runs")
+        print(f"{'page':>8}  {'full (OFFSET)':>22}  {'summary (keyset)':>22}")
+        for page in args.pages:
+            offset = (page - 1) * args.page_size
+            if offset >= args.rows:
+                continue
+
+            async def full_page() -> bytes:
+                records, total = await service.get_audit_records(limit=args.page_size, offset=offset)
+                response = LLMAuditListResponse(
+                    records=[_to_audit_response(r) for r in records],
+                    total_count=total, page=page, page_size=args.page_size,
+                )
+                return json.dumps(jsonable_encoder(response)).encode("utf-8")
+
+            # The cursor a client holds after paging to this depth
+            cursor = None
+            if offset:
+                previous = (
+                    db.query(LLMAudit.created_at, LLMAudit.id)
+                    .order_by(LLMAudit.created_at.desc(), LLMAudit.id.desc())
+                    .offset(offset - 1).limit(1).one()
+                )
+                cursor = encode_audit_cursor(previous.created_at, previous.id)
+
+            async def summary_page() -> bytes:
+                rows, next_cursor, total = await service.get_audit_summaries(limit=args.page_size, cursor=cursor)
+                response = LLMAuditSummaryListResponse(
+                    records=[_to_audit_summary(r) for r in rows],
+                    total_count=total, page_size=args.page_size, next_cursor=next_cursor,
+                )
+                return json.dumps(jsonable_encoder(response)).encode("utf-8")
+
+            full_ms, full_bytes = await _timed(full_page, args.iterations)
+            summary_ms, summary_bytes = await _timed(summary_page, args.iterations)
+            print(
+                f"{page:>8}  {full_ms:>9.1f}ms {full_bytes / 1024:>9.0f}KB  "
+                f"{summary_ms:>9.1f}ms {summary_bytes / 1024:>9.0f}KB"
+            )
+    finally:
+        db.rollback()
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM audit interaction listing")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--prompt-chars", type=int, default=8000)
+    parser.add_argument("--output-chars", type=int, default=4000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000, 2000])
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for NumericTypeDetector over real survey question texts.
+
+Loads every question from the generated surveys stored under
+evaluations/results/ and runs type detection plus unit extraction on each one,
+comparing the old per-pattern ``re.search`` loops over raw pattern strings with
+the precompiled pattern families. Both paths are checked for identical results
+before timing.
+
+Usage:
+    python scripts/benchmark_numeric_type_detection.py --iterations 50
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.benchmark_utils import print_speedup, report, time_calls
+from src.utils.numeric_type_detector import NumericType, NumericTypeDetector
+from src.utils.survey_utils import extract_all_questions
+
+RESULTS_DIR = Path(__file__).parent.parent / "evaluations" / "results"
+
+LEGACY_UNIT_PATTERNS = [
+    r'per\s+([^,.?]+)',
+    r'in\s+([^,.?]+)',
+    r'measured\s+in\s+([^,.?]+)',
+    r'units?\s+of\s+([^,.?]+)',
+    r'([a-z]+)\s*[?.,]'
+]
+
+
+def _collect_question_texts(node: Any, texts: List[str]) -> None:
+    if isinstance(node, dict):
+        if isinstance(node.get("sections"), list) or isinstance(node.get("questions"), list):
+            texts.extend(q.get("text", "") for q in extract_all_questions(node) if isinstance(q, dict))
+            return
+        for value in node.values():
+            _collect_question_texts(value, texts)
+    elif isinstance(node, list):
+        for value in node:
+            _collect_question_texts(value, texts)
+
+
+def _load_corpus(results_dir: Path) -> List[str]:
+    texts: List[str] = []
+    for path in sorted(results_dir.glob("*.json")):
+        try:
+            data = json.loads(path.read_text())
+        except (ValueError, OSError):
+            continue  # Some stored results are truncated
+        _collect_question_texts(data, texts)
+    return [text for text in texts if text]
+
+
+def _legacy_matches(text: str, patterns: list) -> bool:
+    """The per-pattern loop detection used before the families were precompiled"""
+    for pattern in patterns:
+        if re.search(pattern, text, re.IGNORECASE):
+            return True
+    return False
+
+
+def _legacy_detect(question_text: str) -> NumericType:
+    text = f"{question_text.lower()} "
+    d = NumericTypeDetector
+    for numeric_type, patterns in (
+        (NumericType.AGE, d.AGE_PATTERNS),
+        (NumericType.CURRENCY, d.CURRENCY_PATTERNS),
+        (NumericType.QUANTITY, d.QUANTITY_PATTERNS),
+        (NumericType.RATING, d.RATING_PATTERNS),
+        (NumericType.PERCENTAGE, d.PERCENTAGE_PATTERNS),
+        (NumericType.MEASUREMENT, d.MEASUREMENT_PATTERNS),
+    ):
+        if _legacy_matches(text, patterns):
+            return numeric_type
+    return NumericType.GENERIC
+
+
+def _legacy_extract_unit(text: str) -> Optional[str]:
+    for pattern in LEGACY_UNIT_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            unit = match[1].strip()
+            non_units = ['what', 'how', 'which', 'when', 'where', 'why', 'the', 'a', 'an']
+            if unit.lower() not in non_units and len(unit) > 1:
+                return unit
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark NumericTypeDetector on real survey questions")
+    parser.add_argument("--results-dir", type=Path, default=RESULTS_DIR)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = _load_corpus(args.results_dir)
+    if not corpus:
+        sys.exit(f"No survey questions found under {args.results_dir}")
+
+    for text in corpus:
+        assert _legacy_detect(text) == NumericTypeDetector.detect_numeric_type(text), text
+        assert _legacy_extract_unit(text) == NumericTypeDetector.extract_unit_from_text(text), text
+
+    def legacy_pass() -> None:
+        for text in corpus:
+            _legacy_detect(text)
+            _legacy_extract_unit(text)
+
+    def compiled_pass() -> None:
+        for text in corpus:
+            NumericTypeDetector.detect_numeric_type(text)
+            NumericTypeDetector.extract_unit_from_text(text)
+
+    before = time_calls(legacy_pass, args.iterations)
+    after = time_calls(compiled_pass, args.iterations)
+
+    print(f"Detecting {len(corpus)} question texts over {args.iterations} iterations")
+    report("before: per-pattern re.search", before)
+    report("after: precompiled families", after)
+    print_speedup(before, after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for SurveyDiffService on large surveys.
+
+Diffs two synthetic versions of a sectioned survey (default 300 questions,
+roughly a third of them reworded, some added and removed) and reports:
+
+- the full ``compute_diff`` call, including question matching
+- the diff bookkeeping alone (question matching served from a precomputed
+  result), comparing the old per-question section lookup, which re-extracted
+  every question and walked the sections for each index, with the per-survey
+  index built once by ``_build_survey_index``
+
+Usage:
+    python scripts/benchmark_survey_diff.py --questions 300 --iterations 20
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.benchmark_utils import print_speedup, report, time_calls
+from src.services.survey_diff_service import SurveyDiffService
+from src.utils.survey_comparison import compare_surveys_detailed
+from src.utils.survey_utils import extract_all_questions
+
+TOPICS = ["brand", "price", "usage", "satisfaction", "channel", "loyalty", "awareness", "intent"]
+
+
+def _build_survey(questions: int, per_section: int, revision: int) -> Dict[str, Any]:
+    sections = []
+    for start in range(0, questions, per_section):
+        section_questions = []
+        for i in range(start, min(start + per_section, questions)):
+            if revision and i % 17 == 0:
+                continue  # Removed in the revision
+            text = f"How would you rate the {TOPICS[i % len(TOPICS)]} of product {i}?"
+            if revision and i % 3 == 0:
+                text = f"Thinking about product {i}, how do you rate its {TOPICS[i % len(TOPICS)]}?"
+            section_questions.append({
+                "id": f"q{i}",
+                "text": text,
+                "type": "single_choice" if i % 2 else "rating",
+                "options": ["Poor", "Fair", "Good", "Excellent"],
+                "required": i % 5 != 0,
+            })
+        if revision:
+            section_questions.append({"id": f"new{start}", "text": f"Any other comments on section {start}?", "type": "text"})
+        sections.append({"id": start // per_section + 1, "title": f"Section {start // per_section + 1}", "questions": section_questions})
+    return {"title": "Benchmark survey", "sections": sections}
+
+
+def _legacy_section_id(survey: Dict[str, Any], question_index: int) -> Optional[int]:
+    """The per-question lookup the diff used before the survey index"""
+    questions = extract_all_questions(survey)
+    if question_index >= len(questions):
+        return None
+    current_idx = 0
+    for section in survey.get("sections", []):
+        section_questions = section.get("questions", [])
+        if current_idx <= question_index < current_idx + len(section_questions):
+            return section.get("id")
+        current_idx += len(section_questions)
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SurveyDiffService on large surveys")
+    parser.add_argument("--questions", type=int, default=300)
+    parser.add_argument("--per-section", type=int, default=25)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    newer = _build_survey(args.questions, args.per_section, revision=1)
+    older = _build_survey(args.questions, args.per_section, revision=0)
+    service = SurveyDiffService()
+
+    # Warm lazy sklearn imports
+    service.compute_diff(newer, older)
+
+    full = time_calls(lambda: service.compute_diff(newer, older), args.iterations)
+
+    comparison = compare_surveys_detailed(newer, older)
+    questions_newer = extract_all_questions(newer)
+    questions_older = extract_all_questions(older)
+
+    def legacy_lookups() -> None:
+        for idx in range(len(questions_newer)):
+            _legacy_section_id(newer, idx)
+        for idx in range(len(questions_older)):
+            _legacy_section_id(older, idx)
+
+    with patch("src.services.survey_diff_service.compare_surveys_detailed", return_value=comparison):
+        bookkeeping = time_calls(lambda: service.compute_diff(newer, older), args.iterations)
+    lookups_before = time_calls(legacy_lookups, args.iterations)
+    lookups_after = time_calls(
+        lambda: (service._build_survey_index(newer), service._build_survey_index(older)), args.iterations
+    )
+
+    print(f"Diffing {len(questions_newer)} vs {len(questions_older)} questions over {args.iterations} iterations")
+    report("compute_diff (with matching)", full)
+    report("compute_diff (matching precomputed)", bookkeeping)
+    report("before: per-question section lookup", lookups_before)
+    report("after: survey index", lookups_after)
+    print_speedup(lookups_before, lookups_after, "section lookup speedup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Timing and reporting helpers shared by the scripts/benchmark_*.py micro-benchmarks.
+
+Usage:
+    from scripts.benchmark_utils import print_speedup, report, time_calls
+
+    before = time_calls(old_path, iterations)
+    after = time_calls(new_path, iterations)
+    report("before: old path", before)
+    report("after: new path", after)
+    print_speedup(before, after)
+"""
+
+import math
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+
+def time_calls(fn: Callable[[], object], iterations: int) -> List[float]:
+    """
+    Time repeated calls of ``fn``
+
+    Args:
+        fn: Zero-argument callable to time
+        iterations: Number of calls
+
+    Returns:
+        Wall-clock duration of each call in milliseconds
+    """
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def time_async_calls(fn: Callable[[], Awaitable[object]], iterations: int) -> List[float]:
+    """
+    Time repeated awaits of ``fn()``
+
+    Args:
+        fn: Zero-argument coroutine function to time
+        iterations: Number of calls
+
+    Returns:
+        Wall-clock duration of each call in milliseconds
+    """
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    """Print mean, p50 and p95 of ``timings`` on one line"""
+    timings = sorted(timings)
+    p95 = timings[math.ceil(len(timings) * 0.95) - 1]  # Nearest-rank
+    print(f"{label:<36} mean={statistics.mean(timings):9.3f}ms  p50={statistics.median(timings):9.3f}ms  p95={p95:9.3f}ms")
+
+
+def print_speedup(before: List[float], after: List[float], label: str = "speedup") -> None:
+    """Print the ratio of mean ``before`` to mean ``after`` timings"""
+    print(f"{label}: {statistics.mean(before) / max(statistics.mean(after), 1e-9):.1f}x")
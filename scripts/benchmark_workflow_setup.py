@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for per-request workflow setup cost.
+
+Compares building and compiling the LangGraph workflow on every request (the
+old ``create_workflow(db, connection_manager)`` path) with reusing the
+process-wide compiled graph and only building a run config per request.
+
+Usage:
+    python scripts/benchmark_workflow_setup.py --iterations 200
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.benchmark_utils import print_speedup, report, time_calls
+from src.workflows.workflow import build_run_config, create_workflow, get_compiled_workflow
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-request workflow setup")
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    db = MagicMock()
+    connection_manager = MagicMock()
+
+    # Warm imports and the shared graph so neither side pays one-off costs
+    create_workflow(db, connection_manager)
+    get_compiled_workflow()
+
+    before = time_calls(lambda: create_workflow(db, connection_manager), args.iterations)
+    after = time_calls(
+        lambda: (get_compiled_workflow(), build_run_config(connection_manager=connection_manager)),
+        args.iterations,
+    )
+
+    print(f"Per-request workflow setup over {args.iterations} iterations")
+    report("before: create_workflow", before)
+    report("after: shared graph + config", after)
+    print_speedup(before, after)
+
+
+if __name__ == "__main__":
+    main()
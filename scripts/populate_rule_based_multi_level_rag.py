@@ -9,9 +9,13 @@ import sys
 import os
 import json
 import logging
+import uuid
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 # Add src to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
@@ -241,7 +245,14 @@ class RuleBasedRAGPopulator:
     
     async def _extract_sections(self, golden_pair: GoldenRFQSurveyPair, dry_run: bool) -> int:
         """Extract sections from golden pair survey JSON"""
-        sections_created = 0
+        golden_sections = self.build_golden_sections(golden_pair)
+        if not dry_run:
+            return self._upsert_golden_sections(golden_sections)
+        return len(golden_sections)
+    
+    def build_golden_sections(self, golden_pair: GoldenRFQSurveyPair) -> List[GoldenSection]:
+        """Build unsaved GoldenSection rows from golden pair survey JSON (no database access)"""
+        golden_sections = []
         
         try:
             survey_data = golden_pair.survey_json
@@ -253,7 +264,7 @@ class RuleBasedRAGPopulator:
             
             for section_data in sections:
                 try:
-                    section_id = section_data.get('id', f"section_{sections_created}")
+                    section_id = section_data.get('id', f"section_{len(golden_sections)}")
                     section_title = section_data.get('title', '')
                     section_text = section_data.get('description', '')
                     
@@ -269,26 +280,21 @@ class RuleBasedRAGPopulator:
                     # Extract question patterns
                     question_patterns = self._extract_question_patterns(section_text)
                     
-                    if not dry_run:
-                        # Create golden section
-                        golden_section = GoldenSection(
-                            section_id=section_id,
-                            survey_id=str(golden_pair.id),
-                            golden_pair_id=golden_pair.id,
-                            section_title=section_title,
-                            section_text=section_text,
-                            section_type=section_type,
-                            methodology_tags=methodology_tags,
-                            industry_keywords=industry_keywords,
-                            question_patterns=question_patterns,
-                            quality_score=0.5,  # Default quality score
-                            human_verified=False,
-                            labels={}
-                        )
-                        
-                        self.db.add(golden_section)
-                    
-                    sections_created += 1
+                    # Create golden section
+                    golden_sections.append(GoldenSection(
+                        section_id=section_id,
+                        survey_id=str(golden_pair.id),
+                        golden_pair_id=golden_pair.id,
+                        section_title=section_title,
+                        section_text=section_text,
+                        section_type=section_type,
+                        methodology_tags=methodology_tags,
+                        industry_keywords=industry_keywords,
+                        question_patterns=question_patterns,
+                        quality_score=0.5,  # Default quality score
+                        human_verified=False,
+                        labels={}
+                    ))
                     
                 except Exception as e:
                     logger.warning(f"⚠️ Error extracting section from {golden_pair.id}: {str(e)}")
@@ -296,11 +302,18 @@ class RuleBasedRAGPopulator:
         except Exception as e:
             logger.warning(f"⚠️ Error processing sections for {golden_pair.id}: {str(e)}")
         
-        return sections_created
+        return golden_sections
     
     async def _extract_questions(self, golden_pair: GoldenRFQSurveyPair, dry_run: bool) -> int:
         """Extract questions from golden pair survey JSON"""
-        questions_created = 0
+        golden_questions = self.build_golden_questions(golden_pair)
+        if not dry_run:
+            return self._upsert_golden_questions(golden_questions)
+        return len(golden_questions)
+    
+    def build_golden_questions(self, golden_pair: GoldenRFQSurveyPair) -> List[GoldenQuestion]:
+        """Build unsaved GoldenQuestion rows from golden pair survey JSON (no database access)"""
+        golden_questions = []
         
         # Initialize label normalizer
         from src.services.label_normalizer import LabelNormalizer
@@ -329,7 +342,7 @@ class RuleBasedRAGPopulator:
             
             for question_data in questions:
                 try:
-                    question_id = question_data.get('id', f"question_{questions_created}")
+                    question_id = question_data.get('id', f"question_{len(golden_questions)}")
                     question_text = question_data.get('text', '')
                     question_type = question_data.get('type', '')
                     
@@ -350,26 +363,21 @@ class RuleBasedRAGPopulator:
                     # Extract question patterns
                     question_patterns = self._extract_question_patterns(question_text)
                     
-                    if not dry_run:
-                        # Create golden question
-                        golden_question = GoldenQuestion(
-                            question_id=question_id,
-                            survey_id=str(golden_pair.id),
-                            golden_pair_id=golden_pair.id,
-                            question_text=question_text,
-                            question_type=detected_type,
-                            question_subtype=detected_subtype,
-                            methodology_tags=methodology_tags,
-                            industry_keywords=industry_keywords,
-                            question_patterns=question_patterns,
-                            quality_score=0.5,  # Default quality score
-                            human_verified=False,
-                            labels=labels  # Use normalized labels
-                        )
-                        
-                        self.db.add(golden_question)
-                    
-                    questions_created += 1
+                    # Create golden question
+                    golden_questions.append(GoldenQuestion(
+                        question_id=question_id,
+                        survey_id=str(golden_pair.id),
+                        golden_pair_id=golden_pair.id,
+                        question_text=question_text,
+                        question_type=detected_type,
+                        question_subtype=detected_subtype,
+                        methodology_tags=methodology_tags,
+                        industry_keywords=industry_keywords,
+                        question_patterns=question_patterns,
+                        quality_score=0.5,  # Default quality score
+                        human_verified=False,
+                        labels=labels  # Use normalized labels
+                    ))
                     
                 except Exception as e:
                     logger.warning(f"⚠️ Error extracting question from {golden_pair.id}: {str(e)}")
@@ -377,7 +385,89 @@ class RuleBasedRAGPopulator:
         except Exception as e:
             logger.warning(f"⚠️ Error processing questions for {golden_pair.id}: {str(e)}")
         
-        return questions_created
+        return golden_questions
+    
+    def _upsert_golden_sections(self, golden_sections: List[GoldenSection]) -> int:
+        """
+        Upsert GoldenSection rows on (survey_id, section_id), the key the batch annotation sync uses
+
+        Re-runs refresh the rule-based rows in place; rows verified by annotations are left untouched.
+
+        Returns:
+            Number of distinct sections written
+        """
+        rows = self._golden_row_values(golden_sections, 'section_id')
+        if rows:
+            statement = pg_insert(GoldenSection).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[GoldenSection.survey_id, GoldenSection.section_id],
+                set_={
+                    "section_title": statement.excluded.section_title,
+                    "section_text": statement.excluded.section_text,
+                    "section_type": statement.excluded.section_type,
+                    "methodology_tags": statement.excluded.methodology_tags,
+                    "industry_keywords": statement.excluded.industry_keywords,
+                    "question_patterns": statement.excluded.question_patterns,
+                    "quality_score": statement.excluded.quality_score,
+                    "updated_at": func.now(),
+                },
+                where=GoldenSection.human_verified.isnot(True),
+            )
+            self.db.execute(statement)
+        return len(rows)
+    
+    def _upsert_golden_questions(self, golden_questions: List[GoldenQuestion]) -> int:
+        """
+        Upsert GoldenQuestion rows on (survey_id, question_id), the key the batch annotation sync uses
+
+        Re-runs refresh the rule-based rows in place; rows verified by annotations are left untouched.
+
+        Returns:
+            Number of distinct questions written
+        """
+        rows = self._golden_row_values(golden_questions, 'question_id')
+        if rows:
+            statement = pg_insert(GoldenQuestion).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[GoldenQuestion.survey_id, GoldenQuestion.question_id],
+                set_={
+                    "question_text": statement.excluded.question_text,
+                    "question_type": statement.excluded.question_type,
+                    "question_subtype": statement.excluded.question_subtype,
+                    "methodology_tags": statement.excluded.methodology_tags,
+                    "industry_keywords": statement.excluded.industry_keywords,
+                    "question_patterns": statement.excluded.question_patterns,
+                    "quality_score": statement.excluded.quality_score,
+                    "labels": statement.excluded.labels,
+                    "updated_at": func.now(),
+                },
+                where=GoldenQuestion.human_verified.isnot(True),
+            )
+            self.db.execute(statement)
+        return len(rows)
+    
+    @staticmethod
+    def _golden_row_values(golden_rows: List[Any], id_column: str) -> List[Dict[str, Any]]:
+        """
+        Convert unsaved golden rows into INSERT values, keeping the first row per (survey_id, id)
+
+        A single INSERT ... ON CONFLICT cannot touch the same key twice, so repeated
+        section/question ids within a survey are dropped here.
+        """
+        values_by_key = {}
+        for golden_row in golden_rows:
+            values = {}
+            for column in golden_row.__table__.columns:
+                value = getattr(golden_row, column.key)
+                if value is None and column.default is not None and column.default.is_scalar:
+                    value = column.default.arg
+                values[column.key] = value
+            values[id_column] = str(values[id_column])
+            values['id'] = values['id'] or uuid.uuid4()
+            values['created_at'] = values['created_at'] or datetime.now()
+            values['updated_at'] = datetime.now()
+            values_by_key.setdefault((values['survey_id'], values[id_column]), values)
+        return list(values_by_key.values())
     
     def _detect_section_type(self, text: str) -> str:
         """Detect section type from text"""
@@ -461,6 +551,7 @@ class RuleBasedRAGPopulator:
             sections = survey_data.get('sections', [])
             
             sections_created = 0
+            golden_sections = []
             
             for i, section in enumerate(sections):
                 if not isinstance(section, dict):
@@ -494,10 +585,12 @@ class RuleBasedRAGPopulator:
                         created_at=survey.created_at or datetime.now()
                     )
                     
-                    self.db.add(golden_section)
+                    golden_sections.append(golden_section)
                 
                 sections_created += 1
             
+            if not dry_run:
+                self._upsert_golden_sections(golden_sections)
             return sections_created
             
         except Exception as e:
@@ -525,6 +618,7 @@ class RuleBasedRAGPopulator:
             questions = all_questions
             
             questions_created = 0
+            golden_questions = []
             
             for i, question in enumerate(questions):
                 if not isinstance(question, dict):
@@ -563,10 +657,12 @@ class RuleBasedRAGPopulator:
                         created_at=survey.created_at or datetime.now()
                     )
                     
-                    self.db.add(golden_question)
+                    golden_questions.append(golden_question)
                 
                 questions_created += 1
             
+            if not dry_run:
+                self._upsert_golden_questions(golden_questions)
             return questions_created
             
         except Exception as e:
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Bring cached survey-to-golden similarity up to the current golden-set version.
+
+Embeds golden surveys and generated surveys that have no stored embedding yet
+(or were edited since), then updates each survey's cached top-k golden matches. Surveys already cached
+are scored only against golden pairs changed since their version; pass
+--rebuild to drop the cache and score every survey against every golden pair.
+
+Requires migration 059. Safe to run multiple times.
+
+Usage:
+    python scripts/refresh_golden_similarity_index.py [--rebuild] [--top-k 10]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database import get_db
+from src.database.models import SurveyGoldenTopMatches
+from src.services.golden_similarity_index_service import (
+    GOLDEN_SIMILARITY_TOP_K,
+    GoldenSimilarityIndexService,
+)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    db = next(get_db())
+    try:
+        if args.rebuild:
+            deleted = db.query(SurveyGoldenTopMatches).delete(synchronize_session=False)
+            db.commit()
+            print(f"Dropped {deleted} cached top-match rows")
+
+        stats = await GoldenSimilarityIndexService(db, top_k=args.top_k).refresh()
+        print(
+            f"Embedded: {stats['golden_pairs_embedded']} golden pairs, {stats['surveys_embedded']} surveys. "
+            f"Refreshed: {stats['incremental']} incremental, {stats['full']} full"
+        )
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh cached survey-to-golden similarity")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every survey from scratch")
+    parser.add_argument("--top-k", type=int, default=GOLDEN_SIMILARITY_TOP_K)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ All migrations handled directly via SQL
 """
 
 from typing import Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from src.database.connection import get_db
@@ -73,7 +73,9 @@ async def get_safety_info():
             "seed_retrieval_weights": "/api/v1/admin/seed-retrieval-weights",
             "seed_methodology_compatibility": "/api/v1/admin/seed-methodology-compatibility",
             "seed_methodology_rules": "/api/v1/admin/seed-methodology-rules",
-            "migrate_all": "/api/v1/admin/migrate-all"
+            "migrate_all": "/api/v1/admin/migrate-all",
+            "workflow_queue": "/api/v1/admin/workflow-queue",
+            "perf": "/api/v1/admin/perf"
         },
         "environment_protection": {
             "production_blocked": "Dangerous operations are blocked in production unless ALLOW_DANGEROUS_OPERATIONS=true",
@@ -280,7 +282,12 @@ async def migrate_all(db: Session = Depends(get_db)):
                 "051_fix_annotation_unique_constraints.sql",
                 "052_add_feedback_digest_to_surveys.sql",
                 "053_add_survey_versioning.sql",
-                "054_add_regeneration_comment_tracking.sql"
+                "054_add_regeneration_comment_tracking.sql",
+                "055_add_workflow_jobs_queue.sql",
+                "056_add_workflow_checkpoints.sql",
+                "057_add_llm_audit_keyset_index.sql",
+                "058_add_golden_content_upsert_keys.sql",
+                "059_add_golden_similarity_cache.sql"
             ]
             
             for migration_file in incremental_migrations:
@@ -476,59 +483,51 @@ async def sync_annotations_to_rag(db: Session = Depends(get_db)) -> Dict[str, An
         
         sync_service = AnnotationRAGSyncService(db)
         
-        # Sync all question annotations
-        logger.info("📝 [Admin] Syncing question annotations...")
-        question_annotations = db.query(QuestionAnnotation).filter(
-            QuestionAnnotation.annotator_id == "current-user"  # Only human annotations
+        # Only human annotations; IDs grouped per survey so each survey is synced in one batch
+        question_annotations = db.query(QuestionAnnotation.id, QuestionAnnotation.survey_id).filter(
+            QuestionAnnotation.annotator_id == "current-user"
         ).all()
-        
-        logger.info(f"📊 Found {len(question_annotations)} question annotations to sync")
-        
-        for qa in question_annotations:
-            try:
-                stats['question_annotations_processed'] += 1
-                # Pass only the ID to avoid session binding issues
-                annotation_id = qa.id
-                result = await sync_service.sync_question_annotation(annotation_id)
-                
-                if result.get("success"):
-                    stats['questions_synced'] += 1
-                    logger.info(f"✅ Synced question annotation {annotation_id}: {result.get('action')}")
-                else:
-                    error_msg = f"Failed to sync question annotation {annotation_id}: {result.get('error')}"
-                    logger.warning(f"⚠️ {error_msg}")
-                    stats['errors'].append(error_msg)
-                    
-            except Exception as e:
-                error_msg = f"Error syncing question annotation {qa.id}: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                stats['errors'].append(error_msg)
-        
-        # Sync all section annotations
-        logger.info("📝 [Admin] Syncing section annotations...")
-        section_annotations = db.query(SectionAnnotation).filter(
-            SectionAnnotation.annotator_id == "current-user"  # Only human annotations
+        section_annotations = db.query(SectionAnnotation.id, SectionAnnotation.survey_id).filter(
+            SectionAnnotation.annotator_id == "current-user"
         ).all()
         
-        logger.info(f"📊 Found {len(section_annotations)} section annotations to sync")
+        logger.info(f"📊 Found {len(question_annotations)} question and {len(section_annotations)} section annotations to sync")
         
+        ids_by_survey = {}
+        for qa in question_annotations:
+            ids_by_survey.setdefault(qa.survey_id, ([], []))[0].append(qa.id)
         for sa in section_annotations:
+            ids_by_survey.setdefault(sa.survey_id, ([], []))[1].append(sa.id)
+        
+        for survey_id, (question_ids, section_ids) in ids_by_survey.items():
+            stats['question_annotations_processed'] += len(question_ids)
+            stats['section_annotations_processed'] += len(section_ids)
             try:
-                stats['section_annotations_processed'] += 1
-                # Pass only the ID to avoid session binding issues
-                annotation_id = sa.id
-                result = await sync_service.sync_section_annotation(annotation_id)
+                result = await sync_service.sync_annotations_batch(
+                    survey_id,
+                    question_annotation_ids=question_ids,
+                    section_annotation_ids=section_ids
+                )
+                stats['questions_synced'] += result.get("questions_synced", 0)
+                stats['sections_synced'] += result.get("sections_synced", 0)
                 
-                if result.get("success"):
-                    stats['sections_synced'] += 1
-                    logger.info(f"✅ Synced section annotation {annotation_id}: {result.get('action')}")
-                else:
-                    error_msg = f"Failed to sync section annotation {annotation_id}: {result.get('error')}"
+                if not result.get("success"):
+                    error_msg = f"Failed to sync annotations for survey {survey_id}: {result.get('error')}"
                     logger.warning(f"⚠️ {error_msg}")
                     stats['errors'].append(error_msg)
-                    
+                    continue
+                
+                for kind, items in (("question", result.get("questions", [])), ("section", result.get("sections", []))):
+                    for item in items:
+                        if not item.get("success"):
+                            error_msg = f"Failed to sync {kind} annotation {item.get('annotation_id')}: {item.get('error')}"
+                            logger.warning(f"⚠️ {error_msg}")
+                            stats['errors'].append(error_msg)
+                
+                logger.info(f"✅ Synced survey {survey_id}: {result.get('questions_synced', 0)} questions, {result.get('sections_synced', 0)} sections")
+                
             except Exception as e:
-                error_msg = f"Error syncing section annotation {sa.id}: {str(e)}"
+                error_msg = f"Error syncing annotations for survey {survey_id}: {str(e)}"
                 logger.error(f"❌ {error_msg}")
                 stats['errors'].append(error_msg)
         
@@ -1195,6 +1194,60 @@ async def check_migration_status(db: Session = Depends(get_db)):
         )
 
 
+@router.get("/workflow-queue")
+async def get_workflow_queue_metrics(db: Session = Depends(get_db)):
+    """
+    Workflow job queue depth, running jobs per worker and oldest waiting job age
+    """
+    try:
+        from src.services.workflow_queue_service import WorkflowQueueService
+        
+        return {
+            "status": "success",
+            "metrics": WorkflowQueueService(db).get_metrics()
+        }
+    except Exception as e:
+        logger.error(f"❌ [Admin] Failed to fetch workflow queue metrics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch workflow queue metrics: {str(e)}")
+
+
+@router.get("/perf")
+async def get_perf_stats(
+    window_seconds: int = Query(900, ge=1, le=86400, description="Sliding window in seconds"),
+    recent_traces: int = Query(20, ge=0, le=200, description="Number of recent traces to list")
+):
+    """
+    Span latency percentiles (p50/p95/p99) per span name for this process, plus recent traces
+    and per-model LLM gateway limits and retrieval prefetch hit rates
+    """
+    from src.services.llm_gateway import llm_gateway
+    from src.services.retrieval_prefetch_service import retrieval_prefetch
+    from src.services.tracing import tracer
+
+    return {
+        "status": "success",
+        "tracing_enabled": tracer.enabled,
+        "window_seconds": window_seconds,
+        "spans": tracer.get_stats(window_seconds),
+        "recent_traces": tracer.get_recent_traces(recent_traces),
+        "llm_gateway": llm_gateway.get_metrics(),
+        "retrieval_prefetch": retrieval_prefetch.get_metrics()
+    }
+
+
+@router.get("/perf/traces/{trace_id}")
+async def get_perf_trace(trace_id: str):
+    """
+    All buffered spans of one trace, in start order
+    """
+    from src.services.tracing import tracer
+
+    spans = tracer.get_trace(trace_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found in the trace buffer")
+    return {"status": "success", "trace_id": trace_id, "spans": spans}
+
+
 @router.get("/human-vs-ai-stats")
 async def get_human_vs_ai_stats(db: Session = Depends(get_db)):
     """
@@ -1203,88 +1256,18 @@ async def get_human_vs_ai_stats(db: Session = Depends(get_db)):
     try:
         logger.info("🔍 [Admin] Fetching human vs AI annotation statistics")
         
-        from src.database.models import QuestionAnnotation, SectionAnnotation, SurveyAnnotation
-        from src.utils.database_session_manager import DatabaseSessionManager
-        
-        # Get basic counts
-        total_qa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(QuestionAnnotation).count(),
-            fallback_value=0,
-            operation_name="total question annotations"
-        )
-        
-        total_sa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(SectionAnnotation).count(),
-            fallback_value=0,
-            operation_name="total section annotations"
-        )
-        
-        total_sva = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(SurveyAnnotation).count(),
-            fallback_value=0,
-            operation_name="total survey annotations"
-        )
-        
-        # AI vs Human breakdown
-        ai_qa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(QuestionAnnotation).filter(QuestionAnnotation.ai_generated == True).count(),
-            fallback_value=0,
-            operation_name="AI question annotations"
-        )
-        
-        human_qa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(QuestionAnnotation).filter(QuestionAnnotation.annotator_id == "current-user").count(),
-            fallback_value=0,
-            operation_name="human question annotations"
-        )
-        
-        ai_sa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(SectionAnnotation).filter(SectionAnnotation.ai_generated == True).count(),
-            fallback_value=0,
-            operation_name="AI section annotations"
-        )
-        
-        human_sa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(SectionAnnotation).filter(SectionAnnotation.annotator_id == "current-user").count(),
-            fallback_value=0,
-            operation_name="human section annotations"
-        )
-        
-        # Override and verification stats
-        overridden_qa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(QuestionAnnotation).filter(QuestionAnnotation.human_overridden == True).count(),
-            fallback_value=0,
-            operation_name="overridden question annotations"
-        )
-        
-        overridden_sa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(SectionAnnotation).filter(SectionAnnotation.human_overridden == True).count(),
-            fallback_value=0,
-            operation_name="overridden section annotations"
-        )
+        from src.services.annotation_stats_service import AnnotationStatsService
         
-        verified_qa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(QuestionAnnotation).filter(QuestionAnnotation.human_verified == True).count(),
-            fallback_value=0,
-            operation_name="verified question annotations"
-        )
+        # One aggregate query per table (cached for a short TTL)
+        breakdown = AnnotationStatsService(db).get_human_vs_ai_breakdown()
+        question_stats = breakdown["question_annotations"]
+        section_stats = breakdown["section_annotations"]
         
-        verified_sa = DatabaseSessionManager.safe_query(
-            db,
-            lambda: db.query(SectionAnnotation).filter(SectionAnnotation.human_verified == True).count(),
-            fallback_value=0,
-            operation_name="verified section annotations"
-        )
+        total_qa, ai_qa, human_qa = question_stats["total"], question_stats["ai_generated"], question_stats["human_created"]
+        overridden_qa, verified_qa = question_stats["overridden"], question_stats["verified"]
+        total_sa, ai_sa, human_sa = section_stats["total"], section_stats["ai_generated"], section_stats["human_created"]
+        overridden_sa, verified_sa = section_stats["overridden"], section_stats["verified"]
+        total_sva = breakdown["survey_annotations"]["total"]
         
         # Calculate percentages
         total_annotations = total_qa + total_sa + total_sva
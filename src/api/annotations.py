@@ -652,7 +652,8 @@ async def save_bulk_annotations(
             from src.services.annotation_rag_sync_service import AnnotationRAGSyncService
             sync_service = AnnotationRAGSyncService(db)
             
-            # Sync question annotations
+            # Collect the saved human annotation IDs, then sync them in one batch
+            question_annotation_ids = []
             for qa_req in annotations.question_annotations:
                 # Find the saved annotation ID
                 qa = db.query(QuestionAnnotation).filter(
@@ -664,14 +665,9 @@ async def save_bulk_annotations(
                 ).first()
                 
                 if qa and qa.annotator_id == "current-user":  # Only sync human annotations
-                    logger.info(f"🔗 Syncing question annotation {qa.id} to RAG")
-                    result = await sync_service.sync_question_annotation(qa.id)
-                    if result.get("success"):
-                        logger.info(f"✅ Synced question {qa.question_id}: {result.get('action')}")
-                    else:
-                        logger.warning(f"⚠️ Failed to sync question {qa.question_id}: {result.get('error')}")
+                    question_annotation_ids.append(qa.id)
             
-            # Sync section annotations
+            section_annotation_ids = []
             for sa_req in annotations.section_annotations:
                 # Find the saved annotation ID
                 sa = db.query(SectionAnnotation).filter(
@@ -683,12 +679,19 @@ async def save_bulk_annotations(
                 ).first()
                 
                 if sa and sa.annotator_id == "current-user":  # Only sync human annotations
-                    logger.info(f"🔗 Syncing section annotation {sa.id} to RAG")
-                    result = await sync_service.sync_section_annotation(sa.id)
-                    if result.get("success"):
-                        logger.info(f"✅ Synced section {sa.section_id}: {result.get('action')}")
-                    else:
-                        logger.warning(f"⚠️ Failed to sync section {sa.section_id}: {result.get('error')}")
+                    section_annotation_ids.append(sa.id)
+            
+            logger.info(f"🔗 Syncing {len(question_annotation_ids)} question and {len(section_annotation_ids)} section annotations to RAG")
+            result = await sync_service.sync_annotations_batch(
+                survey_id,
+                question_annotation_ids=question_annotation_ids,
+                section_annotation_ids=section_annotation_ids
+            )
+            for item in result.get("questions", []) + result.get("sections", []):
+                if not item.get("success"):
+                    logger.warning(f"⚠️ Failed to sync annotation {item.get('annotation_id')}: {item.get('error')}")
+            if not result.get("success"):
+                logger.warning(f"⚠️ RAG batch sync failed: {result.get('error')}")
             
             db.commit()  # Commit RAG sync changes
             logger.info("✅ [API] RAG sync completed")
@@ -715,68 +718,17 @@ def get_annotation_stats(
     db: Session = Depends(get_db)
 ):
     """Get annotation statistics"""
+    from src.services.annotation_stats_service import AnnotationStatsService
     
-    # Base queries
-    question_query = db.query(QuestionAnnotation)
-    section_query = db.query(SectionAnnotation)
-    
-    # Filter by annotator if specified
-    if annotator_id:
-        question_query = question_query.filter(QuestionAnnotation.annotator_id == annotator_id)
-        section_query = section_query.filter(SectionAnnotation.annotator_id == annotator_id)
-    
-    # Count annotations
-    question_count = question_query.count()
-    section_count = section_query.count()
-    
-    # Get average scores
-    question_annotations = question_query.all()
-    section_annotations = section_query.all()
-    
-    if question_annotations:
-        avg_question_quality = sum(qa.quality for qa in question_annotations) / len(question_annotations)
-        avg_question_relevant = sum(qa.relevant for qa in question_annotations) / len(question_annotations)
-        avg_question_pillars = {
-            'methodological_rigor': sum(qa.methodological_rigor for qa in question_annotations) / len(question_annotations),
-            'content_validity': sum(qa.content_validity for qa in question_annotations) / len(question_annotations),
-            'respondent_experience': sum(qa.respondent_experience for qa in question_annotations) / len(question_annotations),
-            'analytical_value': sum(qa.analytical_value for qa in question_annotations) / len(question_annotations),
-            'business_impact': sum(qa.business_impact for qa in question_annotations) / len(question_annotations),
-        }
-    else:
-        avg_question_quality = 0
-        avg_question_relevant = 0
-        avg_question_pillars = {}
-    
-    if section_annotations:
-        avg_section_quality = sum(sa.quality for sa in section_annotations) / len(section_annotations)
-        avg_section_relevant = sum(sa.relevant for sa in section_annotations) / len(section_annotations)
-        avg_section_pillars = {
-            'methodological_rigor': sum(sa.methodological_rigor for sa in section_annotations) / len(section_annotations),
-            'content_validity': sum(sa.content_validity for sa in section_annotations) / len(section_annotations),
-            'respondent_experience': sum(sa.respondent_experience for sa in section_annotations) / len(section_annotations),
-            'analytical_value': sum(sa.analytical_value for sa in section_annotations) / len(section_annotations),
-            'business_impact': sum(sa.business_impact for sa in section_annotations) / len(section_annotations),
-        }
-    else:
-        avg_section_quality = 0
-        avg_section_relevant = 0
-        avg_section_pillars = {}
+    # Counts and averages are computed in SQL, one aggregate query per table
+    stats = AnnotationStatsService(db).get_annotation_averages(annotator_id)
+    question_stats = stats["question_annotations"]
+    section_stats = stats["section_annotations"]
     
     return {
-        "question_annotations": {
-            "count": question_count,
-            "avg_quality": round(avg_question_quality, 2),
-            "avg_relevant": round(avg_question_relevant, 2),
-            "avg_pillars": {k: round(v, 2) for k, v in avg_question_pillars.items()}
-        },
-        "section_annotations": {
-            "count": section_count,
-            "avg_quality": round(avg_section_quality, 2),
-            "avg_relevant": round(avg_section_relevant, 2),
-            "avg_pillars": {k: round(v, 2) for k, v in avg_section_pillars.items()}
-        },
-        "total_annotations": question_count + section_count
+        "question_annotations": question_stats,
+        "section_annotations": section_stats,
+        "total_annotations": question_stats["count"] + section_stats["count"]
     }
 
 @router.post("/annotations/survey/{survey_id}/advanced-labeling")
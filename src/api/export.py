@@ -4,13 +4,23 @@ Handles export of surveys to various formats (DOCX, etc.).
 """
 
 from fastapi import APIRouter, HTTPException, Response, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List
+from sqlalchemy.orm import Session
+from typing import Dict, Any, List, Optional
+from uuid import UUID
 import logging
 
+from src.database import get_db, Survey
 from src.services.export.base import export_registry
 from src.services.export.docx_renderer import DocxSurveyRenderer
 from src.services.export.pdf_renderer import PdfSurveyRenderer
+from src.services.export.export_service import (
+    CONTENT_TYPES,
+    BulkExportEntry,
+    build_export_filename,
+    export_service,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +34,14 @@ class SurveyExportRequest(BaseModel):
     filename: str = None
 
 
+class BulkSurveyExportRequest(BaseModel):
+    """Request model for exporting many surveys as one ZIP archive."""
+    survey_ids: List[str]
+    format: str = "docx"
+    include_all_versions: bool = False
+    filename: Optional[str] = None
+
+
 class ExportFormatInfo(BaseModel):
     """Information about available export formats."""
     format: str
@@ -72,8 +90,8 @@ async def export_survey(request: SurveyExportRequest):
                 detail=f"Unsupported format: {request.format}. Available formats: {available_formats}"
             )
 
-        # Get renderer
-        renderer = export_registry.get_renderer(request.format)
+        # Instantiate renderer to fail fast if its dependencies are unavailable
+        export_registry.get_renderer(request.format)
 
         # Validate survey data
         if not request.survey_data:
@@ -127,25 +145,11 @@ async def export_survey(request: SurveyExportRequest):
             questions = request.survey_data.get("questions", [])
             logger.info(f"Exporting survey with {len(questions)} questions to {request.format} format")
 
-        exported_data = renderer.render_survey(request.survey_data)
+        # Render off the event loop (cached by format, renderer version and survey hash)
+        exported_data = await export_service.render(request.format, request.survey_data)
 
-        # Determine filename
-        if request.filename:
-            filename = request.filename
-            if not filename.endswith(f".{request.format}"):
-                filename += f".{request.format}"
-        else:
-            survey_title = request.survey_data.get("title", "survey")
-            # Clean filename
-            clean_title = "".join(c for c in survey_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            filename = f"{clean_title.replace(' ', '_')}.{request.format}"
-
-        # Set appropriate content type
-        content_type_map = {
-            "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            "pdf": "application/pdf"
-        }
-        content_type = content_type_map.get(request.format, "application/octet-stream")
+        filename = build_export_filename(request.survey_data, request.format, request.filename)
+        content_type = CONTENT_TYPES.get(request.format, "application/octet-stream")
 
         logger.info(f"Successfully exported survey as {filename} ({len(exported_data)} bytes)")
 
@@ -166,6 +170,71 @@ async def export_survey(request: SurveyExportRequest):
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 
+@router.post("/surveys/bulk")
+async def export_surveys_bulk(
+    request: BulkSurveyExportRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Export many surveys (optionally with all their versions) as a streamed ZIP archive.
+
+    Each survey is rendered concurrently and added to the archive as soon as it
+    finishes, so large exports start downloading immediately instead of timing out.
+    Responds 404 listing the IDs if any requested survey does not exist.
+    """
+    if request.format not in export_registry.get_available_formats():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format: {request.format}. Available formats: {export_registry.get_available_formats()}"
+        )
+    if not request.survey_ids:
+        raise HTTPException(status_code=400, detail="At least one survey_id is required")
+
+    try:
+        survey_uuids = [UUID(survey_id) for survey_id in request.survey_ids]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid survey_id: {str(e)}")
+
+    surveys = db.query(Survey).filter(Survey.id.in_(survey_uuids)).all()
+    found_ids = {survey.id for survey in surveys}
+    missing_ids = list(dict.fromkeys(str(survey_id) for survey_id in survey_uuids if survey_id not in found_ids))
+    if missing_ids:
+        raise HTTPException(status_code=404, detail=f"Surveys not found: {', '.join(missing_ids)}")
+
+    if request.include_all_versions:
+        rfq_ids = {survey.rfq_id for survey in surveys if survey.rfq_id}
+        if rfq_ids:
+            versions = db.query(Survey).filter(Survey.rfq_id.in_(rfq_ids)).all()
+            surveys.extend(version for version in versions if version.id not in found_ids)
+
+    entries: List[BulkExportEntry] = []
+    for survey in sorted(surveys, key=lambda s: (str(s.rfq_id), s.version or 0)):
+        survey_data = survey.final_output or survey.raw_output
+        if not survey_data:
+            logger.warning(f"⚠️ [Export API] Skipping survey {survey.id} with no output")
+            continue
+        base_name = build_export_filename(survey_data, request.format).rsplit(".", 1)[0]
+        entries.append(BulkExportEntry(
+            name=f"{base_name}_v{survey.version or 1}_{str(survey.id)[:8]}",
+            survey_data=survey_data
+        ))
+
+    if not entries:
+        raise HTTPException(status_code=400, detail="None of the requested surveys have exportable content")
+
+    archive_name = request.filename or f"surveys_{request.format}_export"
+    if not archive_name.endswith(".zip"):
+        archive_name += ".zip"
+
+    logger.info(f"📦 [Export API] Streaming bulk {request.format} export of {len(entries)} surveys as {archive_name}")
+
+    return StreamingResponse(
+        export_service.stream_zip(request.format, entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={archive_name}"}
+    )
+
+
 @router.post("/validate")
 async def validate_survey_for_export(survey_data: Dict[str, Any]):
     """
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, File, UploadFile
 from sqlalchemy.orm import Session
 from src.database import get_db
 from src.api.dependencies import require_models_ready
 from src.services.golden_service import GoldenService
+from src.services.golden_similarity_index_service import refresh_golden_similarity_index
 from src.services.golden_state_service import GoldenStateService
 from src.services.document_parser import document_parser, DocumentParsingError
 from src.utils.error_messages import UserFriendlyError, create_error_response
+from src.config.logging_config import log_text_preview
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from uuid import UUID
@@ -39,6 +41,14 @@ class CreateGoldenPairRequest(BaseModel):
     auto_generate_rfq: Optional[bool] = False  # Flag to indicate if RFQ should be auto-generated
 
 
+class BulkCreateGoldenPairsRequest(BaseModel):
+    pairs: List[CreateGoldenPairRequest]
+
+
+# Upper bound on pairs per bulk request; all pairs of a request share one transaction
+MAX_BULK_GOLDEN_PAIRS = 100
+
+
 class ValidationRequest(BaseModel):
     expert_validation: bool
     quality_score: Optional[float] = None
@@ -114,6 +124,7 @@ async def list_golden_pairs(
 @router.post("/", response_model=GoldenPairResponse)
 async def create_golden_pair(
     request: CreateGoldenPairRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     _: bool = Depends(require_models_ready)
 ):
@@ -172,17 +183,8 @@ async def create_golden_pair(
         logger.info(f"✅ [Golden Pair API] Golden pair created successfully with ID: {golden_pair.id}")
         logger.info(f"📋 [Golden Pair API] Created pair details - title: {getattr(golden_pair, 'title', None)}, quality_score: {golden_pair.quality_score}")
         
-        response = GoldenPairResponse(
-            id=str(golden_pair.id),
-            title=getattr(golden_pair, 'title', None),
-            rfq_text=golden_pair.rfq_text,
-            survey_json=golden_pair.survey_json,
-            methodology_tags=golden_pair.methodology_tags,
-            industry_category=golden_pair.industry_category,
-            research_goal=golden_pair.research_goal,
-            quality_score=float(golden_pair.quality_score) if golden_pair.quality_score else None,
-            usage_count=golden_pair.usage_count
-        )
+        response = _to_golden_pair_response(golden_pair)
+        background_tasks.add_task(refresh_golden_similarity_index)
         
         logger.info(f"🎉 [Golden Pair API] Successfully created golden pair: {response.id}")
         return response
@@ -192,10 +194,58 @@ async def create_golden_pair(
         raise HTTPException(status_code=500, detail=f"Failed to create golden pair: {str(e)}")
 
 
+@router.post("/bulk", response_model=List[GoldenPairResponse])
+async def create_golden_pairs(
+    request: BulkCreateGoldenPairsRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_models_ready)
+):
+    """
+    Create many golden standard pairs at once (for large imports)
+    
+    RFQ embeddings are generated in one batch across all pairs and every pair is
+    written in a single transaction: either all pairs are created or none.
+    """
+    if len(request.pairs) > MAX_BULK_GOLDEN_PAIRS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_GOLDEN_PAIRS} golden pairs can be created per request"
+        )
+    
+    logger.info(f"🏆 [Golden Pair API] Starting bulk creation of {len(request.pairs)} golden pairs")
+    try:
+        golden_service = GoldenService(db)
+        golden_pairs = await golden_service.create_golden_pairs([
+            pair.dict() for pair in request.pairs
+        ])
+        background_tasks.add_task(refresh_golden_similarity_index)
+        logger.info(f"🎉 [Golden Pair API] Successfully created {len(golden_pairs)} golden pairs")
+        return [_to_golden_pair_response(golden_pair) for golden_pair in golden_pairs]
+    except Exception as e:
+        logger.error(f"❌ [Golden Pair API] Failed to create golden pairs: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to create golden pairs: {str(e)}")
+
+
+def _to_golden_pair_response(golden_pair) -> GoldenPairResponse:
+    return GoldenPairResponse(
+        id=str(golden_pair.id),
+        title=getattr(golden_pair, 'title', None),
+        rfq_text=golden_pair.rfq_text,
+        survey_json=golden_pair.survey_json,
+        methodology_tags=golden_pair.methodology_tags,
+        industry_category=golden_pair.industry_category,
+        research_goal=golden_pair.research_goal,
+        quality_score=float(golden_pair.quality_score) if golden_pair.quality_score else None,
+        usage_count=golden_pair.usage_count
+    )
+
+
 @router.put("/{golden_id}", response_model=GoldenPairResponse)
 async def update_golden_pair(
     golden_id: UUID,
     request: CreateGoldenPairRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -212,6 +262,7 @@ async def update_golden_pair(
             research_goal=request.research_goal,
             quality_score=request.quality_score
         )
+        background_tasks.add_task(refresh_golden_similarity_index)
         
         return GoldenPairResponse(
             id=str(golden_pair.id),
@@ -232,6 +283,7 @@ async def update_golden_pair(
 @router.delete("/{golden_id}")
 async def delete_golden_pair(
     golden_id: UUID,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -244,6 +296,7 @@ async def delete_golden_pair(
         if not success:
             raise HTTPException(status_code=404, detail="Golden pair not found")
         
+        background_tasks.add_task(refresh_golden_similarity_index)
         return {"status": "success", "message": "Golden pair deleted successfully"}
         
     except HTTPException:
@@ -335,7 +388,7 @@ async def parse_document(
         # Extract text for preview
         extracted_text = await document_parser.extract_text_from_docx(file_content)
         logger.info(f"✅ [Document Parse] Text extraction completed, length: {len(extracted_text)} chars")
-        logger.info(f"📝 [Document Parse] Extracted text preview: {extracted_text[:200]}...")
+        logger.info(f"📝 [Document Parse] Extracted text preview: {log_text_preview(extracted_text)}...")
         
         # Extract metadata from the correct structure
         # The parsed data has final_output containing the actual survey data
@@ -5,12 +5,15 @@ This module provides API endpoints for managing and monitoring LLM interactions,
 hyperparameter configurations, and prompt templates.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal, Union
 from datetime import datetime
 from uuid import UUID
+import gzip
 import logging
 
 from src.database import get_db
@@ -22,6 +25,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/llm-audit", tags=["LLM Audit"])
 
+# Interaction bodies at least this large are gzip-compressed for clients that accept it
+GZIP_MIN_BYTES = 1024
+
 
 def parse_raw_response(raw_response: str) -> Any:
     """
@@ -89,6 +95,37 @@ class LLMAuditListResponse(BaseModel):
     page_size: int
 
 
+class LLMAuditSummary(BaseModel):
+    """Audit record metadata without prompt/response bodies"""
+    id: str
+    interaction_id: str
+    parent_workflow_id: Optional[str]
+    parent_survey_id: Optional[str]
+    parent_rfq_id: Optional[str]
+    model_name: str
+    model_provider: str
+    model_version: Optional[str]
+    purpose: str
+    sub_purpose: Optional[str]
+    context_type: Optional[str]
+    input_tokens: Optional[int]
+    output_tokens: Optional[int]
+    temperature: Optional[float]
+    max_tokens: Optional[int]
+    response_time_ms: Optional[int]
+    success: bool
+    error_message: Optional[str]
+    tags: Optional[List[str]]
+    created_at: str
+
+
+class LLMAuditSummaryListResponse(BaseModel):
+    records: List[LLMAuditSummary]
+    total_count: Optional[int]  # Only computed for the first page
+    page_size: int
+    next_cursor: Optional[str]
+
+
 class LLMHyperparameterConfigResponse(BaseModel):
     id: str
     config_name: str
@@ -173,9 +210,81 @@ class CreatePromptTemplateRequest(BaseModel):
     is_default: bool = False
 
 
+def _to_audit_response(record: LLMAudit) -> LLMAuditResponse:
+    return LLMAuditResponse(
+        id=str(record.id),
+        interaction_id=record.interaction_id,
+        parent_workflow_id=record.parent_workflow_id,
+        parent_survey_id=record.parent_survey_id,
+        parent_rfq_id=str(record.parent_rfq_id) if record.parent_rfq_id else None,
+        model_name=record.model_name,
+        model_provider=record.model_provider,
+        model_version=record.model_version,
+        purpose=record.purpose,
+        sub_purpose=record.sub_purpose,
+        context_type=record.context_type,
+        input_prompt=record.input_prompt,
+        input_tokens=record.input_tokens,
+        output_content=record.output_content,
+        output_tokens=record.output_tokens,
+        raw_response=parse_raw_response(record.raw_response),
+        temperature=float(record.temperature) if record.temperature else None,
+        top_p=float(record.top_p) if record.top_p else None,
+        max_tokens=record.max_tokens,
+        frequency_penalty=float(record.frequency_penalty) if record.frequency_penalty else None,
+        presence_penalty=float(record.presence_penalty) if record.presence_penalty else None,
+        stop_sequences=record.stop_sequences,
+        response_time_ms=record.response_time_ms,
+        cost_usd=None,  # Hidden for now
+        success=record.success,
+        error_message=record.error_message,
+        interaction_metadata=record.interaction_metadata,
+        tags=record.tags,
+        created_at=record.created_at.isoformat() if record.created_at else "",
+        updated_at=record.updated_at.isoformat() if record.updated_at else ""
+    )
+
+
+def _to_audit_summary(row: Any) -> LLMAuditSummary:
+    return LLMAuditSummary(
+        id=str(row.id),
+        interaction_id=row.interaction_id,
+        parent_workflow_id=row.parent_workflow_id,
+        parent_survey_id=row.parent_survey_id,
+        parent_rfq_id=str(row.parent_rfq_id) if row.parent_rfq_id else None,
+        model_name=row.model_name,
+        model_provider=row.model_provider,
+        model_version=row.model_version,
+        purpose=row.purpose,
+        sub_purpose=row.sub_purpose,
+        context_type=row.context_type,
+        input_tokens=row.input_tokens,
+        output_tokens=row.output_tokens,
+        temperature=float(row.temperature) if row.temperature else None,
+        max_tokens=row.max_tokens,
+        response_time_ms=row.response_time_ms,
+        success=row.success,
+        error_message=row.error_message,
+        tags=row.tags,
+        created_at=row.created_at.isoformat() if row.created_at else ""
+    )
+
+
+def _json_response(request: Request, payload: BaseModel) -> Response:
+    """JSON response, gzip-compressed when the client accepts it and the body is large"""
+    body = json.dumps(jsonable_encoder(payload)).encode("utf-8")
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=gzip.compress(body, compresslevel=6),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(content=body, media_type="application/json")
+
+
 # API Endpoints
 
-@router.get("/interactions", response_model=LLMAuditListResponse)
+@router.get("/interactions", response_model=Union[LLMAuditListResponse, LLMAuditSummaryListResponse])
 async def get_llm_interactions(
     purpose: Optional[str] = Query(None, description="Filter by purpose"),
     sub_purpose: Optional[str] = Query(None, description="Filter by sub-purpose"),
@@ -188,12 +297,43 @@ async def get_llm_interactions(
     end_date: Optional[datetime] = Query(None, description="Filter by end date"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Page size"),
+    view: Literal["full", "summary"] = Query("full", description="'summary' lists metadata only, with cursor paging"),
+    cursor: Optional[str] = Query(None, description="Summary view: next_cursor from the previous page"),
     db: Session = Depends(get_db)
 ):
-    """Get LLM interaction audit records with filtering options"""
+    """
+    Get LLM interaction audit records with filtering options
+    
+    The summary view selects only metadata columns and pages with a keyset cursor on
+    (created_at, id); fetch prompt and response bodies from /interactions/{interaction_id}.
+    """
     try:
         audit_service = LLMAuditService(db)
         
+        if view == "summary":
+            try:
+                rows, next_cursor, total_count = await audit_service.get_audit_summaries(
+                    purpose=purpose,
+                    sub_purpose=sub_purpose,
+                    model_name=model_name,
+                    success=success,
+                    parent_workflow_id=parent_workflow_id,
+                    parent_survey_id=parent_survey_id,
+                    parent_rfq_id=parent_rfq_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    limit=page_size,
+                    cursor=cursor
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return LLMAuditSummaryListResponse(
+                records=[_to_audit_summary(row) for row in rows],
+                total_count=total_count,
+                page_size=page_size,
+                next_cursor=next_cursor
+            )
+        
         offset = (page - 1) * page_size
         records, total_count = await audit_service.get_audit_records(
             purpose=purpose,
@@ -210,40 +350,7 @@ async def get_llm_interactions(
         )
         
         # Convert to response format
-        audit_responses = []
-        for record in records:
-            audit_responses.append(LLMAuditResponse(
-                id=str(record.id),
-                interaction_id=record.interaction_id,
-                parent_workflow_id=record.parent_workflow_id,
-                parent_survey_id=record.parent_survey_id,
-                parent_rfq_id=str(record.parent_rfq_id) if record.parent_rfq_id else None,
-                model_name=record.model_name,
-                model_provider=record.model_provider,
-                model_version=record.model_version,
-                purpose=record.purpose,
-                sub_purpose=record.sub_purpose,
-                context_type=record.context_type,
-                input_prompt=record.input_prompt,
-                input_tokens=record.input_tokens,
-                output_content=record.output_content,
-                output_tokens=record.output_tokens,
-                raw_response=parse_raw_response(record.raw_response),
-                temperature=float(record.temperature) if record.temperature else None,
-                top_p=float(record.top_p) if record.top_p else None,
-                max_tokens=record.max_tokens,
-                frequency_penalty=float(record.frequency_penalty) if record.frequency_penalty else None,
-                presence_penalty=float(record.presence_penalty) if record.presence_penalty else None,
-                stop_sequences=record.stop_sequences,
-                response_time_ms=record.response_time_ms,
-                cost_usd=None,  # Hidden for now
-                success=record.success,
-                error_message=record.error_message,
-                interaction_metadata=record.interaction_metadata,
-                tags=record.tags,
-                created_at=record.created_at.isoformat() if record.created_at else "",
-                updated_at=record.updated_at.isoformat() if record.updated_at else ""
-            ))
+        audit_responses = [_to_audit_response(record) for record in records]
         
         return LLMAuditListResponse(
             records=audit_responses,
@@ -252,6 +359,8 @@ async def get_llm_interactions(
             page_size=page_size
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ [LLM Audit API] Error getting interactions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get LLM interactions: {str(e)}")
@@ -260,47 +369,17 @@ async def get_llm_interactions(
 @router.get("/interactions/{interaction_id}", response_model=LLMAuditResponse)
 async def get_llm_interaction(
     interaction_id: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """Get a specific LLM interaction by interaction ID"""
+    """Get a specific LLM interaction by interaction ID, including prompt and response bodies"""
     try:
         record = db.query(LLMAudit).filter(LLMAudit.interaction_id == interaction_id).first()
         
         if not record:
             raise HTTPException(status_code=404, detail="LLM interaction not found")
         
-        return LLMAuditResponse(
-            id=str(record.id),
-            interaction_id=record.interaction_id,
-            parent_workflow_id=record.parent_workflow_id,
-            parent_survey_id=record.parent_survey_id,
-            parent_rfq_id=str(record.parent_rfq_id) if record.parent_rfq_id else None,
-            model_name=record.model_name,
-            model_provider=record.model_provider,
-            model_version=record.model_version,
-            purpose=record.purpose,
-            sub_purpose=record.sub_purpose,
-            context_type=record.context_type,
-            input_prompt=record.input_prompt,
-            input_tokens=record.input_tokens,
-            output_content=record.output_content,
-            output_tokens=record.output_tokens,
-            raw_response=parse_raw_response(record.raw_response),
-            temperature=float(record.temperature) if record.temperature else None,
-            top_p=float(record.top_p) if record.top_p else None,
-            max_tokens=record.max_tokens,
-            frequency_penalty=float(record.frequency_penalty) if record.frequency_penalty else None,
-            presence_penalty=float(record.presence_penalty) if record.presence_penalty else None,
-            stop_sequences=record.stop_sequences,
-            response_time_ms=record.response_time_ms,
-            cost_usd=None,  # Hidden for now
-            success=record.success,
-            error_message=record.error_message,
-            interaction_metadata=record.interaction_metadata,
-            tags=record.tags,
-            created_at=record.created_at.isoformat() if record.created_at else "",
-            updated_at=record.updated_at.isoformat() if record.updated_at else ""
-        )
+        return _json_response(request, _to_audit_response(record))
         
     except HTTPException:
         raise
@@ -15,6 +15,7 @@ from sqlalchemy import func, desc
 from ..database.connection import get_db
 from ..database.quality_models import QualityMetrics, QualityBaselines, RegressionAlerts, QualityTrendAggregates
 from ..services.quality_regression_service import QualityRegressionService
+from ..services.quality_rollup_service import QualityRollupService, aggregate_metric_buckets, summarize_window
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -83,12 +84,10 @@ async def get_quality_overview(
 
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
 
-        # Get recent quality metrics
-        recent_metrics = db.query(QualityMetrics).filter(
-            QualityMetrics.created_at >= cutoff_time
-        ).all()
+        # Aggregate recent quality metrics in SQL
+        window = summarize_window(db, cutoff_time)
 
-        if not recent_metrics:
+        if not window["count"]:
             return QualityOverviewResponse(
                 current_quality_score=0.0,
                 quality_trend="insufficient_data",
@@ -100,15 +99,9 @@ async def get_quality_overview(
             )
 
         # Calculate overview statistics
-        avg_score = sum(m.weighted_score for m in recent_metrics) / len(recent_metrics)
-        avg_generation_time = sum(
-            m.generation_time_seconds for m in recent_metrics
-            if m.generation_time_seconds is not None
-        ) / len([m for m in recent_metrics if m.generation_time_seconds is not None])
-
-        compliance_rate = sum(
-            1 for m in recent_metrics if m.methodology_compliance
-        ) / len(recent_metrics)
+        avg_score = window["avg_score"]
+        avg_generation_time = window["avg_generation_time"]
+        compliance_rate = window["compliance_rate"]
 
         # Get active alerts
         active_alerts = db.query(RegressionAlerts).filter(
@@ -116,13 +109,10 @@ async def get_quality_overview(
             RegressionAlerts.detected_at >= cutoff_time
         ).count()
 
-        # Determine trend (simplified)
-        if len(recent_metrics) >= 10:
-            first_half = recent_metrics[:len(recent_metrics)//2]
-            second_half = recent_metrics[len(recent_metrics)//2:]
-
-            first_avg = sum(m.weighted_score for m in first_half) / len(first_half)
-            second_avg = sum(m.weighted_score for m in second_half) / len(second_half)
+        # Determine trend (simplified): older half vs newer half of the window
+        if window["count"] >= 10:
+            first_avg = window["first_half_avg"]
+            second_avg = window["second_half_avg"]
 
             if second_avg > first_avg + 0.05:
                 trend = "improving"
@@ -146,7 +136,7 @@ async def get_quality_overview(
             current_quality_score=avg_score,
             quality_trend=trend,
             active_alerts_count=active_alerts,
-            recent_surveys_count=len(recent_metrics),
+            recent_surveys_count=window["count"],
             avg_generation_time=avg_generation_time,
             methodology_compliance_rate=compliance_rate,
             top_issues=top_issues if top_issues else ["No major issues detected"]
@@ -423,68 +413,47 @@ async def update_quality_baselines(
         raise HTTPException(status_code=500, detail="Failed to update baselines")
 
 
+@router.post("/trends/rollup")
+async def rollup_quality_trends(
+    db: Session = Depends(get_db)
+):
+    """Roll up new quality metrics into trend aggregates now instead of waiting for the periodic job"""
+    try:
+        written = QualityRollupService(db).rollup()
+        return {"message": "Quality trend rollup completed", "buckets_written": written}
+
+    except Exception as e:
+        logger.error(f"❌ [QualityAPI] Failed to roll up quality trends: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to roll up quality trends")
+
+
 async def _compute_trend_on_demand(db: Session, metric_name: str, cutoff_time: datetime,
                                  aggregation: str) -> tuple[List[Dict[str, Any]], Dict[str, float]]:
-    """Compute trend data on-demand when pre-computed aggregates aren't available"""
+    """Compute trend data on-demand (bucketed in SQL) when pre-computed aggregates aren't available"""
     try:
-        # Get raw metrics
-        metrics = db.query(QualityMetrics).filter(
-            QualityMetrics.created_at >= cutoff_time
-        ).order_by(QualityMetrics.created_at).all()
-
-        if not metrics:
+        buckets = aggregate_metric_buckets(db, metric_name, cutoff_time, "hour" if aggregation == "hour" else "day")
+        if not buckets:
             return [], {}
 
-        # Group by time period
-        time_groups = {}
-        for metric in metrics:
-            if aggregation == "hour":
-                time_key = metric.created_at.strftime("%Y-%m-%d %H:00:00")
-            else:  # day
-                time_key = metric.created_at.strftime("%Y-%m-%d 00:00:00")
-
-            if time_key not in time_groups:
-                time_groups[time_key] = []
-
-            # Extract the specific metric value
-            if metric_name == 'overall_score':
-                value = metric.weighted_score
-            elif metric_name == 'generation_time' and metric.generation_time_seconds:
-                value = metric.generation_time_seconds
-            elif metric_name == 'golden_similarity' and metric.golden_similarity:
-                value = metric.golden_similarity
-            elif metric_name == 'confidence_score' and metric.confidence_score:
-                value = metric.confidence_score
-            else:
-                continue
-
-            time_groups[time_key].append(value)
-
-        # Compute aggregates for each time period
-        time_series = []
-        all_values = []
-
-        for time_key in sorted(time_groups.keys()):
-            values = time_groups[time_key]
-            if values:
-                time_series.append({
-                    "timestamp": time_key,
-                    "value": sum(values) / len(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "count": len(values)
-                })
-                all_values.extend(values)
-
-        # Compute summary statistics
-        summary_stats = {}
-        if all_values:
-            summary_stats = {
-                "avg": sum(all_values) / len(all_values),
-                "min": min(all_values),
-                "max": max(all_values),
-                "total_samples": len(all_values)
+        time_series = [
+            {
+                "timestamp": bucket["bucket"].isoformat(),
+                "value": bucket["avg"],
+                "min": bucket["min"],
+                "max": bucket["max"],
+                "count": bucket["count"]
             }
+            for bucket in buckets
+        ]
+
+        # Summary statistics from the buckets (sample-weighted mean)
+        total_samples = sum(bucket["count"] for bucket in buckets)
+        summary_stats = {
+            "avg": sum(bucket["avg"] * bucket["count"] for bucket in buckets) / total_samples,
+            "min": min(bucket["min"] for bucket in buckets),
+            "max": max(bucket["max"] for bucket in buckets),
+            "total_samples": total_samples
+        }
 
         return time_series, summary_stats
 
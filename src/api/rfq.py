@@ -3,6 +3,15 @@ from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from src.database import get_db, RFQ, Survey
 from src.api.dependencies import require_models_ready
+from src.services.retrieval_prefetch_service import retrieval_prefetch
+from src.services.workflow_checkpoint_service import WorkflowCheckpointService
+from src.services.workflow_queue_service import (
+    JOB_TYPE_ENHANCED_RFQ,
+    JOB_TYPE_RFQ,
+    WorkflowJobActiveError,
+    WorkflowQueueFullError,
+    WorkflowQueueService,
+)
 from src.models.enhanced_rfq import (
     EnhancedRFQRequest,
     EnhancedRFQResponse,
@@ -15,7 +24,6 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from uuid import uuid4, UUID
 import logging
-import asyncio
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +48,14 @@ class RFQSubmissionResponse(BaseModel):
     rfq_id: Optional[str] = None  # Return RFQ ID (reused or newly created)
 
 
+class WorkflowResumeResponse(BaseModel):
+    workflow_id: str
+    survey_id: Optional[str] = None
+    status: str
+    last_completed_node: str
+    completed_nodes: List[str]
+
+
 class DocumentAnalysisRequest(BaseModel):
     filename: str
     content_type: str
@@ -178,41 +194,24 @@ async def submit_rfq(
         db.refresh(survey)
         logger.info(f"✅ [RFQ API] Survey record created with ID: {survey.id}")
         
-        # Process RFQ directly through workflow (consolidated approach)
-        logger.info(f"🔄 [RFQ API] Starting direct workflow processing: workflow_id={workflow_id}")
-        
-        try:
-            from src.services.workflow_service import WorkflowService
-            from src.main import manager  # Import the connection manager
-            
-            # Initialize workflow service with connection manager
-            workflow_service = WorkflowService(db, manager)
-            
-            # Extract custom prompt if provided
-            custom_prompt = request.custom_prompt if hasattr(request, 'custom_prompt') else None
-            if custom_prompt:
-                logger.info(f"🎨 [RFQ API] Custom prompt detected in basic RFQ: {len(custom_prompt)} chars")
-            
-            # Start workflow processing in background with a small delay to ensure WebSocket connection
-            asyncio.create_task(process_rfq_workflow_async(
-                workflow_service=workflow_service,
-                title=request.title,
-                description=request.description,
-                product_category=request.product_category,
-                target_segment=request.target_segment,
-                research_goal=request.research_goal,
-                workflow_id=workflow_id,
-                survey_id=str(survey.id),
-                custom_prompt=custom_prompt
-            ))
-            
-            logger.info(f"✅ [RFQ API] Workflow processing started in background: workflow_id={workflow_id}")
-            
-        except Exception as e:
-            logger.error(f"❌ [RFQ API] Failed to start workflow processing: {str(e)}")
-            # Mark survey as pending if workflow fails to start
-            survey.status = "draft"
-            db.commit()
+        # Hand the run to the durable workflow queue; a worker executes it and streams progress
+        custom_prompt = request.custom_prompt if hasattr(request, 'custom_prompt') else None
+        if custom_prompt:
+            logger.info(f"🎨 [RFQ API] Custom prompt detected in basic RFQ: {len(custom_prompt)} chars")
+        _enqueue_workflow(
+            db,
+            job_type=JOB_TYPE_RFQ,
+            workflow_id=workflow_id,
+            survey=survey,
+            payload={
+                "title": request.title,
+                "description": request.description,
+                "product_category": request.product_category,
+                "target_segment": request.target_segment,
+                "research_goal": request.research_goal,
+                "custom_prompt": custom_prompt,
+            },
+        )
         
         # Return immediate response
         response = RFQSubmissionResponse(
@@ -226,51 +225,87 @@ async def submit_rfq(
         logger.info(f"🔍 [RFQ API] RFQ ID in response: {response.rfq_id}")
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ [RFQ API] Failed to process RFQ: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to process RFQ: {str(e)}")
 
 
-async def process_rfq_workflow_async(
-    workflow_service,
-    title: str,
-    description: str,
-    product_category: str,
-    target_segment: str,
-    research_goal: str,
+@router.post("/workflows/{workflow_id}/resume", response_model=WorkflowResumeResponse)
+async def resume_workflow(
     workflow_id: str,
-    survey_id: str,
-    custom_prompt: Optional[str] = None
-):
+    db: Session = Depends(get_db)
+) -> WorkflowResumeResponse:
     """
-    Process RFQ workflow asynchronously with detailed logging
+    Resume a failed or timed-out generation workflow from its last completed node
+    Embedding, retrieval and context building are not repeated if they completed.
     """
-    import logging
-    logger = logging.getLogger(__name__)
+    checkpoint = WorkflowCheckpointService(db).get_checkpoint(workflow_id)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail=f"No checkpoint found for workflow {workflow_id}")
+
+    survey = db.query(Survey).filter(Survey.id == checkpoint.survey_id).first() if checkpoint.survey_id else None
+    if survey is not None and survey.status == "validated":
+        raise HTTPException(status_code=409, detail="Workflow already completed")
+
+    try:
+        WorkflowQueueService(db).enqueue_resume(workflow_id, checkpoint.survey_id)
+    except WorkflowJobActiveError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except WorkflowQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Survey generation is at capacity, please retry shortly ({e.queue_depth} requests waiting)",
+            headers={"Retry-After": "30"}
+        )
+
+    if survey is not None:
+        survey.status = "draft"
+        db.commit()
+
+    from src.main import workflow_worker
+    if workflow_worker is not None:
+        workflow_worker.wake()
+    logger.info(f"🔁 [RFQ API] Workflow {workflow_id} queued to resume after {checkpoint.last_node}")
+
+    return WorkflowResumeResponse(
+        workflow_id=workflow_id,
+        survey_id=checkpoint.survey_id,
+        status="queued",
+        last_completed_node=checkpoint.last_node,
+        completed_nodes=list(checkpoint.completed_nodes or [])
+    )
+
+
+def _enqueue_workflow(db: Session, job_type: str, workflow_id: str, survey: Survey, payload: Dict[str, Any]) -> None:
+    """
+    Enqueue a survey generation workflow, rejecting it when the queue is full
     
+    Raises:
+        HTTPException: 503 when admission control rejects the job
+    """
     try:
-        logger.info(f"🚀 [Async Workflow] Starting RFQ processing: title='{title}', workflow_id={workflow_id}")
-        
-        # Add a small delay to ensure WebSocket connection is established
-        logger.info("⏳ [Async Workflow] Waiting 2 seconds for WebSocket connection to establish...")
-        await asyncio.sleep(2)
-        
-        # Process through workflow with detailed logging
-        result = await workflow_service.process_rfq(
-            title=title,
-            description=description,
-            product_category=product_category,
-            target_segment=target_segment,
-            research_goal=research_goal,
+        WorkflowQueueService(db).enqueue(
+            job_type=job_type,
             workflow_id=workflow_id,
-            survey_id=survey_id,
-            custom_prompt=custom_prompt
+            survey_id=str(survey.id),
+            payload=payload
         )
-        
-        logger.info(f"✅ [Async Workflow] Workflow completed successfully: {result.status}")
-
-    except Exception as e:
-        logger.error(f"❌ [Async Workflow] Workflow failed: {str(e)}", exc_info=True)
+    except WorkflowQueueFullError as e:
+        survey.status = "failed"
+        db.commit()
+        raise HTTPException(
+            status_code=503,
+            detail=f"Survey generation is at capacity, please retry shortly ({e.queue_depth} requests waiting)",
+            headers={"Retry-After": "30"}
+        )
+    
+    # Pick the job up right away when this process hosts a worker
+    from src.main import workflow_worker
+    if workflow_worker is not None:
+        workflow_worker.wake()
+    logger.info(f"✅ [RFQ API] Workflow queued: workflow_id={workflow_id}")
 
 
 @router.post("/upload-document", response_model=DocumentAnalysisResponse)
@@ -786,6 +821,9 @@ async def save_enhanced_rfq_draft(
             db.refresh(rfq)
             logger.info(f"✅ [Enhanced RFQ Draft API] Enhanced RFQ record created with ID: {rfq.id}")
 
+        # Warm the embedding and retrieval tiers in the background while the user keeps editing
+        retrieval_prefetch.schedule_for_draft(str(rfq.id), validated_rfq.model_dump(), legacy_fields)
+
         # CRITICAL: Do NOT create a Survey record for draft saves
         # Survey records should only be created when generation actually starts
         # This prevents empty draft surveys from appearing in the survey listing
@@ -962,36 +1000,19 @@ async def submit_enhanced_rfq(
         db.refresh(survey)
         logger.info(f"✅ [Enhanced RFQ API] Survey record created with ID: {survey.id}")
 
-        # Process Enhanced RFQ through workflow
-        logger.info(f"🔄 [Enhanced RFQ API] Starting enhanced workflow processing: workflow_id={workflow_id}")
-
-        try:
-            from src.services.workflow_service import WorkflowService
-            from src.main import manager  # Import the connection manager
-
-            # Initialize workflow service with connection manager
-            workflow_service = WorkflowService(db, manager)
-
-            # custom_prompt already extracted above
-            if custom_prompt:
-                logger.info(f"🎨 [Enhanced RFQ API] Passing custom prompt to workflow: {len(custom_prompt)} chars")
-            
-            # Start enhanced workflow processing in background
-            asyncio.create_task(process_enhanced_rfq_workflow_async(
-                workflow_service=workflow_service,
-                enhanced_rfq=validated_rfq,
-                workflow_id=workflow_id,
-                survey_id=str(survey.id),
-                custom_prompt=custom_prompt
-            ))
-
-            logger.info(f"✅ [Enhanced RFQ API] Enhanced workflow processing started in background: workflow_id={workflow_id}")
-
-        except Exception as e:
-            logger.error(f"❌ [Enhanced RFQ API] Failed to start enhanced workflow processing: {str(e)}")
-            # Mark survey as pending if workflow fails to start
-            survey.status = "draft"
-            db.commit()
+        # Hand the run to the durable workflow queue; a worker executes it and streams progress
+        if custom_prompt:
+            logger.info(f"🎨 [Enhanced RFQ API] Passing custom prompt to workflow: {len(custom_prompt)} chars")
+        _enqueue_workflow(
+            db,
+            job_type=JOB_TYPE_ENHANCED_RFQ,
+            workflow_id=workflow_id,
+            survey=survey,
+            payload={
+                "enhanced_rfq": validated_rfq.model_dump(mode="json"),
+                "custom_prompt": custom_prompt,
+            },
+        )
 
         # Return enhanced response
         response = EnhancedRFQResponse(
@@ -1006,56 +1027,13 @@ async def submit_enhanced_rfq(
         logger.info(f"🎉 [Enhanced RFQ API] Returning enhanced response: {response.model_dump()}")
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ [Enhanced RFQ API] Failed to process Enhanced RFQ: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to process Enhanced RFQ: {str(e)}")
 
 
-async def process_enhanced_rfq_workflow_async(
-    workflow_service,
-    enhanced_rfq: EnhancedRFQRequest,
-    workflow_id: str,
-    survey_id: str,
-    custom_prompt: Optional[str] = None
-):
-    """
-    Process Enhanced RFQ workflow asynchronously with enhanced data context
-    """
-    import logging
-    logger = logging.getLogger(__name__)
-
-    try:
-        logger.info(f"🚀 [Enhanced Async Workflow] Starting Enhanced RFQ processing: title='{enhanced_rfq.title}', workflow_id={workflow_id}")
-        
-        if custom_prompt:
-            logger.info(f"🎨 [Enhanced Async Workflow] Custom prompt provided: {len(custom_prompt)} chars")
-
-        # Add a small delay to ensure WebSocket connection is established
-        logger.info("⏳ [Enhanced Async Workflow] Waiting 2 seconds for WebSocket connection to establish...")
-        await asyncio.sleep(2)
-
-        # Extract legacy fields for workflow compatibility
-        legacy_fields = extract_legacy_fields(enhanced_rfq)
-
-        # Process through enhanced workflow with enriched context
-        result = await workflow_service.process_enhanced_rfq(
-            enhanced_rfq=enhanced_rfq,
-            legacy_title=legacy_fields["title"],
-            legacy_description=legacy_fields["description"],
-            legacy_product_category=legacy_fields["product_category"],
-            legacy_target_segment=legacy_fields["target_segment"],
-            legacy_research_goal=legacy_fields["research_goal"],
-            workflow_id=workflow_id,
-            survey_id=survey_id,
-            custom_prompt=custom_prompt
-        )
-
-        logger.info(f"✅ [Enhanced Async Workflow] Enhanced workflow completed successfully: {result.status}")
-
-    except Exception as e:
-        logger.error(f"❌ [Enhanced Async Workflow] Enhanced workflow failed: {str(e)}", exc_info=True)
-
-
 @router.post("/analyze-text", response_model=DocumentAnalysisResponse)
 async def analyze_text_for_rfq(
     text: str,
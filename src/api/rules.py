@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from src.database import get_db
 from src.services.prompt_service import PromptService
+from src.config.logging_config import log_text_preview
 from pydantic import BaseModel
 from typing import Dict, List, Any, Optional, Union
 import logging
@@ -185,7 +186,7 @@ async def create_or_update_system_prompt(request: SystemPromptRequest, db: Sessi
             existing_prompt.updated_at = datetime.utcnow()
             db.commit()
             
-            logger.info(f"Updated system prompt: {request.prompt_text[:100]}...")
+            logger.info(f"Updated system prompt: {log_text_preview(request.prompt_text, 100)}...")
             return {
                 "message": "System prompt updated successfully",
                 "id": str(existing_prompt.id),
@@ -210,7 +211,7 @@ async def create_or_update_system_prompt(request: SystemPromptRequest, db: Sessi
             db.commit()
             db.refresh(new_prompt)
             
-            logger.info(f"Created system prompt: {request.prompt_text[:100]}...")
+            logger.info(f"Created system prompt: {log_text_preview(request.prompt_text, 100)}...")
             return {
                 "message": "System prompt created successfully",
                 "id": str(new_prompt.id),
@@ -95,6 +95,9 @@ class SurveyVersionResponse(BaseModel):
     created_at: str
     version_notes: Optional[str] = None
     parent_survey_id: Optional[str] = None
+    overall_grade: Optional[str] = None
+    weighted_score: Optional[float] = None
+    golden_similarity_score: Optional[float] = None
 
 
 @router.get("/list", response_model=list[SurveyListItem])
@@ -339,7 +342,8 @@ async def get_survey_versions(
         from src.services.version_service import VersionService
         
         version_service = VersionService(db)
-        versions = version_service.get_version_history(survey_id)
+        # Projection rows only; survey payloads are not loaded for the timeline
+        versions = version_service.get_version_history_summaries(survey_id)
         
         version_list = []
         for survey in versions:
@@ -350,7 +354,10 @@ async def get_survey_versions(
                 status=survey.status,
                 created_at=survey.created_at.isoformat() if survey.created_at else '',
                 version_notes=survey.version_notes,
-                parent_survey_id=str(survey.parent_survey_id) if survey.parent_survey_id else None
+                parent_survey_id=str(survey.parent_survey_id) if survey.parent_survey_id else None,
+                overall_grade=survey.overall_grade,
+                weighted_score=survey.weighted_score,
+                golden_similarity_score=float(survey.golden_similarity_score) if survey.golden_similarity_score is not None else None
             ))
         
         return version_list
@@ -0,0 +1,210 @@
+"""
+Logging configuration
+Queue-based, non-blocking log pipeline with structured JSON output and hot-path sampling
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from .settings import settings
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``
+_RESERVED_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", (), None)).keys()
+) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+TEXT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_hot_path_filter: Optional["HotPathFilter"] = None
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Render records as one JSON object per line, including ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class HotPathFilter(logging.Filter):
+    """
+    Per-logger sampling and rate limiting for records below WARNING.
+
+    ``sample_rates`` maps logger-name prefixes to the fraction of records kept
+    (every Nth record passes). ``rate_limit_per_second`` caps how many records
+    a single logger may emit per second. Warnings and errors always pass.
+    """
+
+    def __init__(self, sample_rates: Dict[str, float], rate_limit_per_second: int):
+        super().__init__()
+        self.sample_rates = sample_rates
+        self.rate_limit_per_second = rate_limit_per_second
+        self._counters: Dict[str, int] = {}
+        self._windows: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+        self.rate_limited = 0
+
+    def _sample_every(self, logger_name: str) -> int:
+        best_prefix = ""
+        every = 1
+        for prefix, rate in self.sample_rates.items():
+            if (logger_name == prefix or logger_name.startswith(prefix + ".")) and len(prefix) > len(best_prefix):
+                best_prefix = prefix
+                every = max(1, round(1 / rate)) if rate > 0 else 0
+        return every
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        with self._lock:
+            every = self._sample_every(record.name)
+            if every != 1:
+                count = self._counters.get(record.name, 0)
+                self._counters[record.name] = count + 1
+                if every == 0 or count % every:
+                    self.sampled_out += 1
+                    return False
+
+            if self.rate_limit_per_second > 0:
+                now = time.monotonic()
+                window = self._windows.setdefault(record.name, [now, 0])
+                if now - window[0] >= 1.0:
+                    window[0], window[1] = now, 0
+                if window[1] >= self.rate_limit_per_second:
+                    self.rate_limited += 1
+                    return False
+                window[1] += 1
+        return True
+
+
+class _DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler renders the full formatted line (timestamps, tracebacks)
+    on the calling thread; here only ``%`` arguments are merged so mutable
+    arguments are captured at call time.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse ``"logger.name=0.1,other.logger=0.5"`` into a prefix -> rate mapping"""
+    rates: Dict[str, float] = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        name, rate = item.split("=", 1)
+        try:
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+def log_text_preview(text: Any, limit: int = 200, tail: bool = False) -> str:
+    """
+    Preview of a prompt or LLM response body for log messages
+
+    Returns the first (or with ``tail`` the last) ``limit`` characters, or a
+    redaction marker instead of the text when ``log_prompt_bodies`` is disabled.
+    """
+    text = "" if text is None else str(text)
+    if not settings.log_prompt_bodies:
+        return f"<redacted {len(text)} chars>"
+    return text[-limit:] if tail else text[:limit]
+
+
+def configure_logging(force: bool = False) -> None:
+    """
+    Install the root logging pipeline (idempotent)
+
+    Records are filtered and enqueued on the calling thread; formatting and
+    stdout writes happen on a single ``QueueListener`` thread. Like
+    ``logging.basicConfig`` this leaves an already configured root logger
+    alone unless ``force`` is set.
+
+    Args:
+        force: Replace existing root handlers
+    """
+    global _listener, _hot_path_filter
+    root = logging.getLogger()
+    if _listener is not None or (root.handlers and not force):
+        return
+
+    if settings.log_format == "json":
+        formatter: logging.Formatter = JsonLogFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    _hot_path_filter = HotPathFilter(
+        parse_sample_rates(settings.log_sample_rates),
+        settings.log_rate_limit_per_second,
+    )
+    queue_handler = _DeferredFormatQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(_hot_path_filter)
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.log_level.upper())
+
+    # Suppress SQLAlchemy engine logs
+    for noisy_logger in ("sqlalchemy.engine", "sqlalchemy.pool", "sqlalchemy.dialects"):
+        logging.getLogger(noisy_logger).setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush pending records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    return {
+        "format": settings.log_format,
+        "level": settings.log_level,
+        "prompt_bodies": settings.log_prompt_bodies,
+        "sampled_out": _hot_path_filter.sampled_out if _hot_path_filter else 0,
+        "rate_limited": _hot_path_filter.rate_limited if _hot_path_filter else 0,
+    }
@@ -25,10 +25,92 @@ class Settings(BaseSettings):
     min_golden_pairs_for_similarity: int = 10
     edit_collection_priority: str = "question_text,question_type,additions,deletions"
     
+    # Export configuration
+    export_process_workers: int = 2
+    export_cache_ttl_seconds: int = 86400
+    export_cache_max_bytes: int = 256 * 1024 * 1024
+    
+    # Annotation statistics cache (seconds)
+    annotation_stats_cache_ttl_seconds: int = 30
+
+    # Pillar rules cache for rule-based pillar scoring (seconds; also invalidated on SurveyRule commits)
+    pillar_rules_cache_ttl_seconds: int = 300
+    
+    # WebSocket progress bus ("auto" uses Redis pub/sub when reachable, "redis" or "memory" to force)
+    progress_bus_backend: str = "auto"
+    progress_send_queue_size: int = 100
+    progress_send_timeout_seconds: float = 10.0
+    
+    # Workflow job queue (global limits across all workers; 0 embedded workers = API only enqueues)
+    workflow_max_concurrent: int = 10
+    workflow_queue_max_depth: int = 100
+    workflow_worker_concurrency: int = 4
+    workflow_embedded_workers: int = 2
+    workflow_worker_poll_seconds: float = 1.0
+    workflow_job_lease_seconds: int = 120
+    workflow_job_heartbeat_seconds: int = 15
+    workflow_job_max_attempts: int = 3
+    workflow_checkpoints_enabled: bool = True
+
+    # Surgical/targeted regeneration: one concurrent LLM call per target section
+    parallel_section_regeneration_enabled: bool = True
+    parallel_section_regeneration_max_concurrency: int = 4
+
+    # Survey generation prompt input budget in tokens (0 = no trimming, usage is still reported);
+    # tokenizer files: <dir>/<owner>__<model>.json or <dir>/default.json (HF tokenizer.json format)
+    prompt_input_token_budget: int = 24000
+    prompt_tokenizer_dir: str = "tokenizers"
+
+    # LLM response cache (comma-separated purposes, e.g. "field_extraction,rfq_extraction,evaluation")
+    llm_cache_enabled_purposes: str = ""
+    llm_cache_backend: str = "auto"  # "auto", "redis" or "disk"
+    llm_cache_ttl_seconds: int = 7 * 86400
+    llm_cache_max_bytes: int = 512 * 1024 * 1024
+    llm_cache_dir: str = ".cache/llm_responses"
+
+    # In-process tracing (ring buffer behind /admin/perf; set a path to also write OTLP/JSON lines)
+    tracing_enabled: bool = True
+    tracing_buffer_size: int = 20000
+    tracing_export_path: str = ""
+
+    # LLM provider gateway (per provider/model; 0 disables a rate limit)
+    # Per-model overrides: "openai/gpt-4o=rpm:500,tpm:30000,concurrency:8;meta/meta-llama-3-70b-instruct=rpm:60"
+    llm_gateway_enabled: bool = True
+    llm_gateway_requests_per_minute: int = 600
+    llm_gateway_tokens_per_minute: int = 0
+    llm_gateway_model_limits: str = ""
+    llm_gateway_max_concurrency: int = 16
+    llm_gateway_min_concurrency: int = 1
+    llm_gateway_max_retries: int = 4
+    llm_gateway_backoff_base_seconds: float = 1.0
+    llm_gateway_backoff_max_seconds: float = 30.0
+
+    # Hedged LLM requests: duplicate a call once it exceeds the model's latency percentile in llm_audit
+    llm_hedging_enabled: bool = False
+    llm_hedge_purposes: str = "survey_generation"
+    llm_hedge_percentile: float = 0.95
+    llm_hedge_min_samples: int = 20
+    llm_hedge_refresh_seconds: int = 600
+
+    # Quality trend rollup: QualityMetrics -> QualityTrendAggregates (hour/day buckets) on an interval
+    quality_rollup_enabled: bool = True
+    quality_rollup_interval_seconds: int = 300
+    quality_rollup_backfill_days: int = 30
+
+    # Speculative embedding/retrieval prefetch on enhanced RFQ draft save (keyed by RFQ content hash)
+    retrieval_prefetch_enabled: bool = True
+    retrieval_prefetch_ttl_seconds: int = 3600
+    
     # Application configuration
     debug: bool = False
     log_level: str = "INFO"
     
+    # Logging pipeline ("text" or "json"); sampling/rate limits are opt-in and only apply below WARNING
+    log_format: str = "text"
+    log_prompt_bodies: bool = True
+    log_sample_rates: str = ""  # e.g. "src.services.retrieval_service=0.1,src.services.embedding_service=0.2"
+    log_rate_limit_per_second: int = 0  # Per-logger records per second (0 = unlimited)
+    
     # Additional environment variables that might be present
     skip_migrations: str = "false"  # Handle as string to avoid validation issues
     database_host: str = "localhost"
@@ -45,6 +127,10 @@ class Settings(BaseSettings):
     def edit_collection_priority_list(self) -> List[str]:
         return [item.strip() for item in self.edit_collection_priority.split(",")]
     
+    @property
+    def llm_cache_enabled_purpose_list(self) -> List[str]:
+        return [item.strip() for item in self.llm_cache_enabled_purposes.split(",") if item.strip()]
+    
     model_config = ConfigDict(
         env_file=".env",
         extra="ignore",  # Ignore extra fields from environment
@@ -31,6 +31,11 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Per-statement spans inside traced requests/workflows (see src/services/tracing.py)
+if settings.tracing_enabled:
+    from src.services.tracing import instrument_sqlalchemy
+    instrument_sqlalchemy(engine)
+
 Base = declarative_base()
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, DateTime, DECIMAL, ARRAY, ForeignKey, CheckConstraint, Boolean, Index, LargeBinary
+from sqlalchemy import Column, String, Text, Integer, BigInteger, DateTime, DECIMAL, ARRAY, ForeignKey, CheckConstraint, Boolean, Index, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -23,6 +23,7 @@ class GoldenRFQSurveyPair(Base):
     title = Column(Text)
     rfq_text = Column(Text, nullable=False)
     rfq_embedding = Column(VECTOR(384))
+    survey_embedding = Column(VECTOR(384))  # Embedding of the golden survey text, for survey similarity
     survey_json = Column(JSONB, nullable=False)
     methodology_tags: Any = Column(ARRAY(Text))
     industry_category: Any = Column(Text)
@@ -55,6 +56,11 @@ class GoldenSection(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Upsert key for annotation sync (see migration 058)
+        Index('uq_golden_sections_survey_section', 'survey_id', 'section_id', unique=True),
+    )
+
 
 class GoldenQuestion(Base):
     """Model for storing individual questions from golden surveys for rule-based retrieval"""
@@ -79,6 +85,11 @@ class GoldenQuestion(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Upsert key for annotation sync (see migration 058)
+        Index('uq_golden_questions_survey_question', 'survey_id', 'question_id', unique=True),
+    )
+
 
 class GoldenQuestionUsage(Base):
     """Model for tracking which surveys use which golden questions"""
@@ -182,6 +193,44 @@ class Survey(Base):
     parent_survey = relationship("Survey", remote_side=[id], backref="child_versions")
 
 
+class SurveyEmbedding(Base):
+    """Stored embedding of a generated survey's text, reused for golden similarity"""
+    __tablename__ = "survey_embeddings"
+
+    survey_id = Column(UUID(as_uuid=True), ForeignKey("surveys.id", ondelete="CASCADE"), primary_key=True)
+    embedding = Column(VECTOR(384), nullable=False)
+    content_hash = Column(Text)  # md5(final_output::text) the embedding was computed from
+    created_at = Column(DateTime, default=func.now())
+
+
+class GoldenSetChange(Base):
+    """Append-only log of golden pair changes; the highest version is the golden-set version"""
+    __tablename__ = "golden_set_changes"
+
+    version = Column(BigInteger, primary_key=True, autoincrement=True)
+    golden_pair_id = Column(UUID(as_uuid=True), nullable=False)  # No FK: deleted pairs keep their change rows
+    change_type = Column(
+        Text,
+        CheckConstraint("change_type IN ('upsert','delete')"),
+        nullable=False
+    )
+    created_at = Column(DateTime, default=func.now())
+
+
+class SurveyGoldenTopMatches(Base):
+    """Cached top-k most similar golden pairs for a survey, as of a golden-set version"""
+    __tablename__ = "survey_golden_top_matches"
+
+    survey_id = Column(UUID(as_uuid=True), ForeignKey("surveys.id", ondelete="CASCADE"), primary_key=True)
+    golden_set_version = Column(BigInteger, nullable=False)
+    matches = Column(JSONB, nullable=False)  # [{"golden_id": ..., "similarity": ...}], highest first
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index('idx_survey_golden_top_matches_version', 'golden_set_version'),
+    )
+
+
 class Edit(Base):
     __tablename__ = "edits"
 
@@ -456,6 +505,51 @@ class WorkflowState(Base):
     )
 
 
+class WorkflowJob(Base):
+    """Durable queue entry for a survey generation workflow, claimed by workers with SKIP LOCKED"""
+    __tablename__ = "workflow_jobs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    workflow_id = Column(String(255), nullable=False, unique=True)
+    survey_id = Column(String(255), nullable=True)
+    job_type = Column(String(50), nullable=False)  # rfq, enhanced_rfq
+    payload = Column(JSONB, nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, completed, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    worker_id = Column(String(255), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        CheckConstraint("status IN ('queued', 'running', 'completed', 'failed')", name='check_workflow_job_status'),
+        Index('idx_workflow_jobs_status_created_at', 'status', 'created_at'),
+        Index('idx_workflow_jobs_survey_id', 'survey_id'),
+    )
+
+
+class WorkflowCheckpoint(Base):
+    """Latest per-node checkpoint of a generation workflow, used to resume after a failure"""
+    __tablename__ = "workflow_checkpoints"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    workflow_id = Column(String(255), nullable=False, unique=True)
+    survey_id = Column(String(255), nullable=True)
+    last_node = Column(String(100), nullable=False)  # Last node that completed successfully
+    completed_nodes = Column(JSONB, nullable=False, default=list)
+    state_data = Column(JSONB, nullable=False)  # Compact state: golden content as IDs, no embeddings
+    rfq_embedding = Column(LargeBinary, nullable=True)  # Packed float32 array
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('idx_workflow_checkpoints_survey_id', 'survey_id'),
+        Index('idx_workflow_checkpoints_updated_at', 'updated_at'),
+    )
+
 class GoldenExampleState(Base):
     """Model for storing golden example creation state"""
     __tablename__ = "golden_example_states"
@@ -641,6 +735,7 @@ class LLMAudit(Base):
         Index('idx_llm_audit_purpose', 'purpose'),
         Index('idx_llm_audit_context_type', 'context_type'),
         Index('idx_llm_audit_created_at', 'created_at'),
+        Index('idx_llm_audit_created_at_id', created_at.desc(), id.desc()),  # Keyset pagination
         Index('idx_llm_audit_success', 'success'),
         Index('idx_llm_audit_cost_usd', 'cost_usd'),
     )
@@ -5,7 +5,7 @@ Database models for quality tracking and regression detection
 from sqlalchemy import Column, String, Text, Integer, DateTime, DECIMAL, ForeignKey, Boolean, Index, Float
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from .connection import Base
 import uuid
 
@@ -74,6 +74,7 @@ class QualityBaselines(Base):
         Index('idx_quality_baselines_metric_name', 'metric_name'),
         Index('idx_quality_baselines_is_active', 'is_active'),
         Index('idx_quality_baselines_created_at', 'created_at'),
+        Index('uq_quality_baselines_active_metric', 'metric_name', unique=True, postgresql_where=text('is_active')),
     )
 
 
@@ -5,22 +5,17 @@ from fastapi.responses import JSONResponse
 from src.api import rfq_router, survey_router, golden_router, golden_content_router, analytics_router, rules_router, utils_router, field_extraction_router, pillar_scores_router, human_reviews_router, annotation_insights_router, annotations, settings as settings_router, llm_audit, export, admin, retrieval_weights, qnr_labels
 from src.api import survey_quality
 from src.config import settings
+from src.config.logging_config import configure_logging
+from src.services.progress_bus import ProgressBus
 import logging
 import asyncio
-import json
-from typing import Dict, List, Any
-
-# Configure logging with timestamps
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+from typing import Dict, Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.workers.workflow_worker import WorkflowWorker
 
-# Suppress SQLAlchemy engine logs
-logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
-logging.getLogger('sqlalchemy.pool').setLevel(logging.WARNING)
-logging.getLogger('sqlalchemy.dialects').setLevel(logging.WARNING)
+# Configure logging: structured records written by a background thread
+configure_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -56,44 +51,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self) -> None:
-        self.active_connections: Dict[str, List[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, workflow_id: str) -> None:
-        await websocket.accept()
-        if workflow_id not in self.active_connections:
-            self.active_connections[workflow_id] = []
-        self.active_connections[workflow_id].append(websocket)
-        logger.info(f"🔌 [WebSocket] Connection established for workflow_id={workflow_id}. Total active: {len(self.active_connections[workflow_id])}")
-
-    def disconnect(self, websocket: WebSocket, workflow_id: str) -> None:
-        if workflow_id in self.active_connections:
-            self.active_connections[workflow_id].remove(websocket)
-            if not self.active_connections[workflow_id]:
-                del self.active_connections[workflow_id]
-        logger.info(f"🔌 [WebSocket] Connection closed for workflow_id={workflow_id}")
-
-    async def send_progress(self, workflow_id: str, message: Dict[str, Any]) -> None:
-        if workflow_id in self.active_connections:
-            for connection in self.active_connections[workflow_id]:
-                try:
-                    await connection.send_text(json.dumps(message))
-                    logger.debug(f"📤 [WebSocket] Sent message to workflow_id={workflow_id}: {message.get('type', 'unknown')}")
-                except Exception as e:
-                    logger.warning(f"⚠️ [WebSocket] Failed to send message to workflow_id={workflow_id}: {str(e)}")
-
-    async def broadcast_to_workflow(self, workflow_id: str, message: Dict[str, Any]) -> None:
-        """Alias for send_progress for compatibility with workflow service"""
-        await self.send_progress(workflow_id, message)
-
-manager = ConnectionManager()
+# WebSocket progress bus: per-connection writers, cross-worker delivery via Redis
+manager = ProgressBus()
+
+# Workflow worker hosted by this process (None when generation runs in dedicated workers)
+workflow_worker: Optional["WorkflowWorker"] = None
+
+# Periodic quality trend rollup (None when disabled)
+quality_rollup_task: Optional[asyncio.Task] = None
 
 @app.on_event("startup")
 async def startup_event() -> None:
     logger.info("🚀 [FastAPI] Starting Survey Generation Engine...")
     
+    # Connect the progress bus (Redis pub/sub when available, in-memory otherwise)
+    await manager.start()
+    
+    # Run queued workflows in-process unless dedicated workers are deployed
+    global workflow_worker
+    if settings.workflow_embedded_workers > 0:
+        from src.workers.workflow_worker import WorkflowWorker
+        workflow_worker = WorkflowWorker(manager, concurrency=settings.workflow_embedded_workers)
+        await workflow_worker.start()
+    
+    # Keep quality trend aggregates current so dashboards read buckets, not raw metrics
+    global quality_rollup_task
+    if settings.quality_rollup_enabled:
+        from src.services.quality_rollup_service import run_periodic_rollup
+        quality_rollup_task = asyncio.create_task(run_periodic_rollup())
+    
     # Start background model loading
     from src.services.model_loader import BackgroundModelLoader
     logger.info("🔄 [FastAPI] Starting background model loading...")
@@ -104,6 +90,19 @@ async def startup_event() -> None:
     logger.info("✅ [FastAPI] Server ready - models loading in background")
     logger.info("🎉 [FastAPI] Startup completed successfully - server is ready to accept requests")
 
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    from src.services.export.export_service import export_service
+    export_service.shutdown()
+    if workflow_worker is not None:
+        await workflow_worker.stop()
+    if quality_rollup_task is not None:
+        quality_rollup_task.cancel()
+    await manager.stop()
+    from src.services.tracing import tracer
+    tracer.flush()
+    logger.info("👋 [FastAPI] Shutdown completed")
+
 app.include_router(rfq_router, prefix="/api/v1")
 app.include_router(survey_router, prefix="/api/v1")
 app.include_router(golden_router, prefix="/api/v1")
@@ -179,10 +178,10 @@ async def model_init_websocket(websocket: WebSocket, client_id: str) -> None:
     try:
         from src.services.model_loader import BackgroundModelLoader
         
-        # Stream progress updates every 1 second while loading
+        # Model loading is per-process, so these updates stay on this worker
         while BackgroundModelLoader.is_loading():
             status = BackgroundModelLoader.get_status()
-            await manager.send_progress(f"init_{client_id}", {
+            manager.send_local(f"init_{client_id}", {
                 "type": "model_loading",
                 "progress": status["progress"],  # 0-100
                 "estimated_seconds": status["estimated_seconds"],
@@ -192,7 +191,7 @@ async def model_init_websocket(websocket: WebSocket, client_id: str) -> None:
             await asyncio.sleep(1)
         
         # Send ready notification
-        await manager.send_progress(f"init_{client_id}", {
+        manager.send_local(f"init_{client_id}", {
             "type": "models_ready",
             "message": "All systems ready!",
             "ready": True
@@ -200,6 +199,7 @@ async def model_init_websocket(websocket: WebSocket, client_id: str) -> None:
         
         # Keep connection alive for a bit to ensure message is sent
         await asyncio.sleep(2)
+        manager.disconnect(websocket, f"init_{client_id}")
         
     except WebSocketDisconnect:
         logger.info(f"🔌 [Model Init WebSocket] Client disconnected for client_id={client_id}")
@@ -12,8 +12,7 @@ import logging
 from src.database.models import (
     QuestionAnnotation,
     SectionAnnotation,
-    SurveyAnnotation,
-    Survey
+    SurveyAnnotation
 )
 from src.services.version_service import VersionService
 
@@ -45,8 +44,9 @@ class AnnotationFeedbackService:
             List of question feedback dictionaries with version information
         """
         # Get all surveys for this RFQ
-        all_versions = self.version_service.get_survey_versions(rfq_id)
+        all_versions = self.version_service.get_version_summaries(rfq_id)
         survey_ids = [str(survey.id) for survey in all_versions]
+        version_by_survey_id = {str(survey.id): survey.version for survey in all_versions}
         
         # Exclude specified survey IDs if provided
         if exclude_survey_ids:
@@ -77,8 +77,7 @@ class AnnotationFeedbackService:
             survey_id = annotation.survey_id
             
             # Get survey version number
-            survey = self.db.query(Survey).filter(Survey.id == UUID(survey_id)).first()
-            version = survey.version if survey else None
+            version = version_by_survey_id.get(str(survey_id))
             
             if question_id not in feedback_by_question:
                 feedback_by_question[question_id] = {
@@ -141,8 +140,9 @@ class AnnotationFeedbackService:
             List of section feedback dictionaries with version information
         """
         # Get all surveys for this RFQ
-        all_versions = self.version_service.get_survey_versions(rfq_id)
+        all_versions = self.version_service.get_version_summaries(rfq_id)
         survey_ids = [str(survey.id) for survey in all_versions]
+        version_by_survey_id = {str(survey.id): survey.version for survey in all_versions}
         
         # Exclude specified survey IDs if provided
         if exclude_survey_ids:
@@ -177,8 +177,7 @@ class AnnotationFeedbackService:
             survey_id = annotation.survey_id
             
             # Get survey version number
-            survey = self.db.query(Survey).filter(Survey.id == UUID(survey_id)).first()
-            version = survey.version if survey else None
+            version = version_by_survey_id.get(str(survey_id))
             
             if section_id not in feedback_by_section:
                 feedback_by_section[section_id] = {
@@ -231,8 +230,9 @@ class AnnotationFeedbackService:
             List of survey-level feedback dictionaries with version information
         """
         # Get all surveys for this RFQ
-        all_versions = self.version_service.get_survey_versions(rfq_id)
+        all_versions = self.version_service.get_version_summaries(rfq_id)
         survey_ids = [str(survey.id) for survey in all_versions]
+        version_by_survey_id = {str(survey.id): survey.version for survey in all_versions}
         
         # Exclude specified survey IDs if provided
         if exclude_survey_ids:
@@ -254,8 +254,7 @@ class AnnotationFeedbackService:
             survey_id = annotation.survey_id
             
             # Get survey version number
-            survey = self.db.query(Survey).filter(Survey.id == UUID(survey_id)).first()
-            version = survey.version if survey else None
+            version = version_by_survey_id.get(str(survey_id))
             
             # Generate structured comment ID: COMMENT-SURVEY-V{version}
             comment_id = f"COMMENT-SURVEY-V{version or '?'}"
@@ -648,55 +648,19 @@ class AnnotationInsightsService:
             baseline_start = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=8)
             baseline_end = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
             
-            # Get annotations for both periods
-            recent_annotations = DatabaseSessionManager.safe_query(
-                self.db,
-                lambda: self.db.query(QuestionAnnotation).filter(
-                    QuestionAnnotation.created_at >= yesterday_start,
-                    QuestionAnnotation.created_at < yesterday_end
-                ).all(),
-                fallback_value=[],
-                operation_name="recent annotations query"
-            )
-            
-            recent_section_annotations = DatabaseSessionManager.safe_query(
-                self.db,
-                lambda: self.db.query(SectionAnnotation).filter(
-                    SectionAnnotation.created_at >= yesterday_start,
-                    SectionAnnotation.created_at < yesterday_end
-                ).all(),
-                fallback_value=[],
-                operation_name="recent section annotations query"
-            )
-            
-            baseline_annotations = DatabaseSessionManager.safe_query(
-                self.db,
-                lambda: self.db.query(QuestionAnnotation).filter(
-                    QuestionAnnotation.created_at >= baseline_start,
-                    QuestionAnnotation.created_at < baseline_end
-                ).all(),
-                fallback_value=[],
-                operation_name="baseline annotations query"
-            )
-            
-            baseline_section_annotations = DatabaseSessionManager.safe_query(
-                self.db,
-                lambda: self.db.query(SectionAnnotation).filter(
-                    SectionAnnotation.created_at >= baseline_start,
-                    SectionAnnotation.created_at < baseline_end
-                ).all(),
-                fallback_value=[],
-                operation_name="baseline section annotations query"
+            # Counts and average pillar scores for both periods in one aggregate query per table
+            from src.services.annotation_stats_service import AnnotationStatsService
+            period_scores = AnnotationStatsService(self.db).get_period_scores(
+                recent=(yesterday_start, yesterday_end),
+                baseline=(baseline_start, baseline_end)
             )
+            recent_count = period_scores["recent_count"]
+            baseline_count = period_scores["baseline_count"]
             
-            # Combine question and section annotations
-            all_recent_annotations = recent_annotations + recent_section_annotations
-            all_baseline_annotations = baseline_annotations + baseline_section_annotations
-            
-            logger.info(f"📊 [AnnotationInsights] Found {len(all_recent_annotations)} recent annotations, {len(all_baseline_annotations)} baseline annotations")
+            logger.info(f"📊 [AnnotationInsights] Found {recent_count} recent annotations, {baseline_count} baseline annotations")
             
             # Check for sufficient data
-            if len(all_recent_annotations) == 0:
+            if recent_count == 0:
                 logger.info("⚠️ [AnnotationInsights] No recent annotations found")
                 return {
                     "improvement_trend": 0.0,
@@ -704,11 +668,11 @@ class AnnotationInsightsService:
                     "message": "No annotations in the last 24 hours",
                     "baseline_period": f"{baseline_start.strftime('%Y-%m-%d')} to {baseline_end.strftime('%Y-%m-%d')}",
                     "recent_period": f"{yesterday_start.strftime('%Y-%m-%d')} to {yesterday_end.strftime('%Y-%m-%d')}",
-                    "baseline_count": len(all_baseline_annotations),
+                    "baseline_count": baseline_count,
                     "recent_count": 0
                 }
             
-            if len(all_baseline_annotations) == 0:
+            if baseline_count == 0:
                 logger.info("⚠️ [AnnotationInsights] No baseline annotations found")
                 return {
                     "improvement_trend": 0.0,
@@ -717,27 +681,23 @@ class AnnotationInsightsService:
                     "baseline_period": f"{baseline_start.strftime('%Y-%m-%d')} to {baseline_end.strftime('%Y-%m-%d')}",
                     "recent_period": f"{yesterday_start.strftime('%Y-%m-%d')} to {yesterday_end.strftime('%Y-%m-%d')}",
                     "baseline_count": 0,
-                    "recent_count": len(all_recent_annotations)
+                    "recent_count": recent_count
                 }
             
-            if len(all_recent_annotations) + len(all_baseline_annotations) < 10:
+            if recent_count + baseline_count < 10:
                 logger.info("⚠️ [AnnotationInsights] Insufficient total annotations")
                 return {
                     "improvement_trend": 0.0,
                     "status": "insufficient_data",
-                    "message": f"Need at least 10 annotations (have {len(all_recent_annotations) + len(all_baseline_annotations)})",
+                    "message": f"Need at least 10 annotations (have {recent_count + baseline_count})",
                     "baseline_period": f"{baseline_start.strftime('%Y-%m-%d')} to {baseline_end.strftime('%Y-%m-%d')}",
                     "recent_period": f"{yesterday_start.strftime('%Y-%m-%d')} to {yesterday_end.strftime('%Y-%m-%d')}",
-                    "baseline_count": len(all_baseline_annotations),
-                    "recent_count": len(all_recent_annotations)
+                    "baseline_count": baseline_count,
+                    "recent_count": recent_count
                 }
             
-            # Calculate average scores
-            recent_scores = [self._get_average_score(ann) for ann in all_recent_annotations]
-            baseline_scores = [self._get_average_score(ann) for ann in all_baseline_annotations]
-            
-            recent_avg = sum(recent_scores) / len(recent_scores) if recent_scores else 0.0
-            baseline_avg = sum(baseline_scores) / len(baseline_scores) if baseline_scores else 0.0
+            recent_avg = period_scores["recent_avg"]
+            baseline_avg = period_scores["baseline_avg"]
             
             # Calculate improvement trend
             if baseline_avg > 0:
@@ -753,8 +713,8 @@ class AnnotationInsightsService:
                 "message": f"Quality {'improved' if improvement_trend > 0 else 'declined'} by {abs(improvement_trend):.1f}%",
                 "baseline_period": f"{baseline_start.strftime('%Y-%m-%d')} to {baseline_end.strftime('%Y-%m-%d')}",
                 "recent_period": f"{yesterday_start.strftime('%Y-%m-%d')} to {yesterday_end.strftime('%Y-%m-%d')}",
-                "baseline_count": len(all_baseline_annotations),
-                "recent_count": len(all_recent_annotations),
+                "baseline_count": baseline_count,
+                "recent_count": recent_count,
                 "baseline_avg": round(baseline_avg, 2),
                 "recent_avg": round(recent_avg, 2)
             }
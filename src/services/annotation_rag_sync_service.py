@@ -6,6 +6,8 @@ Extracts quality insights from annotations and adds them to golden_questions/gol
 import logging
 import uuid
 from typing import Optional, Dict, Any, List
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -20,6 +22,9 @@ from src.utils.database_session_manager import DatabaseSessionManager
 
 logger = logging.getLogger(__name__)
 
+# RETURNING expression that is true for rows the upsert inserted rather than updated
+UPSERT_INSERTED = literal_column("(xmax = 0)").label("inserted")
+
 
 class AnnotationRAGSyncService:
     """
@@ -63,25 +68,8 @@ class AnnotationRAGSyncService:
             annotation_survey_id = annotation.survey_id
             
             # Normalize labels to ensure consistent format
-            from src.services.label_normalizer import LabelNormalizer
-            label_normalizer = LabelNormalizer()
-            
             logger.info(f"🏷️ [Annotation Sync] Raw annotation.labels type: {type(annotation_labels)}, value: {annotation_labels}")
-            
-            if isinstance(annotation_labels, list) and len(annotation_labels) > 0:
-                # Keep original labels - they're already in the correct format
-                annotation_labels = [label for label in annotation_labels if label]
-            elif isinstance(annotation_labels, str):
-                annotation_labels = [annotation_labels] if annotation_labels else []
-            elif annotation_labels is None:
-                annotation_labels = []
-            elif isinstance(annotation_labels, dict) and len(annotation_labels) == 0:
-                # Handle case where labels is {} (empty object from DB)
-                annotation_labels = []
-            else:
-                # Unexpected type
-                logger.warning(f"⚠️ [Annotation Sync] Unexpected labels type: {type(annotation_labels)}, using empty list")
-                annotation_labels = []
+            annotation_labels = self._normalize_labels(annotation_labels)
             
             logger.info(f"🏷️ [Annotation Sync] Processed labels: {annotation_labels}")
 
@@ -253,25 +241,8 @@ class AnnotationRAGSyncService:
             annotation_survey_id = annotation.survey_id
             
             # Normalize labels to ensure consistent format
-            from src.services.label_normalizer import LabelNormalizer
-            label_normalizer = LabelNormalizer()
-            
             logger.info(f"🏷️ [Annotation Sync] Raw annotation.labels type: {type(annotation_labels)}, value: {annotation_labels}")
-            
-            if isinstance(annotation_labels, list) and len(annotation_labels) > 0:
-                # Keep original labels - they're already in the correct format
-                annotation_labels = [label for label in annotation_labels if label]
-            elif isinstance(annotation_labels, str):
-                annotation_labels = [annotation_labels] if annotation_labels else []
-            elif annotation_labels is None:
-                annotation_labels = []
-            elif isinstance(annotation_labels, dict) and len(annotation_labels) == 0:
-                # Handle case where labels is {} (empty object from DB)
-                annotation_labels = []
-            else:
-                # Unexpected type
-                logger.warning(f"⚠️ [Annotation Sync] Unexpected labels type: {type(annotation_labels)}, using empty list")
-                annotation_labels = []
+            annotation_labels = self._normalize_labels(annotation_labels)
             
             logger.info(f"🏷️ [Annotation Sync] Processed labels: {annotation_labels}")
 
@@ -401,6 +372,247 @@ class AnnotationRAGSyncService:
                 logger.error(f"❌ Error during rollback: {str(rollback_error)}")
             return {"success": False, "error": str(e)}
 
+    async def sync_annotations_batch(
+        self,
+        survey_id: str,
+        question_annotation_ids: Optional[List[int]] = None,
+        section_annotation_ids: Optional[List[int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sync many annotations of one survey to the RAG tables in a single transaction.
+
+        Loads the survey once, upserts all golden questions and golden sections with one
+        INSERT ... ON CONFLICT statement per table and commits once. Per-annotation
+        outcomes match sync_question_annotation/sync_section_annotation.
+
+        Args:
+            survey_id: Survey the annotations belong to
+            question_annotation_ids: IDs of QuestionAnnotations to sync
+            section_annotation_ids: IDs of SectionAnnotations to sync
+
+        Returns:
+            Dict with overall success, per-annotation results and synced counts
+        """
+        question_annotation_ids = list(question_annotation_ids or [])
+        section_annotation_ids = list(section_annotation_ids or [])
+        result: Dict[str, Any] = {
+            "success": True,
+            "questions": [],
+            "sections": [],
+            "questions_synced": 0,
+            "sections_synced": 0,
+        }
+        if not question_annotation_ids and not section_annotation_ids:
+            return result
+
+        try:
+            try:
+                uuid.UUID(str(survey_id))
+            except (ValueError, TypeError):
+                logger.warning(f"⚠️ Invalid survey_id format '{survey_id}', skipping batch sync")
+                return {**result, "success": False, "error": "Invalid survey_id format"}
+
+            # One survey load for the whole batch (payload column only)
+            survey = self.db.query(Survey.final_output).filter(Survey.id == str(survey_id)).first()
+            if not survey or not survey.final_output:
+                logger.warning(f"⚠️ Survey {survey_id} not found or has no final_output, skipping batch sync")
+                return {**result, "success": False, "error": "Survey data not available"}
+            survey_data = survey.final_output
+
+            if question_annotation_ids:
+                annotations = self.db.query(QuestionAnnotation).filter(
+                    QuestionAnnotation.id.in_(question_annotation_ids),
+                    QuestionAnnotation.survey_id == str(survey_id),
+                ).order_by(QuestionAnnotation.id).all()
+                result["questions"] = self._upsert_golden_questions(
+                    str(survey_id), survey_data, annotations, question_annotation_ids
+                )
+
+            if section_annotation_ids:
+                annotations = self.db.query(SectionAnnotation).filter(
+                    SectionAnnotation.id.in_(section_annotation_ids),
+                    SectionAnnotation.survey_id == str(survey_id),
+                ).order_by(SectionAnnotation.id).all()
+                result["sections"] = self._upsert_golden_sections(
+                    str(survey_id), survey_data, annotations, section_annotation_ids
+                )
+
+            self.db.commit()
+
+            result["questions_synced"] = sum(1 for r in result["questions"] if r["success"])
+            result["sections_synced"] = sum(1 for r in result["sections"] if r["success"])
+            logger.info(
+                f"✅ Batch synced survey {survey_id}: {result['questions_synced']}/{len(question_annotation_ids)} questions, "
+                f"{result['sections_synced']}/{len(section_annotation_ids)} sections"
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Error batch syncing annotations for survey {survey_id}: {str(e)}")
+            try:
+                self.db.rollback()
+            except Exception as rollback_error:
+                logger.error(f"❌ Error during rollback: {str(rollback_error)}")
+            return {**result, "success": False, "error": str(e), "questions_synced": 0, "sections_synced": 0}
+
+    def _upsert_golden_questions(
+        self,
+        survey_id: str,
+        survey_data: Dict[str, Any],
+        annotations: List[QuestionAnnotation],
+        requested_ids: List[int],
+    ) -> List[Dict[str, Any]]:
+        """Upsert golden questions for a survey's question annotations in one statement"""
+        questions_by_id = self._index_survey_questions(survey_data)
+        outcomes: Dict[int, Dict[str, Any]] = {
+            annotation_id: {"annotation_id": annotation_id, "success": False, "error": "Annotation not found"}
+            for annotation_id in requested_ids
+        }
+        # One row per (survey_id, question_id); the newest annotation wins, as with sequential syncs
+        rows: Dict[str, Dict[str, Any]] = {}
+        annotation_ids_by_key: Dict[str, List[int]] = {}
+
+        for annotation in annotations:
+            question_data = (
+                questions_by_id.get(annotation.question_id)
+                or questions_by_id.get(self._actual_question_id(annotation.question_id))
+            )
+            if not question_data:
+                outcomes[annotation.id] = {
+                    "annotation_id": annotation.id, "success": False, "error": "Question not found in survey"
+                }
+                continue
+
+            labels = self._normalize_labels(annotation.labels)
+            rows[annotation.question_id] = {
+                "question_id": annotation.question_id,
+                "survey_id": survey_id,
+                "golden_pair_id": None,
+                "annotation_id": annotation.id,
+                "question_text": question_data["text"],
+                "question_type": question_data.get("type", "general"),
+                "question_subtype": question_data.get("subtype", "unknown"),
+                "methodology_tags": self._extract_methodology_tags(question_data, labels),
+                "industry_keywords": self._extract_industry_keywords(question_data, labels),
+                "question_patterns": self._extract_question_patterns(question_data),
+                "quality_score": self._calculate_quality_score(
+                    annotation.quality, annotation.relevant, annotation.human_verified, labels
+                ),
+                "usage_count": 0,
+                "human_verified": annotation.human_verified,
+                "labels": labels,
+            }
+            annotation_ids_by_key.setdefault(annotation.question_id, []).append(annotation.id)
+
+        if rows:
+            statement = pg_insert(GoldenQuestion).values(list(rows.values()))
+            statement = statement.on_conflict_do_update(
+                index_elements=[GoldenQuestion.survey_id, GoldenQuestion.question_id],
+                set_={
+                    "quality_score": statement.excluded.quality_score,
+                    "annotation_id": statement.excluded.annotation_id,
+                    "human_verified": statement.excluded.human_verified,
+                    "methodology_tags": statement.excluded.methodology_tags,
+                    "industry_keywords": statement.excluded.industry_keywords,
+                    "question_patterns": statement.excluded.question_patterns,
+                    "labels": statement.excluded.labels,
+                    "updated_at": func.now(),
+                },
+            ).returning(GoldenQuestion.id, GoldenQuestion.question_id, UPSERT_INSERTED)
+
+            for row in self.db.execute(statement):
+                for annotation_id in annotation_ids_by_key.get(row.question_id, []):
+                    outcomes[annotation_id] = {
+                        "annotation_id": annotation_id,
+                        "success": True,
+                        "action": "created" if row.inserted else "updated",
+                        "golden_question_id": str(row.id),
+                    }
+
+        return list(outcomes.values())
+
+    def _upsert_golden_sections(
+        self,
+        survey_id: str,
+        survey_data: Dict[str, Any],
+        annotations: List[SectionAnnotation],
+        requested_ids: List[int],
+    ) -> List[Dict[str, Any]]:
+        """Upsert golden sections for a survey's section annotations in one statement"""
+        outcomes: Dict[int, Dict[str, Any]] = {
+            annotation_id: {"annotation_id": annotation_id, "success": False, "error": "Annotation not found"}
+            for annotation_id in requested_ids
+        }
+        rows: Dict[str, Dict[str, Any]] = {}
+        annotation_ids_by_key: Dict[str, List[int]] = {}
+
+        for annotation in annotations:
+            section_data = self._extract_section_from_survey(survey_data, annotation.section_id)
+            if not section_data:
+                outcomes[annotation.id] = {
+                    "annotation_id": annotation.id, "success": False, "error": "Section not found in survey"
+                }
+                continue
+
+            labels = self._normalize_labels(annotation.labels)
+            section_key = str(annotation.section_id)
+            rows[section_key] = {
+                "survey_id": survey_id,
+                "golden_pair_id": None,
+                "annotation_id": annotation.id,
+                "section_id": section_key,
+                "section_title": section_data.get("title", ""),
+                "section_text": section_data.get("title", "") + " " + section_data.get("description", ""),
+                "section_type": self._detect_section_type(section_data),
+                "methodology_tags": self._extract_methodology_tags(section_data, labels),
+                "industry_keywords": self._extract_industry_keywords(section_data, labels),
+                "quality_score": self._calculate_quality_score(
+                    annotation.quality, annotation.relevant, annotation.human_verified, labels
+                ),
+                "usage_count": 0,
+                "human_verified": annotation.human_verified,
+            }
+            annotation_ids_by_key.setdefault(section_key, []).append(annotation.id)
+
+        if rows:
+            statement = pg_insert(GoldenSection).values(list(rows.values()))
+            statement = statement.on_conflict_do_update(
+                index_elements=[GoldenSection.survey_id, GoldenSection.section_id],
+                set_={
+                    "quality_score": statement.excluded.quality_score,
+                    "annotation_id": statement.excluded.annotation_id,
+                    "human_verified": statement.excluded.human_verified,
+                    "methodology_tags": statement.excluded.methodology_tags,
+                    "industry_keywords": statement.excluded.industry_keywords,
+                    "section_type": statement.excluded.section_type,
+                    "updated_at": func.now(),
+                },
+            ).returning(GoldenSection.id, GoldenSection.section_id, UPSERT_INSERTED)
+
+            for row in self.db.execute(statement):
+                for annotation_id in annotation_ids_by_key.get(row.section_id, []):
+                    outcomes[annotation_id] = {
+                        "annotation_id": annotation_id,
+                        "success": True,
+                        "action": "created" if row.inserted else "updated",
+                        "golden_section_id": str(row.id),
+                    }
+
+        return list(outcomes.values())
+
+    def _normalize_labels(self, labels: Any) -> List[str]:
+        """Normalize annotation labels (list, string, empty object or None) to a list of strings"""
+        if isinstance(labels, list) and len(labels) > 0:
+            # Keep original labels - they're already in the correct format
+            return [label for label in labels if label]
+        if isinstance(labels, str):
+            return [labels] if labels else []
+        if labels is None or (isinstance(labels, dict) and len(labels) == 0):
+            # Handle case where labels is {} (empty object from DB)
+            return []
+        logger.warning(f"⚠️ [Annotation Sync] Unexpected labels type: {type(labels)}, using empty list")
+        return []
+
     def _calculate_quality_score(
         self, quality: int, relevant: int, human_verified: bool, labels: list
     ) -> float:
@@ -470,16 +682,7 @@ class AnnotationRAGSyncService:
             Question dict with text, type, etc., or None if not found
         """
         sections = survey_data.get("sections", [])
-
-        # Handle AI-generated question IDs that have format: {survey_id}_{question_id}
-        # Extract the actual question ID from the prefixed format
-        actual_question_id = question_id
-        if "_" in question_id and len(question_id) > 36:  # UUID is 36 chars
-            # Split by first underscore after UUID (36 chars + 1 underscore = 37)
-            parts = question_id.split("_", 1)
-            if len(parts) == 2 and len(parts[0]) == 36:  # UUID format
-                actual_question_id = parts[1]  # Get the part after survey_id_
-                logger.debug(f"🔍 [AnnotationRAGSync] Extracted question ID '{actual_question_id}' from '{question_id}'")
+        actual_question_id = self._actual_question_id(question_id)
 
         for section in sections:
             if not isinstance(section, dict):
@@ -503,6 +706,51 @@ class AnnotationRAGSyncService:
 
         return None
 
+    def _actual_question_id(self, question_id: str) -> str:
+        """
+        Strip the survey prefix from AI-generated question IDs ({survey_id}_{question_id})
+
+        Args:
+            question_id: Question ID from the annotation
+
+        Returns:
+            Question ID as used inside the survey
+        """
+        # Handle AI-generated question IDs that have format: {survey_id}_{question_id}
+        if "_" in question_id and len(question_id) > 36:  # UUID is 36 chars
+            # Split by first underscore after UUID (36 chars + 1 underscore = 37)
+            parts = question_id.split("_", 1)
+            if len(parts) == 2 and len(parts[0]) == 36:  # UUID format
+                logger.debug(f"🔍 [AnnotationRAGSync] Extracted question ID '{parts[1]}' from '{question_id}'")
+                return parts[1]  # Get the part after survey_id_
+        return question_id
+
+    def _index_survey_questions(self, survey_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Map question ID -> question data (as returned by _extract_question_from_survey)
+        for every question in the survey, first occurrence winning
+
+        Args:
+            survey_data: Survey final_output JSONB
+
+        Returns:
+            Dict of question ID to question dict with text, type, subtype and section_id
+        """
+        index: Dict[str, Dict[str, Any]] = {}
+        for section in survey_data.get("sections", []):
+            if not isinstance(section, dict):
+                continue
+            for question in section.get("questions", []):
+                if not isinstance(question, dict) or question.get("id") in index:
+                    continue
+                index[question.get("id")] = {
+                    "text": question.get("text", ""),
+                    "type": question.get("type", "general"),
+                    "subtype": question.get("subtype", "unknown"),
+                    "section_id": section.get("id"),
+                }
+        return index
+
     def _extract_section_from_survey(
         self, survey_data: Dict[str, Any], section_id: int
     ) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Annotation Statistics Service
+Single-pass aggregate statistics over the annotation tables with a short-lived cache
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.database.models import QuestionAnnotation, SectionAnnotation, SurveyAnnotation
+from src.utils.database_session_manager import DatabaseSessionManager
+
+logger = logging.getLogger(__name__)
+
+PILLAR_FIELDS = (
+    "methodological_rigor",
+    "content_validity",
+    "respondent_experience",
+    "analytical_value",
+    "business_impact",
+)
+
+HUMAN_ANNOTATOR_ID = "current-user"
+
+
+class _StatsCache:
+    """Process-wide TTL cache for aggregate statistics, invalidated on annotation writes."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def get_or_compute(self, key: Hashable, ttl_seconds: float, compute: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < ttl_seconds:
+                return entry[1]
+            generation = self.generation
+
+        value = compute()
+
+        with self._lock:
+            # Drop results computed while a write invalidated the cache
+            if generation == self.generation:
+                self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+
+_stats_cache = _StatsCache()
+
+_ANNOTATION_MODELS = (QuestionAnnotation, SectionAnnotation, SurveyAnnotation)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_annotation_writes(session: Session, flush_context: Any) -> None:
+    """Mark the session when annotation rows are inserted, updated or deleted."""
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, _ANNOTATION_MODELS):
+            session.info["annotation_stats_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_annotation_commit(session: Session) -> None:
+    if session.info.pop("annotation_stats_dirty", False):
+        invalidate_annotation_stats()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_dirty_flag_on_rollback(session: Session) -> None:
+    session.info.pop("annotation_stats_dirty", None)
+
+
+def invalidate_annotation_stats() -> None:
+    """Drop all cached annotation statistics (called automatically after annotation commits)."""
+    _stats_cache.invalidate()
+
+
+class AnnotationStatsService:
+    """
+    Computes annotation breakdowns with one aggregate query per table.
+
+    Each query uses ``COUNT(*) FILTER (WHERE ...)`` / ``AVG(...) FILTER (WHERE ...)``
+    so every bucket of a table is produced by a single scan, and results are cached
+    for ``annotation_stats_cache_ttl_seconds``.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def ttl_seconds(self) -> float:
+        return settings.annotation_stats_cache_ttl_seconds
+
+    # ------------------------------------------------------------------
+    # Statement builders
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _breakdown_statement(model: Any):
+        """Totals, AI/human split, overrides and verifications for question/section annotations."""
+        return select(
+            func.count().label("total"),
+            func.count().filter(model.ai_generated.is_(True)).label("ai_generated"),
+            func.count().filter(model.annotator_id == HUMAN_ANNOTATOR_ID).label("human_created"),
+            func.count().filter(model.human_overridden.is_(True)).label("overridden"),
+            func.count().filter(model.human_verified.is_(True)).label("verified"),
+        ).select_from(model)
+
+    @staticmethod
+    def _averages_statement(model: Any, annotator_id: Optional[str] = None):
+        """Count plus average quality, relevance and pillar scores."""
+        columns = [
+            func.count().label("count"),
+            func.avg(model.quality).label("avg_quality"),
+            func.avg(model.relevant).label("avg_relevant"),
+        ]
+        columns.extend(func.avg(getattr(model, field)).label(field) for field in PILLAR_FIELDS)
+        statement = select(*columns).select_from(model)
+        if annotator_id:
+            statement = statement.where(model.annotator_id == annotator_id)
+        return statement
+
+    @staticmethod
+    def _period_statement(model: Any, recent: Tuple[datetime, datetime], baseline: Tuple[datetime, datetime]):
+        """Counts and summed pillar averages for the recent and baseline periods."""
+        pillar_average = sum(getattr(model, field) for field in PILLAR_FIELDS) / float(len(PILLAR_FIELDS))
+        in_recent = (model.created_at >= recent[0]) & (model.created_at < recent[1])
+        in_baseline = (model.created_at >= baseline[0]) & (model.created_at < baseline[1])
+        return select(
+            func.count().filter(in_recent).label("recent_count"),
+            func.sum(pillar_average).filter(in_recent).label("recent_score_sum"),
+            func.count().filter(in_baseline).label("baseline_count"),
+            func.sum(pillar_average).filter(in_baseline).label("baseline_score_sum"),
+        ).select_from(model).where(model.created_at >= baseline[0], model.created_at < recent[1])
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_human_vs_ai_breakdown(self) -> Dict[str, Dict[str, int]]:
+        """Per-table human vs AI breakdown for question, section and survey annotations."""
+
+        def compute() -> Dict[str, Dict[str, int]]:
+            question_row = self.db.execute(self._breakdown_statement(QuestionAnnotation)).one()
+            section_row = self.db.execute(self._breakdown_statement(SectionAnnotation)).one()
+            survey_total = self.db.execute(select(func.count()).select_from(SurveyAnnotation)).scalar() or 0
+            return {
+                "question_annotations": {key: int(value or 0) for key, value in question_row._mapping.items()},
+                "section_annotations": {key: int(value or 0) for key, value in section_row._mapping.items()},
+                "survey_annotations": {"total": int(survey_total)},
+            }
+
+        return self._cached(("human_vs_ai",), compute, fallback_value=self._empty_breakdown())
+
+    def get_annotation_averages(self, annotator_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Counts and average scores for question and section annotations."""
+
+        def compute() -> Dict[str, Dict[str, Any]]:
+            return {
+                "question_annotations": self._format_averages(
+                    self.db.execute(self._averages_statement(QuestionAnnotation, annotator_id)).one()
+                ),
+                "section_annotations": self._format_averages(
+                    self.db.execute(self._averages_statement(SectionAnnotation, annotator_id)).one()
+                ),
+            }
+
+        empty = {"count": 0, "avg_quality": 0, "avg_relevant": 0, "avg_pillars": {}}
+        return self._cached(
+            ("averages", annotator_id),
+            compute,
+            fallback_value={"question_annotations": dict(empty), "section_annotations": dict(empty)},
+        )
+
+    def get_period_scores(
+        self,
+        recent: Tuple[datetime, datetime],
+        baseline: Tuple[datetime, datetime],
+    ) -> Dict[str, float]:
+        """
+        Annotation counts and average pillar scores for a recent and a baseline period,
+        combined across question and section annotations.
+        """
+
+        def compute() -> Dict[str, float]:
+            totals = {"recent_count": 0, "recent_score_sum": 0.0, "baseline_count": 0, "baseline_score_sum": 0.0}
+            for model in (QuestionAnnotation, SectionAnnotation):
+                row = self.db.execute(self._period_statement(model, recent, baseline)).one()
+                for key, value in row._mapping.items():
+                    totals[key] += value or 0
+            return {
+                "recent_count": int(totals["recent_count"]),
+                "baseline_count": int(totals["baseline_count"]),
+                "recent_avg": float(totals["recent_score_sum"]) / totals["recent_count"] if totals["recent_count"] else 0.0,
+                "baseline_avg": float(totals["baseline_score_sum"]) / totals["baseline_count"] if totals["baseline_count"] else 0.0,
+            }
+
+        return self._cached(
+            ("periods", recent, baseline),
+            compute,
+            fallback_value={"recent_count": 0, "baseline_count": 0, "recent_avg": 0.0, "baseline_avg": 0.0},
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _cached(self, key: Hashable, compute: Callable[[], Any], fallback_value: Any) -> Any:
+        def compute_safely() -> Any:
+            # One session health probe for the whole aggregate instead of one per COUNT
+            return DatabaseSessionManager.safe_query(
+                self.db,
+                compute,
+                fallback_value=None,
+                operation_name=f"annotation statistics {key[0]}",
+            )
+
+        result = _stats_cache.get_or_compute(key, self.ttl_seconds, compute_safely)
+        if result is None:
+            # Don't keep failures around for the whole TTL
+            invalidate_annotation_stats()
+            return fallback_value
+        return result
+
+    @staticmethod
+    def _format_averages(row: Any) -> Dict[str, Any]:
+        values = row._mapping
+        count = int(values["count"] or 0)
+        if count == 0:
+            return {"count": 0, "avg_quality": 0, "avg_relevant": 0, "avg_pillars": {}}
+        return {
+            "count": count,
+            "avg_quality": round(float(values["avg_quality"] or 0), 2),
+            "avg_relevant": round(float(values["avg_relevant"] or 0), 2),
+            "avg_pillars": {field: round(float(values[field] or 0), 2) for field in PILLAR_FIELDS},
+        }
+
+    @staticmethod
+    def _empty_breakdown() -> Dict[str, Dict[str, int]]:
+        empty = {"total": 0, "ai_generated": 0, "human_created": 0, "overridden": 0, "verified": 0}
+        return {
+            "question_annotations": dict(empty),
+            "section_annotations": dict(empty),
+            "survey_annotations": {"total": 0},
+        }
@@ -12,6 +12,7 @@ import time
 
 from ..models.survey import SurveyCreate, SurveyCreateWithSections, Question, QuestionType, SurveySection
 from ..config.settings import settings
+from ..config.logging_config import log_text_preview
 from ..utils.error_messages import UserFriendlyError, get_api_configuration_error
 from ..utils.llm_audit_decorator import LLMAuditContext
 from ..services.llm_audit_service import LLMAuditService
@@ -934,8 +935,8 @@ IMPORTANT: Return ONLY valid JSON that matches the schema exactly. No explanatio
             # CRITICAL FIX: Handle character array output from LLM
             # Sometimes the LLM returns a character array instead of a JSON string
             logger.info(f"🔍 [Document Parser] Checking for character array format...")
-            logger.info(f"🔍 [Document Parser] Content starts with: {json_content[:50]}")
-            logger.info(f"🔍 [Document Parser] Content ends with: {json_content[-50:]}")
+            logger.info(f"🔍 [Document Parser] Content starts with: {log_text_preview(json_content, 50)}")
+            logger.info(f"🔍 [Document Parser] Content ends with: {log_text_preview(json_content, 50, tail=True)}")
             
             if json_content.startswith('[') and json_content.endswith(']'):
                 logger.info(f"🔧 [Document Parser] Detected potential character array format")
@@ -948,28 +949,28 @@ IMPORTANT: Return ONLY valid JSON that matches the schema exactly. No explanatio
                         json_content = ''.join(char_array).strip()
                         logger.info(f"🔧 [Document Parser] Successfully converted character array to string")
                         logger.info(f"🔧 [Document Parser] Original length: {original_length}, New length: {len(json_content)}")
-                        logger.info(f"🔧 [Document Parser] First 200 chars: {json_content[:200]}")
+                        logger.info(f"🔧 [Document Parser] First 200 chars: {log_text_preview(json_content, 200)}")
                     else:
                         logger.warning(f"⚠️ [Document Parser] Character array contains non-string elements")
-                        logger.warning(f"⚠️ [Document Parser] Array type: {type(char_array)}, First few elements: {char_array[:5] if char_array else 'empty'}")
+                        logger.warning(f"⚠️ [Document Parser] Array type: {type(char_array)}, First few elements: {log_text_preview(char_array[:5]) if char_array else 'empty'}")
                 except Exception as e:
                     logger.warning(f"⚠️ [Document Parser] Failed to parse character array: {e}")
-                    logger.warning(f"⚠️ [Document Parser] Raw content: {json_content[:100]}")
+                    logger.warning(f"⚠️ [Document Parser] Raw content: {log_text_preview(json_content, 100)}")
             else:
                 logger.info(f"🔍 [Document Parser] Content does not appear to be a character array")
             
             logger.info(f"📝 [Document Parser] Final JSON content length: {len(json_content)}")
-            logger.debug(f"📝 [Document Parser] JSON content preview: {json_content[:200]}...")
+            logger.debug(f"📝 [Document Parser] JSON content preview: {log_text_preview(json_content, 200)}...")
                 
             logger.info(f"✅ [Document Parser] LLM response received, length: {len(json_content)} chars")
-            logger.info(f"📄 [Document Parser] LLM response preview: {json_content[:500]}...")
-            logger.info(f"📄 [Document Parser] LLM response ending: ...{json_content[-200:]}")
+            logger.info(f"📄 [Document Parser] LLM response preview: {log_text_preview(json_content, 500)}...")
+            logger.info(f"📄 [Document Parser] LLM response ending: ...{log_text_preview(json_content, 200, tail=True)}")
             
             # Try to parse the JSON
             logger.info(f"🔍 [Document Parser] Parsing JSON response")
             logger.info(f"🔍 [Document Parser] JSON content length: {len(json_content)}")
-            logger.info(f"🔍 [Document Parser] JSON content starts with: {json_content[:50]}")
-            logger.info(f"🔍 [Document Parser] JSON content ends with: {json_content[-50:]}")
+            logger.info(f"🔍 [Document Parser] JSON content starts with: {log_text_preview(json_content, 50)}")
+            logger.info(f"🔍 [Document Parser] JSON content ends with: {log_text_preview(json_content, 50, tail=True)}")
             
             # Use centralized JSON parsing utility
             survey_data = parse_llm_json_response(json_content, service_name="DocumentParser")
@@ -997,7 +998,7 @@ IMPORTANT: Return ONLY valid JSON that matches the schema exactly. No explanatio
             
             if survey_data is None:
                 logger.error(f"❌ [Document Parser] All JSON extraction methods failed")
-                logger.error(f"❌ [Document Parser] Raw response (first 1000 chars): {json_content[:1000]}")
+                logger.error(f"❌ [Document Parser] Raw response (first 1000 chars): {log_text_preview(json_content, 1000)}")
                 
                 # Emergency audit logging - ensure raw response is captured
                 try:
@@ -2399,6 +2400,10 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
             prompt = self.create_rfq_extraction_prompt(document_text)
             logger.info(f"📝 [Document Parser] Created RFQ extraction prompt, length: {len(prompt)} chars")
 
+            # Re-uploads of the same document send an identical prompt; serve those from the response cache
+            from src.services.llm_response_cache import with_response_cache
+            rfq_llm_provider = with_response_cache(self.llm_provider, "rfq_extraction")
+
             # Create audit context for this LLM interaction
             interaction_id = f"rfq_extraction_{uuid.uuid4().hex[:8]}"
             audit_service = LLMAuditService(self.db_session) if self.db_session else None
@@ -2440,7 +2445,7 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
                         else:
                             response_format = {"type": "json_object"}
                         
-                        result = await self.llm_provider.generate(
+                        result = await rfq_llm_provider.generate(
                             prompt=prompt,
                             system_prompt=system_prompt_text,
                             model=self.model,
@@ -2463,6 +2468,7 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
                         audit_context.set_output(
                             output_content=processed_output
                         )
+                        audit_context.record_cache_hit(result.get("metadata"))
                 else:
                     # Fallback without auditing
                     logger.info(f"🚀 [Document Parser] Calling {self.provider_name} API for RFQ extraction without auditing")
@@ -2479,7 +2485,7 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
                     else:
                         response_format = {"type": "json_object"}
                     
-                    result = await self.llm_provider.generate(
+                    result = await rfq_llm_provider.generate(
                         prompt=prompt,
                         system_prompt=system_prompt_text,
                         model=self.model,
@@ -2506,7 +2512,7 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
                 else:
                     response_format = {"type": "json_object"}
                 
-                result = await self.llm_provider.generate(
+                result = await rfq_llm_provider.generate(
                     prompt=prompt,
                     system_prompt=system_prompt_text,
                     model=self.model,
@@ -2539,18 +2545,21 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
                     if isinstance(char_array, list) and all(isinstance(c, str) for c in char_array):
                         json_content = ''.join(char_array).strip()
                         logger.info(f"🔧 [Document Parser] Converted character array to string, length: {len(json_content)}")
-                        logger.info(f"🔧 [Document Parser] First 200 chars: {json_content[:200]}")
+                        logger.info(f"🔧 [Document Parser] First 200 chars: {log_text_preview(json_content, 200)}")
                     else:
                         logger.warning(f"⚠️ [Document Parser] Character array contains non-string elements")
                 except Exception as e:
                     logger.warning(f"⚠️ [Document Parser] Failed to parse character array: {e}")
-                    logger.warning(f"⚠️ [Document Parser] Raw content: {json_content[:100]}")
+                    logger.warning(f"⚠️ [Document Parser] Raw content: {log_text_preview(json_content, 100)}")
 
             logger.info(f"✅ [Document Parser] RFQ extraction response received, length: {len(json_content)} chars")
-            logger.info(f"🔍 [Document Parser] Raw LLM response: {json_content[:500]}...")
+            logger.info(f"🔍 [Document Parser] Raw LLM response: {log_text_preview(json_content, 500)}...")
 
             # Parse and validate JSON using robust extraction like survey generation
             rfq_data = self._extract_rfq_json(json_content)
+            if "extraction_error" not in rfq_data:
+                from src.services.llm_response_cache import store_parsed_response
+                await store_parsed_response(rfq_llm_provider, result)
             
             # CRITICAL FIX: Clean up newline characters in field values
             if 'field_mappings' in rfq_data:
@@ -2592,7 +2601,7 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
                     # Safe handling of field_value which might be None
                     if field_value is not None:
                         value_str = str(field_value)
-                        logger.info(f"      Value: {value_str[:100]}{'...' if len(value_str) > 100 else ''}")
+                        logger.info(f"      Value: {log_text_preview(value_str, 100)}{'...' if len(value_str) > 100 else ''}")
                     else:
                         logger.info(f"      Value: <null>")
                     
@@ -2603,7 +2612,7 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
                 import json
                 json_str = json.dumps(rfq_data, indent=2, ensure_ascii=False)
                 logger.info(f"🔍 [Document Parser] Complete JSON structure (first 1000 chars):")
-                logger.info(f"{json_str[:1000]}{'...' if len(json_str) > 1000 else ''}")
+                logger.info(f"{log_text_preview(json_str, 1000)}{'...' if len(json_str) > 1000 else ''}")
             except Exception as json_error:
                 logger.warning(f"⚠️ [Document Parser] Could not serialize JSON for logging: {json_error}")
             
@@ -2747,7 +2756,7 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
 
         # All strategies failed - return fallback
         logger.error(f"❌ [Document Parser] All JSON extraction strategies failed!")
-        logger.error(f"❌ [Document Parser] Raw response: {raw_text[:1000]}...")
+        logger.error(f"❌ [Document Parser] Raw response: {log_text_preview(raw_text, 1000)}...")
         return self._get_fallback_rfq_structure("All JSON extraction strategies failed")
 
     def _gentle_sanitize_json(self, raw_text: str) -> str:
@@ -3145,12 +3154,11 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
                             QuestionAnnotation.annotator_id == "docx_parser"
                         ).all()
                         
-                        sync_count = 0
-                        for annotation in recent_annotations:
-                            result = await sync_service.sync_question_annotation(annotation.id)
-                            if result.get("success"):
-                                sync_count += 1
-                                logger.info(f"✅ Synced annotation to RAG: {result.get('action')}")
+                        result = await sync_service.sync_annotations_batch(
+                            survey_id,
+                            question_annotation_ids=[annotation.id for annotation in recent_annotations]
+                        )
+                        sync_count = result.get("questions_synced", 0)
                         
                         logger.info(f"🎉 [Document Parser] Synced {sync_count}/{len(recent_annotations)} annotations to RAG")
                         
@@ -3500,6 +3508,89 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
         
         return 0
 
+    def build_question_annotations(self, survey_id: str, questions: List[Dict]) -> List[Any]:
+        """Build unsaved QuestionAnnotation rows from LLM-embedded annotation data."""
+        from ..database.models import QuestionAnnotation
+        from src.services.label_normalizer import LabelNormalizer
+        
+        logger.info(f"💬 [Comment Annotation] Processing annotations for {len(questions)} questions")
+        
+        # Initialize label normalizer
+        label_normalizer = LabelNormalizer()
+        
+        annotations = []
+        
+        for i, question in enumerate(questions):
+            question_id = question.get("id", f"q_{i+1}")
+            
+            # Check if this question has an annotation embedded by the LLM
+            if "annotation" in question and isinstance(question["annotation"], dict):
+                annotation_data = question["annotation"]
+                
+                # Extract annotation details
+                comment_text = annotation_data.get("comment", "")
+                anchored_text = annotation_data.get("anchored_text", "")
+                author = annotation_data.get("author", "docx_parser")
+                date = annotation_data.get("date", "")
+                
+                if comment_text:  # Only create annotation if there's actual comment text
+                    # Normalize the comment text as a label
+                    normalized_label = label_normalizer.normalize(comment_text)
+                    
+                    logger.info(f"🏷️ [Comment Annotation] Normalizing comment '{comment_text}' -> '{normalized_label}'")
+                    
+                    # Create advanced_labels with full context
+                    advanced_labels = {
+                        "comment_text": comment_text,
+                        "anchored_text": anchored_text,
+                        "comment_author": author,
+                        "comment_date": date,
+                        "matching_method": "llm_with_anchored_text",
+                        "matching_confidence": 1.0,  # LLM did the matching, so high confidence
+                        "original_comment": comment_text,
+                        "normalized_label": normalized_label
+                    }
+                    
+                    # Create annotation with normalized labels
+                    annotation = QuestionAnnotation(
+                        question_id=question_id,
+                        survey_id=survey_id,
+                        
+                        # Store both original and normalized
+                        comment=comment_text,
+                        labels=[normalized_label],  # Use normalized label
+                        
+                        # Store full context in advanced_labels
+                        advanced_labels=advanced_labels,
+                        
+                        # Use comment author as annotator_id
+                        annotator_id=author,
+                        
+                        # Default values for required fields
+                        required=True,
+                        quality=3,
+                        relevant=3,
+                        methodological_rigor=3,
+                        content_validity=3,
+                        respondent_experience=3,
+                        analytical_value=3,
+                        business_impact=3,
+                        
+                        # Mark as AI-generated from DOCX parsing
+                        ai_generated=True,
+                        ai_confidence=1.0,
+                        generation_timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+                    )
+                    
+                    annotations.append(annotation)
+                    logger.info(f"✅ [Comment Annotation] Created annotation for question {question_id}: '{comment_text[:50]}...'")
+                else:
+                    logger.debug(f"⚠️ [Comment Annotation] Question {question_id} has annotation field but no comment text")
+            else:
+                logger.debug(f"ℹ️ [Comment Annotation] Question {question_id} has no annotation field")
+        
+        return annotations
+    
     def create_question_annotations_from_comments(
         self, 
         survey_id: str, 
@@ -3513,85 +3604,9 @@ REMEMBER: Return ONLY the JSON structure above. No other text, explanations, or
             return
         
         try:
-            from ..database.models import QuestionAnnotation
-            from src.services.label_normalizer import LabelNormalizer
-            
-            logger.info(f"💬 [Comment Annotation] Processing annotations for {len(questions)} questions")
-            
-            # Initialize label normalizer
-            label_normalizer = LabelNormalizer()
-            
-            annotations_created = 0
-            
-            for i, question in enumerate(questions):
-                question_id = question.get("id", f"q_{i+1}")
-                
-                # Check if this question has an annotation embedded by the LLM
-                if "annotation" in question and isinstance(question["annotation"], dict):
-                    annotation_data = question["annotation"]
-                    
-                    # Extract annotation details
-                    comment_text = annotation_data.get("comment", "")
-                    anchored_text = annotation_data.get("anchored_text", "")
-                    author = annotation_data.get("author", "docx_parser")
-                    date = annotation_data.get("date", "")
-                    
-                    if comment_text:  # Only create annotation if there's actual comment text
-                        # Normalize the comment text as a label
-                        normalized_label = label_normalizer.normalize(comment_text)
-                        
-                        logger.info(f"🏷️ [Comment Annotation] Normalizing comment '{comment_text}' -> '{normalized_label}'")
-                        
-                        # Create advanced_labels with full context
-                        advanced_labels = {
-                            "comment_text": comment_text,
-                            "anchored_text": anchored_text,
-                            "comment_author": author,
-                            "comment_date": date,
-                            "matching_method": "llm_with_anchored_text",
-                            "matching_confidence": 1.0,  # LLM did the matching, so high confidence
-                            "original_comment": comment_text,
-                            "normalized_label": normalized_label
-                        }
-                        
-                        # Create annotation with normalized labels
-                        annotation = QuestionAnnotation(
-                            question_id=question_id,
-                            survey_id=survey_id,
-                            
-                            # Store both original and normalized
-                            comment=comment_text,
-                            labels=[normalized_label],  # Use normalized label
-                            
-                            # Store full context in advanced_labels
-                            advanced_labels=advanced_labels,
-                            
-                            # Use comment author as annotator_id
-                            annotator_id=author,
-                            
-                            # Default values for required fields
-                            required=True,
-                            quality=3,
-                            relevant=3,
-                            methodological_rigor=3,
-                            content_validity=3,
-                            respondent_experience=3,
-                            analytical_value=3,
-                            business_impact=3,
-                            
-                            # Mark as AI-generated from DOCX parsing
-                            ai_generated=True,
-                            ai_confidence=1.0,
-                            generation_timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-                        )
-                        
-                        self.db_session.add(annotation)
-                        annotations_created += 1
-                        logger.info(f"✅ [Comment Annotation] Created annotation for question {question_id}: '{comment_text[:50]}...'")
-                    else:
-                        logger.debug(f"⚠️ [Comment Annotation] Question {question_id} has annotation field but no comment text")
-                else:
-                    logger.debug(f"ℹ️ [Comment Annotation] Question {question_id} has no annotation field")
+            annotations = self.build_question_annotations(survey_id, questions)
+            self.db_session.add_all(annotations)
+            annotations_created = len(annotations)
             
             self.db_session.commit()
             logger.info(f"🎉 [Comment Annotation] Successfully created {annotations_created} question annotations from LLM-embedded data")
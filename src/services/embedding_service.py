@@ -1,12 +1,14 @@
 from typing import List, Optional, Any
 from sentence_transformers import SentenceTransformer
 from src.config import settings
+from src.config.logging_config import log_text_preview
 import replicate
 import asyncio
 import uuid
 import time
 from ..utils.llm_audit_decorator import LLMAuditContext
 from ..services.llm_audit_service import LLMAuditService
+from ..services.tracing import traced
 
 
 class EmbeddingService:
@@ -163,6 +165,7 @@ class EmbeddingService:
         
         return any(indicator in self.model_name for indicator in replicate_indicators)
     
+    @traced("embedding.get_embedding")
     async def get_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for given text
@@ -170,18 +173,22 @@ class EmbeddingService:
         import logging
         logger = logging.getLogger(__name__)
         
-        logger.info(f"🔄 [EmbeddingService] Generating embedding for text length: {len(text)}")
-        logger.debug(f"🔄 [EmbeddingService] Text preview: '{text[:100]}...'")
-        
         self._ensure_initialized()
         
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🔄 [EmbeddingService] Generating embedding via %s for text length %d: '%s...'",
+                "Replicate" if self.use_replicate else "SentenceTransformer",
+                len(text),
+                log_text_preview(text, 100),
+            )
+        
         if self.use_replicate:
-            logger.info("🌐 [EmbeddingService] Using Replicate API for embedding generation")
             return await self._get_replicate_embedding(text)
         else:
-            logger.info("🤖 [EmbeddingService] Using SentenceTransformer for embedding generation")
             return await self._get_sentence_transformer_embedding(text)
     
+    @traced("embedding.get_embeddings_batch")
     async def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts
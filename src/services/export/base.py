@@ -64,6 +64,9 @@ class SurveyExportRenderer(ABC):
     Enforces implementation of all question types to ensure complete coverage.
     """
 
+    # Bump whenever rendering output changes so cached exports are invalidated
+    renderer_version: str = "1"
+
     def __init__(self) -> None:
         self._registered_types: Set[QuestionType] = set()
         self._register_question_types()
@@ -313,6 +316,13 @@ class ExportRegistry:
         renderer_class = self._renderers[format_name]
         return renderer_class()  # type: ignore[no-any-return]
 
+    def get_renderer_version(self, format_name: str) -> str:
+        """Get the output version of the renderer registered for a format."""
+        if format_name not in self._renderers:
+            raise ValueError(f"No renderer registered for format: {format_name}")
+
+        return str(getattr(self._renderers[format_name], "renderer_version", "1"))
+
     def get_available_formats(self) -> List[str]:
         """Get list of available export formats."""
         return list(self._renderers.keys())
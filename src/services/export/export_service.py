@@ -0,0 +1,279 @@
+"""
+Survey export service.
+Renders surveys off the event loop in a process pool, caches rendered bytes and
+streams bulk exports as ZIP archives.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from src.config import settings
+from .base import export_registry
+from . import docx_renderer, pdf_renderer  # noqa: F401  (registers renderers)
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+
+
+def _render_export(format_name: str, survey_data: Dict[str, Any]) -> bytes:
+    """
+    Render a survey in a worker process.
+
+    Module-level so it can be pickled by ProcessPoolExecutor; importing this
+    module in the worker registers the renderers with its export registry.
+    """
+    renderer = export_registry.get_renderer(format_name)
+    return renderer.render_survey(survey_data)
+
+
+def build_export_filename(survey_data: Dict[str, Any], format_name: str, filename: Optional[str] = None) -> str:
+    """Build a safe download filename from an explicit name or the survey title."""
+    if filename:
+        if not filename.endswith(f".{format_name}"):
+            filename += f".{format_name}"
+        return filename
+
+    survey_title = survey_data.get("title") or "survey"
+    clean_title = "".join(c for c in survey_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    return f"{clean_title.replace(' ', '_') or 'survey'}.{format_name}"
+
+
+@dataclass
+class BulkExportEntry:
+    """One survey to include in a bulk ZIP export."""
+    name: str
+    survey_data: Dict[str, Any]
+
+
+class _ExportBytesCache:
+    """Thread-safe in-memory LRU cache bounded by total payload size."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def set(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _ZipStreamBuffer:
+    """Write-only, non-seekable sink that lets ZipFile output be drained chunk by chunk."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class SurveyExportService:
+    """
+    Renders survey exports without blocking the event loop.
+
+    Rendered output is cached by (format, renderer version, survey JSON hash) in
+    a size-bounded in-process LRU and, when available, in Redis.
+    """
+
+    CACHE_KEY_PREFIX = "survey_export"
+
+    def __init__(self, max_workers: Optional[int] = None, use_process_pool: bool = True) -> None:
+        self.max_workers = max_workers or settings.export_process_workers
+        self.use_process_pool = use_process_pool
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._memory_cache = _ExportBytesCache(settings.export_cache_max_bytes)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def hash_survey(survey_data: Dict[str, Any]) -> str:
+        """Stable content hash of the survey JSON."""
+        canonical = json.dumps(survey_data, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def build_cache_key(self, format_name: str, survey_data: Dict[str, Any]) -> str:
+        renderer_version = export_registry.get_renderer_version(format_name)
+        return f"{self.CACHE_KEY_PREFIX}:{format_name}:{renderer_version}:{self.hash_survey(survey_data)}"
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if not self.use_process_pool:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                logger.info(f"🏭 [SurveyExportService] Started export process pool with {self.max_workers} workers")
+            return self._pool
+
+    def _get_cached(self, cache_key: str) -> Optional[bytes]:
+        data = self._memory_cache.get(cache_key)
+        if data is not None:
+            return data
+
+        from src.services.cache_service import cache_service
+        cached = cache_service.get(cache_key)
+        if isinstance(cached, bytes):
+            self._memory_cache.set(cache_key, cached)
+            return cached
+        return None
+
+    def _store_cached(self, cache_key: str, data: bytes) -> None:
+        self._memory_cache.set(cache_key, data)
+
+        from src.services.cache_service import cache_service
+        cache_service.set(cache_key, data, expire=settings.export_cache_ttl_seconds)
+
+    async def _render_uncached(self, format_name: str, survey_data: Dict[str, Any]) -> bytes:
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                return await loop.run_in_executor(pool, _render_export, format_name, survey_data)
+            except BrokenProcessPool:
+                logger.warning("⚠️ [SurveyExportService] Export process pool broken, rendering in thread instead")
+                with self._pool_lock:
+                    self._pool = None
+        return await loop.run_in_executor(None, _render_export, format_name, survey_data)
+
+    async def render(self, format_name: str, survey_data: Dict[str, Any]) -> bytes:
+        """
+        Render a survey to the given format, serving repeated exports from cache.
+
+        Args:
+            format_name: Registered export format (e.g. "docx", "pdf")
+            survey_data: Survey JSON to render
+
+        Returns:
+            Rendered document bytes
+        """
+        cache_key = self.build_cache_key(format_name, survey_data)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            self.cache_hits += 1
+            logger.info(f"⚡ [SurveyExportService] Cache hit for {format_name} export ({len(cached)} bytes)")
+            return cached
+
+        self.cache_misses += 1
+        data = await self._render_uncached(format_name, survey_data)
+        self._store_cached(cache_key, data)
+        return data
+
+    async def _render_entry(
+        self, format_name: str, entry: BulkExportEntry, semaphore: asyncio.Semaphore
+    ) -> Tuple[BulkExportEntry, Optional[bytes], Optional[str]]:
+        try:
+            async with semaphore:
+                return entry, await self.render(format_name, entry.survey_data), None
+        except Exception as e:
+            logger.error(f"❌ [SurveyExportService] Failed to render '{entry.name}': {str(e)}")
+            return entry, None, str(e)
+
+    async def stream_zip(self, format_name: str, entries: List[BulkExportEntry]) -> AsyncIterator[bytes]:
+        """
+        Stream a ZIP archive of rendered surveys.
+
+        Renders run concurrently, at most one per export worker, and each file is
+        written to the archive as soon as it finishes, so the client starts
+        receiving data before the slowest survey is done. Failed renders are
+        recorded as ``<name>.error.txt``.
+        """
+        buffer = _ZipStreamBuffer()
+        used_names: set = set()
+        # Keeps a large export from queueing every survey JSON on the process pool at once
+        semaphore = asyncio.Semaphore(self.max_workers)
+        tasks = [asyncio.ensure_future(self._render_entry(format_name, entry, semaphore)) for entry in entries]
+        timestamp = datetime.now().timetuple()[:6]
+
+        try:
+            # Rendered DOCX/PDF files are already compressed, so store them as-is
+            # instead of spending event loop time deflating them again.
+            with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+                for next_done in asyncio.as_completed(tasks):
+                    entry, data, error = await next_done
+                    if data is not None:
+                        name = self._unique_name(f"{entry.name}.{format_name}", used_names)
+                        archive.writestr(zipfile.ZipInfo(name, date_time=timestamp), data)
+                    else:
+                        name = self._unique_name(f"{entry.name}.error.txt", used_names)
+                        archive.writestr(zipfile.ZipInfo(name, date_time=timestamp), f"Export failed: {error}")
+                    yield buffer.drain()
+            yield buffer.drain()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _unique_name(name: str, used_names: set) -> str:
+        candidate = name
+        counter = 2
+        while candidate in used_names:
+            stem, dot, extension = name.rpartition(".")
+            candidate = f"{stem}_{counter}{dot}{extension}"
+            counter += 1
+        used_names.add(candidate)
+        return candidate
+
+    def clear_cache(self) -> None:
+        """Clear the in-process export cache."""
+        self._memory_cache.clear()
+
+    def shutdown(self) -> None:
+        """Shut down the export process pool."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+# Global export service instance
+export_service = SurveyExportService()
@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional
 import replicate
 
 from ..config.settings import settings
+from ..config.logging_config import log_text_preview
 from ..services.logging_utils import log_service_configuration
 from ..services.llm_audit_service import LLMAuditService
 from ..utils.error_messages import UserFriendlyError, get_api_configuration_error
@@ -43,7 +44,8 @@ class FieldExtractionService:
         try:
             self.llm_provider = create_llm_provider(
                 provider=self.provider_name,
-                model=None  # Will use model from settings
+                model=None,  # Will use model from settings
+                cache_purpose="field_extraction"
             )
             logger.info(f"✅ [FieldExtractionService] Initialized {self.provider_name} provider")
         except Exception as e:
@@ -328,6 +330,7 @@ Return ONLY a JSON object with this exact structure:
                         output_content=processed_output,
                         response_time_ms=response_time_ms,
                     )
+                    audit_context.record_cache_hit(result.get("metadata"))
             else:
                 logger.debug("Calling LLM for field extraction", extra={"audited": False})
                 system_prompt_text = "Extract fields from RFQ/Survey. Return ONLY valid JSON.\n\nExtract:\n- methodology_tags: [\"van_westendorp\", \"conjoint\", \"maxdiff\", \"nps\", \"satisfaction\"]\n- industry_category: \"electronics|healthcare|financial|retail|automotive\"\n- research_goal: \"pricing_research|feature_research|satisfaction_research|brand_research|market_sizing\"\n- quality_score: 0.0-1.0\n- suggested_title: \"[descriptive title]\"\n\nMethodology Detection:\n- Van Westendorp: \"too cheap\", \"too expensive\" questions\n- Conjoint: Choice scenarios with attributes\n- MaxDiff: \"Most/Least important\" selections\n- NPS: \"How likely to recommend\""
@@ -367,7 +370,7 @@ Return ONLY a JSON object with this exact structure:
 
             if extracted_fields is None:
                 logger.error("❌ [Field Extraction] JSON parsing failed")
-                logger.error(f"❌ [Field Extraction] Raw response (first 1000 chars): {json_content[:1000]}")
+                logger.error(f"❌ [Field Extraction] Raw response (first 1000 chars): {log_text_preview(json_content, 1000)}")
                 
                 # Emergency audit logging - ensure raw response is captured
                 try:
@@ -396,6 +399,9 @@ Return ONLY a JSON object with this exact structure:
                     raw_response=json_content
                 )
 
+            from src.services.llm_response_cache import store_parsed_response
+            await store_parsed_response(self.llm_provider, result)
+
             cleaned_fields = self._clean_extracted_fields(extracted_fields)
             logger.info(
                 "Field extraction completed",
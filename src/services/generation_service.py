@@ -11,8 +11,10 @@ import replicate
 from sqlalchemy.orm import Session
 
 from src.config import settings
+from src.config.logging_config import log_text_preview
 from src.services.logging_utils import log_service_configuration
 from src.services.llm_audit_service import LLMAuditService
+from src.services.llm_gateway import llm_gateway
 from src.services.progress_tracker import get_progress_tracker
 from src.services.prompt_service import PromptService
 from src.utils.error_messages import UserFriendlyError, get_api_configuration_error
@@ -241,7 +243,7 @@ class GenerationService:
             )
             
             logger.info(f"🔍 [GenerationService] Storing CUSTOM prompt in LLM audit (length: {len(prompt)})")
-            logger.info(f"🔍 [GenerationService] Custom prompt preview: {prompt[:200]}...")
+            logger.info(f"🔍 [GenerationService] Custom prompt preview: {log_text_preview(prompt)}...")
 
             interaction_id = f"survey_generation_{uuid.uuid4().hex[:8]}"
             audit_service = LLMAuditService(self.db_session)
@@ -261,6 +263,8 @@ class GenerationService:
                 'custom_prompt_used': bool(system_prompt),
                 'regeneration_mode': regeneration_mode,
             }
+            if not system_prompt and context.get('prompt_token_usage'):
+                metadata['prompt_token_usage'] = context['prompt_token_usage']
             
             # Add regeneration-specific metadata
             if regeneration_mode:
@@ -454,6 +458,8 @@ class GenerationService:
                 'custom_rules_count': len(custom_rules.get('rules', [])) if custom_rules else 0,
                 'regeneration_mode': regeneration_mode,
             }
+            if context.get('prompt_token_usage'):
+                metadata['prompt_token_usage'] = context['prompt_token_usage']
             
             # Add regeneration-specific metadata
             if regeneration_mode:
@@ -584,6 +590,72 @@ class GenerationService:
                     raise wrapped_error
                 else:
                     raise Exception(f"Survey generation failed: {str(e)}") from e
+
+    async def generate_section(self, context: Dict[str, Any], section_id: Any) -> Dict[str, Any]:
+        """
+        Regenerate a single section with its own small prompt (parallel surgical regeneration)
+
+        Args:
+            context: Generation context including surgical_analysis and previous survey fields
+            section_id: ID of the section to regenerate
+
+        Returns:
+            {"section": regenerated section, "comments_addressed": [...]}
+        """
+        prompt = self.prompt_service.prompt_builder.build_section_regeneration_prompt(context, section_id)
+        audit_service = LLMAuditService(self.db_session)
+
+        async with LLMAuditContext(
+            audit_service=audit_service,
+            interaction_id=f"section_regeneration_{section_id}_{uuid.uuid4().hex[:8]}",
+            model_name=self.model,
+            model_provider=self.provider_name,
+            purpose="survey_generation",
+            input_prompt=prompt,
+            context_type="generation",
+            parent_workflow_id=context.get('workflow_id'),
+            parent_survey_id=context.get('audit_survey_id'),
+            parent_rfq_id=context.get('rfq_id'),
+            hyperparameters=get_json_optimized_hyperparameters("survey_generation"),
+            metadata={'regeneration_mode': True, 'section_id': section_id},
+            tags=["survey", "generation", "regeneration", "section", self.provider_name],
+        ) as audit_context:
+            llm_gateway.refresh_hedge_thresholds()
+            result = await self.llm_provider.generate(
+                prompt=prompt,
+                model=self.model,
+                temperature=0.7,
+                max_tokens=6000,
+                response_format={"type": "json_object"}
+            )
+            raw_response_text = result["output"]
+            audit_context.set_raw_response(raw_response_text)
+
+            survey_data = self._extract_survey_json(raw_response_text)
+            sections = survey_data.get("sections", [])
+            section = next((s for s in sections if s.get("id") == section_id), sections[0] if sections else None)
+            if not section or not section.get("questions"):
+                raise SurveyGenerationError(
+                    f"Section {section_id} regeneration returned no questions",
+                    error_code="GEN_SECTION_001",
+                    raw_response=raw_response_text
+                )
+            section["id"] = section_id
+
+            output_content = json.dumps(section)
+            audit_context.set_output(
+                output_content=output_content,
+                input_tokens=len(prompt.split()),
+                output_tokens=len(output_content.split()),
+                cost_usd=None,
+            )
+
+        logger.info(f"✅ [GenerationService] Regenerated section {section_id}: {len(section['questions'])} questions")
+        return {
+            "section": section,
+            "comments_addressed": survey_data.get("comments_addressed", []) or []
+        }
+
     def _extract_survey_json(self, raw_text: str) -> Dict[str, Any]:
         """
         Extract survey JSON from raw LLM output using unified parsing with json-repair
@@ -613,8 +685,8 @@ class GenerationService:
         else:
             logger.error("❌ [GenerationService] All JSON extraction strategies failed")
             logger.error(f"❌ [GenerationService] Raw response length: {len(raw_text)}")
-            logger.error(f"❌ [GenerationService] Raw response preview (first 1000 chars): {raw_text[:1000]}")
-            logger.error(f"❌ [GenerationService] Raw response ending (last 500 chars): {raw_text[-500:]}")
+            logger.error(f"❌ [GenerationService] Raw response preview (first 1000 chars): {log_text_preview(raw_text, 1000)}")
+            logger.error(f"❌ [GenerationService] Raw response ending (last 500 chars): {log_text_preview(raw_text, 500, tail=True)}")
             
             # Check for potential truncation issues
             if not raw_text.strip().endswith('}'):
@@ -662,8 +734,8 @@ class GenerationService:
         This should work for most cases since the text is already cleaned.
         """
         logger.debug(f"🔍 [GenerationService] Direct JSON: Attempting to parse {len(sanitized_text)} characters")
-        logger.debug(f"🔍 [GenerationService] Direct JSON: First 200 chars: {sanitized_text[:200]}...")
-        logger.debug(f"🔍 [GenerationService] Direct JSON: Last 200 chars: ...{sanitized_text[-200:]}")
+        logger.debug(f"🔍 [GenerationService] Direct JSON: First 200 chars: {log_text_preview(sanitized_text)}...")
+        logger.debug(f"🔍 [GenerationService] Direct JSON: Last 200 chars: ...{log_text_preview(sanitized_text, tail=True)}")
 
         try:
             # First try direct parsing
@@ -1975,7 +2047,7 @@ class GenerationService:
                 event_data = getattr(event, "data", "")
                 
                 # Log event details for debugging
-                logger.debug(f"🛈 [GenerationService] Event {event_count}: type='{event_type}', data_length={len(str(event_data))}")
+                logger.debug("🛈 [GenerationService] Event %d: type='%s'", event_count, event_type)
                 
                 # Handle different event types more robustly
                 if event_type == 'output' or event_type == 'data' or (not event_type and event_data):
@@ -1984,7 +2056,10 @@ class GenerationService:
                     new_content = str(event_data)
                     accumulated_content += new_content
                     
-                    logger.debug(f"📝 [GenerationService] Output event {output_events}: added {len(new_content)} chars, total: {len(accumulated_content)}")
+                    logger.debug(
+                        "📝 [GenerationService] Output event %d: added %d chars, total: %d",
+                        output_events, len(new_content), len(accumulated_content),
+                    )
 
                     current_time = time.time()
                     elapsed_time = current_time - start_time
@@ -2005,7 +2080,7 @@ class GenerationService:
                     break
                 else:
                     # Non-output events (e.g., logs) can be safely ignored or logged at debug level
-                    logger.debug(f"🛈 [GenerationService] Non-output event: {event_type}")
+                    logger.debug("🛈 [GenerationService] Non-output event: %s", event_type)
 
             # Check if we actually collected any content
             if not accumulated_content.strip():
@@ -2147,7 +2222,8 @@ class GenerationService:
                 # Replicate - basic JSON mode
                 response_format = {"type": "json_object"}
             
-            # Call provider
+            # Call provider (hedged against long-tail stalls when enabled, bounded by the workflow deadline)
+            llm_gateway.refresh_hedge_thresholds()
             result = await self.llm_provider.generate(
                 prompt=prompt,
                 model=self.model,
@@ -2,10 +2,17 @@ from sqlalchemy.orm import Session
 from src.database import GoldenRFQSurveyPair
 from src.database.models import Survey
 from src.services.embedding_service import EmbeddingService
-from typing import Dict, List, Any, Optional
-from uuid import UUID
+from src.services.golden_similarity_index_service import GoldenSimilarityIndexService
+from src.services.llm_response_cache import build_llm_cache_key, llm_response_cache
+from src.services.llm_gateway import Priority, estimate_tokens, llm_gateway
+from src.utils.survey_utils import extract_all_questions
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID, uuid4
 from src.config import settings
+from src.config.logging_config import log_text_preview
 from datetime import datetime
+import asyncio
 import replicate
 import json
 import logging
@@ -13,6 +20,47 @@ from scripts.populate_rule_based_multi_level_rag import RuleBasedRAGPopulator
 
 logger = logging.getLogger(__name__)
 
+# Pairs whose field extraction / RFQ generation LLM calls run at once during bulk creation
+GOLDEN_PAIR_PREPARE_CONCURRENCY = 4
+
+
+def _first_per_key(rows: List[Any], key: Callable[[Any], str]) -> List[Any]:
+    """Drop rows whose key was already seen, keeping input order"""
+    seen = set()
+    unique_rows = []
+    for row in rows:
+        if key(row) not in seen:
+            seen.add(key(row))
+            unique_rows.append(row)
+    return unique_rows
+
+
+@dataclass
+class GoldenPairDraft:
+    """A golden pair moving through the creation pipeline, before it is written"""
+    survey_json: Dict[str, Any]
+    rfq_text: Optional[str] = None
+    title: Optional[str] = None
+    methodology_tags: Optional[List[str]] = None
+    industry_category: Optional[str] = None
+    research_goal: Optional[str] = None
+    quality_score: Optional[float] = None
+    auto_generate_rfq: bool = False
+    fields_resolved: bool = False
+    golden_pair: GoldenRFQSurveyPair = field(init=False)
+    sections: List[Any] = field(default_factory=list)
+    questions: List[Any] = field(default_factory=list)
+    annotations: List[Any] = field(default_factory=list)
+    
+    def __post_init__(self):
+        # Assigned up front so content rows can reference the pair before it is inserted
+        self.golden_pair = GoldenRFQSurveyPair(id=uuid4(), survey_json=self.survey_json)
+    
+    @property
+    def actual_survey_data(self) -> Dict[str, Any]:
+        """The survey itself, unwrapped from final_output when nested"""
+        return self.survey_json.get('final_output', self.survey_json)
+
 
 class GoldenService:
     def __init__(self, db: Session):
@@ -95,21 +143,36 @@ RFQ Text:"""
 
             logger.info(f"🚀 [GoldenService] Calling Replicate API for RFQ generation")
 
-            output = await self.replicate_client.async_run(
-                settings.generation_model,
-                input={
-                    "prompt": prompt,
-                    "temperature": 0.3,  # Lower temperature for more consistent, professional output
-                    "max_tokens": 1500,
-                    "top_p": 0.9
-                }
-            )
+            generation_params = {
+                "temperature": 0.3,  # Lower temperature for more consistent, professional output
+                "max_tokens": 1500,
+                "top_p": 0.9
+            }
 
-            # Extract text from output
-            if isinstance(output, list):
-                generated_rfq = "".join(str(item) for item in output)
-            else:
-                generated_rfq = str(output)
+            async def run_generation() -> str:
+                output = await llm_gateway.call(
+                    lambda: self.replicate_client.async_run(
+                        settings.generation_model,
+                        input={"prompt": prompt, **generation_params}
+                    ),
+                    provider="replicate",
+                    model=settings.generation_model,
+                    estimated_tokens=estimate_tokens(prompt) + generation_params["max_tokens"],
+                    priority=Priority.BACKGROUND,
+                )
+                # Extract text from output
+                if isinstance(output, list):
+                    return "".join(str(item) for item in output)
+                return str(output)
+
+            generated_rfq, cache_hit = await llm_response_cache.get_or_generate(
+                "golden_rfq_generation",
+                build_llm_cache_key(settings.generation_model, prompt, hyperparameters=generation_params),
+                run_generation,
+                validate=lambda output: bool(output.strip())
+            )
+            if cache_hit:
+                logger.info(f"♻️ [GoldenService] Reused cached RFQ for identical survey input")
 
             # Clean up the generated RFQ
             generated_rfq = generated_rfq.strip()
@@ -119,7 +182,7 @@ RFQ Text:"""
                 generated_rfq = generated_rfq[9:].strip()
 
             logger.info(f"✅ [GoldenService] RFQ generated successfully, length: {len(generated_rfq)}")
-            logger.info(f"📝 [GoldenService] Generated RFQ preview: {generated_rfq[:200]}...")
+            logger.info(f"📝 [GoldenService] Generated RFQ preview: {log_text_preview(generated_rfq)}...")
 
             return generated_rfq
 
@@ -150,262 +213,240 @@ We need a comprehensive survey with approximately {len(questions)} questions to
         """
         logger.info(f"🏆 [GoldenService] Starting golden pair creation")
         logger.info(f"📝 [GoldenService] Input data - title: {title}, rfq_text_length: {len(rfq_text) if rfq_text else 0}")
-        logger.info(f"📊 [GoldenService] Survey JSON type: {type(survey_json)}")
         logger.info(f"📊 [GoldenService] Survey JSON keys: {list(survey_json.keys()) if isinstance(survey_json, dict) else 'Not a dict'}")
-        logger.info(f"🏷️ [GoldenService] Methodology tags: {methodology_tags}")
-        logger.info(f"🏭 [GoldenService] Industry category: {industry_category}")
-        logger.info(f"🎯 [GoldenService] Research goal: {research_goal}")
-        logger.info(f"⭐ [GoldenService] Quality score: {quality_score}")
         
-        # Run field extraction if fields are missing
-        if not methodology_tags or not industry_category or not research_goal:
-            logger.info(f"🔍 [GoldenService] Running field extraction for missing metadata")
-            try:
-                from src.services.field_extraction_service import FieldExtractionService
-                field_extractor = FieldExtractionService()
-                
-                # Extract text from survey_json for field extraction
-                survey_text = ""
-                if isinstance(survey_json, dict):
-                    final_output = survey_json.get('final_output', survey_json)
-                    if isinstance(final_output, dict):
-                        # Extract text from questions and sections
-                        questions = final_output.get('questions', [])
-                        for q in questions:
-                            if isinstance(q, dict) and 'text' in q:
-                                survey_text += q['text'] + " "
-                        
-                        sections = final_output.get('sections', [])
-                        for s in sections:
-                            if isinstance(s, dict):
-                                if 'title' in s:
-                                    survey_text += s['title'] + " "
-                                if 'description' in s:
-                                    survey_text += s['description'] + " "
-                
-                if survey_text.strip():
-                    extracted_fields = await field_extractor.extract_fields(survey_text, survey_json)
-                    logger.info(f"✅ [GoldenService] Field extraction completed: {extracted_fields}")
-                    
-                    # Use extracted fields if original fields are missing
-                    if not methodology_tags and extracted_fields.get('methodology_tags'):
-                        methodology_tags = extracted_fields['methodology_tags']
-                        logger.info(f"🏷️ [GoldenService] Using extracted methodology tags: {methodology_tags}")
-                    
-                    if not industry_category and extracted_fields.get('industry_category'):
-                        industry_category = extracted_fields['industry_category']
-                        logger.info(f"🏭 [GoldenService] Using extracted industry category: {industry_category}")
-                    
-                    if not research_goal and extracted_fields.get('research_goal'):
-                        research_goal = extracted_fields['research_goal']
-                        logger.info(f"🎯 [GoldenService] Using extracted research goal: {research_goal}")
-                else:
-                    logger.warning(f"⚠️ [GoldenService] No survey text found for field extraction")
-            except Exception as e:
-                logger.warning(f"⚠️ [GoldenService] Field extraction failed: {e}")
-                # Continue with original values
-
+        golden_pairs = await self.create_golden_pairs([{
+            "rfq_text": rfq_text,
+            "survey_json": survey_json,
+            "title": title,
+            "methodology_tags": methodology_tags,
+            "industry_category": industry_category,
+            "research_goal": research_goal,
+            "quality_score": quality_score,
+            "auto_generate_rfq": auto_generate_rfq,
+        }])
+        return golden_pairs[0]
+    
+    async def create_golden_pairs(self, pairs: List[Dict[str, Any]]) -> List[GoldenRFQSurveyPair]:
+        """
+        Create golden standard pairs as a pipeline
+        
+        Once a pair's RFQ text is known, its embedding, field extraction and golden
+        content extraction run concurrently; embeddings are batched across all pairs.
+        Pairs, reference surveys, golden sections/questions and embedded annotations
+        are written in a single transaction.
+        
+        Args:
+            pairs: create_golden_pair keyword arguments, one dict per pair
+            
+        Returns:
+            The created golden pairs, in input order
+        """
+        if not pairs:
+            return []
+        
+        logger.info(f"🏆 [GoldenService] Creating {len(pairs)} golden pair(s)")
+        drafts = [GoldenPairDraft(**pair) for pair in pairs]
+        semaphore = asyncio.Semaphore(GOLDEN_PAIR_PREPARE_CONCURRENCY)
+        
         try:
-            # Handle RFQ text - generate if requested, or allow empty if auto-generate is enabled
-            if not rfq_text or not rfq_text.strip():
-                if auto_generate_rfq:
-                    logger.info(f"🤖 [GoldenService] RFQ text is missing and auto_generate_rfq is True, generating from survey")
-                    rfq_text = await self.generate_rfq_from_survey(
-                        survey_json=survey_json,
-                        methodology_tags=methodology_tags,
-                        industry_category=industry_category,
-                        research_goal=research_goal
-                    )
-                    logger.info(f"✅ [GoldenService] RFQ generated, length: {len(rfq_text)}")
-                else:
-                    # Allow creating golden examples without RFQ text
-                    logger.info(f"📝 [GoldenService] No RFQ text provided and auto_generate_rfq is False - creating golden example without RFQ")
-                    rfq_text = ""  # Use empty string instead of raising error
-            else:
-                logger.info(f"📝 [GoldenService] Using provided RFQ text")
-
-            logger.info(f"🧠 [GoldenService] Generating embedding for RFQ text")
-            # Generate embedding for RFQ text
-            rfq_embedding = await self.embedding_service.get_embedding(rfq_text)
-            logger.info(f"✅ [GoldenService] Embedding generated successfully, length: {len(rfq_embedding) if rfq_embedding else 0}")
-
-            logger.info(f"💾 [GoldenService] Creating GoldenRFQSurveyPair record")
-            # Create golden pair record with default quality score if not provided
-            final_quality_score = quality_score if quality_score is not None else 1.0
-            logger.info(f"⭐ [GoldenService] Using quality score: {final_quality_score}")
-            
-            # Determine the golden pair title (will be updated later if needed)
-            golden_pair_title = title or "Untitled Golden Pair"
-            
-            # Create the golden pair first to get the ID
-            golden_pair = GoldenRFQSurveyPair(
-                title=golden_pair_title,
-                rfq_text=rfq_text,
-                rfq_embedding=rfq_embedding,
-                survey_json=survey_json,
-                methodology_tags=methodology_tags,
-                industry_category=industry_category,
-                research_goal=research_goal,
-                quality_score=final_quality_score,
-                human_verified=True  # Manually created examples are human-verified
+            # Generated RFQs depend on the extracted metadata, so those pairs extract first
+            await asyncio.gather(*(self._resolve_rfq_text(draft, semaphore) for draft in drafts))
+            
+            logger.info(f"🧠 [GoldenService] Embedding {len(drafts)} RFQ(s) alongside field and content extraction")
+            embeddings, *_ = await asyncio.gather(
+                self.embedding_service.get_embeddings_batch([draft.rfq_text for draft in drafts]),
+                asyncio.to_thread(self._build_golden_content, drafts),
+                *(self._extract_missing_fields(draft, semaphore) for draft in drafts if not draft.fields_resolved)
             )
             
-            logger.info(f"💾 [GoldenService] Adding golden pair to database")
-            self.db.add(golden_pair)
-            
-            # Commit to get the golden_pair.id
+            for draft, embedding in zip(drafts, embeddings):
+                self._finalize_golden_pair(draft, embedding)
+                self.db.add(draft.golden_pair)
+                self.db.add(self._build_reference_survey(draft))
+            
+            # Golden pair rows must exist before the content rows referencing them
+            self.db.flush()
+            for draft in drafts:
+                self.db.add_all(draft.sections + draft.questions + draft.annotations)
+                GoldenSimilarityIndexService.record_golden_change(self.db, draft.golden_pair.id)
+            self.db.flush()
+            annotation_ids = [[annotation.id for annotation in draft.annotations] for draft in drafts]
             self.db.commit()
-            self.db.refresh(golden_pair)
-            
-            # Generate survey_id for the reference example (use actual UUID)
-            survey_id = golden_pair.id  # Use the same UUID as the golden pair
-            logger.info(f"🔍 [GoldenService] Using golden pair ID as survey_id for reference example: {survey_id}")
-            
-            # Add survey_id to the survey_json for consistency
-            if isinstance(survey_json, dict):
-                survey_json["survey_id"] = str(survey_id)  # Convert UUID to string for JSON
-                
-                # Ensure survey JSON has a proper title
-                survey_title = survey_json.get('title', '').strip()
-                golden_title = (title or '').strip()
-                
-                # Determine the best title to use
-                if survey_title:
-                    # Survey JSON already has a title, use it
-                    final_title = survey_title
-                    logger.info(f"📝 [GoldenService] Using existing survey title: {final_title}")
-                elif golden_title:
-                    # Use golden pair title
-                    final_title = golden_title
-                    survey_json["title"] = final_title
-                    logger.info(f"📝 [GoldenService] Using golden pair title: {final_title}")
-                else:
-                    # Generate a meaningful fallback title
-                    industry = industry_category or "General"
-                    methodology = ", ".join(methodology_tags) if methodology_tags else "Survey"
-                    final_title = f"{industry} {methodology} Survey"
-                    survey_json["title"] = final_title
-                    logger.info(f"📝 [GoldenService] Generated fallback title: {final_title}")
-                
-                # Update the golden pair with the modified survey_json and final title
-                golden_pair.survey_json = survey_json
-                golden_pair.title = final_title  # Ensure golden pair title matches survey title
-                self.db.commit()
-            
-            # Create survey record for annotation support
-            logger.info(f"💾 [GoldenService] Creating survey record for reference example")
-            
-            # Extract the actual survey data from the nested structure
-            actual_survey_data = survey_json.get('final_output', survey_json)
-            logger.info(f"🔍 [GoldenService] Using actual survey data from final_output")
-            logger.info(f"  Keys in actual_survey_data: {list(actual_survey_data.keys())}")
-            logger.info(f"  Has 'questions': {'questions' in actual_survey_data}")
-            if 'questions' in actual_survey_data:
-                questions = actual_survey_data.get('questions', [])
-                logger.info(f"  Number of questions: {len(questions)}")
-                if questions:
-                    logger.info(f"  First question preview: {str(questions[0])[:200]}")
-            
-            reference_survey = Survey(
-                id=survey_id,  # Use the same UUID as golden pair
-                rfq_id=None,  # Reference examples don't have RFQ
-                status="reference",  # Special status for reference examples
-                raw_output=actual_survey_data,
-                final_output=actual_survey_data,
-                created_at=datetime.now()
+        except Exception as e:
+            logger.error(f"❌ [GoldenService] Failed to create golden pair: {str(e)}", exc_info=True)
+            logger.error(f"❌ [GoldenService] Rolling back transaction")
+            self.db.rollback()
+            raise Exception(f"Failed to create golden pair: {str(e)}")
+        
+        for draft, ids in zip(drafts, annotation_ids):
+            logger.info(
+                f"✅ [GoldenService] Golden pair {draft.golden_pair.id} created: {len(draft.sections)} sections, "
+                f"{len(draft.questions)} questions, {len(ids)} annotations"
             )
-            
-            self.db.add(reference_survey)
-            self.db.commit()
-            self.db.refresh(reference_survey)
-            
-            # Diagnostic logging - check what was saved to the Survey record
-            logger.info(f"🔍 [GoldenService] Diagnostic - Survey record after commit:")
-            logger.info(f"  Survey ID: {reference_survey.id}")
-            logger.info(f"  Survey status: {reference_survey.status}")
-            logger.info(f"  Has final_output: {reference_survey.final_output is not None}")
-            if reference_survey.final_output:
-                logger.info(f"  Keys in final_output: {list(reference_survey.final_output.keys())}")
-                logger.info(f"  Has 'questions' in final_output: {'questions' in reference_survey.final_output}")
-                if 'questions' in reference_survey.final_output:
-                    logger.info(f"  Questions in final_output: {len(reference_survey.final_output.get('questions', []))}")
-            
-            logger.info(f"✅ [GoldenService] Golden pair created successfully with ID: {golden_pair.id}")
-            logger.info(f"✅ [GoldenService] Survey record created with ID: {survey_id}")
-            logger.info(f"📋 [GoldenService] Created pair details - title: {golden_pair.title}, quality_score: {golden_pair.quality_score}")
-            
-            # Automatically populate multi-level RAG for this golden pair
-            logger.info(f"🔍 [GoldenService] Populating multi-level RAG for golden pair {golden_pair.id}")
+            if ids:
+                await self._sync_annotations_to_rag(draft.golden_pair.id, ids)
+        
+        return [draft.golden_pair for draft in drafts]
+    
+    async def _resolve_rfq_text(self, draft: "GoldenPairDraft", semaphore: asyncio.Semaphore) -> None:
+        """Generate the RFQ text when requested (after field extraction), else default to the given text"""
+        if draft.rfq_text and draft.rfq_text.strip():
+            return
+        
+        if not draft.auto_generate_rfq:
+            # Allow creating golden examples without RFQ text
+            logger.info(f"📝 [GoldenService] No RFQ text provided and auto_generate_rfq is False - creating golden example without RFQ")
+            draft.rfq_text = ""
+            return
+        
+        await self._extract_missing_fields(draft, semaphore)
+        async with semaphore:
+            logger.info(f"🤖 [GoldenService] RFQ text is missing and auto_generate_rfq is True, generating from survey")
+            draft.rfq_text = await self.generate_rfq_from_survey(
+                survey_json=draft.survey_json,
+                methodology_tags=draft.methodology_tags,
+                industry_category=draft.industry_category,
+                research_goal=draft.research_goal
+            )
+        logger.info(f"✅ [GoldenService] RFQ generated, length: {len(draft.rfq_text)}")
+    
+    async def _extract_missing_fields(self, draft: "GoldenPairDraft", semaphore: asyncio.Semaphore) -> None:
+        """Fill missing methodology tags, industry and research goal via field extraction (non-critical)"""
+        draft.fields_resolved = True
+        if draft.methodology_tags and draft.industry_category and draft.research_goal:
+            return
+        
+        survey_text = self._survey_text_for_field_extraction(draft.survey_json)
+        if not survey_text:
+            logger.warning(f"⚠️ [GoldenService] No survey text found for field extraction")
+            return
+        
+        logger.info(f"🔍 [GoldenService] Running field extraction for missing metadata")
+        try:
+            from src.services.field_extraction_service import FieldExtractionService
+            async with semaphore:
+                extracted_fields = await FieldExtractionService().extract_fields(survey_text, draft.survey_json)
+            logger.info(f"✅ [GoldenService] Field extraction completed: {extracted_fields}")
+        except Exception as e:
+            logger.warning(f"⚠️ [GoldenService] Field extraction failed: {e}")
+            return
+        
+        # Use extracted fields if original fields are missing
+        if not draft.methodology_tags and extracted_fields.get('methodology_tags'):
+            draft.methodology_tags = extracted_fields['methodology_tags']
+        if not draft.industry_category and extracted_fields.get('industry_category'):
+            draft.industry_category = extracted_fields['industry_category']
+        if not draft.research_goal and extracted_fields.get('research_goal'):
+            draft.research_goal = extracted_fields['research_goal']
+    
+    def _survey_text_for_field_extraction(self, survey_json: Dict[str, Any]) -> str:
+        """Question texts plus section titles/descriptions used as field extraction input"""
+        survey_text = ""
+        if isinstance(survey_json, dict):
+            final_output = survey_json.get('final_output', survey_json)
+            if isinstance(final_output, dict):
+                # Extract text from questions and sections
+                for q in final_output.get('questions', []):
+                    if isinstance(q, dict) and 'text' in q:
+                        survey_text += q['text'] + " "
+                
+                for s in final_output.get('sections', []):
+                    if isinstance(s, dict):
+                        if 'title' in s:
+                            survey_text += s['title'] + " "
+                        if 'description' in s:
+                            survey_text += s['description'] + " "
+        return survey_text.strip()
+    
+    def _build_golden_content(self, drafts: List["GoldenPairDraft"]) -> None:
+        """Build multi-level RAG rows and embedded annotations for each draft (CPU only, no database access)"""
+        from src.services.document_parser import document_parser
+        populator = RuleBasedRAGPopulator(self.db)
+        
+        for draft in drafts:
+            golden_pair = draft.golden_pair
             try:
-                populator = RuleBasedRAGPopulator(self.db)
-                sections_created = await populator._extract_sections(golden_pair, dry_run=False)
-                questions_created = await populator._extract_questions(golden_pair, dry_run=False)
-                self.db.commit()
-                logger.info(f"✅ [GoldenService] Multi-level RAG populated: {sections_created} sections, {questions_created} questions")
+                # Duplicate ids would violate the unique (survey_id, section/question_id) indexes
+                # and abort the whole transaction, so keep the first row per id
+                draft.sections = _first_per_key(populator.build_golden_sections(golden_pair), lambda row: str(row.section_id))
+                draft.questions = _first_per_key(populator.build_golden_questions(golden_pair), lambda row: str(row.question_id))
             except Exception as e:
-                logger.warning(f"⚠️ [GoldenService] Multi-level RAG population failed (non-critical): {str(e)}")
-                # Don't fail golden pair creation if RAG population fails
+                logger.warning(f"⚠️ [GoldenService] Multi-level RAG extraction failed (non-critical): {str(e)}")
+                draft.sections, draft.questions = [], []
             
-            # Extract annotations from embedded annotation fields in questions
             try:
-                logger.info(f"💬 [GoldenService] Extracting annotations from questions")
-                
-                # Get questions from the survey data
-                questions = []
-                if 'questions' in actual_survey_data:
-                    questions = actual_survey_data['questions']
-                elif 'sections' in actual_survey_data:
-                    for section in actual_survey_data['sections']:
-                        if 'questions' in section:
-                            questions.extend(section['questions'])
-                
-                if questions:
-                    # Use DocumentParser's method to extract annotations
-                    from src.services.document_parser import DocumentParser
-                    parser = DocumentParser(self.db)
-                    annotations_created = parser.create_question_annotations_from_comments(
-                        survey_id=str(survey_id),
-                        questions=questions,
-                        comments=[]  # Empty since annotations are embedded in questions
-                    )
-                    logger.info(f"✅ [GoldenService] Created {annotations_created} annotations from embedded data")
-                    
-                    # Sync annotations to RAG if any were created
-                    if annotations_created and annotations_created > 0:
-                        logger.info(f"🔗 [GoldenService] Syncing {annotations_created} annotations to RAG")
-                        try:
-                            from src.services.annotation_rag_sync_service import AnnotationRAGSyncService
-                            from src.database.models import QuestionAnnotation
-                            
-                            sync_service = AnnotationRAGSyncService(self.db)
-                            
-                            # Get all annotations we just created
-                            recent_annotations = self.db.query(QuestionAnnotation).filter(
-                                QuestionAnnotation.survey_id == str(survey_id)
-                            ).all()
-                            
-                            sync_count = 0
-                            for annotation in recent_annotations:
-                                result = await sync_service.sync_question_annotation(annotation.id)
-                                if result.get("success"):
-                                    sync_count += 1
-                            
-                            logger.info(f"🎉 [GoldenService] Synced {sync_count}/{len(recent_annotations)} annotations to RAG")
-                        except Exception as e:
-                            logger.warning(f"⚠️ [GoldenService] Failed to sync annotations to RAG (non-critical): {str(e)}")
-                else:
-                    logger.info(f"ℹ️ [GoldenService] No questions found for annotation extraction")
-                    
+                questions = extract_all_questions(draft.actual_survey_data)
+                # Same for idx_question_annotations_unique (question_id, annotator_id, survey_id): repeated
+                # question ids, or a q_{n} fallback id matching a real one, would fail the whole batch
+                draft.annotations = _first_per_key(
+                    document_parser.build_question_annotations(str(golden_pair.id), questions),
+                    lambda row: f"{row.question_id}\x00{row.annotator_id}"
+                )
             except Exception as e:
                 logger.warning(f"⚠️ [GoldenService] Failed to extract annotations (non-critical): {str(e)}")
+                draft.annotations = []
+    
+    def _finalize_golden_pair(self, draft: "GoldenPairDraft", rfq_embedding: List[float]) -> None:
+        """Fill the golden pair row and give the survey JSON its survey_id and final title"""
+        golden_pair = draft.golden_pair
+        survey_json = draft.survey_json
+        final_title = draft.title or "Untitled Golden Pair"
+        
+        if isinstance(survey_json, dict):
+            survey_json["survey_id"] = str(golden_pair.id)  # Convert UUID to string for JSON
+            
+            survey_title = survey_json.get('title', '').strip()
+            golden_title = (draft.title or '').strip()
+            
+            # Determine the best title to use
+            if survey_title:
+                final_title = survey_title
+            elif golden_title:
+                final_title = golden_title
+                survey_json["title"] = final_title
+            else:
+                # Generate a meaningful fallback title
+                industry = draft.industry_category or "General"
+                methodology = ", ".join(draft.methodology_tags) if draft.methodology_tags else "Survey"
+                final_title = f"{industry} {methodology} Survey"
+                survey_json["title"] = final_title
+        
+        golden_pair.title = final_title
+        golden_pair.rfq_text = draft.rfq_text
+        golden_pair.rfq_embedding = rfq_embedding
+        golden_pair.survey_json = survey_json
+        golden_pair.methodology_tags = draft.methodology_tags
+        golden_pair.industry_category = draft.industry_category
+        golden_pair.research_goal = draft.research_goal
+        golden_pair.quality_score = draft.quality_score if draft.quality_score is not None else 1.0
+        golden_pair.human_verified = True  # Manually created examples are human-verified
+    
+    def _build_reference_survey(self, draft: "GoldenPairDraft") -> Survey:
+        """Survey record (same UUID as the golden pair) that gives reference examples annotation support"""
+        return Survey(
+            id=draft.golden_pair.id,
+            rfq_id=None,  # Reference examples don't have RFQ
+            status="reference",  # Special status for reference examples
+            raw_output=draft.actual_survey_data,
+            final_output=draft.actual_survey_data,
+            created_at=datetime.now()
+        )
+    
+    async def _sync_annotations_to_rag(self, survey_id: UUID, annotation_ids: List[int]) -> None:
+        """Sync annotations created with a golden pair to the RAG tables (non-critical)"""
+        logger.info(f"🔗 [GoldenService] Syncing {len(annotation_ids)} annotations to RAG")
+        try:
+            from src.services.annotation_rag_sync_service import AnnotationRAGSyncService
             
-            return golden_pair
-            
+            result = await AnnotationRAGSyncService(self.db).sync_annotations_batch(
+                str(survey_id),
+                question_annotation_ids=annotation_ids
+            )
+            sync_count = result.get("questions_synced", 0)
+            logger.info(f"🎉 [GoldenService] Synced {sync_count}/{len(annotation_ids)} annotations to RAG")
         except Exception as e:
-            logger.error(f"❌ [GoldenService] Failed to create golden pair: {str(e)}", exc_info=True)
-            logger.error(f"❌ [GoldenService] Rolling back transaction")
-            self.db.rollback()
-            raise Exception(f"Failed to create golden pair: {str(e)}")
+            logger.warning(f"⚠️ [GoldenService] Failed to sync annotations to RAG (non-critical): {str(e)}")
     
     def sync_survey_to_golden_pair(self, golden_pair_id: UUID, survey_data: Dict[str, Any]):
         """Sync Survey changes back to GoldenRFQSurveyPair.survey_json"""
@@ -425,6 +466,9 @@ We need a comprehensive survey with approximately {len(questions)} questions to
             # Direct structure
             golden_pair.survey_json = survey_data
         
+        # Re-embedded on the next similarity index refresh
+        golden_pair.survey_embedding = None
+        GoldenSimilarityIndexService.record_golden_change(self.db, golden_pair_id)
         self.db.commit()
         logger.info(f"✅ Synced survey data to golden pair {golden_pair_id}")
     
@@ -481,6 +525,7 @@ We need a comprehensive survey with approximately {len(questions)} questions to
             # Update fields
             golden_pair.rfq_text = rfq_text
             golden_pair.survey_json = survey_json
+            golden_pair.survey_embedding = None  # Re-embedded on the next similarity index refresh
             golden_pair.methodology_tags = methodology_tags or []
             golden_pair.industry_category = industry_category or "General"
             golden_pair.research_goal = research_goal or "Market Research"
@@ -516,6 +561,7 @@ We need a comprehensive survey with approximately {len(questions)} questions to
                 self.db.add(reference_survey)
                 logger.info(f"✅ Created new survey record for golden pair {survey_id}")
             
+            GoldenSimilarityIndexService.record_golden_change(self.db, golden_id)
             self.db.commit()
             self.db.refresh(golden_pair)
             
@@ -567,6 +613,7 @@ We need a comprehensive survey with approximately {len(questions)} questions to
             
             # Delete the golden pair record (this also removes the vector from pgvector)
             self.db.delete(golden_pair)
+            GoldenSimilarityIndexService.record_golden_change(self.db, golden_id, "delete")
             self.db.commit()
             
             logger.info(f"✅ [GoldenService] Successfully deleted golden pair {golden_id} and its vector embedding")
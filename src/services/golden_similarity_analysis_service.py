@@ -10,6 +10,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from src.services.embedding_service import EmbeddingService
 from src.services.validation_service import ValidationService
+from src.utils.survey_utils import survey_to_text
 from difflib import SequenceMatcher
 
 logger = logging.getLogger(__name__)
@@ -27,7 +28,8 @@ class GoldenSimilarityAnalysisService:
         self,
         survey: Dict[str, Any],
         golden_examples: List[Dict[str, Any]],
-        rfq_context: Optional[Dict[str, Any]] = None
+        rfq_context: Optional[Dict[str, Any]] = None,
+        survey_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Main analysis orchestrator - returns comprehensive similarity analysis
@@ -36,6 +38,7 @@ class GoldenSimilarityAnalysisService:
             survey: Generated survey JSON
             golden_examples: List of golden examples used during generation
             rfq_context: Optional RFQ context (industry, methodologies, etc.)
+            survey_id: ID of the stored survey, to reuse its stored embedding and cached top golden matches
             
         Returns:
             Comprehensive similarity analysis with best matches and breakdowns
@@ -52,7 +55,7 @@ class GoldenSimilarityAnalysisService:
             methodologies = rfq_context.get('methodology_tags', []) if rfq_context else []
             
             # Calculate individual similarities
-            individual_similarities = await self.calculate_individual_similarities(survey, golden_examples)
+            individual_similarities = await self.calculate_individual_similarities(survey, golden_examples, survey_id)
             
             # Calculate average similarity
             overall_average = sum(s['similarity'] for s in individual_similarities) / len(individual_similarities) if individual_similarities else 0.0
@@ -76,7 +79,8 @@ class GoldenSimilarityAnalysisService:
                 "individual_similarities": individual_similarities,
                 "methodology_alignment": methodology_alignment,
                 "industry_alignment": industry_alignment,
-                "total_golden_examples_analyzed": len(individual_similarities)
+                "total_golden_examples_analyzed": len(individual_similarities),
+                "top_golden_matches": self._cached_top_matches(survey_id)
             }
             
             logger.info(f"✅ [GoldenSimilarityAnalysis] Analysis complete: avg={overall_average:.3f}, best={best_match.get('similarity', 0):.3f}")
@@ -89,7 +93,8 @@ class GoldenSimilarityAnalysisService:
     async def calculate_individual_similarities(
         self,
         survey: Dict[str, Any],
-        golden_examples: List[Dict[str, Any]]
+        golden_examples: List[Dict[str, Any]],
+        survey_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Calculate similarity score for each golden example
@@ -97,6 +102,7 @@ class GoldenSimilarityAnalysisService:
         Args:
             survey: Generated survey JSON
             golden_examples: List of golden examples
+            survey_id: ID of the stored survey, to reuse its stored embedding when current
             
         Returns:
             List of individual similarity scores with metadata
@@ -104,9 +110,12 @@ class GoldenSimilarityAnalysisService:
         similarities = []
         
         try:
-            # Generate embedding for the generated survey
-            survey_text = self._survey_to_text(survey)
-            survey_embedding = await self.embedding_service.get_embedding(survey_text)
+            # Reuse the stored survey embedding, else generate one
+            survey_embedding = self._stored_survey_embedding(survey_id)
+            if survey_embedding is None:
+                survey_text = self._survey_to_text(survey)
+                survey_embedding = await self.embedding_service.get_embedding(survey_text)
+            stored_embeddings = self._stored_golden_embeddings(golden_examples)
             
             for example in golden_examples:
                 try:
@@ -116,10 +125,12 @@ class GoldenSimilarityAnalysisService:
                     methodology_tags = example.get("methodology_tags", [])
                     industry_category = example.get("industry_category")
                     
-                    # Generate embedding for golden survey
-                    golden_survey = example.get("survey_json", {})
-                    golden_text = self._survey_to_text(golden_survey)
-                    golden_embedding = await self.embedding_service.get_embedding(golden_text)
+                    # Reuse the stored golden survey embedding, else generate one
+                    golden_embedding = stored_embeddings.get(str(golden_id))
+                    if golden_embedding is None:
+                        golden_survey = example.get("survey_json", {})
+                        golden_text = self._survey_to_text(golden_survey)
+                        golden_embedding = await self.embedding_service.get_embedding(golden_text)
                     
                     # Calculate cosine similarity
                     similarity = self._cosine_similarity(survey_embedding, golden_embedding)
@@ -147,6 +158,50 @@ class GoldenSimilarityAnalysisService:
             logger.error(f"❌ [GoldenSimilarityAnalysis] Failed to calculate individual similarities: {str(e)}")
             return []
 
+    def _similarity_index(self):
+        from src.services.golden_similarity_index_service import GoldenSimilarityIndexService
+        return GoldenSimilarityIndexService(self.db_session, embedding_service=self.embedding_service)
+
+    def _stored_survey_embedding(self, survey_id: Optional[str]) -> Optional[List[float]]:
+        """Persisted embedding of the survey, if it was computed from its current final_output"""
+        if not self.db_session or not survey_id:
+            return None
+        try:
+            return self._similarity_index().get_survey_embedding(survey_id)
+        except Exception as e:
+            logger.warning(f"⚠️ [GoldenSimilarityAnalysis] Failed to load stored survey embedding: {e}")
+            return None
+
+    def _cached_top_matches(self, survey_id: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """Survey's cached top-k golden matches across the whole golden set, if current"""
+        if not self.db_session or not survey_id:
+            return None
+        try:
+            cached = self._similarity_index().get_top_matches(survey_id)
+        except Exception as e:
+            logger.warning(f"⚠️ [GoldenSimilarityAnalysis] Failed to load cached top golden matches: {e}")
+            return None
+        return cached["matches"] if cached and cached["is_current"] else None
+
+    def _stored_golden_embeddings(self, golden_examples: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Load the persisted survey embeddings of the given golden examples, keyed by golden ID"""
+        golden_ids = [example.get("id") for example in golden_examples if example.get("id")]
+        if not self.db_session or not golden_ids:
+            return {}
+        
+        from src.database.models import GoldenRFQSurveyPair
+        try:
+            rows = self.db_session.query(
+                GoldenRFQSurveyPair.id, GoldenRFQSurveyPair.survey_embedding
+            ).filter(
+                GoldenRFQSurveyPair.id.in_(golden_ids),
+                GoldenRFQSurveyPair.survey_embedding.isnot(None)
+            ).all()
+            return {str(row.id): row.survey_embedding for row in rows}
+        except Exception as e:
+            logger.warning(f"⚠️ [GoldenSimilarityAnalysis] Failed to load stored golden embeddings: {e}")
+            return {}
+
     def find_best_industry_match(
         self,
         individual_similarities: List[Dict[str, Any]],
@@ -436,36 +491,7 @@ class GoldenSimilarityAnalysisService:
     def _survey_to_text(self, survey: Dict[str, Any]) -> str:
         """Convert survey JSON to text for comparison"""
         try:
-            text_parts = []
-            
-            # Add title
-            if "title" in survey:
-                text_parts.append(f"Title: {survey['title']}")
-            
-            # Add description
-            if "description" in survey:
-                text_parts.append(f"Description: {survey['description']}")
-            
-            # Handle sections format
-            if "sections" in survey and isinstance(survey["sections"], list):
-                for section in survey["sections"]:
-                    if isinstance(section, dict):
-                        section_title = section.get("title", "")
-                        text_parts.append(f"Section: {section_title}")
-                        
-                        if "questions" in section and isinstance(section["questions"], list):
-                            for question in section["questions"]:
-                                if isinstance(question, dict) and "text" in question:
-                                    text_parts.append(f"Q: {question['text']}")
-            
-            # Handle legacy questions format
-            elif "questions" in survey and isinstance(survey["questions"], list):
-                for question in survey["questions"]:
-                    if isinstance(question, dict) and "text" in question:
-                        text_parts.append(f"Q: {question['text']}")
-            
-            return " ".join(text_parts)
-            
+            return survey_to_text(survey)
         except Exception as e:
             logger.warning(f"Failed to convert survey to text: {e}")
             return ""
@@ -503,6 +529,7 @@ class GoldenSimilarityAnalysisService:
             "individual_similarities": [],
             "methodology_alignment": {"score": 0.0, "methodology_details": []},
             "industry_alignment": {"score": 0.0, "industry": "unknown"},
-            "total_golden_examples_analyzed": 0
+            "total_golden_examples_analyzed": 0,
+            "top_golden_matches": None
         }
 
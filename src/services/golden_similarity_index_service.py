@@ -0,0 +1,385 @@
+"""
+Golden Similarity Index Service
+
+Keeps each survey's top-k most similar golden pairs up to date incrementally.
+Survey and golden survey embeddings are stored once, golden pair changes are
+logged as golden-set versions, and a refresh only scores the golden pairs that
+changed since a survey's cached version, as one matrix product per batch.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import Text, cast, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.database.models import (
+    GoldenRFQSurveyPair,
+    GoldenSetChange,
+    Survey,
+    SurveyEmbedding,
+    SurveyGoldenTopMatches,
+)
+from src.utils.survey_utils import survey_to_text
+
+logger = logging.getLogger(__name__)
+
+# Golden matches cached per survey
+GOLDEN_SIMILARITY_TOP_K = 10
+
+# Texts embedded per embedding call, and cached rows written per upsert statement
+EMBEDDING_BATCH_SIZE = 64
+TOP_MATCHES_UPSERT_BATCH_SIZE = 500
+
+
+def survey_content_hash():
+    """SQL expression hashing a survey's final_output, to tell whether a stored embedding is current"""
+    return func.md5(cast(Survey.final_output, Text))
+
+
+def normalize_rows(vectors: Sequence[Any]) -> np.ndarray:
+    """Stack vectors into a float32 matrix with unit-length rows (zero rows stay zero)"""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def top_matches(similarities: np.ndarray, golden_ids: Sequence[str], k: int) -> List[List[Dict[str, Any]]]:
+    """
+    Select the k most similar golden pairs for every row of a similarity matrix
+
+    Args:
+        similarities: surveys x goldens cosine similarity matrix
+        golden_ids: Golden pair IDs, one per column
+        k: Matches to keep per survey
+
+    Returns:
+        One match list per row, highest similarity first
+    """
+    if similarities.shape[1] == 0:
+        return [[] for _ in range(similarities.shape[0])]
+
+    k = min(k, similarities.shape[1])
+    candidates = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    results = []
+    for row, columns in zip(similarities, candidates):
+        columns = columns[np.argsort(-row[columns], kind="stable")]
+        results.append([
+            {"golden_id": golden_ids[column], "similarity": round(float(row[column]), 4)}
+            for column in columns
+        ])
+    return results
+
+
+def merge_top_matches(
+    matches: List[Dict[str, Any]],
+    touched_ids: Set[str],
+    new_scores: Dict[str, float],
+    k: int
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Apply changed golden pairs to a cached top-k list
+
+    Entries for touched golden pairs are replaced by their new scores (or dropped
+    when the pair is gone). Pairs outside a full list scored at most its lowest
+    similarity, so the merge is exact unless the merged list falls below that.
+
+    Args:
+        matches: Cached matches, highest similarity first
+        touched_ids: Golden pair IDs added, edited or deleted since the cache was built
+        new_scores: Similarity to each touched golden pair that still exists
+        k: Matches to keep per survey
+
+    Returns:
+        The updated matches, or None when the survey must be scored against every golden pair
+    """
+    if len(matches) >= k and all(score < matches[-1]["similarity"] for score in new_scores.values()) \
+            and not any(match["golden_id"] in touched_ids for match in matches):
+        return matches  # No changed pair enters or leaves the list
+
+    merged = [match for match in matches if match["golden_id"] not in touched_ids]
+    merged.extend(
+        {"golden_id": golden_id, "similarity": round(float(score), 4)}
+        for golden_id, score in new_scores.items()
+    )
+    merged.sort(key=lambda match: match["similarity"], reverse=True)
+    merged = merged[:k]
+
+    if len(matches) >= k and (len(merged) < k or merged[-1]["similarity"] < matches[-1]["similarity"]):
+        return None
+    return merged
+
+
+class GoldenSimilarityIndexService:
+    """Service maintaining persisted embeddings and cached top-k golden matches per survey"""
+
+    def __init__(self, db_session: Session, top_k: int = GOLDEN_SIMILARITY_TOP_K, embedding_service: Any = None):
+        if embedding_service is None:
+            from src.services.embedding_service import EmbeddingService
+            embedding_service = EmbeddingService()
+
+        self.db = db_session
+        self.top_k = top_k
+        self.embedding_service = embedding_service
+
+    @staticmethod
+    def record_golden_change(db_session: Session, golden_pair_id: Any, change_type: str = "upsert") -> None:
+        """
+        Log a golden pair change, advancing the golden-set version
+
+        Added to the caller's session so the change commits with the golden pair itself.
+
+        Args:
+            db_session: Session holding the golden pair change
+            golden_pair_id: ID of the added, edited or deleted golden pair
+            change_type: 'upsert' or 'delete'
+        """
+        db_session.add(GoldenSetChange(golden_pair_id=golden_pair_id, change_type=change_type))
+
+    def current_version(self) -> int:
+        """Highest logged golden-set version (0 before any change)"""
+        return self.db.query(func.coalesce(func.max(GoldenSetChange.version), 0)).scalar() or 0
+
+    def get_survey_embedding(self, survey_id: Any) -> Optional[List[float]]:
+        """Stored embedding of a survey, or None when missing or computed from an older final_output"""
+        row = (
+            self.db.query(SurveyEmbedding.embedding)
+            .join(Survey, Survey.id == SurveyEmbedding.survey_id)
+            .filter(SurveyEmbedding.survey_id == survey_id, SurveyEmbedding.content_hash == survey_content_hash())
+            .first()
+        )
+        return None if row is None else row.embedding
+
+    def get_top_matches(self, survey_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Cached top-k golden matches for a survey
+
+        Returns:
+            The matches, the golden-set version they reflect and whether they are current
+            (no golden pair changed since and the survey was not edited), or None if not cached
+        """
+        row = (
+            self.db.query(
+                SurveyGoldenTopMatches.golden_set_version,
+                SurveyGoldenTopMatches.matches,
+                (SurveyEmbedding.content_hash == survey_content_hash()).label("survey_unchanged"),
+            )
+            .join(SurveyEmbedding, SurveyEmbedding.survey_id == SurveyGoldenTopMatches.survey_id)
+            .join(Survey, Survey.id == SurveyGoldenTopMatches.survey_id)
+            .filter(SurveyGoldenTopMatches.survey_id == survey_id)
+            .first()
+        )
+        if not row:
+            return None
+        return {
+            "golden_set_version": row.golden_set_version,
+            "is_current": bool(row.survey_unchanged) and row.golden_set_version >= self.current_version(),
+            "matches": row.matches,
+        }
+
+    async def refresh(self) -> Dict[str, int]:
+        """
+        Bring every survey's cached top-k golden matches up to the current golden-set version
+
+        Missing golden and survey embeddings are generated first. Surveys with a cached
+        list are scored only against the golden pairs changed since its version; new
+        surveys, and lists a change pushed below their k-th match, are scored against
+        all golden pairs.
+
+        Returns:
+            Counts of embedded goldens/surveys and incrementally/fully refreshed surveys
+        """
+        # Read first: every pair changed up to this version is embedded below
+        version = self.current_version()
+        golden_embedded = await self.embed_golden_pairs()
+        surveys_embedded = await self.embed_surveys()
+
+        stale = (
+            self.db.query(SurveyEmbedding.survey_id, SurveyEmbedding.embedding,
+                          SurveyGoldenTopMatches.golden_set_version, SurveyGoldenTopMatches.matches)
+            .outerjoin(SurveyGoldenTopMatches, SurveyGoldenTopMatches.survey_id == SurveyEmbedding.survey_id)
+            .filter(
+                (SurveyGoldenTopMatches.golden_set_version.is_(None))
+                | (SurveyGoldenTopMatches.golden_set_version < version)
+            )
+            .all()
+        )
+        stats = {
+            "golden_pairs_embedded": golden_embedded,
+            "surveys_embedded": surveys_embedded,
+            "incremental": 0,
+            "full": 0,
+        }
+        if not stale:
+            logger.info(f"✅ [GoldenSimilarityIndex] All surveys current at golden-set version {version}")
+            return stats
+
+        golden_ids, golden_matrix = self._golden_matrix()
+        golden_columns = {golden_id: column for column, golden_id in enumerate(golden_ids)}
+        updated: Dict[Any, List[Dict[str, Any]]] = {}
+        needs_full = [row for row in stale if row.golden_set_version is None]
+
+        cached = [row for row in stale if row.golden_set_version is not None]
+        for since, rows in self._group_by_version(cached):
+            touched_ids = self._changed_golden_ids(since, version)
+            columns = [golden_columns[golden_id] for golden_id in touched_ids if golden_id in golden_columns]
+            similarities = self._similarities(rows, golden_matrix[columns])
+            for row, scores in zip(rows, similarities):
+                new_scores = {golden_ids[column]: score for column, score in zip(columns, scores)}
+                merged = merge_top_matches(row.matches or [], touched_ids, new_scores, self.top_k)
+                if merged is None:
+                    needs_full.append(row)
+                else:
+                    updated[row.survey_id] = merged
+        stats["incremental"] = len(updated)
+
+        if needs_full:
+            similarities = self._similarities(needs_full, golden_matrix)
+            for row, matches in zip(needs_full, top_matches(similarities, golden_ids, self.top_k)):
+                updated[row.survey_id] = matches
+            stats["full"] = len(needs_full)
+
+        self._store_top_matches(updated, version)
+        self.db.commit()
+        logger.info(
+            f"✅ [GoldenSimilarityIndex] Refreshed {len(updated)} surveys to golden-set version {version} "
+            f"({stats['incremental']} incremental, {stats['full']} full)"
+        )
+        return stats
+
+    async def embed_golden_pairs(self) -> int:
+        """Embed golden surveys that have no stored embedding yet (new or edited pairs)"""
+        pairs = self.db.query(GoldenRFQSurveyPair).filter(
+            GoldenRFQSurveyPair.survey_embedding.is_(None)
+        ).all()
+        for batch in self._batches(pairs):
+            embeddings = await self.embedding_service.get_embeddings_batch([
+                survey_to_text(self._golden_survey(pair.survey_json)) for pair in batch
+            ])
+            for pair, embedding in zip(batch, embeddings):
+                pair.survey_embedding = embedding
+            self.db.commit()
+
+        if pairs:
+            logger.info(f"🧠 [GoldenSimilarityIndex] Embedded {len(pairs)} golden surveys")
+        return len(pairs)
+
+    async def embed_surveys(self) -> int:
+        """
+        Embed generated surveys with no stored embedding, or whose final_output changed since
+
+        Cached matches of re-embedded surveys are dropped so the refresh rebuilds them in full.
+        """
+        content_hash = survey_content_hash()
+        surveys = (
+            self.db.query(Survey.id, Survey.final_output, content_hash.label("content_hash"),
+                          SurveyEmbedding.survey_id.label("embedded_id"))
+            .outerjoin(SurveyEmbedding, SurveyEmbedding.survey_id == Survey.id)
+            .filter(
+                SurveyEmbedding.content_hash.is_distinct_from(content_hash),  # Also true when not embedded
+                Survey.final_output.isnot(None),
+                Survey.status != "reference"  # Golden pairs' own survey copies
+            )
+            .all()
+        )
+        for batch in self._batches(surveys):
+            embeddings = await self.embedding_service.get_embeddings_batch([
+                survey_to_text(survey.final_output) for survey in batch
+            ])
+            statement = pg_insert(SurveyEmbedding).values([
+                {"survey_id": survey.id, "embedding": embedding, "content_hash": survey.content_hash}
+                for survey, embedding in zip(batch, embeddings)
+            ])
+            self.db.execute(statement.on_conflict_do_update(
+                index_elements=[SurveyEmbedding.survey_id],
+                set_={
+                    "embedding": statement.excluded.embedding,
+                    "content_hash": statement.excluded.content_hash,
+                    "created_at": func.now(),
+                },
+            ))
+            edited_ids = [survey.id for survey in batch if survey.embedded_id is not None]
+            if edited_ids:
+                self.db.query(SurveyGoldenTopMatches).filter(
+                    SurveyGoldenTopMatches.survey_id.in_(edited_ids)
+                ).delete(synchronize_session=False)
+            self.db.commit()
+
+        if surveys:
+            logger.info(f"🧠 [GoldenSimilarityIndex] Embedded {len(surveys)} new or edited surveys")
+        return len(surveys)
+
+    def _golden_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """IDs and unit-length survey embedding matrix of every embedded golden pair"""
+        rows = self.db.query(GoldenRFQSurveyPair.id, GoldenRFQSurveyPair.survey_embedding).filter(
+            GoldenRFQSurveyPair.survey_embedding.isnot(None)
+        ).all()
+        if not rows:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        return [str(row.id) for row in rows], normalize_rows([row.survey_embedding for row in rows])
+
+    @staticmethod
+    def _similarities(rows: List[Any], golden_matrix: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each survey row's embedding to each golden matrix row"""
+        if golden_matrix.shape[0] == 0:
+            return np.zeros((len(rows), 0), dtype=np.float32)
+        return normalize_rows([row.embedding for row in rows]) @ golden_matrix.T
+
+    def _changed_golden_ids(self, since: int, until: int) -> Set[str]:
+        """IDs of golden pairs changed after version ``since`` up to ``until``"""
+        rows = self.db.query(GoldenSetChange.golden_pair_id).filter(
+            GoldenSetChange.version > since,
+            GoldenSetChange.version <= until
+        ).distinct().all()
+        return {str(row.golden_pair_id) for row in rows}
+
+    def _store_top_matches(self, updated: Dict[Any, List[Dict[str, Any]]], version: int) -> None:
+        rows = [
+            {"survey_id": survey_id, "golden_set_version": version, "matches": matches}
+            for survey_id, matches in updated.items()
+        ]
+        for start in range(0, len(rows), TOP_MATCHES_UPSERT_BATCH_SIZE):
+            statement = pg_insert(SurveyGoldenTopMatches).values(rows[start:start + TOP_MATCHES_UPSERT_BATCH_SIZE])
+            statement = statement.on_conflict_do_update(
+                index_elements=[SurveyGoldenTopMatches.survey_id],
+                set_={
+                    "golden_set_version": statement.excluded.golden_set_version,
+                    "matches": statement.excluded.matches,
+                    "updated_at": func.now(),
+                },
+            )
+            self.db.execute(statement)
+
+    @staticmethod
+    def _group_by_version(rows: Iterable[Any]) -> List[Tuple[int, List[Any]]]:
+        groups: Dict[int, List[Any]] = {}
+        for row in rows:
+            groups.setdefault(row.golden_set_version, []).append(row)
+        return sorted(groups.items())
+
+    @staticmethod
+    def _golden_survey(survey_json: Any) -> Any:
+        if isinstance(survey_json, dict) and "final_output" in survey_json:
+            return survey_json["final_output"]
+        return survey_json
+
+    @staticmethod
+    def _batches(rows: List[Any]) -> Iterable[List[Any]]:
+        for start in range(0, len(rows), EMBEDDING_BATCH_SIZE):
+            yield rows[start:start + EMBEDDING_BATCH_SIZE]
+
+
+async def refresh_golden_similarity_index() -> None:
+    """Background task: refresh cached golden matches in a fresh session after a golden pair change"""
+    from src.database import get_db
+
+    db = next(get_db())
+    try:
+        await GoldenSimilarityIndexService(db).refresh()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"⚠️ [GoldenSimilarityIndex] Background refresh failed (non-critical): {str(e)}")
+    finally:
+        db.close()
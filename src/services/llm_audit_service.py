@@ -8,18 +8,66 @@ regardless of purpose or context.
 
 import uuid
 import time
+import base64
 import logging
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, tuple_
 
 from src.database.models import LLMAudit, LLMHyperparameterConfig, LLMPromptTemplate
+from src.config.logging_config import log_text_preview
+from src.services.llm_gateway import start_metrics_capture, stop_metrics_capture
+from src.services.tracing import tracer
 from src.utils.error_messages import UserFriendlyError
 
 logger = logging.getLogger(__name__)
 
+# Metadata-only projection for audit listings; prompt/response bodies are fetched per interaction
+AUDIT_SUMMARY_COLUMNS = (
+    LLMAudit.id,
+    LLMAudit.interaction_id,
+    LLMAudit.parent_workflow_id,
+    LLMAudit.parent_survey_id,
+    LLMAudit.parent_rfq_id,
+    LLMAudit.model_name,
+    LLMAudit.model_provider,
+    LLMAudit.model_version,
+    LLMAudit.purpose,
+    LLMAudit.sub_purpose,
+    LLMAudit.context_type,
+    LLMAudit.input_tokens,
+    LLMAudit.output_tokens,
+    LLMAudit.temperature,
+    LLMAudit.max_tokens,
+    LLMAudit.response_time_ms,
+    LLMAudit.success,
+    LLMAudit.error_message,
+    LLMAudit.tags,
+    LLMAudit.created_at,
+)
+
+
+def encode_audit_cursor(created_at: datetime, record_id: Any) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of an audit record"""
+    raw = f"{created_at.isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_audit_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by ``encode_audit_cursor``
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, record_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(record_id)
+    except Exception as e:
+        raise ValueError(f"Invalid audit cursor: {cursor}") from e
+
 
 class LLMAuditService:
     """Service for comprehensive LLM interaction auditing"""
@@ -95,10 +143,10 @@ class LLMAuditService:
         success: bool = True,
         error_message: str = None
     ) -> str:
-        logger.info(f"🚀 [LLMAuditService] Starting log_llm_interaction for {interaction_id}")
-        logger.info(f"🔍 [LLMAuditService] db_session available: {self.db_session is not None}")
-        logger.info(f"🔍 [LLMAuditService] purpose: {purpose}, parent_survey_id: {parent_survey_id}, parent_rfq_id: {parent_rfq_id}")
-        logger.info(f"🔍 [LLMAuditService] parent_survey_id type: {type(parent_survey_id)}, parent_rfq_id type: {type(parent_rfq_id)}")
+        logger.debug(
+            "🚀 [LLMAuditService] Starting log_llm_interaction for %s (purpose=%s, parent_survey_id=%s, parent_rfq_id=%s)",
+            interaction_id, purpose, parent_survey_id, parent_rfq_id,
+        )
         """
         Log an LLM interaction to the audit system using an independent database session.
         
@@ -152,14 +200,18 @@ class LLMAuditService:
                 audit_session = get_independent_db_session()
             
             # Log the parameters being passed for debugging
-            logger.info(f"🔍 [LLMAuditService] Logging LLM interaction:")
-            logger.info(f"🔍 [LLMAuditService] Interaction ID: {interaction_id}")
-            logger.info(f"🔍 [LLMAuditService] Purpose: {purpose}")
-            logger.info(f"🔍 [LLMAuditService] Parent Survey ID: {parent_survey_id}")
-            logger.info(f"🔍 [LLMAuditService] Parent RFQ ID: {parent_rfq_id}")
-            logger.info(f"🔍 [LLMAuditService] Parent Workflow ID: {parent_workflow_id}")
-            logger.info(f"🔍 [LLMAuditService] Context Type: {context_type}")
-            logger.info(f"🔍 [LLMAuditService] Using independent session: {id(audit_session)}")
+            logger.debug(
+                "🔍 [LLMAuditService] Logging LLM interaction %s",
+                interaction_id,
+                extra={
+                    "purpose": purpose,
+                    "parent_survey_id": parent_survey_id,
+                    "parent_rfq_id": parent_rfq_id,
+                    "parent_workflow_id": parent_workflow_id,
+                    "context_type": context_type,
+                    "audit_session_id": id(audit_session),
+                },
+            )
             
             # Extract hyperparameters
             hyperparams = hyperparameters or {}
@@ -219,8 +271,11 @@ class LLMAuditService:
             json_raw_response = self._convert_raw_response_to_json(raw_response)
             
             # Log the input prompt being stored
-            logger.info(f"🔍 [LLMAuditService] Storing input_prompt (length: {len(input_prompt)})")
-            logger.info(f"🔍 [LLMAuditService] input_prompt preview: {input_prompt[:200]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "🔍 [LLMAuditService] Storing input_prompt (length: %d): %s...",
+                    len(input_prompt), log_text_preview(input_prompt),
+                )
             
             # Create audit record
             audit_record = LLMAudit(
@@ -254,15 +309,14 @@ class LLMAuditService:
             )
             
             # Add and commit using the independent session
-            logger.info(f"🔍 [LLMAuditService] Adding audit record to session: {interaction_id}")
             audit_session.add(audit_record)
-            logger.info(f"🔍 [LLMAuditService] Committing audit record: {interaction_id}")
             audit_session.commit()
-            logger.info(f"🔍 [LLMAuditService] Commit successful: {interaction_id}")
             
-            logger.info(f"✅ [LLMAuditService] Logged LLM interaction: {interaction_id} ({purpose})")
             audit_record_id = str(audit_record.id)
-            logger.info(f"🔍 [LLMAuditService] Audit record ID: {audit_record_id}")
+            logger.info(
+                "✅ [LLMAuditService] Logged LLM interaction: %s (%s), audit record %s",
+                interaction_id, purpose, audit_record_id,
+            )
             
             return audit_record_id
             
@@ -388,27 +442,18 @@ class LLMAuditService:
             Tuple of (audit_records, total_count)
         """
         try:
-            query = self.db_session.query(LLMAudit)
-            
-            # Apply filters
-            if purpose:
-                query = query.filter(LLMAudit.purpose == purpose)
-            if sub_purpose:
-                query = query.filter(LLMAudit.sub_purpose == sub_purpose)
-            if model_name:
-                query = query.filter(LLMAudit.model_name == model_name)
-            if success is not None:
-                query = query.filter(LLMAudit.success == success)
-            if parent_workflow_id:
-                query = query.filter(LLMAudit.parent_workflow_id == parent_workflow_id)
-            if parent_survey_id:
-                query = query.filter(LLMAudit.parent_survey_id == parent_survey_id)
-            if parent_rfq_id:
-                query = query.filter(LLMAudit.parent_rfq_id == parent_rfq_id)
-            if start_date:
-                query = query.filter(LLMAudit.created_at >= start_date)
-            if end_date:
-                query = query.filter(LLMAudit.created_at <= end_date)
+            query = self._filter_audit_query(
+                self.db_session.query(LLMAudit),
+                purpose=purpose,
+                sub_purpose=sub_purpose,
+                model_name=model_name,
+                success=success,
+                parent_workflow_id=parent_workflow_id,
+                parent_survey_id=parent_survey_id,
+                parent_rfq_id=parent_rfq_id,
+                start_date=start_date,
+                end_date=end_date
+            )
             
             # Get total count
             total_count = query.count()
@@ -422,6 +467,106 @@ class LLMAuditService:
             logger.error(f"❌ [LLMAuditService] Failed to get audit records: {str(e)}")
             return [], 0
     
+    @staticmethod
+    def _filter_audit_query(
+        query,
+        purpose: str = None,
+        sub_purpose: str = None,
+        model_name: str = None,
+        success: bool = None,
+        parent_workflow_id: str = None,
+        parent_survey_id: str = None,
+        parent_rfq_id: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None
+    ):
+        """Apply the audit listing filters to a query over LLMAudit"""
+        if purpose:
+            query = query.filter(LLMAudit.purpose == purpose)
+        if sub_purpose:
+            query = query.filter(LLMAudit.sub_purpose == sub_purpose)
+        if model_name:
+            query = query.filter(LLMAudit.model_name == model_name)
+        if success is not None:
+            query = query.filter(LLMAudit.success == success)
+        if parent_workflow_id:
+            query = query.filter(LLMAudit.parent_workflow_id == parent_workflow_id)
+        if parent_survey_id:
+            query = query.filter(LLMAudit.parent_survey_id == parent_survey_id)
+        if parent_rfq_id:
+            query = query.filter(LLMAudit.parent_rfq_id == parent_rfq_id)
+        if start_date:
+            query = query.filter(LLMAudit.created_at >= start_date)
+        if end_date:
+            query = query.filter(LLMAudit.created_at <= end_date)
+        return query
+    
+    async def get_audit_summaries(
+        self,
+        purpose: str = None,
+        sub_purpose: str = None,
+        model_name: str = None,
+        success: bool = None,
+        parent_workflow_id: str = None,
+        parent_survey_id: str = None,
+        parent_rfq_id: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Tuple[List[Any], Optional[str], Optional[int]]:
+        """
+        Get metadata-only audit rows, newest first, with keyset pagination on (created_at, id)
+        
+        Only the AUDIT_SUMMARY_COLUMNS are selected, so prompt and response bodies are never
+        read; page cost stays constant however deep the cursor is. Rows with no created_at
+        are not listed.
+        
+        Args:
+            limit: Page size
+            cursor: Cursor returned for the previous page (None for the first page)
+            include_total: Count matching rows (skipped when paging with a cursor)
+            
+        Returns:
+            Tuple of (rows, next_cursor, total_count); next_cursor is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self._filter_audit_query(
+            # Rows without a created_at have no keyset position (and DESC sorts NULLs first)
+            self.db_session.query(*AUDIT_SUMMARY_COLUMNS).filter(LLMAudit.created_at.isnot(None)),
+            purpose=purpose,
+            sub_purpose=sub_purpose,
+            model_name=model_name,
+            success=success,
+            parent_workflow_id=parent_workflow_id,
+            parent_survey_id=parent_survey_id,
+            parent_rfq_id=parent_rfq_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+        
+        total_count = None
+        if cursor:
+            after_created_at, after_id = decode_audit_cursor(cursor)
+            # A row comparison is an index range condition on idx_llm_audit_created_at_id;
+            # the equivalent OR of column comparisons is not
+            query = query.filter(tuple_(LLMAudit.created_at, LLMAudit.id) < tuple_(after_created_at, after_id))
+        elif include_total:
+            total_count = query.count()
+        
+        # Fetch one extra row to know whether another page follows
+        rows = query.order_by(desc(LLMAudit.created_at), desc(LLMAudit.id)).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_audit_cursor(last.created_at, last.id)
+        
+        return rows, next_cursor, total_count
+    
     async def get_interaction(self, interaction_id: str) -> Optional[LLMAudit]:
         """
         Get a specific LLM interaction by interaction_id
@@ -661,13 +806,26 @@ class LLMAuditContext:
     
     async def __aenter__(self):
         self.start_time = time.time()
+        self._span = tracer.start_span(
+            f"llm.{self.purpose}",
+            model=self.model_name,
+            provider=self.model_provider,
+            interaction_id=self.interaction_id,
+        )
+        self._gateway_capture = start_metrics_capture(self.purpose)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        logger.info(f"🚀 [LLMAuditContext] __aexit__ called for {self.interaction_id}")
-        logger.info(f"🔍 [LLMAuditContext] Exception type: {exc_type}")
-        logger.info(f"🔍 [LLMAuditContext] parent_survey_id: {self.parent_survey_id}")
-        logger.info(f"🔍 [LLMAuditContext] parent_rfq_id: {self.parent_rfq_id}")
+        logger.debug(
+            "🚀 [LLMAuditContext] __aexit__ called for %s (exception=%s, parent_survey_id=%s, parent_rfq_id=%s)",
+            self.interaction_id, exc_type, self.parent_survey_id, self.parent_rfq_id,
+        )
+        
+        # End the LLM span before the audit write so the write is not counted as model time
+        if self.metadata.get('cache_hit'):
+            self._span.set_attribute("cache_hit", True)
+        self._span.end(exc_val)
+        self.record_gateway_metrics(stop_metrics_capture(self._gateway_capture))
         
         # Calculate response time
         response_time_ms = None
@@ -687,12 +845,10 @@ class LLMAuditContext:
             'output_tokens': self.metadata.get('output_tokens'),
             'cost_usd': self.metadata.get('cost_usd')
         }
-        logger.info(f"🔍 [LLMAuditContext] Performance metrics: {performance_metrics}")
+        logger.debug("🔍 [LLMAuditContext] Performance metrics: %s", performance_metrics)
         
         # Log the interaction
         try:
-            logger.info(f"🔍 [LLMAuditContext] Calling audit_service.log_llm_interaction for {self.interaction_id}")
-            logger.info(f"🔍 [LLMAuditContext] Parameters: purpose={self.purpose}, parent_survey_id={self.parent_survey_id}, parent_rfq_id={self.parent_rfq_id}")
             await self.audit_service.log_llm_interaction(
                 interaction_id=self.interaction_id,
                 model_name=self.model_name,
@@ -713,7 +869,7 @@ class LLMAuditContext:
                 success=self.success,
                 error_message=self.error_message
             )
-            logger.info(f"✅ [LLMAuditContext] Successfully logged interaction {self.interaction_id}")
+            logger.debug("✅ [LLMAuditContext] Successfully logged interaction %s", self.interaction_id)
         except Exception as e:
             import traceback
             logger.error(f"❌ [LLMAuditContext] Failed to log interaction: {str(e)}")
@@ -735,6 +891,30 @@ class LLMAuditContext:
         """Set the raw response from the LLM before any processing"""
         self.raw_response = raw_response
     
+    def record_cache_hit(self, provider_metadata: Optional[Dict[str, Any]]):
+        """Mark the interaction as served from the LLM response cache (no-op for live calls)"""
+        if not isinstance(provider_metadata, dict) or not provider_metadata.get("cache_hit"):
+            return
+        self.metadata['cache_hit'] = True
+        self.metadata['cache_key'] = provider_metadata.get("cache_key")
+        self.metadata['cost_usd'] = 0.0
+        if "cache_hit" not in self.tags:
+            self.tags.append("cache_hit")
+    
+    def record_gateway_metrics(self, calls: List[Dict[str, Any]]):
+        """Attach LLM gateway queueing/retry metrics for the provider calls made in this context"""
+        if not calls:
+            return
+        self.metadata['gateway'] = {
+            'calls': len(calls),
+            'model': calls[-1]['model'],
+            'priority': calls[-1]['priority'],
+            'attempts': sum(call['attempts'] for call in calls),
+            'rate_limited': sum(call['rate_limited'] for call in calls),
+            'queue_wait_ms': round(sum(call['queue_wait_ms'] for call in calls), 1),
+            'concurrency_limit': calls[-1]['concurrency_limit'],
+        }
+    
     async def log_parsing_failure(
         self,
         raw_response: str,
@@ -0,0 +1,585 @@
+"""
+LLM Provider Gateway
+Shared per-model rate limiting, adaptive concurrency, priorities and retries for LLM provider calls.
+
+Every provider call goes through ``llm_gateway.call``. For each ``provider/model`` the gateway keeps:
+- request and token buckets (requests/minute, tokens/minute)
+- an AIMD concurrency limit: additive increase on healthy calls, multiplicative
+  decrease on 429s and latency spikes
+- a priority queue, so interactive generation is admitted before background evaluation
+
+Rate-limited and transient failures are retried with jittered exponential backoff.
+Per-call gateway metrics are attached to the surrounding ``LLMAuditContext`` metadata.
+
+Calls also honour a deadline propagated from the workflow (``llm_deadline``), and
+can be hedged: once a call has run longer than the model's observed latency
+percentile (from ``llm_audit.response_time_ms``), a duplicate is issued and
+whichever finishes first wins.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Latency above this multiple of the moving average counts as congestion
+LATENCY_SPIKE_FACTOR = 3.0
+LATENCY_EWMA_ALPHA = 0.2
+RATE_LIMIT_DECREASE = 0.5
+LATENCY_DECREASE = 0.75
+TRANSIENT_STATUS_CODES = {408, 409, 500, 502, 503, 504, 529}
+HEDGE_SAMPLE_WINDOW = timedelta(days=7)
+
+
+class Priority(IntEnum):
+    """Admission order when a model is saturated (lower is served first)"""
+    INTERACTIVE = 0
+    STANDARD = 1
+    BACKGROUND = 2
+
+
+# Default priority per LLM audit purpose; anything else is STANDARD
+PURPOSE_PRIORITIES = {
+    "survey_generation": Priority.INTERACTIVE,
+    "evaluation": Priority.BACKGROUND,
+    "survey_evaluation": Priority.BACKGROUND,
+    "golden_example_fields": Priority.BACKGROUND,
+}
+
+_priority_override: ContextVar[Optional[Priority]] = ContextVar("llm_priority", default=None)
+_audit_purpose: ContextVar[Optional[str]] = ContextVar("llm_audit_purpose", default=None)
+_metrics_sink: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("llm_gateway_metrics", default=None)
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+class LLMDeadlineExceeded(asyncio.TimeoutError):
+    """Raised when an LLM call cannot finish before the propagated deadline"""
+
+
+@contextmanager
+def llm_deadline(seconds: float) -> Iterator[float]:
+    """
+    Bound every LLM call made inside the block (including workflow nodes and tasks it starts)
+
+    Args:
+        seconds: Time budget from now; nested deadlines can only tighten an outer one
+
+    Returns:
+        The absolute deadline (``time.monotonic()`` based)
+    """
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline (None when no deadline is set)"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """Run the enclosed LLM calls with an explicit priority"""
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def start_metrics_capture(purpose: Optional[str] = None) -> Tuple[Any, Any, List[Dict[str, Any]]]:
+    """
+    Collect gateway metrics for calls made until ``stop_metrics_capture`` (used by LLMAuditContext)
+
+    Args:
+        purpose: LLM audit purpose, used to pick the default priority
+
+    Returns:
+        Opaque handle for ``stop_metrics_capture``
+    """
+    sink: List[Dict[str, Any]] = []
+    return _metrics_sink.set(sink), _audit_purpose.set(purpose), sink
+
+
+def stop_metrics_capture(handle: Tuple[Any, Any, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    sink_token, purpose_token, sink = handle
+    try:
+        _metrics_sink.reset(sink_token)
+        _audit_purpose.reset(purpose_token)
+    except ValueError:
+        pass
+    return sink
+
+
+def current_priority() -> Priority:
+    override = _priority_override.get()
+    if override is not None:
+        return override
+    return PURPOSE_PRIORITIES.get(_audit_purpose.get() or "", Priority.STANDARD)
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    return sum(len(text) for text in texts if text) // 4
+
+
+def classify_error(error: BaseException) -> Tuple[bool, bool, Optional[float]]:
+    """
+    Classify a provider error
+
+    Returns:
+        (retryable, rate_limited, retry_after_seconds)
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(error, "status", None) or getattr(response, "status_code", None)
+    message = str(error).lower()
+
+    rate_limited = status == 429 or any(
+        marker in message for marker in ("429", "rate limit", "rate_limit", "too many requests", "throttled")
+    )
+    transient = rate_limited or status in TRANSIENT_STATUS_CODES or isinstance(error, ConnectionError) or any(
+        marker in message for marker in ("overloaded", "temporarily unavailable", "connection reset", "server error")
+    )
+
+    retry_after = None
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        try:
+            retry_after = float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            retry_after = None
+    return transient, rate_limited, retry_after
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute`` (capacity: one minute of budget)"""
+
+    def __init__(self, rate_per_minute: int):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is available now)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket instead of forever
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate_per_second
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + max(0.0, amount))
+
+
+class _ModelLimiter:
+    """Admission control for one provider/model"""
+
+    def __init__(self, key: str, rpm: int, tpm: int, max_concurrency: int, min_concurrency: int):
+        self.key = key
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(max(self.min_concurrency, self.max_concurrency // 2))
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.latency_ewma_ms: Optional[float] = None
+        self.loop = asyncio.get_running_loop()
+        self._condition = asyncio.Condition()
+        self._waiting: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self.stats = {
+            "requests": 0, "retries": 0, "rate_limited": 0, "failures": 0, "deadline_exceeded": 0,
+            "hedges": 0, "hedge_wins": 0, "queue_wait_ms_total": 0.0,
+        }
+
+    def _wait_seconds(self, token_cost: float, now: float) -> float:
+        wait = max(0.0, self.blocked_until - now)
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(token_cost, now))
+        return wait
+
+    async def acquire(self, priority: Priority, token_cost: float) -> None:
+        ticket = (int(priority), next(self._sequence))
+        async with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiting[0] == ticket and self.in_flight < int(self.limit):
+                        wait = self._wait_seconds(token_cost, time.monotonic())
+                        if wait <= 0:
+                            break
+                        timeout = wait
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+                raise
+
+            heapq.heappop(self._waiting)
+            self.in_flight += 1
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(token_cost)
+            self._condition.notify_all()
+
+    def admit_hedge(self, token_cost: float) -> None:
+        """Admit a hedged duplicate immediately (queueing behind the stalled call would defeat it), still charging the buckets"""
+        self.in_flight += 1
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(token_cost)
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency_ms: float) -> None:
+        if self.latency_ewma_ms is not None and latency_ms > self.latency_ewma_ms * LATENCY_SPIKE_FACTOR:
+            self.limit = max(self.min_concurrency, self.limit * LATENCY_DECREASE)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+        self.latency_ewma_ms = latency_ms if self.latency_ewma_ms is None else (
+            LATENCY_EWMA_ALPHA * latency_ms + (1 - LATENCY_EWMA_ALPHA) * self.latency_ewma_ms
+        )
+
+    def on_rate_limited(self, retry_after: Optional[float]) -> None:
+        self.limit = max(self.min_concurrency, self.limit * RATE_LIMIT_DECREASE)
+        self.stats["rate_limited"] += 1
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def refund_tokens(self, amount: float) -> None:
+        if self.tokens is not None:
+            self.tokens.refund(amount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queue_wait_ms_total": round(self.stats["queue_wait_ms_total"], 1),
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiting),
+            "latency_ewma_ms": round(self.latency_ewma_ms, 1) if self.latency_ewma_ms is not None else None,
+            "request_tokens_available": round(self.requests.tokens, 1) if self.requests else None,
+            "llm_tokens_available": round(self.tokens.tokens, 1) if self.tokens else None,
+        }
+
+
+def parse_model_limits(spec: str) -> Dict[str, Dict[str, int]]:
+    """
+    Parse ``LLM_GATEWAY_MODEL_LIMITS``, e.g. ``"openai/gpt-4o=rpm:500,tpm:30000;meta/llama-3-70b=rpm:60"``
+
+    Returns:
+        Mapping of model name (or ``provider/model``) to {"rpm": ..., "tpm": ..., "concurrency": ...}
+    """
+    limits: Dict[str, Dict[str, int]] = {}
+    for entry in spec.split(";"):
+        if "=" not in entry:
+            continue
+        model, values = entry.rsplit("=", 1)
+        model_limits = {}
+        for item in values.split(","):
+            name, _, value = item.partition(":")
+            try:
+                model_limits[name.strip()] = int(value)
+            except ValueError:
+                logger.warning(f"⚠️ [LLMGateway] Ignoring invalid limit '{item}' for {model.strip()}")
+        limits[model.strip()] = model_limits
+    return limits
+
+
+class LLMGateway:
+    """Shared gateway in front of every LLM provider call"""
+
+    def __init__(self):
+        self.enabled = settings.llm_gateway_enabled
+        self.model_limits = parse_model_limits(settings.llm_gateway_model_limits)
+        self.requests_per_minute = settings.llm_gateway_requests_per_minute
+        self.tokens_per_minute = settings.llm_gateway_tokens_per_minute
+        self.max_concurrency = settings.llm_gateway_max_concurrency
+        self.min_concurrency = settings.llm_gateway_min_concurrency
+        self.max_retries = settings.llm_gateway_max_retries
+        self.backoff_base_seconds = settings.llm_gateway_backoff_base_seconds
+        self.backoff_max_seconds = settings.llm_gateway_backoff_max_seconds
+        self.hedging_enabled = settings.llm_hedging_enabled
+        self.hedge_purposes = {p.strip() for p in settings.llm_hedge_purposes.split(",") if p.strip()}
+        self.hedge_percentile = settings.llm_hedge_percentile
+        self.hedge_min_samples = settings.llm_hedge_min_samples
+        self.hedge_refresh_seconds = settings.llm_hedge_refresh_seconds
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._hedge_thresholds_ms: Dict[Tuple[str, str], float] = {}
+        self._hedge_thresholds_loaded_at: Optional[float] = None
+        self._hedge_refresh_task: Optional[asyncio.Task] = None
+
+    def _get_limiter(self, provider: str, model: str) -> _ModelLimiter:
+        key = f"{provider}/{model}"
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(key)
+        if limiter is None or limiter.loop is not loop:
+            limits = self.model_limits.get(key) or self.model_limits.get(model) or {}
+            limiter = _ModelLimiter(
+                key,
+                rpm=limits.get("rpm", self.requests_per_minute),
+                tpm=limits.get("tpm", self.tokens_per_minute),
+                max_concurrency=limits.get("concurrency", self.max_concurrency),
+                min_concurrency=self.min_concurrency,
+            )
+            self._limiters[key] = limiter
+        return limiter
+
+    def refresh_hedge_thresholds(self) -> None:
+        """
+        Start reloading per-model hedge thresholds from ``llm_audit`` if they are older than the refresh interval
+
+        The threshold for a (model, purpose) is the configured percentile of successful,
+        non-cached ``response_time_ms`` over the last week. The aggregate query runs in a
+        background thread with its own session, so callers on the generation path never
+        wait for it; they use the previous thresholds until the reload finishes.
+        """
+        if not self.hedging_enabled:
+            return
+        now = time.monotonic()
+        if self._hedge_thresholds_loaded_at is not None and now - self._hedge_thresholds_loaded_at < self.hedge_refresh_seconds:
+            return
+        if self._hedge_refresh_task is not None and not self._hedge_refresh_task.done():
+            return
+        self._hedge_thresholds_loaded_at = now
+        self._hedge_refresh_task = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(self._load_hedge_thresholds)
+        )
+
+    def _load_hedge_thresholds(self) -> None:
+        from sqlalchemy import func, or_
+        from src.database.connection import SessionLocal
+        from src.database.models import LLMAudit
+
+        try:
+            with SessionLocal() as db_session:
+                rows = db_session.query(
+                    LLMAudit.model_name,
+                    LLMAudit.purpose,
+                    func.percentile_cont(self.hedge_percentile).within_group(LLMAudit.response_time_ms),
+                    func.count(LLMAudit.id),
+                ).filter(
+                    LLMAudit.success.is_(True),
+                    LLMAudit.response_time_ms.isnot(None),
+                    LLMAudit.purpose.in_(self.hedge_purposes),
+                    LLMAudit.created_at >= datetime.now() - HEDGE_SAMPLE_WINDOW,
+                    or_(LLMAudit.tags.is_(None), ~LLMAudit.tags.contains(["cache_hit"])),
+                ).group_by(LLMAudit.model_name, LLMAudit.purpose).all()
+        except Exception as e:
+            logger.warning(f"⚠️ [LLMGateway] Failed to load hedge thresholds: {e}")
+            return
+
+        # Swapped in as one assignment, so readers on the event loop see old or new thresholds
+        self._hedge_thresholds_ms = {
+            (model_name, purpose): float(threshold_ms)
+            for model_name, purpose, threshold_ms, samples in rows
+            if threshold_ms is not None and samples >= self.hedge_min_samples
+        }
+        logger.info(f"✅ [LLMGateway] Loaded {len(self._hedge_thresholds_ms)} hedge thresholds (p{self.hedge_percentile * 100:g})")
+
+    def _hedge_after_seconds(self, model: Optional[str]) -> Optional[float]:
+        if not self.hedging_enabled:
+            return None
+        purpose = _audit_purpose.get()
+        if purpose not in self.hedge_purposes:
+            return None
+        threshold_ms = self._hedge_thresholds_ms.get((model, purpose))
+        return threshold_ms / 1000 if threshold_ms is not None else None
+
+    async def _within_deadline(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        remaining = remaining_time()
+        if remaining is None:
+            return await fn()
+        if remaining <= 0:
+            raise LLMDeadlineExceeded("LLM call timed out: workflow deadline reached")
+        try:
+            return await asyncio.wait_for(fn(), remaining)
+        except asyncio.TimeoutError as e:
+            if remaining_time() > 0:
+                raise
+            raise LLMDeadlineExceeded("LLM call timed out: workflow deadline reached") from e
+
+    async def _run_hedged(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        limiter: "_ModelLimiter",
+        estimated_tokens: int,
+        hedge_after: float,
+        metrics: Dict[str, Any],
+    ) -> Any:
+        """Run ``fn``; if it is still running after ``hedge_after`` seconds, race a duplicate and cancel the loser"""
+        primary = asyncio.ensure_future(fn())
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        async def hedge():
+            limiter.admit_hedge(estimated_tokens)
+            try:
+                return await fn()
+            finally:
+                await limiter.release()
+
+        metrics["hedged"] = True
+        limiter.stats["hedges"] += 1
+        logger.info(f"🔀 [LLMGateway] {limiter.key} exceeded {hedge_after:.1f}s, issuing hedged request")
+        backup = asyncio.ensure_future(hedge())
+        pending = {primary, backup}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        if task is backup:
+                            metrics["hedge_won"] = True
+                            limiter.stats["hedge_wins"] += 1
+                        return task.result()
+            # Both failed: surface the original request's error
+            return primary.result()
+        finally:
+            for task in (primary, backup):
+                task.cancel()
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        provider: str,
+        model: Optional[str],
+        estimated_tokens: int = 0,
+        priority: Optional[Priority] = None,
+        actual_tokens: Optional[Callable[[Any], Optional[int]]] = None,
+    ) -> Any:
+        """
+        Run one provider call under the model's rate limits, concurrency limit, retry policy and deadline
+
+        Args:
+            fn: Zero-argument coroutine factory performing the provider call (called once per attempt or hedge)
+            provider: Provider name ("replicate", "openai")
+            model: Model identifier
+            estimated_tokens: Prompt tokens plus max output tokens, reserved against tokens/minute
+            priority: Admission priority (defaults to the audit purpose's priority)
+            actual_tokens: Optional function returning the real token usage from the result, to refund the reservation
+
+        Returns:
+            Whatever ``fn`` returns
+
+        Raises:
+            LLMDeadlineExceeded: If the propagated deadline passes while queued, running or backing off
+        """
+        if not self.enabled:
+            return await self._within_deadline(fn)
+
+        limiter = self._get_limiter(provider, model or "default")
+        priority = priority if priority is not None else current_priority()
+        hedge_after = self._hedge_after_seconds(model)
+        metrics = {"model": limiter.key, "priority": priority.name.lower(), "attempts": 0,
+                   "queue_wait_ms": 0.0, "rate_limited": 0}
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                queued_at = time.monotonic()
+                try:
+                    await self._within_deadline(lambda: limiter.acquire(priority, estimated_tokens))
+                except LLMDeadlineExceeded:
+                    limiter.stats["deadline_exceeded"] += 1
+                    raise
+                wait_ms = (time.monotonic() - queued_at) * 1000
+                metrics["queue_wait_ms"] += wait_ms
+                metrics["attempts"] += 1
+                limiter.stats["requests"] += 1
+                limiter.stats["queue_wait_ms_total"] += wait_ms
+
+                started_at = time.monotonic()
+                try:
+                    if hedge_after is not None:
+                        result = await self._within_deadline(
+                            lambda: self._run_hedged(fn, limiter, estimated_tokens, hedge_after, metrics)
+                        )
+                    else:
+                        result = await self._within_deadline(fn)
+                except LLMDeadlineExceeded:
+                    limiter.stats["deadline_exceeded"] += 1
+                    raise
+                except Exception as e:
+                    retryable, rate_limited, retry_after = classify_error(e)
+                    if rate_limited:
+                        limiter.on_rate_limited(retry_after)
+                        metrics["rate_limited"] += 1
+                    delay = retry_after or random.uniform(
+                        0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt)
+                    )
+                    remaining = remaining_time()
+                    if not retryable or attempt >= self.max_retries or (remaining is not None and remaining <= delay):
+                        limiter.stats["failures"] += 1
+                        raise
+                    limiter.stats["retries"] += 1
+                    logger.warning(
+                        f"⚠️ [LLMGateway] {limiter.key} attempt {attempt + 1} failed ({'rate limited' if rate_limited else 'transient'}): "
+                        f"{e}; retrying in {delay:.1f}s"
+                    )
+                else:
+                    latency_ms = (time.monotonic() - started_at) * 1000
+                    limiter.on_success(latency_ms)
+                    if actual_tokens is not None:
+                        used = actual_tokens(result)
+                        if used is not None:
+                            limiter.refund_tokens(estimated_tokens - used)
+                    metrics["latency_ms"] = round(latency_ms, 1)
+                    return result
+                finally:
+                    await limiter.release()
+
+                await asyncio.sleep(delay)
+        finally:
+            metrics["queue_wait_ms"] = round(metrics["queue_wait_ms"], 1)
+            metrics["concurrency_limit"] = round(limiter.limit, 2)
+            sink = _metrics_sink.get()
+            if sink is not None:
+                sink.append(metrics)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model gateway counters and current limits"""
+        return {key: limiter.snapshot() for key, limiter in self._limiters.items()}
+
+
+# Global gateway instance
+llm_gateway = LLMGateway()
@@ -12,6 +12,7 @@ import replicate
 import httpx
 from openai import AsyncOpenAI
 from src.config.settings import settings
+from src.services.llm_gateway import estimate_tokens, llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -84,20 +85,25 @@ class ReplicateProvider(LLMProvider):
         start_time = time.time()
         
         try:
-            # Replicate API call with timeout
-            output = await asyncio.wait_for(
-                self.client.async_run(
-                    model,
-                    input={
-                        "prompt": prompt,
-                        "response_format": response_format or {"type": "json_object"},
-                        "temperature": temperature,
-                        "max_tokens": max_tokens,
-                        "top_p": 0.9,
-                        "system_prompt": system_prompt
-                    }
+            # Replicate API call with timeout, rate limited and retried by the gateway
+            output = await llm_gateway.call(
+                lambda: asyncio.wait_for(
+                    self.client.async_run(
+                        model,
+                        input={
+                            "prompt": prompt,
+                            "response_format": response_format or {"type": "json_object"},
+                            "temperature": temperature,
+                            "max_tokens": max_tokens,
+                            "top_p": 0.9,
+                            "system_prompt": system_prompt
+                        }
+                    ),
+                    timeout=1800.0  # 30 minute timeout
                 ),
-                timeout=1800.0  # 30 minute timeout
+                provider="replicate",
+                model=model,
+                estimated_tokens=estimate_tokens(prompt, system_prompt) + max_tokens,
             )
             
             # Convert output to string for unified parsing
@@ -189,16 +195,23 @@ class OpenAIProvider(LLMProvider):
                 # Basic JSON mode
                 response_format_param = {"type": "json_object"}
             
-            # OpenAI API call
-            response = await asyncio.wait_for(
-                self.client.chat.completions.create(
-                    model=model or "gpt-4o",
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    response_format=response_format_param
+            # OpenAI API call, rate limited and retried by the gateway
+            # (max_tokens is reserved up front, as OpenAI does; the unused part is refunded from usage)
+            response = await llm_gateway.call(
+                lambda: asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        model=model or "gpt-4o",
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        response_format=response_format_param
+                    ),
+                    timeout=900.0  # 15 minute timeout
                 ),
-                timeout=900.0  # 15 minute timeout
+                provider="openai",
+                model=model or "gpt-4o",
+                estimated_tokens=estimate_tokens(prompt, system_prompt) + max_tokens,
+                actual_tokens=lambda response: response.usage.total_tokens if response.usage else None,
             )
             
             # Extract raw response
@@ -233,7 +246,8 @@ def create_llm_provider(
     provider: str = "replicate",
     model: Optional[str] = None,
     api_token: Optional[str] = None,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    cache_purpose: Optional[str] = None
 ) -> LLMProvider:
     """
     Factory function to create appropriate LLM provider
@@ -243,6 +257,8 @@ def create_llm_provider(
         model: Model name (used to auto-detect provider if provider not specified)
         api_token: Replicate API token (optional, uses settings if not provided)
         api_key: OpenAI API key (optional, uses settings if not provided)
+        cache_purpose: Serve repeated identical calls from the LLM response cache
+            when this purpose is listed in ``llm_cache_enabled_purposes``
         
     Returns:
         LLMProvider instance
@@ -255,9 +271,14 @@ def create_llm_provider(
             provider = "replicate"
     
     if provider == "openai":
-        return OpenAIProvider(api_key=api_key)
+        llm_provider = OpenAIProvider(api_key=api_key)
     elif provider == "replicate":
-        return ReplicateProvider(api_token=api_token)
+        llm_provider = ReplicateProvider(api_token=api_token)
     else:
         raise ValueError(f"Unknown provider: {provider}. Supported: 'replicate', 'openai'")
+    
+    if cache_purpose:
+        from src.services.llm_response_cache import with_response_cache
+        llm_provider = with_response_cache(llm_provider, cache_purpose)
+    return llm_provider
 
@@ -0,0 +1,388 @@
+"""
+LLM Response Cache
+Content-hash cache for deterministic LLM calls (extraction, evaluation, RFQ generation)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.config.settings import settings
+from src.services.llm_provider import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "llm_response:"
+
+
+def build_llm_cache_key(
+    model: Optional[str],
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    hyperparameters: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Build a cache key from the model, the prompt hash and the hyperparameters
+
+    Args:
+        model: Model identifier
+        prompt: User prompt
+        system_prompt: Optional system prompt
+        hyperparameters: Sampling parameters and response format
+
+    Returns:
+        Cache key of the form ``llm_response:<sha256>``
+    """
+    payload = json.dumps(
+        {
+            "model": model or "",
+            "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "system_prompt_sha256": hashlib.sha256((system_prompt or "").encode("utf-8")).hexdigest(),
+            "hyperparameters": hyperparameters or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return f"{CACHE_KEY_PREFIX}{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+class _RedisBackend:
+    """Stores entries in Redis with a TTL; Redis' own maxmemory policy bounds the size."""
+
+    name = "redis"
+
+    def __init__(self, ttl_seconds: int, max_entry_bytes: int):
+        from src.services.cache_service import cache_service
+
+        self.cache = cache_service
+        self.ttl_seconds = ttl_seconds
+        self.max_entry_bytes = max_entry_bytes
+
+    @property
+    def available(self) -> bool:
+        return self.cache.redis_client is not None
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.cache.get(key)
+        if isinstance(value, str):
+            return value.encode("utf-8")
+        return value if isinstance(value, bytes) else None
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) <= self.max_entry_bytes:
+            self.cache.set(key, value, expire=self.ttl_seconds)
+
+    def clear(self) -> None:
+        pass
+
+
+class _DiskBackend:
+    """
+    One file per entry; expired files are ignored and least recently used files evicted past the size limit.
+
+    The total size is tracked as entries are written and removed, so the directory
+    is only scanned once at startup and again when the limit is exceeded.
+    """
+
+    name = "disk"
+
+    def __init__(self, directory: str, ttl_seconds: int, max_bytes: int):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key.replace(":", "_") + ".json")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.ttl_seconds:
+                os.remove(path)
+                with self._lock:
+                    if self._total_bytes is not None:
+                        self._total_bytes -= stat.st_size
+                return None
+            with open(path, "rb") as handle:
+                value = handle.read()
+            # Access time drives LRU eviction; mtime keeps the write time for the TTL
+            os.utime(path, (time.time(), stat.st_mtime))
+            return value
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"⚠️ [LLMResponseCache] Failed to read disk entry: {str(e)}")
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                if self._total_bytes is None:
+                    self._evict()
+                with open(tmp_path, "wb") as handle:
+                    handle.write(value)
+                try:
+                    replaced_bytes = os.stat(path).st_size
+                except FileNotFoundError:
+                    replaced_bytes = 0
+                os.replace(tmp_path, path)
+                self._total_bytes += len(value) - replaced_bytes
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+            except OSError as e:
+                logger.warning(f"⚠️ [LLMResponseCache] Failed to write disk entry: {str(e)}")
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under the limit; resyncs the total size"""
+        now = time.time()
+        entries = []
+        total_bytes = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime > self.ttl_seconds:
+                os.remove(entry.path)
+                continue
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+            total_bytes += stat.st_size
+
+        if total_bytes > self.max_bytes:
+            for _, size, path in sorted(entries):
+                os.remove(path)
+                total_bytes -= size
+                if total_bytes <= self.max_bytes:
+                    break
+        self._total_bytes = total_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    os.remove(entry.path)
+            self._total_bytes = 0
+
+
+class LLMResponseCache:
+    """
+    Opt-in response cache for LLM calls whose output is a pure function of their input.
+
+    Only purposes listed in ``llm_cache_enabled_purposes`` are cached. Entries live in
+    Redis when it is reachable (``llm_cache_backend="auto"``) and on local disk otherwise.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend_name = backend or settings.llm_cache_backend
+        self._backend: Any = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self) -> Any:
+        if self._backend is None:
+            self._backend = self._create_backend()
+        return self._backend
+
+    def _create_backend(self) -> Any:
+        if self.backend_name in ("auto", "redis"):
+            redis_backend = _RedisBackend(settings.llm_cache_ttl_seconds, settings.llm_cache_max_bytes)
+            if redis_backend.available or self.backend_name == "redis":
+                logger.info("🗄️ [LLMResponseCache] Using Redis backend")
+                return redis_backend
+        logger.info(f"🗄️ [LLMResponseCache] Using disk backend at {settings.llm_cache_dir}")
+        return _DiskBackend(settings.llm_cache_dir, settings.llm_cache_ttl_seconds, settings.llm_cache_max_bytes)
+
+    @staticmethod
+    def is_enabled(purpose: Optional[str]) -> bool:
+        return bool(purpose) and purpose in settings.llm_cache_enabled_purpose_list
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = self.backend.get(key)
+            entry = json.loads(value) if value else None
+        except Exception as e:
+            logger.warning(f"⚠️ [LLMResponseCache] Lookup failed: {str(e)}")
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(self, key: str, output: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        entry = {"output": output, "metadata": metadata or {}, "cached_at": time.time()}
+        try:
+            self.backend.set(key, json.dumps(entry, default=str).encode("utf-8"))
+        except Exception as e:
+            logger.warning(f"⚠️ [LLMResponseCache] Store failed: {str(e)}")
+
+    async def get_or_generate(
+        self,
+        purpose: Optional[str],
+        key: str,
+        generate: Callable[[], Awaitable[str]],
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> Tuple[str, bool]:
+        """
+        Return a cached output for ``key`` or produce and store one
+
+        Args:
+            purpose: Cache purpose; caching is skipped when it is not enabled
+            key: Key from ``build_llm_cache_key``
+            generate: Coroutine factory producing the raw output on a miss
+            validate: Only outputs it accepts are stored, so a bad output is not replayed on retry
+
+        Returns:
+            Tuple of (output, cache_hit)
+        """
+        if not self.is_enabled(purpose):
+            return await generate(), False
+
+        entry = await asyncio.to_thread(self.get, key)
+        if entry is not None:
+            logger.info(f"♻️ [LLMResponseCache] Cache hit for purpose={purpose}")
+            return entry["output"], True
+
+        output = await generate()
+        if validate is None or validate(output):
+            await asyncio.to_thread(self.set, key, output, {"purpose": purpose})
+        return output, False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend_name,
+            "enabled_purposes": settings.llm_cache_enabled_purpose_list,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class CachedLLMProvider(LLMProvider):
+    """
+    LLMProvider wrapper that serves repeated identical calls from ``LLMResponseCache``.
+
+    Fresh responses are not stored by ``generate``: the caller stores one with
+    ``store_parsed_response`` once it has parsed it, so an unparseable output is
+    never replayed to retries.
+    """
+
+    def __init__(self, provider: LLMProvider, purpose: str, cache: Optional[LLMResponseCache] = None):
+        self.provider = provider
+        self.purpose = purpose
+        self.cache = cache or llm_response_cache
+
+    def get_provider_name(self) -> str:
+        return self.provider.get_provider_name()
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 16000,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Generate through the wrapped provider unless an identical call is cached (misses are not stored)"""
+        start_time = time.time()
+        key = build_llm_cache_key(
+            model,
+            prompt,
+            system_prompt,
+            {
+                "provider": self.get_provider_name(),
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "response_format": response_format,
+            },
+        )
+
+        entry = await asyncio.to_thread(self.cache.get, key)
+        if entry is not None:
+            logger.info(f"♻️ [LLMResponseCache] Cache hit for purpose={self.purpose}")
+            return {
+                "output": entry["output"],
+                "metadata": {
+                    **entry.get("metadata", {}),
+                    "cache_hit": True,
+                    "cache_key": key,
+                    "cache_purpose": self.purpose,
+                    "response_time_ms": int((time.time() - start_time) * 1000),
+                },
+            }
+
+        result = await self.provider.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+        )
+        result.setdefault("metadata", {})
+        result["metadata"].update({"cache_hit": False, "cache_key": key, "cache_purpose": self.purpose})
+        return result
+
+    async def store(self, result: Dict[str, Any]) -> None:
+        """Store a response returned by ``generate`` (cache hits are already stored)"""
+        metadata = result.get("metadata") or {}
+        if metadata.get("cache_hit") is not False or not metadata.get("cache_key"):
+            return
+        stored_metadata = {
+            name: value for name, value in metadata.items()
+            if name not in ("cache_hit", "cache_key", "cache_purpose")
+        }
+        await asyncio.to_thread(self.cache.set, metadata["cache_key"], result["output"], stored_metadata)
+
+    def __getattr__(self, name):
+        """Delegate other attributes to the wrapped provider"""
+        return getattr(self.provider, name)
+
+
+def with_response_cache(provider: LLMProvider, purpose: Optional[str]) -> LLMProvider:
+    """
+    Wrap a provider with the response cache when caching is enabled for ``purpose``
+
+    Args:
+        provider: Provider to wrap
+        purpose: Cache purpose, e.g. "field_extraction" or "rfq_extraction"
+
+    Returns:
+        The cached wrapper, or ``provider`` unchanged when caching is disabled
+    """
+    if isinstance(provider, CachedLLMProvider) or not LLMResponseCache.is_enabled(purpose):
+        return provider
+    return CachedLLMProvider(provider, purpose)
+
+
+async def store_parsed_response(provider: LLMProvider, result: Dict[str, Any]) -> None:
+    """
+    Cache a response after the caller parsed it successfully
+
+    Args:
+        provider: Provider that produced ``result``; a no-op unless it is a ``CachedLLMProvider``
+        result: Return value of ``provider.generate``
+    """
+    if isinstance(provider, CachedLLMProvider):
+        await provider.store(result)
+
+
+# Global LLM response cache instance
+llm_response_cache = LLMResponseCache()
@@ -5,13 +5,160 @@ Evaluates survey adherence to the 5-pillar evaluation framework
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+import re
+import threading
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from src.utils.survey_utils import extract_all_questions, get_questions_count
+from src.config import settings
+from src.database.models import SurveyRule
 
 logger = logging.getLogger(__name__)
 
+# Every phrase a rule handler looks for in question text (matched as lowercase substrings)
+RULE_KEYWORDS = (
+    'objective', 'goal', 'purpose', 'business', 'customer', 'satisfaction',
+    "don't you think", "wouldn't you agree", "isn't it true", 'obviously',
+    'screening', 'qualify', 'eligible',
+    'algorithm', 'api', 'database', 'infrastructure', 'optimization',
+    'excellent', 'poor', 'terrible', 'amazing', 'awful',
+    'sample', 'respondents', 'privacy', 'consent', 'confidential',
+)
+# Lookahead alternation so overlapping keywords are all found in one scan of each text
+_KEYWORD_PATTERN = re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in RULE_KEYWORDS) + "))")
+
+LEADING_PHRASES = ("don't you think", "wouldn't you agree", "isn't it true", 'obviously')
+JARGON_WORDS = ('algorithm', 'api', 'database', 'infrastructure', 'optimization')
+BIASED_WORDS = ('excellent', 'poor', 'terrible', 'amazing', 'awful')
+
+
+@dataclass
+class SurveyFeatures:
+    """Everything the rule handlers need, extracted from the survey in a single pass"""
+    question_count: int = 0
+    section_count: int = 0
+    has_sections: bool = False
+    question_types: Set[str] = field(default_factory=set)
+    option_counts: List[int] = field(default_factory=list)
+    text_lengths: List[int] = field(default_factory=list)
+    keyword_hits: Dict[str, int] = field(default_factory=dict)  # keyword -> number of questions containing it
+    double_barreled_count: int = 0
+    response_types: Set[str] = field(default_factory=set)
+
+    def has_keyword(self, *keywords: str) -> bool:
+        return any(keyword in self.keyword_hits for keyword in keywords)
+
+
+def extract_survey_features(survey_data: Optional[Dict[str, Any]]) -> SurveyFeatures:
+    """
+    Build the feature table for a survey in one pass over its questions
+
+    Args:
+        survey_data: Survey JSON in legacy (``questions``) or sectioned format
+
+    Returns:
+        SurveyFeatures used by every pillar rule
+    """
+    features = SurveyFeatures()
+    if not survey_data:
+        return features
+
+    features.has_sections = 'sections' in survey_data
+    if survey_data.get('questions'):
+        question_groups = [survey_data['questions']]
+    else:
+        question_groups = [section.get('questions', []) for section in survey_data.get('sections') or []]
+        features.section_count = len(question_groups)
+
+    for questions in question_groups:
+        for question in questions:
+            text = question.get('text', '')
+            lowered = text.lower()
+            features.question_count += 1
+            features.question_types.add(question.get('type', ''))
+            features.text_lengths.append(len(text))
+            if 'options' in question:
+                features.option_counts.append(len(question.get('options') or []))
+                features.response_types.add('multiple_choice')
+            elif 'scale' in lowered:
+                features.response_types.add('scale')
+            if ' and ' in text and '?' in text:
+                features.double_barreled_count += 1
+            for keyword in set(_KEYWORD_PATTERN.findall(lowered)):
+                features.keyword_hits[keyword] = features.keyword_hits.get(keyword, 0) + 1
+
+    return features
+
+
+class _PillarRulesCache:
+    """Process-wide cache of active pillar rules, loaded with one query and invalidated on SurveyRule writes"""
+
+    def __init__(self) -> None:
+        self._rules: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def get(self, db_session: Session) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            if self._rules is not None and time.monotonic() - self._loaded_at < settings.pillar_rules_cache_ttl_seconds:
+                return self._rules
+            generation = self.generation
+
+        rows = db_session.query(SurveyRule).filter(
+            SurveyRule.rule_type == 'pillar',
+            SurveyRule.is_active == True
+        ).all()
+        rules: Dict[str, List[Dict[str, Any]]] = {}
+        for rule in rows:
+            rules.setdefault(rule.category, []).append({
+                'id': str(rule.id),
+                'description': rule.rule_description,
+                'priority': rule.rule_content.get('priority', 'medium') if rule.rule_content else 'medium',
+                'evaluation_criteria': rule.rule_content.get('evaluation_criteria', []) if rule.rule_content else []
+            })
+
+        with self._lock:
+            # Don't keep rules loaded while a write invalidated the cache
+            if generation == self.generation:
+                self._rules = rules
+                self._loaded_at = time.monotonic()
+        return rules
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rules = None
+            self.generation += 1
+
+
+_pillar_rules_cache = _PillarRulesCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_pillar_rule_writes(session: Session, flush_context: Any) -> None:
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, SurveyRule):
+            session.info["pillar_rules_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_pillar_rule_commit(session: Session) -> None:
+    if session.info.pop("pillar_rules_dirty", False):
+        invalidate_pillar_rules_cache()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_pillar_rules_flag_on_rollback(session: Session) -> None:
+    session.info.pop("pillar_rules_dirty", None)
+
+
+def invalidate_pillar_rules_cache() -> None:
+    """Drop cached pillar rules (called automatically after SurveyRule commits)"""
+    _pillar_rules_cache.invalidate()
+
 @dataclass
 class PillarScore:
     """Individual pillar score with details"""
@@ -72,9 +219,12 @@ class PillarScoringService:
         pillar_scores = []
         total_weighted_score = 0.0
         
+        # Extract survey features once; every rule is evaluated against this table
+        features = extract_survey_features(survey_data)
+        
         # Evaluate each pillar
         for pillar_name, weight in self.pillar_weights.items():
-            pillar_score = self._evaluate_pillar(survey_data, pillar_name, weight)
+            pillar_score = self._evaluate_pillar(features, pillar_name, weight)
             pillar_scores.append(pillar_score)
             total_weighted_score += pillar_score.weighted_score
         
@@ -96,9 +246,9 @@ class PillarScoringService:
         logger.info(f"✅ [PillarScoring] Summary: {summary}")
         return result
     
-    def _evaluate_pillar(self, survey_data: Dict[str, Any], pillar_name: str, weight: float) -> PillarScore:
+    def _evaluate_pillar(self, features: SurveyFeatures, pillar_name: str, weight: float) -> PillarScore:
         """Evaluate a specific pillar"""
-        # Get pillar rules from database
+        # Get pillar rules (cached for all pillars)
         pillar_rules = self._get_pillar_rules(pillar_name)
         
         if not pillar_rules:
@@ -122,7 +272,7 @@ class PillarScoringService:
         recommendations = []
         
         for i, rule in enumerate(pillar_rules):
-            rule_evaluation = self._evaluate_rule(survey_data, rule, pillar_name)
+            rule_evaluation = self._evaluate_rule(features, rule, pillar_name)
             if rule_evaluation['met']:
                 criteria_met += 1
                 details.append(f"✅ {rule['description']}")
@@ -148,214 +298,147 @@ class PillarScoringService:
         )
     
     def _get_pillar_rules(self, pillar_name: str) -> List[Dict[str, Any]]:
-        """Get rules for a specific pillar from database"""
+        """Get rules for a specific pillar (served from the in-memory rules cache)"""
         try:
-            from src.database.models import SurveyRule
-            
-            rules = self.db_session.query(SurveyRule).filter(
-                SurveyRule.rule_type == 'pillar',
-                SurveyRule.category == pillar_name,
-                SurveyRule.is_active == True
-            ).all()
-            
-            return [
-                {
-                    'id': str(rule.id),
-                    'description': rule.rule_description,
-                    'priority': rule.rule_content.get('priority', 'medium') if rule.rule_content else 'medium',
-                    'evaluation_criteria': rule.rule_content.get('evaluation_criteria', []) if rule.rule_content else []
-                }
-                for rule in rules
-            ]
+            return _pillar_rules_cache.get(self.db_session).get(pillar_name, [])
         except Exception as e:
             logger.error(f"Error fetching pillar rules for {pillar_name}: {e}")
             return []
     
-    def _evaluate_rule(self, survey_data: Dict[str, Any], rule: Dict[str, Any], pillar_name: str) -> Dict[str, Any]:
-        """Evaluate a specific rule against the survey data"""
+    def _evaluate_rule(self, features: SurveyFeatures, rule: Dict[str, Any], pillar_name: str) -> Dict[str, Any]:
+        """Evaluate a specific rule against the precomputed survey features"""
         
         rule_description = rule['description'].lower()
         recommendations = []
         
         # Content Validity evaluation
         if pillar_name == 'content_validity':
-            return self._evaluate_content_validity(survey_data, rule_description, recommendations)
+            return self._evaluate_content_validity(features, rule_description, recommendations)
         
         # Methodological Rigor evaluation
         elif pillar_name == 'methodological_rigor':
-            return self._evaluate_methodological_rigor(survey_data, rule_description, recommendations)
+            return self._evaluate_methodological_rigor(features, rule_description, recommendations)
         
         # Clarity & Comprehensibility evaluation
         elif pillar_name == 'clarity_comprehensibility':
-            return self._evaluate_clarity_comprehensibility(survey_data, rule_description, recommendations)
+            return self._evaluate_clarity_comprehensibility(features, rule_description, recommendations)
         
         # Structural Coherence evaluation
         elif pillar_name == 'structural_coherence':
-            return self._evaluate_structural_coherence(survey_data, rule_description, recommendations)
+            return self._evaluate_structural_coherence(features, rule_description, recommendations)
         
         # Deployment Readiness evaluation
         elif pillar_name == 'deployment_readiness':
-            return self._evaluate_deployment_readiness(survey_data, rule_description, recommendations)
+            return self._evaluate_deployment_readiness(features, rule_description, recommendations)
         
         else:
             return {'met': False, 'recommendations': ['Unknown pillar type']}
     
-    def _evaluate_content_validity(self, survey_data: Dict[str, Any], rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
+    def _evaluate_content_validity(self, features: SurveyFeatures, rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
         """Evaluate content validity rules"""
-        questions = extract_all_questions(survey_data)
-        
         if 'research objective' in rule_description:
             # Check if questions address research objectives
-            has_objective_questions = any(
-                'objective' in q.get('text', '').lower() or 
-                'goal' in q.get('text', '').lower() or
-                'purpose' in q.get('text', '').lower()
-                for q in questions
-            )
+            has_objective_questions = features.has_keyword('objective', 'goal', 'purpose')
             if not has_objective_questions:
                 recommendations.append("Add questions that directly address research objectives")
             return {'met': has_objective_questions, 'recommendations': recommendations}
         
         elif 'comprehensive coverage' in rule_description:
             # Check for comprehensive question coverage
-            question_types = set(q.get('type', '') for q in questions)
-            has_variety = len(question_types) >= 3
+            has_variety = len(features.question_types) >= 3
             if not has_variety:
                 recommendations.append("Include more variety in question types for comprehensive coverage")
             return {'met': has_variety, 'recommendations': recommendations}
         
         elif 'business objective' in rule_description:
             # Check for business objective alignment
-            has_business_focus = any(
-                'business' in q.get('text', '').lower() or
-                'customer' in q.get('text', '').lower() or
-                'satisfaction' in q.get('text', '').lower()
-                for q in questions
-            )
+            has_business_focus = features.has_keyword('business', 'customer', 'satisfaction')
             if not has_business_focus:
                 recommendations.append("Include questions that translate business objectives into measurable constructs")
             return {'met': has_business_focus, 'recommendations': recommendations}
         
         return {'met': True, 'recommendations': recommendations}
     
-    def _evaluate_methodological_rigor(self, survey_data: Dict[str, Any], rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
+    def _evaluate_methodological_rigor(self, features: SurveyFeatures, rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
         """Evaluate methodological rigor rules"""
-        questions = extract_all_questions(survey_data)
-        
         if 'leading' in rule_description or 'loaded' in rule_description:
             # Check for leading questions
-            has_leading_questions = any(
-                any(bias_word in q.get('text', '').lower() for bias_word in [
-                    'don\'t you think', 'wouldn\'t you agree', 'isn\'t it true', 'obviously'
-                ])
-                for q in questions
-            )
+            has_leading_questions = features.has_keyword(*LEADING_PHRASES)
             if has_leading_questions:
                 recommendations.append("Remove leading or loaded language from questions")
             return {'met': not has_leading_questions, 'recommendations': recommendations}
         
         elif 'logical sequence' in rule_description:
             # Check question flow
-            has_flow = len(questions) > 0
+            has_flow = features.question_count > 0
             if not has_flow:
                 recommendations.append("Ensure questions follow logical sequence from general to specific")
             return {'met': has_flow, 'recommendations': recommendations}
         
         elif 'screening' in rule_description:
             # Check for screening questions
-            has_screening = any(
-                'screening' in q.get('text', '').lower() or
-                'qualify' in q.get('text', '').lower() or
-                'eligible' in q.get('text', '').lower()
-                for q in questions
-            )
+            has_screening = features.has_keyword('screening', 'qualify', 'eligible')
             if not has_screening:
                 recommendations.append("Include screening questions early in the survey")
             return {'met': has_screening, 'recommendations': recommendations}
         
         return {'met': True, 'recommendations': recommendations}
     
-    def _evaluate_clarity_comprehensibility(self, survey_data: Dict[str, Any], rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
+    def _evaluate_clarity_comprehensibility(self, features: SurveyFeatures, rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
         """Evaluate clarity and comprehensibility rules"""
-        questions = extract_all_questions(survey_data)
-        
         if 'jargon' in rule_description or 'technical' in rule_description:
             # Check for jargon
-            has_jargon = any(
-                any(tech_word in q.get('text', '').lower() for tech_word in [
-                    'algorithm', 'api', 'database', 'infrastructure', 'optimization'
-                ])
-                for q in questions
-            )
+            has_jargon = features.has_keyword(*JARGON_WORDS)
             if has_jargon:
                 recommendations.append("Replace technical jargon with simple, clear language")
             return {'met': not has_jargon, 'recommendations': recommendations}
         
         elif 'single concept' in rule_description:
             # Check for single-concept questions
-            has_double_barreled = any(
-                ' and ' in q.get('text', '') and '?' in q.get('text', '')
-                for q in questions
-            )
+            has_double_barreled = features.double_barreled_count > 0
             if has_double_barreled:
                 recommendations.append("Split double-barreled questions into single-concept questions")
             return {'met': not has_double_barreled, 'recommendations': recommendations}
         
         elif 'neutral' in rule_description or 'unambiguous' in rule_description:
             # Check for neutral wording
-            has_biased_wording = any(
-                any(bias_word in q.get('text', '').lower() for bias_word in [
-                    'excellent', 'poor', 'terrible', 'amazing', 'awful'
-                ])
-                for q in questions
-            )
+            has_biased_wording = features.has_keyword(*BIASED_WORDS)
             if has_biased_wording:
                 recommendations.append("Use neutral, unambiguous language in questions")
             return {'met': not has_biased_wording, 'recommendations': recommendations}
         
         return {'met': True, 'recommendations': recommendations}
     
-    def _evaluate_structural_coherence(self, survey_data: Dict[str, Any], rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
+    def _evaluate_structural_coherence(self, features: SurveyFeatures, rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
         """Evaluate structural coherence rules"""
-        questions = extract_all_questions(survey_data)
-        
         if 'logical progression' in rule_description:
             # Check for logical flow
-            has_sections = (survey_data and 'sections' in survey_data) or len(questions) > 0
+            has_sections = features.has_sections or features.question_count > 0
             if not has_sections:
                 recommendations.append("Organize questions into logical sections with clear progression")
             return {'met': has_sections, 'recommendations': recommendations}
         
         elif 'grouped together' in rule_description:
             # Check for question grouping
-            has_grouping = len(questions) > 0  # Basic check
+            has_grouping = features.question_count > 0  # Basic check
             if not has_grouping:
                 recommendations.append("Group related questions together")
             return {'met': has_grouping, 'recommendations': recommendations}
         
         elif 'consistent' in rule_description and 'scale' in rule_description:
             # Check for consistent response scales
-            response_types = set()
-            for q in questions:
-                if 'options' in q:
-                    response_types.add('multiple_choice')
-                elif 'scale' in q.get('text', '').lower():
-                    response_types.add('scale')
-            
-            has_consistency = len(response_types) <= 2  # Allow some variety
+            has_consistency = len(features.response_types) <= 2  # Allow some variety
             if not has_consistency:
                 recommendations.append("Use consistent response scales within question groups")
             return {'met': has_consistency, 'recommendations': recommendations}
         
         return {'met': True, 'recommendations': recommendations}
     
-    def _evaluate_deployment_readiness(self, survey_data: Dict[str, Any], rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
+    def _evaluate_deployment_readiness(self, features: SurveyFeatures, rule_description: str, recommendations: List[str]) -> Dict[str, Any]:
         """Evaluate deployment readiness rules"""
-        questions = extract_all_questions(survey_data)
-        
         if 'appropriate length' in rule_description:
             # Check survey length
-            question_count = len(questions)
+            question_count = features.question_count
             is_appropriate_length = 5 <= question_count <= 25
             if not is_appropriate_length:
                 recommendations.append(f"Adjust survey length (current: {question_count} questions, recommended: 5-25)")
@@ -363,23 +446,14 @@ class PillarScoringService:
         
         elif 'realistic' in rule_description and 'sample' in rule_description:
             # Check for realistic sample size considerations
-            has_sample_info = any(
-                'sample' in q.get('text', '').lower() or
-                'respondents' in q.get('text', '').lower()
-                for q in questions
-            )
+            has_sample_info = features.has_keyword('sample', 'respondents')
             if not has_sample_info:
                 recommendations.append("Consider sample size requirements in survey design")
             return {'met': has_sample_info, 'recommendations': recommendations}
         
         elif 'compliance' in rule_description or 'privacy' in rule_description:
             # Check for compliance considerations
-            has_compliance = any(
-                'privacy' in q.get('text', '').lower() or
-                'consent' in q.get('text', '').lower() or
-                'confidential' in q.get('text', '').lower()
-                for q in questions
-            )
+            has_compliance = features.has_keyword('privacy', 'consent', 'confidential')
             if not has_compliance:
                 recommendations.append("Include privacy and compliance considerations")
             return {'met': has_compliance, 'recommendations': recommendations}
@@ -0,0 +1,261 @@
+"""
+Progress bus for WebSocket fan-out.
+
+Every WebSocket gets a bounded send queue drained by its own writer task, so a
+slow client never delays the others. Pending snapshot-style messages (progress
+percentages, streaming content updates) are coalesced to the latest one of the
+same type instead of building a backlog. Messages are published through Redis pub/sub when
+available so clients connected to any uvicorn worker receive progress for
+workflows running on another; without Redis delivery stays in-process.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from fastapi import WebSocket
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Message types that describe current state; only the latest pending one of each type matters
+COALESCIBLE_MESSAGE_TYPES = {"progress", "llm_content_update", "model_loading"}
+
+CHANNEL_PREFIX = "survey_progress:"
+
+
+class _ConnectionWriter:
+    """Owns one WebSocket's send queue and the task that drains it."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        workflow_id: str,
+        max_pending: int,
+        send_timeout: float,
+        bus: "ProgressBus",
+    ) -> None:
+        self.websocket = websocket
+        self.workflow_id = workflow_id
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+        self.bus = bus
+        self.pending: Deque[Tuple[Optional[str], str]] = deque()
+        self.coalesced = 0
+        self.dropped = 0
+        self._wakeup = asyncio.Event()
+        self.task = asyncio.create_task(self._run())
+
+    def enqueue(self, payload: str, coalesce_key: Optional[str]) -> None:
+        if coalesce_key is not None:
+            # Replace the pending snapshot of the same type with the newer one
+            for index, (pending_key, _) in enumerate(self.pending):
+                if pending_key == coalesce_key:
+                    del self.pending[index]
+                    self.coalesced += 1
+                    break
+        if len(self.pending) >= self.max_pending:
+            # Only snapshot messages may be dropped; messages that must all be delivered
+            # (completion, errors, ...) are kept even if the queue grows past max_pending
+            evictable = next((index for index, (pending_key, _) in enumerate(self.pending) if pending_key is not None), None)
+            if evictable is not None:
+                del self.pending[evictable]
+                self.dropped += 1
+            elif coalesce_key is not None:
+                self.dropped += 1
+                return
+        self.pending.append((coalesce_key, payload))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                while not self.pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                _, payload = self.pending.popleft()
+                await asyncio.wait_for(self.websocket.send_text(payload), timeout=self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ [ProgressBus] Dropping connection for workflow_id={self.workflow_id}: {str(e)}")
+            self.bus.disconnect(self.websocket, self.workflow_id)
+
+    def close(self) -> None:
+        if not self.task.done():
+            self.task.cancel()
+
+
+class ProgressBus:
+    """
+    WebSocket connection registry with per-connection writers and cross-worker delivery.
+
+    Keeps the ``connect`` / ``disconnect`` / ``send_progress`` /
+    ``broadcast_to_workflow`` interface of the original connection manager.
+    """
+
+    def __init__(
+        self,
+        max_pending: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+    ) -> None:
+        self.active_connections: Dict[str, List[WebSocket]] = {}
+        self._writers: Dict[int, _ConnectionWriter] = {}
+        self.max_pending = max_pending or settings.progress_send_queue_size
+        self.send_timeout = send_timeout or settings.progress_send_timeout_seconds
+        self._redis: Any = None
+        self._pubsub: Any = None
+        self._listener_task: Optional[asyncio.Task] = None
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self._redis is not None else "memory"
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Connect to Redis pub/sub if configured; otherwise stay in-memory."""
+        if settings.progress_bus_backend == "memory" or self._redis is not None:
+            logger.info(f"📡 [ProgressBus] Using {self.backend} backend")
+            return
+
+        try:
+            import redis.asyncio as redis_asyncio
+
+            client = redis_asyncio.from_url(settings.redis_url)
+            await client.ping()
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            self._redis = client
+            self._pubsub = pubsub
+            self._listener_task = asyncio.create_task(self._listen())
+            logger.info("📡 [ProgressBus] Using Redis pub/sub backend for cross-worker progress")
+        except Exception as e:
+            if settings.progress_bus_backend == "redis":
+                logger.error(f"❌ [ProgressBus] Redis backend required but unavailable: {str(e)}")
+            else:
+                logger.info(f"📡 [ProgressBus] Redis unavailable ({str(e)}), using in-memory backend")
+            self._redis = None
+            self._pubsub = None
+
+    async def stop(self) -> None:
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+        for writer in list(self._writers.values()):
+            writer.close()
+        self._writers.clear()
+        try:
+            if self._pubsub is not None:
+                await self._pubsub.aclose()
+            if self._redis is not None:
+                await self._redis.aclose()
+        except Exception as e:
+            logger.debug(f"[ProgressBus] Error closing Redis connections: {str(e)}")
+        finally:
+            self._pubsub = None
+            self._redis = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode("utf-8")
+                    payload = message["data"]
+                    if isinstance(payload, bytes):
+                        payload = payload.decode("utf-8")
+                    workflow_id = channel[len(CHANNEL_PREFIX):]
+                    self._deliver_local(workflow_id, payload, self._payload_coalesce_key(payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ [ProgressBus] Redis listener error, retrying: {str(e)}")
+                await asyncio.sleep(1)
+
+    # ------------------------------------------------------------------
+    # Connection registry
+    # ------------------------------------------------------------------
+
+    async def connect(self, websocket: WebSocket, workflow_id: str) -> None:
+        await websocket.accept()
+        self.active_connections.setdefault(workflow_id, []).append(websocket)
+        self._writers[id(websocket)] = _ConnectionWriter(
+            websocket, workflow_id, self.max_pending, self.send_timeout, self
+        )
+        logger.info(f"🔌 [WebSocket] Connection established for workflow_id={workflow_id}. Total active: {len(self.active_connections[workflow_id])}")
+
+    def disconnect(self, websocket: WebSocket, workflow_id: str) -> None:
+        connections = self.active_connections.get(workflow_id)
+        if connections and websocket in connections:
+            connections.remove(websocket)
+            if not connections:
+                del self.active_connections[workflow_id]
+        writer = self._writers.pop(id(websocket), None)
+        if writer is not None:
+            writer.close()
+        logger.info(f"🔌 [WebSocket] Connection closed for workflow_id={workflow_id}")
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    async def send_progress(self, workflow_id: str, message: Dict[str, Any]) -> None:
+        """Publish a message to every client of a workflow on any worker."""
+        payload = json.dumps(message)
+        coalesce_key = self._coalesce_key(message)
+
+        if self._redis is not None:
+            try:
+                # Our own subscription delivers to local clients as well
+                await self._redis.publish(f"{CHANNEL_PREFIX}{workflow_id}", payload)
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ [ProgressBus] Redis publish failed, delivering locally: {str(e)}")
+
+        self._deliver_local(workflow_id, payload, coalesce_key)
+
+    async def broadcast_to_workflow(self, workflow_id: str, message: Dict[str, Any]) -> None:
+        """Alias for send_progress for compatibility with workflow service"""
+        await self.send_progress(workflow_id, message)
+
+    def send_local(self, workflow_id: str, message: Dict[str, Any]) -> None:
+        """Deliver only to clients connected to this worker (e.g. per-process model loading status)."""
+        self._deliver_local(workflow_id, json.dumps(message), self._coalesce_key(message))
+
+    def _deliver_local(self, workflow_id: str, payload: str, coalesce_key: Optional[str]) -> None:
+        for websocket in self.active_connections.get(workflow_id, []):
+            writer = self._writers.get(id(websocket))
+            if writer is not None:
+                writer.enqueue(payload, coalesce_key)
+
+    @staticmethod
+    def _coalesce_key(message: Dict[str, Any]) -> Optional[str]:
+        """Message type for snapshot-style messages, None for messages that must all be delivered"""
+        message_type = message.get("type")
+        return message_type if message_type in COALESCIBLE_MESSAGE_TYPES else None
+
+    @classmethod
+    def _payload_coalesce_key(cls, payload: str) -> Optional[str]:
+        try:
+            return cls._coalesce_key(json.loads(payload))
+        except (ValueError, AttributeError):
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "workflows": len(self.active_connections),
+            "connections": len(self._writers),
+            "pending_messages": sum(len(writer.pending) for writer in self._writers.values()),
+            "coalesced_messages": sum(writer.coalesced for writer in self._writers.values()),
+            "dropped_messages": sum(writer.dropped for writer in self._writers.values()),
+        }
@@ -7,7 +7,9 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 import json
 import logging
+from src.config import settings
 from src.services.annotation_insights_service import AnnotationInsightsService
+from src.services.prompt_token_budget import PromptTokenBudgeter, get_token_counter
 
 logger = logging.getLogger(__name__)
 
@@ -2449,6 +2451,12 @@ class PromptBuilder:
             output_module
         ]
 
+        # Fit the modules into the input token budget (trims golden lists, feedback digest, taxonomy)
+        target_model = generation_config.get("model") or settings.generation_model
+        budgeter = PromptTokenBudgeter(get_token_counter(target_model), settings.prompt_input_token_budget)
+        token_report = budgeter.fit(modules)
+        context["prompt_token_usage"] = token_report
+
         # Format each module and combine
         prompt_parts = []
         for module in sorted(modules, key=lambda m: m.order):
@@ -2459,8 +2467,13 @@ class PromptBuilder:
 
         final_prompt = "\n".join(prompt_parts).strip()
 
-        logger.info(f"✅ [PromptBuilder] Generated modular prompt: {len(final_prompt)} chars")
-        logger.info(f"📊 [PromptBuilder] Modules: Role, Inputs, Instructions, Examples, Output")
+        logger.info(
+            f"✅ [PromptBuilder] Generated modular prompt: {len(final_prompt)} chars, "
+            f"{token_report['tokens_after']} tokens ({token_report['tokenizer']}, budget {token_report['budget_tokens']})"
+        )
+        for module_name, usage in token_report["modules"].items():
+            trimmed = f", trimmed {usage['trimmed_sections']}" if usage["trimmed_sections"] else ""
+            logger.info(f"📊 [PromptBuilder]   {module_name}: {usage['tokens']} → {usage['tokens_after']} tokens{trimmed}")
 
         return final_prompt
 
@@ -3456,6 +3469,8 @@ class PromptBuilder:
         Build optimized regeneration section for surgical mode
         Only includes context for sections being regenerated to minimize prompt size
         """
+        from src.workflows.state import RegenerationMode
+
         # Determine mode name for display
         mode_name = "SURGICAL" if context.get("regeneration_mode_type") == RegenerationMode.SURGICAL else "TARGETED"
         mode_emoji = "🔬" if context.get("regeneration_mode_type") == RegenerationMode.SURGICAL else "🎯"
@@ -3631,10 +3646,110 @@ class PromptBuilder:
         ])
         
         logger.info(f"🔬 [PromptBuilder] Built {mode_name.lower()} regeneration section: {len(surgical_analysis['sections_to_regenerate'])} sections to regenerate")
-        
+
         return PromptSection(
             title="2.5 Regeneration Context and Improvement Requirements",
             content=content,
             order=2.5,
             required=False
-        )
\ No newline at end of file
+        )
+
+    def build_section_regeneration_prompt(self, context: Dict[str, Any], section_id: Any) -> str:
+        """
+        Build a small prompt that regenerates a single section of a surgical/targeted regeneration
+
+        The prompt carries the encoded survey (for style and flow), the previous version of this
+        section and only the feedback that applies to it, so each section can be generated by its
+        own concurrent LLM call.
+
+        Args:
+            context: Generation context from ContextBuilderNode, including regeneration fields
+            section_id: ID of the section to regenerate
+
+        Returns:
+            Prompt asking for ``{"sections": [<section>], "comments_addressed": [...]}``
+        """
+        surgical_analysis = context.get("surgical_analysis") or {}
+        previous_survey_encoded = context.get("previous_survey_encoded")
+        previous_survey_json = context.get("previous_survey_json") or {}
+        annotation_feedback_summary = context.get("annotation_feedback_summary")
+        rfq_details = context.get("rfq_details") or {}
+
+        previous_section = next(
+            (s for s in previous_survey_json.get("sections", []) if s.get("id") == section_id),
+            None
+        )
+        section_question_ids = {q.get("id") for q in (previous_section or {}).get("questions", [])}
+
+        # Narrow the analysis and question feedback to this section only
+        all_section_ids = surgical_analysis.get("sections_to_regenerate", []) + surgical_analysis.get("sections_to_preserve", [])
+        section_analysis = {
+            "sections_to_regenerate": [section_id],
+            "sections_to_preserve": [sid for sid in all_section_ids if sid != section_id],
+            "regeneration_rationale": {
+                section_id: surgical_analysis.get("regeneration_rationale", {}).get(section_id, [])
+            },
+            "regeneration_percentage": 100 / len(all_section_ids) if all_section_ids else 100
+        }
+        section_feedback_summary = None
+        if annotation_feedback_summary:
+            question_feedback = annotation_feedback_summary.get("question_feedback", {})
+            section_feedback_summary = {
+                **annotation_feedback_summary,
+                "question_feedback": {
+                    **question_feedback,
+                    "questions_with_feedback": [
+                        qf for qf in question_feedback.get("questions_with_feedback", [])
+                        if qf.get("question_id") in section_question_ids
+                    ]
+                }
+            }
+
+        section_name = self._get_section_name(section_id)
+        content = [
+            "# Expert Survey Designer and Market Research Specialist",
+            "",
+            f"Regenerate ONLY {section_name} (Section {section_id}) of an existing survey.",
+            "",
+            "## RFQ:",
+            rfq_details.get("text") or "",
+            ""
+        ]
+
+        if previous_survey_encoded:
+            content.extend([
+                "## Current Survey Structure (encoded):",
+                json.dumps(previous_survey_encoded, ensure_ascii=False),
+                ""
+            ])
+
+        if previous_section:
+            content.extend([
+                f"## Previous Version of Section {section_id}:",
+                json.dumps(previous_section, ensure_ascii=False),
+                ""
+            ])
+
+        regeneration_section = self._build_surgical_regeneration_section(
+            context, section_analysis, previous_survey_encoded, section_feedback_summary, previous_survey_json
+        )
+        content.extend(regeneration_section.content)
+
+        content.extend([
+            "## OUTPUT FORMAT:",
+            "Return a single JSON object and nothing else:",
+            json.dumps({
+                "sections": [{
+                    "id": section_id,
+                    "title": (previous_section or {}).get("title", section_name),
+                    "description": "...",
+                    "questions": ["<questions in the same schema as the previous version>"]
+                }],
+                "comments_addressed": ["COMMENT-..."]
+            }, ensure_ascii=False),
+            f"The 'sections' array must contain exactly one section with id {section_id}."
+        ])
+
+        prompt = "\n".join(content)
+        logger.info(f"🔬 [PromptBuilder] Built section {section_id} regeneration prompt ({len(prompt)} chars)")
+        return prompt
\ No newline at end of file
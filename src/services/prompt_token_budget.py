@@ -0,0 +1,181 @@
+"""
+Prompt Token Budget
+Tokenizer-accurate token counting and budget-driven trimming of PromptBuilder modules.
+
+Each prompt module has a priority and a minimum share of the input budget. When the
+assembled prompt is over budget, trimmable sections (golden question/section lists,
+the feedback digest, the QNR taxonomy) of the lowest-priority modules are cut back
+line by line, never below the module's minimum share.
+
+Token counts use a local ``tokenizer.json`` for the target model (see
+``PROMPT_TOKENIZER_DIR``); without one, a ~4 characters/token estimate is used.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import settings
+from src.services.llm_gateway import estimate_tokens
+
+try:
+    from tokenizers import Tokenizer
+    TOKENIZERS_AVAILABLE = True
+except ImportError:
+    Tokenizer = None
+    TOKENIZERS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModuleBudget:
+    """Budget policy for one prompt module (keyed by ``PromptModule.order``)"""
+    priority: int  # Higher priority modules are trimmed last
+    min_share: float  # Fraction of the input budget the module keeps if it needs it
+    trimmable_sections: List[str] = field(default_factory=list)  # Trimmed in this order
+
+
+MODULE_BUDGETS: Dict[int, ModuleBudget] = {
+    1: ModuleBudget(priority=4, min_share=0.02),  # Role
+    2: ModuleBudget(priority=4, min_share=0.25),  # Inputs (RFQ, regeneration context)
+    3: ModuleBudget(priority=2, min_share=0.30, trimmable_sections=[
+        "3.5 Additional Feedback from Reviews",  # Feedback digest
+        "Survey Requirements & Question Types",  # QNR taxonomy is the tail of this section
+    ]),
+    4: ModuleBudget(priority=1, min_share=0.05, trimmable_sections=[
+        "golden_questions",
+        "golden_sections",
+        "golden_examples",
+    ]),
+    5: ModuleBudget(priority=3, min_share=0.10),  # Output format
+}
+
+# Lines kept at the top of a trimmed section (its heading and intro)
+MIN_SECTION_LINES = 4
+
+
+def _tokenizer_file(model: str) -> Optional[str]:
+    """``<dir>/<owner>__<model>.json`` (version suffix stripped), falling back to ``<dir>/default.json``"""
+    directory = settings.prompt_tokenizer_dir
+    name = model.split(":", 1)[0].replace("/", "__")
+    for candidate in (f"{name}.json", "default.json"):
+        path = os.path.join(directory, candidate)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+class TokenCounter:
+    """Counts tokens with the target model's local tokenizer (or a character estimate)"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._tokenizer = None
+        path = _tokenizer_file(model) if TOKENIZERS_AVAILABLE else None
+        if path:
+            try:
+                self._tokenizer = Tokenizer.from_file(path)
+                logger.info(f"✅ [PromptTokenBudget] Loaded tokenizer for {model} from {path}")
+            except Exception as e:
+                logger.warning(f"⚠️ [PromptTokenBudget] Failed to load tokenizer {path}: {e}")
+        if self._tokenizer is None:
+            logger.info(f"ℹ️ [PromptTokenBudget] No local tokenizer for {model}, estimating ~4 chars/token")
+
+    @property
+    def exact(self) -> bool:
+        return self._tokenizer is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._tokenizer is not None:
+            return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+        return max(1, estimate_tokens(text))
+
+
+@lru_cache(maxsize=8)
+def get_token_counter(model: str) -> TokenCounter:
+    return TokenCounter(model)
+
+
+class PromptTokenBudgeter:
+    """Fits PromptBuilder modules into an input token budget"""
+
+    def __init__(self, counter: TokenCounter, budget_tokens: int):
+        self.counter = counter
+        self.budget_tokens = budget_tokens
+
+    def _section_tokens(self, content: List[str]) -> int:
+        return self.counter.count("\n".join(content))
+
+    def _trim_section(self, section, max_tokens: int) -> int:
+        """Keep the leading lines of ``section`` that fit ``max_tokens``; returns tokens removed"""
+        before = self._section_tokens(section.content)
+        kept: List[str] = []
+        used = 0
+        for index, line in enumerate(section.content):
+            line_tokens = self.counter.count(line) + 1
+            if index >= MIN_SECTION_LINES and used + line_tokens > max_tokens:
+                omitted = len(section.content) - index
+                kept.append(f"(... {omitted} more lines omitted to fit the prompt token budget)")
+                break
+            kept.append(line)
+            used += line_tokens
+        section.content = kept
+        return max(0, before - self._section_tokens(kept))
+
+    def fit(self, modules: List[Any]) -> Dict[str, Any]:
+        """
+        Trim lower-priority content in place until the modules fit the budget
+
+        Args:
+            modules: PromptModule instances (modified in place)
+
+        Returns:
+            Report with per-module token usage before/after, trimmed sections and totals
+        """
+        module_tokens = {module.order: self.counter.count(module.format_output()) for module in modules}
+        total = sum(module_tokens.values())
+        report = {
+            "budget_tokens": self.budget_tokens,
+            "tokens_before": total,
+            "tokenizer": "exact" if self.counter.exact else "estimate",
+            "modules": {
+                module.name: {"tokens": module_tokens[module.order], "trimmed_sections": []} for module in modules
+            },
+        }
+
+        overflow = total - self.budget_tokens if self.budget_tokens > 0 else 0
+        by_priority = sorted(modules, key=lambda m: MODULE_BUDGETS.get(m.order, ModuleBudget(0, 0.0)).priority)
+        for module in by_priority:
+            if overflow <= 0:
+                break
+            policy = MODULE_BUDGETS.get(module.order)
+            if policy is None or not policy.trimmable_sections:
+                continue
+            floor = int(policy.min_share * self.budget_tokens)
+            allowance = min(overflow, module_tokens[module.order] - floor)
+            sections = {section.title: section for section in module.sections}
+            for title in policy.trimmable_sections:
+                section = sections.get(title)
+                if allowance <= 0 or section is None:
+                    continue
+                section_tokens = self._section_tokens(section.content)
+                removed = self._trim_section(section, section_tokens - allowance)
+                if removed:
+                    allowance -= removed
+                    overflow -= removed
+                    report["modules"][module.name]["trimmed_sections"].append(title)
+
+        for module in modules:
+            report["modules"][module.name]["tokens_after"] = self.counter.count(module.format_output())
+        report["tokens_after"] = sum(entry["tokens_after"] for entry in report["modules"].values())
+        if self.budget_tokens > 0 and report["tokens_after"] > self.budget_tokens:
+            logger.warning(
+                f"⚠️ [PromptTokenBudget] Prompt still {report['tokens_after']} tokens after trimming "
+                f"(budget {self.budget_tokens}); remaining content is required"
+            )
+        return report
@@ -12,7 +12,6 @@ from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 
 from .quality_regression_service import QualityRegressionService, QualityMetrics
-from ..database.quality_models import QualityMetrics as QualityMetricsDB
 from ..database.connection import get_db
 
 logger = logging.getLogger(__name__)
@@ -32,13 +31,13 @@ class QualityIntegrationService:
         try:
             logger.info(f"📊 [QualityIntegration] Recording generation quality for survey: {survey_data.get('survey_id', 'unknown')}")
 
-            # Record metrics using the quality service
+            # Record metrics using the quality service; it persists the row and updates baselines
+            generation_context = {
+                **generation_context,
+                'rfq_complexity_score': self._calculate_rfq_complexity(generation_context)
+            }
             await self.quality_service.record_quality_metrics(survey_data, generation_context)
 
-            # Store in database if session available
-            if self.db_session:
-                await self._store_quality_metrics_db(survey_data, generation_context)
-
             logger.info(f"✅ [QualityIntegration] Quality metrics recorded successfully")
 
         except Exception as e:
@@ -132,80 +131,6 @@ class QualityIntegrationService:
             logger.error(f"❌ [QualityIntegration] Failed to check/update baselines: {str(e)}", exc_info=True)
             return False
 
-    async def _store_quality_metrics_db(self, survey_data: Dict[str, Any],
-                                      generation_context: Dict[str, Any]) -> None:
-        """Store quality metrics directly in database"""
-        try:
-            pillar_scores = survey_data.get('pillar_scores', {})
-            survey = survey_data.get('survey', {})
-
-            # Create database record
-            metrics_record = QualityMetricsDB(
-                survey_id=survey_data.get('survey_id'),
-                workflow_id=generation_context.get('workflow_id', ''),
-                overall_grade=pillar_scores.get('overall_grade', 'F'),
-                weighted_score=pillar_scores.get('weighted_score', 0.0),
-                confidence_score=survey.get('confidence_score'),
-                pillar_scores=pillar_scores.get('pillar_breakdown', {}),
-                generation_time_seconds=generation_context.get('generation_time_seconds'),
-                golden_similarity=generation_context.get('golden_similarity'),
-                methodology_compliance=self._check_methodology_compliance(survey_data),
-                error_count=len(generation_context.get('errors', [])),
-                methodology_tags=survey.get('methodologies', []),
-                rfq_complexity_score=self._calculate_rfq_complexity(generation_context)
-            )
-
-            self.db_session.add(metrics_record)
-            self.db_session.commit()
-
-            logger.debug(f"📊 [QualityIntegration] Quality metrics stored in database")
-
-        except Exception as e:
-            logger.error(f"❌ [QualityIntegration] Failed to store metrics in DB: {str(e)}", exc_info=True)
-            if self.db_session:
-                self.db_session.rollback()
-
-    def _check_methodology_compliance(self, survey_data: Dict[str, Any]) -> bool:
-        """Check methodology compliance for the survey"""
-        try:
-            survey = survey_data.get('survey', {})
-            methodologies = survey.get('methodologies', [])
-            sections = survey.get('sections', [])
-
-            if not sections:
-                return False
-
-            # Count total questions
-            total_questions = sum(len(section.get('questions', [])) for section in sections)
-            if total_questions < 3:
-                return False
-
-            # Check methodology-specific requirements
-            for methodology in methodologies:
-                if methodology == 'van_westendorp':
-                    pricing_questions = sum(
-                        1 for section in sections
-                        for q in section.get('questions', [])
-                        if q.get('methodology') == 'van_westendorp'
-                    )
-                    if pricing_questions != 4:
-                        return False
-
-                elif methodology == 'nps':
-                    nps_questions = sum(
-                        1 for section in sections
-                        for q in section.get('questions', [])
-                        if q.get('methodology') == 'nps'
-                    )
-                    if nps_questions == 0:
-                        return False
-
-            return True
-
-        except Exception as e:
-            logger.error(f"❌ [QualityIntegration] Error checking methodology compliance: {str(e)}")
-            return False
-
     def _calculate_rfq_complexity(self, generation_context: Dict[str, Any]) -> float:
         """Calculate complexity score for the RFQ"""
         try:
@@ -8,15 +8,74 @@ in generation quality, pillar scores, and overall system performance.
 import logging
 import json
 import asyncio
+import math
+import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
-from statistics import mean, stdev
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import case, func, desc
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.database.quality_models import (
+    QualityBaselines,
+    QualityMetrics as QualityMetricsDB,
+    RegressionAlerts,
+)
 
 logger = logging.getLogger(__name__)
 
+# Baseline metric name -> (quality_metrics column, whether only positive values are sampled)
+BASELINE_METRIC_COLUMNS = {
+    'overall_score': (QualityMetricsDB.weighted_score, False),
+    'generation_time': (QualityMetricsDB.generation_time_seconds, True),
+    'golden_similarity': (QualityMetricsDB.golden_similarity, True),
+    'confidence_score': (QualityMetricsDB.confidence_score, True),
+    'error_rate': (QualityMetricsDB.error_count, False),
+}
+
+# Baselines with fewer samples are not used for regression detection
+MIN_BASELINE_SAMPLES = 10
+
+# Affected survey IDs attached to an alert
+ALERT_SURVEY_ID_LIMIT = 100
+
+
+def welford_update(baseline_mean: float, baseline_std: float, sample_size: int, value: float) -> Tuple[float, float, int]:
+    """
+    Add one sample to a running mean/sample standard deviation (Welford's algorithm)
+
+    The sum of squared deviations is recovered from the stored sample std, so only
+    mean, std and sample size need to be persisted.
+
+    Returns:
+        (mean, std, sample_size) including ``value``
+    """
+    m2 = (baseline_std ** 2) * (sample_size - 1) if sample_size > 1 else 0.0
+    sample_size += 1
+    delta = value - baseline_mean
+    baseline_mean += delta / sample_size
+    m2 += delta * (value - baseline_mean)
+    baseline_std = math.sqrt(max(m2, 0.0) / (sample_size - 1)) if sample_size > 1 else 0.0
+    return baseline_mean, baseline_std, sample_size
+
+
+def _sampled_metric_values(metrics: "QualityMetrics") -> Dict[str, float]:
+    """Values of ``metrics`` that count towards each baseline"""
+    values = {}
+    for metric_name, (column, positive_only) in BASELINE_METRIC_COLUMNS.items():
+        value = getattr(metrics, column.key, None)
+        if value is None or (positive_only and value <= 0):
+            continue
+        values[metric_name] = float(value)
+    return values
+
+
+def _sampled_column(metric_name: str):
+    """SQL expression for a baseline metric that is NULL for unsampled rows"""
+    column, positive_only = BASELINE_METRIC_COLUMNS[metric_name]
+    return case((column > 0, column), else_=None) if positive_only else column
+
 
 @dataclass
 class QualityMetrics:
@@ -100,8 +159,13 @@ class QualityRegressionService:
                 workflow_id=generation_context.get('workflow_id', '')
             )
 
-            # Store metrics in database
-            await self._store_quality_metrics(metrics)
+            # Store metrics in database and fold them into the running baselines
+            await self._store_quality_metrics(
+                metrics,
+                raw_pillar_scores=pillar_scores.get('pillar_breakdown', {}),
+                methodology_tags=survey_data.get('survey', {}).get('methodologies', []),
+                rfq_complexity_score=generation_context.get('rfq_complexity_score')
+            )
 
             logger.info(f"✅ [QualityRegression] Quality metrics recorded: score={metrics.weighted_score:.3f}, grade={metrics.overall_grade}")
             return metrics
@@ -115,10 +179,11 @@ class QualityRegressionService:
         try:
             logger.info(f"🔍 [QualityRegression] Starting regression detection for last {lookback_hours} hours")
 
-            # Get recent metrics
-            recent_metrics = await self._get_recent_metrics(lookback_hours)
-            if len(recent_metrics) < 5:
-                logger.info(f"⚠️ [QualityRegression] Insufficient data for regression detection: {len(recent_metrics)} samples")
+            # Per-metric window statistics, aggregated in SQL
+            recent_stats = await self._get_recent_metric_stats(lookback_hours)
+            sample_count = recent_stats.pop('_total', {}).get('count', 0)
+            if sample_count < 5:
+                logger.info(f"⚠️ [QualityRegression] Insufficient data for regression detection: {sample_count} samples")
                 return []
 
             # Get baselines
@@ -129,11 +194,19 @@ class QualityRegressionService:
                 return []
 
             alerts = []
+            survey_ids = None
 
             # Check each metric type
             for metric_name, baseline in baselines.items():
+                if baseline.sample_size < MIN_BASELINE_SAMPLES:
+                    continue
+                stats = recent_stats.get(metric_name)
+                if not stats or not stats['count']:
+                    continue
+                if survey_ids is None:
+                    survey_ids = await self._get_recent_survey_ids(lookback_hours)
                 alert = await self._check_metric_regression(
-                    metric_name, recent_metrics, baseline
+                    metric_name, stats['mean'], stats['count'], baseline, survey_ids
                 )
                 if alert:
                     alerts.append(alert)
@@ -180,75 +253,46 @@ class QualityRegressionService:
         try:
             logger.info(f"🔄 [QualityRegression] Updating quality baselines using last {period_days} days")
 
+            if not self.db_session:
+                logger.warning("⚠️ [QualityRegression] No database session available for updating baselines")
+                return {}
+
             cutoff_date = datetime.utcnow() - timedelta(days=period_days)
 
-            # Get metrics from the baseline period
-            baseline_metrics = await self._get_metrics_since(cutoff_date)
+            # Mean, sample std and count per metric over the baseline period, aggregated in SQL
+            sample_count = self.db_session.query(func.count(QualityMetricsDB.id)).filter(
+                QualityMetricsDB.created_at >= cutoff_date
+            ).scalar() or 0
 
-            if len(baseline_metrics) < 10:
-                logger.warning(f"⚠️ [QualityRegression] Insufficient data for baseline update: {len(baseline_metrics)} samples")
+            if sample_count < MIN_BASELINE_SAMPLES:
+                logger.warning(f"⚠️ [QualityRegression] Insufficient data for baseline update: {sample_count} samples")
                 return {}
 
+            columns = []
+            for metric_name in BASELINE_METRIC_COLUMNS:
+                value = _sampled_column(metric_name)
+                columns.extend([
+                    func.avg(value).label(f"{metric_name}_mean"),
+                    func.coalesce(func.stddev_samp(value), 0.0).label(f"{metric_name}_std"),
+                    func.count(value).label(f"{metric_name}_count"),
+                ])
+            row = self.db_session.query(*columns).filter(QualityMetricsDB.created_at >= cutoff_date).one()
+
+            now = datetime.utcnow()
             baselines = {}
-
-            # Calculate baseline for overall score
-            overall_scores = [m.weighted_score for m in baseline_metrics]
-            baselines['overall_score'] = QualityBaseline(
-                metric_name='overall_score',
-                baseline_value=mean(overall_scores),
-                baseline_std=stdev(overall_scores) if len(overall_scores) > 1 else 0.0,
-                sample_size=len(overall_scores),
-                created_at=datetime.utcnow(),
-                period_days=period_days
-            )
-
-            # Calculate baseline for generation time
-            generation_times = [m.generation_time_seconds for m in baseline_metrics if m.generation_time_seconds > 0]
-            if generation_times:
-                baselines['generation_time'] = QualityBaseline(
-                    metric_name='generation_time',
-                    baseline_value=mean(generation_times),
-                    baseline_std=stdev(generation_times) if len(generation_times) > 1 else 0.0,
-                    sample_size=len(generation_times),
-                    created_at=datetime.utcnow(),
+            for metric_name in BASELINE_METRIC_COLUMNS:
+                count = getattr(row, f"{metric_name}_count") or 0
+                if not count:
+                    continue
+                baselines[metric_name] = QualityBaseline(
+                    metric_name=metric_name,
+                    baseline_value=float(getattr(row, f"{metric_name}_mean")),
+                    baseline_std=float(getattr(row, f"{metric_name}_std") or 0.0),
+                    sample_size=count,
+                    created_at=now,
                     period_days=period_days
                 )
 
-            # Calculate baseline for golden similarity
-            similarities = [m.golden_similarity for m in baseline_metrics if m.golden_similarity > 0]
-            if similarities:
-                baselines['golden_similarity'] = QualityBaseline(
-                    metric_name='golden_similarity',
-                    baseline_value=mean(similarities),
-                    baseline_std=stdev(similarities) if len(similarities) > 1 else 0.0,
-                    sample_size=len(similarities),
-                    created_at=datetime.utcnow(),
-                    period_days=period_days
-                )
-
-            # Calculate baseline for confidence score
-            confidence_scores = [m.confidence_score for m in baseline_metrics if m.confidence_score > 0]
-            if confidence_scores:
-                baselines['confidence_score'] = QualityBaseline(
-                    metric_name='confidence_score',
-                    baseline_value=mean(confidence_scores),
-                    baseline_std=stdev(confidence_scores) if len(confidence_scores) > 1 else 0.0,
-                    sample_size=len(confidence_scores),
-                    created_at=datetime.utcnow(),
-                    period_days=period_days
-                )
-
-            # Calculate baseline for error rate
-            error_rates = [m.error_count for m in baseline_metrics]
-            baselines['error_rate'] = QualityBaseline(
-                metric_name='error_rate',
-                baseline_value=mean(error_rates),
-                baseline_std=stdev(error_rates) if len(error_rates) > 1 else 0.0,
-                sample_size=len(error_rates),
-                created_at=datetime.utcnow(),
-                period_days=period_days
-            )
-
             # Store updated baselines
             await self._store_baselines(baselines)
 
@@ -264,9 +308,31 @@ class QualityRegressionService:
         try:
             logger.info(f"📋 [QualityRegression] Getting regression alerts for last {hours} hours")
 
-            # This would query stored alerts from database
-            # For now, returning empty list
-            alerts = []
+            if not self.db_session:
+                return []
+
+            query = self.db_session.query(RegressionAlerts).filter(
+                RegressionAlerts.detected_at >= datetime.utcnow() - timedelta(hours=hours),
+                RegressionAlerts.status == 'open'
+            )
+            if severity:
+                query = query.filter(RegressionAlerts.regression_severity == severity)
+
+            alerts = [
+                RegressionAlert(
+                    alert_id=row.alert_id,
+                    metric_name=row.metric_name,
+                    current_value=row.current_value,
+                    baseline_value=row.baseline_value,
+                    regression_severity=row.regression_severity,
+                    confidence_level=row.confidence_level,
+                    detected_at=row.detected_at,
+                    survey_ids=row.affected_survey_ids or [],
+                    description=row.description or '',
+                    recommended_actions=row.recommended_actions or []
+                )
+                for row in query.order_by(desc(RegressionAlerts.detected_at)).all()
+            ]
 
             logger.info(f"✅ [QualityRegression] Retrieved {len(alerts)} regression alerts")
             return alerts
@@ -319,26 +385,117 @@ class QualityRegressionService:
             logger.error(f"❌ [QualityRegression] Error checking methodology compliance: {str(e)}")
             return False
 
-    async def _store_quality_metrics(self, metrics: QualityMetrics):
-        """Store quality metrics in database"""
+    async def _store_quality_metrics(self, metrics: QualityMetrics,
+                                     raw_pillar_scores: Any = None,
+                                     methodology_tags: Optional[List[str]] = None,
+                                     rfq_complexity_score: Optional[float] = None):
+        """
+        Store quality metrics and update the running baselines in one savepoint
+
+        The writes join the caller's transaction: a failure here only rolls back the
+        savepoint, and the rows are committed when the caller commits.
+        """
         try:
             if not self.db_session:
                 logger.warning("⚠️ [QualityRegression] No database session available for storing metrics")
                 return
 
-            # This would store metrics in a quality_metrics table
-            # Implementation depends on your database schema
+            if not metrics.survey_id:
+                logger.warning("⚠️ [QualityRegression] Quality metrics have no survey_id, not storing")
+                return
+
             logger.debug(f"📊 [QualityRegression] Storing quality metrics for survey {metrics.survey_id}")
+            with self.db_session.begin_nested():
+                self.db_session.add(QualityMetricsDB(
+                    survey_id=metrics.survey_id,
+                    workflow_id=metrics.workflow_id,
+                    overall_grade=metrics.overall_grade,
+                    weighted_score=metrics.weighted_score,
+                    confidence_score=metrics.confidence_score,
+                    pillar_scores=raw_pillar_scores if raw_pillar_scores is not None else metrics.pillar_scores,
+                    generation_time_seconds=metrics.generation_time_seconds,
+                    golden_similarity=metrics.golden_similarity,
+                    methodology_compliance=metrics.methodology_compliance,
+                    error_count=metrics.error_count,
+                    methodology_tags=methodology_tags or [],
+                    rfq_complexity_score=rfq_complexity_score,
+                    created_at=metrics.timestamp
+                ))
+                self._update_running_baselines(metrics)
 
         except Exception as e:
             logger.error(f"❌ [QualityRegression] Failed to store quality metrics: {str(e)}", exc_info=True)
 
+    def _update_running_baselines(self, metrics: QualityMetrics) -> None:
+        """Fold one survey's metrics into the active baselines in O(1) per metric"""
+        values = _sampled_metric_values(metrics)
+        if not values:
+            return
+
+        # A metric's first sample seeds its baseline; the partial unique index on active
+        # metric names makes concurrent recorders agree on a single row
+        seed = pg_insert(QualityBaselines).values([
+            {
+                "id": uuid.uuid4(),
+                "metric_name": metric_name,
+                "baseline_value": value,
+                "baseline_std": 0.0,
+                "sample_size": 1,
+                "period_days": 0,
+                "period_start": metrics.timestamp,
+                "period_end": metrics.timestamp,
+                "is_active": True,
+            }
+            for metric_name, value in values.items()
+        ]).on_conflict_do_nothing(
+            index_elements=[QualityBaselines.metric_name],
+            index_where=QualityBaselines.is_active,
+        ).returning(QualityBaselines.metric_name)
+        seeded = set(self.db_session.execute(seed).scalars())
+
+        existing = [metric_name for metric_name in values if metric_name not in seeded]
+        if not existing:
+            return
+
+        # Row locks keep concurrent recorders from losing each other's updates
+        active = self.db_session.query(QualityBaselines).filter(
+            QualityBaselines.is_active.is_(True),
+            QualityBaselines.metric_name.in_(existing)
+        ).with_for_update().all()
+
+        for row in active:
+            row.baseline_value, row.baseline_std, row.sample_size = welford_update(
+                row.baseline_value, row.baseline_std, row.sample_size, values[row.metric_name]
+            )
+            row.period_end = max(row.period_end, metrics.timestamp)
+            row.period_days = (row.period_end - row.period_start).days
+
+    def _to_quality_metrics(self, row: QualityMetricsDB) -> QualityMetrics:
+        """Convert a quality_metrics row to the QualityMetrics dataclass"""
+        pillar_scores = row.pillar_scores or {}
+        if isinstance(pillar_scores, list):
+            pillar_scores = {
+                pillar.get('pillar_name'): pillar.get('weighted_score')
+                for pillar in pillar_scores if isinstance(pillar, dict)
+            }
+        return QualityMetrics(
+            overall_grade=row.overall_grade,
+            weighted_score=row.weighted_score or 0.0,
+            pillar_scores=pillar_scores,
+            generation_time_seconds=row.generation_time_seconds or 0.0,
+            golden_similarity=row.golden_similarity or 0.0,
+            confidence_score=row.confidence_score or 0.0,
+            methodology_compliance=bool(row.methodology_compliance),
+            error_count=row.error_count or 0,
+            timestamp=row.created_at,
+            survey_id=str(row.survey_id),
+            workflow_id=row.workflow_id
+        )
+
     async def _get_recent_metrics(self, hours: int) -> List[QualityMetrics]:
         """Get quality metrics from recent hours"""
         try:
-            # This would query quality_metrics table
-            # For now, returning empty list for mock
-            return []
+            return await self._get_metrics_since(datetime.utcnow() - timedelta(hours=hours))
 
         except Exception as e:
             logger.error(f"❌ [QualityRegression] Failed to get recent metrics: {str(e)}", exc_info=True)
@@ -347,18 +504,85 @@ class QualityRegressionService:
     async def _get_metrics_since(self, cutoff_date: datetime) -> List[QualityMetrics]:
         """Get quality metrics since specified date"""
         try:
-            # This would query quality_metrics table
-            return []
+            if not self.db_session:
+                return []
+
+            rows = self.db_session.query(QualityMetricsDB).filter(
+                QualityMetricsDB.created_at >= cutoff_date
+            ).order_by(QualityMetricsDB.created_at).all()
+            return [self._to_quality_metrics(row) for row in rows]
 
         except Exception as e:
             logger.error(f"❌ [QualityRegression] Failed to get metrics since date: {str(e)}", exc_info=True)
             return []
 
+    async def _get_recent_metric_stats(self, hours: int) -> Dict[str, Dict[str, float]]:
+        """
+        Mean and sample count per baseline metric over recent hours in one aggregate query
+
+        Returns:
+            metric_name -> {'mean', 'count'}, plus '_total' -> {'count'} for all rows in the window
+        """
+        try:
+            if not self.db_session:
+                return {}
+
+            columns = [func.count(QualityMetricsDB.id).label("total")]
+            for metric_name in BASELINE_METRIC_COLUMNS:
+                value = _sampled_column(metric_name)
+                columns.extend([
+                    func.avg(value).label(f"{metric_name}_mean"),
+                    func.count(value).label(f"{metric_name}_count"),
+                ])
+            row = self.db_session.query(*columns).filter(
+                QualityMetricsDB.created_at >= datetime.utcnow() - timedelta(hours=hours)
+            ).one()
+
+            stats = {'_total': {'count': row.total or 0}}
+            for metric_name in BASELINE_METRIC_COLUMNS:
+                count = getattr(row, f"{metric_name}_count") or 0
+                if count:
+                    stats[metric_name] = {'mean': float(getattr(row, f"{metric_name}_mean")), 'count': count}
+            return stats
+
+        except Exception as e:
+            logger.error(f"❌ [QualityRegression] Failed to get recent metric stats: {str(e)}", exc_info=True)
+            return {}
+
+    async def _get_recent_survey_ids(self, hours: int) -> List[str]:
+        """Most recent survey IDs with metrics in the window, for alert context"""
+        try:
+            rows = self.db_session.query(QualityMetricsDB.survey_id).filter(
+                QualityMetricsDB.created_at >= datetime.utcnow() - timedelta(hours=hours)
+            ).order_by(desc(QualityMetricsDB.created_at)).limit(ALERT_SURVEY_ID_LIMIT).all()
+            return [str(row.survey_id) for row in rows]
+
+        except Exception as e:
+            logger.error(f"❌ [QualityRegression] Failed to get recent survey ids: {str(e)}", exc_info=True)
+            return []
+
     async def _get_quality_baselines(self) -> Dict[str, QualityBaseline]:
         """Get current quality baselines"""
         try:
-            # This would query quality_baselines table
-            return {}
+            if not self.db_session:
+                return {}
+
+            rows = self.db_session.query(QualityBaselines).filter(
+                QualityBaselines.is_active.is_(True)
+            ).order_by(desc(QualityBaselines.created_at)).all()
+
+            baselines = {}
+            for row in rows:
+                # Newest active row wins if an older one was not deactivated
+                baselines.setdefault(row.metric_name, QualityBaseline(
+                    metric_name=row.metric_name,
+                    baseline_value=row.baseline_value,
+                    baseline_std=row.baseline_std,
+                    sample_size=row.sample_size,
+                    created_at=row.created_at,
+                    period_days=row.period_days
+                ))
+            return baselines
 
         except Exception as e:
             logger.error(f"❌ [QualityRegression] Failed to get quality baselines: {str(e)}", exc_info=True)
@@ -375,29 +599,13 @@ class QualityRegressionService:
         except Exception as e:
             logger.error(f"❌ [QualityRegression] Failed to create initial baselines: {str(e)}", exc_info=True)
 
-    async def _check_metric_regression(self, metric_name: str, recent_metrics: List[QualityMetrics],
-                                     baseline: QualityBaseline) -> Optional[RegressionAlert]:
-        """Check if a specific metric shows regression"""
+    async def _check_metric_regression(self, metric_name: str, current_mean: float, sample_count: int,
+                                     baseline: QualityBaseline, survey_ids: List[str]) -> Optional[RegressionAlert]:
+        """Check if a specific metric's recent mean shows regression against its baseline"""
         try:
-            # Extract metric values
-            if metric_name == 'overall_score':
-                current_values = [m.weighted_score for m in recent_metrics]
-            elif metric_name == 'generation_time':
-                current_values = [m.generation_time_seconds for m in recent_metrics if m.generation_time_seconds > 0]
-            elif metric_name == 'golden_similarity':
-                current_values = [m.golden_similarity for m in recent_metrics if m.golden_similarity > 0]
-            elif metric_name == 'confidence_score':
-                current_values = [m.confidence_score for m in recent_metrics if m.confidence_score > 0]
-            elif metric_name == 'error_rate':
-                current_values = [m.error_count for m in recent_metrics]
-            else:
+            if metric_name not in BASELINE_METRIC_COLUMNS or not sample_count:
                 return None
 
-            if not current_values:
-                return None
-
-            current_mean = mean(current_values)
-
             # Determine regression type and severity
             if metric_name == 'generation_time':
                 # For generation time, regression is when it gets significantly slower
@@ -431,7 +639,7 @@ class QualityRegressionService:
                     return None
 
             # Calculate confidence level
-            confidence_level = min(0.95, len(current_values) / 20.0)  # Higher confidence with more samples
+            confidence_level = min(0.95, sample_count / 20.0)  # Higher confidence with more samples
 
             # Create alert
             alert = RegressionAlert(
@@ -442,7 +650,7 @@ class QualityRegressionService:
                 regression_severity=severity,
                 confidence_level=confidence_level,
                 detected_at=datetime.utcnow(),
-                survey_ids=[m.survey_id for m in recent_metrics],
+                survey_ids=survey_ids,
                 description=self._create_alert_description(metric_name, current_mean, baseline.baseline_value, severity),
                 recommended_actions=self._get_recommended_actions(metric_name, severity)
             )
@@ -523,11 +731,24 @@ class QualityRegressionService:
                 logger.warning("⚠️ [QualityRegression] No database session available for storing alert")
                 return
 
-            # This would store alert in regression_alerts table
             logger.info(f"🚨 [QualityRegression] Storing {alert.regression_severity} regression alert for {alert.metric_name}")
+            self.db_session.add(RegressionAlerts(
+                alert_id=alert.alert_id,
+                metric_name=alert.metric_name,
+                current_value=alert.current_value,
+                baseline_value=alert.baseline_value,
+                regression_severity=alert.regression_severity,
+                confidence_level=alert.confidence_level,
+                affected_survey_ids=alert.survey_ids,
+                description=alert.description,
+                recommended_actions=alert.recommended_actions,
+                detected_at=alert.detected_at
+            ))
+            self.db_session.commit()
 
         except Exception as e:
             logger.error(f"❌ [QualityRegression] Failed to store regression alert: {str(e)}", exc_info=True)
+            self.db_session.rollback()
 
     async def _store_baselines(self, baselines: Dict[str, QualityBaseline]):
         """Store quality baselines in database"""
@@ -536,11 +757,30 @@ class QualityRegressionService:
                 logger.warning("⚠️ [QualityRegression] No database session available for storing baselines")
                 return
 
-            # This would store baselines in quality_baselines table
             logger.info(f"📊 [QualityRegression] Storing {len(baselines)} quality baselines")
 
+            # Replace the active baselines; later recordings keep updating the new rows
+            self.db_session.query(QualityBaselines).filter(
+                QualityBaselines.is_active.is_(True),
+                QualityBaselines.metric_name.in_(list(baselines))
+            ).update({QualityBaselines.is_active: False}, synchronize_session=False)
+            for baseline in baselines.values():
+                self.db_session.add(QualityBaselines(
+                    metric_name=baseline.metric_name,
+                    baseline_value=baseline.baseline_value,
+                    baseline_std=baseline.baseline_std,
+                    sample_size=baseline.sample_size,
+                    period_days=baseline.period_days,
+                    period_start=baseline.created_at - timedelta(days=baseline.period_days),
+                    period_end=baseline.created_at,
+                    created_at=baseline.created_at,
+                    is_active=True
+                ))
+            self.db_session.commit()
+
         except Exception as e:
             logger.error(f"❌ [QualityRegression] Failed to store baselines: {str(e)}", exc_info=True)
+            self.db_session.rollback()
 
 
 # Global instance
@@ -0,0 +1,228 @@
+"""
+Quality Rollup Service
+SQL-side bucketing of QualityMetrics and incremental rollup into QualityTrendAggregates.
+
+Buckets are computed in Postgres (``date_trunc`` with avg/min/max/stddev and
+``percentile_cont``), so reads cost O(buckets) instead of loading every metrics row.
+A periodic job re-aggregates from the newest stored bucket onwards (that bucket may
+have been partial) for each metric and aggregation level.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.database.quality_models import QualityMetrics, QualityTrendAggregates
+
+logger = logging.getLogger(__name__)
+
+# Dashboard metric name -> QualityMetrics column
+METRIC_COLUMNS = {
+    "overall_score": QualityMetrics.weighted_score,
+    "generation_time": QualityMetrics.generation_time_seconds,
+    "golden_similarity": QualityMetrics.golden_similarity,
+    "confidence_score": QualityMetrics.confidence_score,
+}
+
+AGGREGATION_LEVELS = ("hour", "day")
+
+# Serialises rollups across API processes
+ROLLUP_ADVISORY_LOCK_KEY = 730_042
+
+
+def aggregate_metric_buckets(
+    db: Session,
+    metric_name: str,
+    start: datetime,
+    aggregation: str = "hour",
+    end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Bucket one metric in SQL
+
+    Args:
+        db: Database session
+        metric_name: Key of METRIC_COLUMNS
+        start: Inclusive lower bound on created_at
+        aggregation: ``date_trunc`` unit ("hour" or "day")
+        end: Exclusive upper bound on created_at
+
+    Returns:
+        One dict per non-empty bucket, oldest first, with bucket/avg/min/max/std/count/p50/p90/p95/p99
+    """
+    column = METRIC_COLUMNS.get(metric_name)
+    if column is None or aggregation not in AGGREGATION_LEVELS:
+        return []
+
+    bucket = func.date_trunc(aggregation, QualityMetrics.created_at).label("bucket")
+    query = select(
+        bucket,
+        func.avg(column).label("avg"),
+        func.min(column).label("min"),
+        func.max(column).label("max"),
+        func.coalesce(func.stddev_pop(column), 0.0).label("std"),
+        func.count(column).label("count"),
+        func.percentile_cont(0.5).within_group(column).label("p50"),
+        func.percentile_cont(0.9).within_group(column).label("p90"),
+        func.percentile_cont(0.95).within_group(column).label("p95"),
+        func.percentile_cont(0.99).within_group(column).label("p99"),
+    ).where(QualityMetrics.created_at >= start, column.isnot(None))
+    if end is not None:
+        query = query.where(QualityMetrics.created_at < end)
+    query = query.group_by(bucket).order_by(bucket)
+
+    return [
+        {
+            "bucket": row.bucket,
+            "avg": float(row.avg),
+            "min": float(row.min),
+            "max": float(row.max),
+            "std": float(row.std),
+            "count": row.count,
+            "p50": float(row.p50),
+            "p90": float(row.p90),
+            "p95": float(row.p95),
+            "p99": float(row.p99),
+        }
+        for row in db.execute(query)
+    ]
+
+
+def summarize_window(db: Session, start: datetime) -> Dict[str, Any]:
+    """
+    Overview statistics for QualityMetrics created since ``start`` in one aggregate query
+
+    Returns:
+        count, avg_score, avg_generation_time, compliance_rate and the average score of the
+        older and newer half of the window (by created_at)
+    """
+    in_window = QualityMetrics.created_at >= start
+    totals = db.execute(
+        select(
+            func.count(QualityMetrics.id).label("count"),
+            func.avg(QualityMetrics.weighted_score).label("avg_score"),
+            func.avg(QualityMetrics.generation_time_seconds).label("avg_generation_time"),
+            func.avg(case((QualityMetrics.methodology_compliance.is_(True), 1.0), else_=0.0)).label("compliance_rate"),
+        ).where(in_window)
+    ).one()
+
+    halves = select(
+        QualityMetrics.weighted_score.label("score"),
+        func.ntile(2).over(order_by=QualityMetrics.created_at).label("half"),
+    ).where(in_window).subquery()
+    half_averages = {
+        row.half: float(row.avg_score)
+        for row in db.execute(
+            select(halves.c.half, func.avg(halves.c.score).label("avg_score")).group_by(halves.c.half)
+        )
+    }
+
+    return {
+        "count": totals.count or 0,
+        "avg_score": float(totals.avg_score or 0.0),
+        "avg_generation_time": float(totals.avg_generation_time or 0.0),
+        "compliance_rate": float(totals.compliance_rate or 0.0),
+        "first_half_avg": half_averages.get(1),
+        "second_half_avg": half_averages.get(2),
+    }
+
+
+def truncate_to_bucket(moment: datetime, aggregation: str) -> datetime:
+    """Python equivalent of ``date_trunc(aggregation, moment)``"""
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if aggregation == "day" else moment
+
+
+class QualityRollupService:
+    """Keeps QualityTrendAggregates up to date from QualityMetrics"""
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    def _rollup_start(self, metric_name: str, aggregation: str, backfill_start: datetime) -> datetime:
+        latest = self.db_session.query(func.max(QualityTrendAggregates.date)).filter(
+            QualityTrendAggregates.metric_name == metric_name,
+            QualityTrendAggregates.aggregation_level == aggregation,
+        ).scalar()
+        # The newest stored bucket may have been partial, so it is recomputed
+        start = max(latest, backfill_start) if latest else backfill_start
+        return truncate_to_bucket(start, aggregation)
+
+    def rollup(self, now: Optional[datetime] = None, backfill_days: Optional[int] = None) -> int:
+        """
+        Recompute trend aggregates from the newest stored bucket to ``now``
+
+        Args:
+            now: End of the rollup window (defaults to the current UTC time)
+            backfill_days: How far back to aggregate when a metric has no stored buckets
+
+        Returns:
+            Number of bucket rows written
+        """
+        now = now or datetime.utcnow()
+        backfill_days = backfill_days if backfill_days is not None else settings.quality_rollup_backfill_days
+        backfill_start = now - timedelta(days=backfill_days)
+        written = 0
+        try:
+            # Only one process rolls up at a time; the others skip this round
+            if not self.db_session.execute(select(func.pg_try_advisory_xact_lock(ROLLUP_ADVISORY_LOCK_KEY))).scalar():
+                logger.info("ℹ️ [QualityRollup] Rollup already running in another process, skipping")
+                return 0
+
+            for aggregation in AGGREGATION_LEVELS:
+                for metric_name in METRIC_COLUMNS:
+                    start = self._rollup_start(metric_name, aggregation, backfill_start)
+                    buckets = aggregate_metric_buckets(self.db_session, metric_name, start, aggregation, end=now)
+                    self.db_session.query(QualityTrendAggregates).filter(
+                        QualityTrendAggregates.metric_name == metric_name,
+                        QualityTrendAggregates.aggregation_level == aggregation,
+                        QualityTrendAggregates.date >= start,
+                    ).delete(synchronize_session=False)
+                    self.db_session.add_all([
+                        QualityTrendAggregates(
+                            date=bucket["bucket"],
+                            aggregation_level=aggregation,
+                            metric_name=metric_name,
+                            avg_value=bucket["avg"],
+                            min_value=bucket["min"],
+                            max_value=bucket["max"],
+                            std_value=bucket["std"],
+                            sample_count=bucket["count"],
+                            p50_value=bucket["p50"],
+                            p90_value=bucket["p90"],
+                            p95_value=bucket["p95"],
+                            p99_value=bucket["p99"],
+                        )
+                        for bucket in buckets
+                    ])
+                    written += len(buckets)
+            self.db_session.commit()
+            logger.info(f"✅ [QualityRollup] Rolled up {written} trend buckets")
+            return written
+        except Exception as e:
+            self.db_session.rollback()
+            logger.error(f"❌ [QualityRollup] Rollup failed: {str(e)}", exc_info=True)
+            return 0
+
+
+async def run_periodic_rollup(interval_seconds: Optional[int] = None) -> None:
+    """Run QualityRollupService.rollup every ``interval_seconds`` until cancelled"""
+    from src.database.connection import SessionLocal
+
+    interval_seconds = interval_seconds or settings.quality_rollup_interval_seconds
+
+    def rollup_once() -> int:
+        with SessionLocal() as db:
+            return QualityRollupService(db).rollup()
+
+    while True:
+        try:
+            await asyncio.to_thread(rollup_once)
+        except Exception as e:
+            logger.error(f"❌ [QualityRollup] Periodic rollup failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
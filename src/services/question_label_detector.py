@@ -231,6 +231,17 @@ class QuestionLabelDetector:
     
     def detect_labels_in_section(self, section: Dict) -> Set[str]:
         """Detect all labels in a section"""
+        all_labels = self.detect_labels_in_section_text(section)
+        
+        # Check questions
+        for question in section.get('questions', []):
+            labels = self.detect_labels_in_question(question)
+            all_labels.update(labels)
+        
+        return all_labels
+    
+    def detect_labels_in_section_text(self, section: Dict) -> Set[str]:
+        """Detect labels in a section's text blocks and intro text (questions excluded)"""
         all_labels = set()
         
         # Check text blocks
@@ -249,11 +260,6 @@ class QuestionLabelDetector:
                 if self._matches_patterns(text_content, 'text', [], patterns):
                     all_labels.add(label_name)
         
-        # Check questions
-        for question in section.get('questions', []):
-            labels = self.detect_labels_in_question(question)
-            all_labels.update(labels)
-        
         return all_labels
     
     def detect_labels_in_survey(self, survey: Dict) -> Dict[int, Set[str]]:
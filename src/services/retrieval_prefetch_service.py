@@ -0,0 +1,305 @@
+"""
+Retrieval Prefetch Service
+Speculative embedding and multi-tier retrieval for enhanced RFQ drafts.
+
+Saving a draft (``POST /rfq/enhanced/draft``) schedules a background prefetch of the
+RFQ embedding and the golden pair/section/question, feedback digest, methodology and
+template tiers. Results are cached under a content hash of the RFQ fields the workflow
+retrieves with, so ``RFQNode`` and ``GoldenRetrieverNode`` can reuse them when the
+submitted RFQ is unchanged. Entries live in Redis (shared with the workflow worker)
+with a process-local fallback, and expire after ``RETRIEVAL_PREFETCH_TTL_SECONDS``.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "retrieval_prefetch:"
+
+# Retrieval limits shared with GoldenRetrieverNode so prefetched tiers match a cold run
+GOLDEN_PAIR_LIMIT = 3
+GOLDEN_SECTION_LIMIT = 5
+GOLDEN_QUESTION_LIMIT = 8
+FEEDBACK_DIGEST_LIMIT = 50
+METHODOLOGY_BLOCK_LIMIT = 5
+TEMPLATE_QUESTION_LIMIT = 10
+
+# RFQNode falls back to this research goal when the RFQ has none
+DEFAULT_RESEARCH_GOAL = "General market research"
+
+# Process-local entries kept when Redis is unavailable
+MAX_LOCAL_ENTRIES = 256
+
+
+def _hash(payload: Dict[str, Any]) -> str:
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def embedding_cache_key(rfq_text: str) -> str:
+    """Cache key for the embedding of ``rfq_text`` under the configured embedding model"""
+    return f"{CACHE_KEY_PREFIX}embedding:" + _hash({
+        "model": settings.embedding_model,
+        "rfq_text": rfq_text or "",
+    })
+
+
+def context_cache_key(
+    rfq_text: str,
+    industry: Optional[str],
+    research_goal: Optional[str],
+    product_category: Optional[str],
+) -> str:
+    """
+    Cache key for the retrieval tiers of an RFQ
+
+    Args:
+        rfq_text: Text the workflow embeds (the enriched description for enhanced RFQs)
+        industry: Industry filter for golden retrieval
+        research_goal: Research goal for methodology blocks
+        product_category: Category for template questions
+
+    Returns:
+        Cache key of the form ``retrieval_prefetch:context:<sha256>``
+    """
+    return f"{CACHE_KEY_PREFIX}context:" + _hash({
+        "model": settings.embedding_model,
+        "rfq_text": rfq_text or "",
+        "industry": industry,
+        "research_goal": research_goal,
+        "product_category": product_category,
+    })
+
+
+class RetrievalPrefetchService:
+    """Computes and caches retrieval context for RFQ drafts"""
+
+    def __init__(self):
+        self.enabled = settings.retrieval_prefetch_enabled
+        self.ttl_seconds = settings.retrieval_prefetch_ttl_seconds
+        self._local: Dict[str, Any] = {}  # key -> (expires_at, encoded entry)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}  # rfq_id -> running prefetch
+        self.embedding_service = None  # Created on first prefetch to keep imports light
+        self.stats = {"prefetches": 0, "failures": 0, "cancelled": 0, "embedding_hits": 0, "context_hits": 0, "misses": 0}
+
+    # ------------------------------------------------------------------ storage
+
+    def _store(self, key: str, value: Any) -> None:
+        encoded = json.dumps(value, default=str).encode("utf-8")
+        with self._lock:
+            if len(self._local) >= MAX_LOCAL_ENTRIES:
+                self._local.pop(min(self._local, key=lambda k: self._local[k][0]), None)
+            self._local[key] = (time.monotonic() + self.ttl_seconds, encoded)
+        try:
+            from src.services.cache_service import cache_service
+            cache_service.set(key, encoded, expire=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"⚠️ [RetrievalPrefetch] Failed to store {key} in Redis: {e}")
+
+    def _load(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry and entry[0] <= time.monotonic():
+                self._local.pop(key, None)
+                entry = None
+        encoded = entry[1] if entry else None
+        if encoded is None:
+            try:
+                from src.services.cache_service import cache_service
+                encoded = cache_service.get(key)
+            except Exception:
+                encoded = None
+        if not encoded:
+            return None
+        try:
+            return json.loads(encoded)
+        except (TypeError, ValueError):
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    # ------------------------------------------------------------------ lookups
+
+    def get_embedding(self, rfq_text: str) -> Optional[List[float]]:
+        """Prefetched embedding for ``rfq_text``, or None"""
+        if not self.enabled or not rfq_text:
+            return None
+        embedding = self._load(embedding_cache_key(rfq_text))
+        self.stats["embedding_hits" if embedding else "misses"] += 1
+        return embedding
+
+    def get_context(
+        self,
+        rfq_text: str,
+        industry: Optional[str],
+        research_goal: Optional[str],
+        product_category: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Prefetched retrieval tiers for an RFQ, or None when nothing matches"""
+        if not self.enabled or not rfq_text:
+            return None
+        context = self._load(context_cache_key(rfq_text, industry, research_goal, product_category))
+        self.stats["context_hits" if context else "misses"] += 1
+        return context
+
+    # ------------------------------------------------------------------ prefetch
+
+    async def prefetch(
+        self,
+        rfq_text: str,
+        industry: Optional[str] = None,
+        research_goal: Optional[str] = None,
+        product_category: Optional[str] = None,
+    ) -> bool:
+        """
+        Compute and cache the embedding and retrieval tiers for an RFQ
+
+        Args:
+            rfq_text: Text the workflow will embed
+            industry: Industry filter for golden retrieval
+            research_goal: Research goal for methodology blocks
+            product_category: Category for template questions
+
+        Returns:
+            True when the context was computed (or already cached)
+        """
+        if not self.enabled or not rfq_text:
+            return False
+        key = context_cache_key(rfq_text, industry, research_goal, product_category)
+        if self._load(key) is not None:
+            logger.info("⚡ [RetrievalPrefetch] Retrieval context already cached for this RFQ content")
+            return True
+
+        start = time.perf_counter()
+        embedding = self._load(embedding_cache_key(rfq_text))
+        if embedding is None:
+            if self.embedding_service is None:
+                from src.services.embedding_service import EmbeddingService
+                self.embedding_service = EmbeddingService()
+            embedding = await self.embedding_service.get_embedding(rfq_text)
+            self._store(embedding_cache_key(rfq_text), embedding)
+
+        from src.database import get_db
+        from src.services.retrieval_service import RetrievalService
+
+        db = next(get_db())
+        try:
+            retrieval_service = RetrievalService(db)
+            context = {
+                "golden_examples": await retrieval_service.retrieve_golden_pairs(
+                    embedding=embedding, methodology_tags=None, industry=industry, limit=GOLDEN_PAIR_LIMIT
+                ),
+                "golden_sections": await retrieval_service.retrieve_golden_sections(
+                    embedding=embedding, methodology_tags=None, industry=industry, limit=GOLDEN_SECTION_LIMIT
+                ),
+                "golden_questions": await retrieval_service.retrieve_golden_questions(
+                    embedding=embedding, methodology_tags=None, industry=industry, limit=GOLDEN_QUESTION_LIMIT
+                ),
+                "feedback_digest": None,
+                "methodology_blocks": await retrieval_service.retrieve_methodology_blocks(
+                    research_goal=research_goal, limit=METHODOLOGY_BLOCK_LIMIT
+                ),
+                "template_questions": await retrieval_service.retrieve_template_questions(
+                    category=product_category, limit=TEMPLATE_QUESTION_LIMIT
+                ),
+            }
+            try:
+                context["feedback_digest"] = await retrieval_service.get_feedback_digest(
+                    methodology_tags=None, industry=industry, limit=FEEDBACK_DIGEST_LIMIT
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ [RetrievalPrefetch] Failed to prefetch feedback digest: {e}")
+        finally:
+            db.close()
+
+        self._store(key, context)
+        self.stats["prefetches"] += 1
+        logger.info(
+            f"✅ [RetrievalPrefetch] Prefetched retrieval context in {(time.perf_counter() - start) * 1000:.0f}ms "
+            f"({len(context['golden_examples'])} pairs, {len(context['golden_sections'])} sections, "
+            f"{len(context['golden_questions'])} questions)"
+        )
+        return True
+
+    def schedule(self, rfq_id: str, **kwargs: Any) -> Optional[asyncio.Task]:
+        """
+        Start ``prefetch`` in the background for a draft, replacing any prefetch still
+        running for an earlier save of the same RFQ
+
+        Args:
+            rfq_id: Draft RFQ id
+            **kwargs: Arguments for ``prefetch``
+
+        Returns:
+            The background task, or None when prefetching is disabled
+        """
+        if not self.enabled:
+            return None
+        previous = self._inflight.pop(rfq_id, None)
+        if previous is not None and not previous.done():
+            previous.cancel()
+            self.stats["cancelled"] += 1
+
+        async def run():
+            try:
+                await self.prefetch(**kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failures"] += 1
+                logger.warning(f"⚠️ [RetrievalPrefetch] Prefetch failed for RFQ {rfq_id}: {e}")
+            finally:
+                if self._inflight.get(rfq_id) is task:
+                    self._inflight.pop(rfq_id, None)
+
+        task = asyncio.ensure_future(run())
+        self._inflight[rfq_id] = task
+        return task
+
+    def schedule_for_draft(self, rfq_id: str, enhanced_rfq_data: Dict[str, Any], legacy_fields: Dict[str, Any]) -> Optional[asyncio.Task]:
+        """
+        Prefetch with the inputs the enhanced workflow will retrieve with for this draft
+
+        Args:
+            rfq_id: Draft RFQ id
+            enhanced_rfq_data: Validated enhanced RFQ (as stored on the RFQ)
+            legacy_fields: Legacy fields extracted from the enhanced RFQ
+
+        Returns:
+            The background task, or None when prefetching is disabled
+        """
+        if not self.enabled:
+            return None
+        try:
+            from src.utils.enhanced_rfq_converter import createEnhancedDescriptionWithTextRequirements
+            rfq_text = createEnhancedDescriptionWithTextRequirements(enhanced_rfq_data)
+        except Exception as e:
+            logger.warning(f"⚠️ [RetrievalPrefetch] Failed to build enriched description: {e}")
+            rfq_text = legacy_fields.get("description")
+        return self.schedule(
+            rfq_id,
+            rfq_text=rfq_text,
+            industry=enhanced_rfq_data.get("industry_category"),
+            research_goal=legacy_fields.get("research_goal") or DEFAULT_RESEARCH_GOAL,
+            product_category=legacy_fields.get("product_category"),
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            local_entries = len(self._local)
+        return {**self.stats, "enabled": self.enabled, "local_entries": local_entries, "inflight": len(self._inflight)}
+
+
+# Global retrieval prefetch service instance
+retrieval_prefetch = RetrievalPrefetchService()
@@ -32,11 +32,12 @@ class RetrievalService:
         import logging
         logger = logging.getLogger(__name__)
         
-        logger.info(f"🔍 [RetrievalService] Starting multi-factor golden pairs retrieval")
-        logger.info(f"🔍 [RetrievalService] Embedding dimension: {len(embedding)}")
-        logger.info(f"🔍 [RetrievalService] Methodology tags: {methodology_tags}")
-        logger.info(f"🔍 [RetrievalService] Industry: {industry}")
-        logger.info(f"🔍 [RetrievalService] Limit: {limit}")
+        logger.info(
+            "🔍 [RetrievalService] Starting multi-factor golden pairs retrieval "
+            "(embedding_dim=%d, methodology_tags=%s, industry=%s, limit=%d)",
+            len(embedding), methodology_tags, industry, limit,
+            extra={"event": "golden_retrieval_start"},
+        )
         
         try:
             # Load configurable weights
@@ -102,7 +103,6 @@ class RetrievalService:
                 human_verification_boost = 0.0
                 if hasattr(row, 'human_verified') and row.human_verified:
                     human_verification_boost = 0.5  # 50% boost for human-verified examples to ensure priority
-                    logger.info(f"   🏆 Human-verified example: +{human_verification_boost:.2f} boost")
                 
                 # Calculate multi-factor score
                 multi_factor_score = self._calculate_multi_factor_score(
@@ -117,10 +117,13 @@ class RetrievalService:
                 # Apply human verification boost to final score
                 multi_factor_score += human_verification_boost
                 
-                logger.info(f"📋 [RetrievalService] Golden pair {i+1}: ID={row.id}")
-                logger.info(f"   Similarity: {row.similarity:.4f}, Methodology: {methodology_match_score:.4f}")
-                logger.info(f"   Industry: {industry_relevance_score:.4f}, Quality: {row.quality_score or 0:.2f}")
-                logger.info(f"   Annotation: {annotation_score:.2f}, Multi-factor: {multi_factor_score:.4f}")
+                # Per-row scoring is a hot path: lazy %-formatting, one debug record per row
+                logger.debug(
+                    "📋 [RetrievalService] Golden pair %d: ID=%s similarity=%.4f methodology=%.4f "
+                    "industry=%.4f quality=%.2f annotation=%.2f human_boost=%.2f multi_factor=%.4f",
+                    i + 1, row.id, row.similarity, methodology_match_score, industry_relevance_score,
+                    row.quality_score or 0, annotation_score, human_verification_boost, multi_factor_score,
+                )
                 
                 golden_examples.append({
                     "id": str(row.id),
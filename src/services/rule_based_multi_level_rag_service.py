@@ -7,6 +7,7 @@ import logging
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import text, and_, or_
+from src.config.logging_config import log_text_preview
 from src.database.models import GoldenSection, GoldenQuestion, QuestionAnnotation
 from src.utils.database_session_manager import DatabaseSessionManager
 import re
@@ -62,7 +63,7 @@ class RuleBasedMultiLevelRAGService:
         Retrieve golden sections using rule-based matching
         """
         try:
-            logger.info(f"🔍 [RuleBasedRAG] Retrieving sections for RFQ: {rfq_text[:100]}...")
+            logger.info(f"🔍 [RuleBasedRAG] Retrieving sections for RFQ: {log_text_preview(rfq_text, 100)}...")
             
             # Extract patterns from RFQ text
             rfq_lower = rfq_text.lower()
@@ -167,7 +168,7 @@ class RuleBasedMultiLevelRAGService:
         Retrieve golden questions using rule-based matching
         """
         try:
-            logger.info(f"🔍 [RuleBasedRAG] Retrieving questions for RFQ: {rfq_text[:100]}...")
+            logger.info(f"🔍 [RuleBasedRAG] Retrieving questions for RFQ: {log_text_preview(rfq_text, 100)}...")
             
             # Extract patterns from RFQ text
             rfq_lower = rfq_text.lower()
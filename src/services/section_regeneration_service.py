@@ -0,0 +1,71 @@
+"""
+Section Regeneration Service
+Regenerates the target sections of a surgical/targeted regeneration concurrently, one LLM call per section
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.config import settings
+from src.services.survey_merger_service import SurveyMergerService
+
+logger = logging.getLogger(__name__)
+
+SectionCallback = Callable[[Dict[str, Any], int, int], Awaitable[None]]
+
+
+class SectionRegenerationService:
+    """Fan out per-section regeneration prompts and splice results into the previous survey as they finish"""
+
+    def __init__(self, generation_service, max_concurrency: Optional[int] = None):
+        self.generation_service = generation_service
+        self.max_concurrency = max(1, max_concurrency or settings.parallel_section_regeneration_max_concurrency)
+        self.merger = SurveyMergerService()
+
+    async def regenerate_sections(
+        self,
+        context: Dict[str, Any],
+        section_ids: List[Any],
+        on_section: Optional[SectionCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Regenerate ``section_ids`` concurrently under ``max_concurrency``
+
+        Args:
+            context: Generation context including previous_survey_json and surgical_analysis
+            section_ids: Sections to regenerate
+            on_section: Optional ``async (section, completed, total)`` callback run as each section finishes
+
+        Returns:
+            The previous survey with every regenerated section spliced in, plus ``comments_addressed``
+        """
+        survey = copy.deepcopy(context.get("previous_survey_json") or {"sections": []})
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def regenerate(section_id: Any) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generation_service.generate_section(context, section_id)
+
+        logger.info(f"🔬 [SectionRegeneration] Regenerating {len(section_ids)} sections (max {self.max_concurrency} concurrent)")
+        tasks = [asyncio.ensure_future(regenerate(section_id)) for section_id in section_ids]
+        comments_addressed: List[str] = []
+        try:
+            for completed, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+                result = await next_result
+                self.merger.splice_section(survey, result["section"])
+                comments_addressed.extend(
+                    comment_id for comment_id in result["comments_addressed"] if comment_id not in comments_addressed
+                )
+                if on_section:
+                    await on_section(result["section"], completed, len(tasks))
+        finally:
+            # One failed section fails the regeneration; don't leave the others running
+            for task in tasks:
+                task.cancel()
+
+        survey["comments_addressed"] = comments_addressed
+        survey.setdefault("metadata", {})["parallel_section_regeneration"] = True
+        logger.info(f"✅ [SectionRegeneration] Regenerated sections {section_ids}")
+        return survey
@@ -61,14 +61,18 @@ class SurveyDiffService:
 
             logger.info(f"🔍 [SurveyDiff] Computing diff: type={comparison_type}")
 
+            # Questions, question -> section ids and section lookup, built once per survey
+            index1 = self._build_survey_index(survey1_data)
+            index2 = self._build_survey_index(survey2_data)
+
             # Core diff computation (shared for all types)
             # Compute question diff first so we can use it for section diff
-            question_diff = self._compute_question_diff(survey1_data, survey2_data)
-            section_diff = self._compute_section_diff(survey1_data, survey2_data, question_diff)
+            question_diff = self._compute_question_diff(survey1_data, survey2_data, index1, index2)
+            section_diff = self._compute_section_diff(survey1_data, survey2_data, question_diff, index1, index2)
             quality_diff = self._compute_quality_diff(survey1_data, survey2_data)
 
             # Build summary
-            summary = self._build_summary(question_diff, section_diff, comparison_type, survey1_data)
+            summary = self._build_summary(question_diff, section_diff, comparison_type, survey1_data, index1)
 
             # Build result
             result = {
@@ -160,13 +164,50 @@ class SurveyDiffService:
 
         return False
 
-    def _compute_question_diff(self, survey1: Dict[str, Any], survey2: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _build_survey_index(self, survey: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Index a survey once for diffing
+
+        Returns:
+            questions: All questions in diff order
+            question_section_ids: Section ID per question index (None outside sections)
+            sections_by_id: Section ID -> first section with that ID
+        """
+        questions = extract_all_questions(survey)
+        sections = survey.get('sections', []) or []
+
+        question_section_ids = [
+            section.get('id') for section in sections for _ in section.get('questions', [])
+        ][:len(questions)]
+        question_section_ids.extend([None] * (len(questions) - len(question_section_ids)))
+
+        sections_by_id: Dict[Any, Dict[str, Any]] = {}
+        for section in sections:
+            sections_by_id.setdefault(section.get('id'), section)
+
+        return {
+            "questions": questions,
+            "question_section_ids": question_section_ids,
+            "sections_by_id": sections_by_id
+        }
+
+    def _compute_question_diff(
+        self,
+        survey1: Dict[str, Any],
+        survey2: Dict[str, Any],
+        index1: Optional[Dict[str, Any]] = None,
+        index2: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """Compute question-level differences"""
-        questions1 = extract_all_questions(survey1)
-        questions2 = extract_all_questions(survey2)
+        index1 = index1 or self._build_survey_index(survey1)
+        index2 = index2 or self._build_survey_index(survey2)
+        questions1 = index1["questions"]
+        questions2 = index2["questions"]
+        section_ids1 = index1["question_section_ids"]
+        section_ids2 = index2["question_section_ids"]
 
         # Use existing comparison utility for question matching
-        comparison_result = compare_surveys_detailed(survey1, survey2)
+        comparison_result = compare_surveys_detailed(survey1, survey2, questions1, questions2)
         matched_pairs = comparison_result.get('question_match', {}).get('matched_pairs', [])
 
         # Build question diff list
@@ -207,7 +248,7 @@ class SurveyDiffService:
                     "id": q1.get('id', f"q{idx1}"),
                     "status": status,
                     "similarity": round(similarity, 3),
-                    "section_id": self._get_question_section_id(survey1, idx1),
+                    "section_id": section_ids1[idx1] if idx1 < len(section_ids1) else None,
                     "changes": changes,
                     "question1": q1,
                     "question2": q2,
@@ -222,7 +263,7 @@ class SurveyDiffService:
                     "id": q1.get('id', f"q{idx1}"),
                     "status": "added",
                     "similarity": None,
-                    "section_id": self._get_question_section_id(survey1, idx1),
+                    "section_id": section_ids1[idx1],
                     "changes": [],
                     "question1": q1,
                     "question2": None,
@@ -237,7 +278,7 @@ class SurveyDiffService:
                     "id": q2.get('id', f"q{idx2}"),
                     "status": "removed",
                     "similarity": None,
-                    "section_id": self._get_question_section_id(survey2, idx2),
+                    "section_id": section_ids2[idx2],
                     "changes": [],
                     "question1": None,
                     "question2": q2,
@@ -273,29 +314,13 @@ class SurveyDiffService:
 
         return changes
 
-    def _get_question_section_id(self, survey: Dict[str, Any], question_index: int) -> Optional[int]:
-        """Get section ID for a question by its index"""
-        questions = extract_all_questions(survey)
-        if question_index >= len(questions):
-            return None
-
-        # If survey has sections, find which section contains this question
-        sections = survey.get('sections', [])
-        if sections:
-            current_idx = 0
-            for section in sections:
-                section_questions = section.get('questions', [])
-                if current_idx <= question_index < current_idx + len(section_questions):
-                    return section.get('id')
-                current_idx += len(section_questions)
-
-        return None
-
     def _compute_section_diff(
         self, 
         survey1: Dict[str, Any], 
         survey2: Dict[str, Any],
-        question_diff: List[Dict[str, Any]] = None
+        question_diff: List[Dict[str, Any]] = None,
+        index1: Optional[Dict[str, Any]] = None,
+        index2: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Compute section-level differences using question diff results"""
         sections1 = survey1.get('sections', [])
@@ -305,6 +330,9 @@ class SurveyDiffService:
         if not sections1 and not sections2:
             return []
 
+        sections_by_id_1 = (index1 or self._build_survey_index(survey1))["sections_by_id"]
+        sections_by_id_2 = (index2 or self._build_survey_index(survey2))["sections_by_id"]
+
         # Build section diff
         section_diff = []
 
@@ -331,8 +359,8 @@ class SurveyDiffService:
                     section_question_changes[section_id][status] = section_question_changes[section_id].get(status, 0) + 1
 
         for section_id in sorted(all_section_ids):
-            section1 = next((s for s in sections1 if s.get('id') == section_id), None)
-            section2 = next((s for s in sections2 if s.get('id') == section_id), None)
+            section1 = sections_by_id_1.get(section_id)
+            section2 = sections_by_id_2.get(section_id)
 
             if section1 and section2:
                 # Both exist - check for changes using question diff
@@ -417,7 +445,8 @@ class SurveyDiffService:
         question_diff: List[Dict[str, Any]],
         section_diff: List[Dict[str, Any]],
         comparison_type: str,
-        survey1_data: Dict[str, Any]
+        survey1_data: Dict[str, Any],
+        index1: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Build summary statistics"""
         questions_added = sum(1 for q in question_diff if q.get('status') == 'added')
@@ -430,7 +459,7 @@ class SurveyDiffService:
             "questions_modified": questions_modified,
             "questions_removed": questions_removed,
             "questions_preserved": questions_preserved,
-            "total_questions_1": len(extract_all_questions(survey1_data)),
+            "total_questions_1": len(index1["questions"] if index1 else extract_all_questions(survey1_data)),
             "total_questions_2": questions_preserved + questions_modified + questions_removed,
             "sections_changed": sum(1 for s in section_diff if s.get('status') != 'preserved'),
             "sections_preserved": sum(1 for s in section_diff if s.get('status') == 'preserved')
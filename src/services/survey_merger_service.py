@@ -96,6 +96,26 @@ class SurveyMergerService:
         
         return merged
 
+    def splice_section(self, survey: Dict[str, Any], section: Dict[str, Any]) -> None:
+        """
+        Replace one section of ``survey`` in place as soon as it has been regenerated
+
+        Used by parallel section regeneration; ``merge_surveys`` still renumbers and
+        validates the final result.
+
+        Args:
+            survey: Working copy of the previous survey
+            section: Regenerated section (matched by ``id``; appended if not present)
+        """
+        sections = survey.setdefault('sections', [])
+        for index, existing in enumerate(sections):
+            if existing.get('id') == section.get('id'):
+                sections[index] = section
+                break
+        else:
+            sections.append(section)
+        logger.info(f"🔬 [SurveyMerger] Spliced regenerated section {section.get('id')} ({len(section.get('questions', []))} questions)")
+
     def _renumber_questions(self, survey: Dict[str, Any]) -> Dict[str, Any]:
         """
         Renumber questions using proper section-based format (SQ01, CQ01, etc.)
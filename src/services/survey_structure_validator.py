@@ -42,6 +42,15 @@ class ValidationIssue:
         }
 
 
+@dataclass
+class QuestionFacts:
+    """Per-question facts gathered once during the validation traversal"""
+    section_id: Optional[int]
+    question: Dict
+    text: str  # Lowercased question text
+    question_type: str
+
+
 @dataclass
 class StructureValidationReport:
     """Non-blocking validation report"""
@@ -126,27 +135,55 @@ class SurveyStructureValidator:
         self.detector = QuestionLabelDetector() if db_session else None
     
     async def validate_structure(self, survey_json: Dict, 
-                                 rfq_context: Dict) -> StructureValidationReport:
+                                 rfq_context: Dict,
+                                 detected_labels: Optional[Dict] = None) -> StructureValidationReport:
         """
         Validate survey structure - NEVER blocks generation
         Returns quality score and flagged issues
+        
+        Walks the survey once, feeding QuestionFacts to every per-question rule.
+        detected_labels (LabelDetectionNode output) skips re-detection for the
+        sections it covers.
         """
         try:
             issues = []
             section_scores = {}
-            detected_labels = self.detector.detect_labels_in_survey(survey_json)
             missing_required = {}
+            section_labels = self._normalize_detected_labels(detected_labels)
+            detected = {}
+            satisfaction_issues = []
+            positioning_issues = []
+            funnel_issues = []
             
             # Extract context
             methodology = rfq_context.get('methodology_tags', []) or []
             industry = rfq_context.get('industry')
             
-            # Validate each section
             for section in survey_json.get('sections', []):
                 section_id = section.get('id')
+                labels = section_labels.get(str(section_id))
+                needs_detection = labels is None
+                if needs_detection:
+                    labels = self.detector.detect_labels_in_section_text(section)
+                
+                for question in section.get('questions', []):
+                    facts = QuestionFacts(
+                        section_id=section_id,
+                        question=question,
+                        text=question.get('text', '').lower(),
+                        question_type=question.get('type', '')
+                    )
+                    if needs_detection:
+                        labels.update(self.detector.detect_labels_in_question(question))
+                    satisfaction_issues.extend(self._check_satisfaction_scale(facts))
+                    positioning_issues.extend(self._check_positioning_exclusion(facts))
+                    funnel_issues.extend(self._check_brand_awareness_funnel(facts))
+                
+                detected[section_id] = labels
+                
+                # Validate the section against its required labels
                 section_issues, section_score, missing = self._validate_section(
-                    section, detected_labels.get(section_id, set()), 
-                    methodology, industry
+                    section, labels, methodology, industry
                 )
                 issues.extend(section_issues)
                 section_scores[section_id] = section_score
@@ -155,7 +192,7 @@ class SurveyStructureValidator:
             
             # Methodology-specific validation
             if 'van_westendorp' in [m.lower() for m in methodology]:
-                vw_issues, vw_score = self._validate_van_westendorp(detected_labels)
+                vw_issues, vw_score = self._validate_van_westendorp(detected)
                 issues.extend(vw_issues)
                 if 5 in section_scores:  # Methodology section
                     section_scores[5] = min(section_scores[5], vw_score)
@@ -164,22 +201,16 @@ class SurveyStructureValidator:
             
             # Gabor Granger validation
             if 'gabor_granger' in [m.lower() for m in methodology]:
-                gg_issues, gg_score = self._validate_gabor_granger(detected_labels)
+                gg_issues, gg_score = self._validate_gabor_granger(detected)
                 issues.extend(gg_issues)
                 if 5 in section_scores:  # Methodology section
                     section_scores[5] = min(section_scores[5], gg_score)
                 else:
                     section_scores[5] = gg_score
             
-            # Validate satisfaction scale format and positioning exclusion
-            satisfaction_issues = self._validate_satisfaction_scales(survey_json)
+            # Per-question rule issues gathered during the traversal
             issues.extend(satisfaction_issues)
-            
-            positioning_issues = self._validate_positioning_exclusion(survey_json)
             issues.extend(positioning_issues)
-            
-            # Validate Brand_Awareness_Funnel format
-            funnel_issues = self._validate_brand_awareness_funnel(survey_json)
             issues.extend(funnel_issues)
             
             # Calculate overall score
@@ -190,7 +221,7 @@ class SurveyStructureValidator:
                 overall_score=overall_score,
                 issues=issues,
                 section_scores=section_scores,
-                detected_labels=detected_labels,
+                detected_labels=detected,
                 missing_required_labels=missing_required
             )
             
@@ -400,117 +431,108 @@ class SurveyStructureValidator:
         else:
             return "poor"
     
-    def _validate_satisfaction_scales(self, survey_json: Dict) -> List[ValidationIssue]:
+    def _normalize_detected_labels(self, detected_labels: Optional[Dict]) -> Dict[str, Set[str]]:
+        """Key precomputed section labels by str(section_id), as stored in workflow state"""
+        if not detected_labels:
+            return {}
+        return {str(section_id): set(labels or []) for section_id, labels in detected_labels.items()}
+    
+    def _check_satisfaction_scale(self, facts: QuestionFacts) -> List[ValidationIssue]:
         """Validate that Brand_Product_Satisfaction questions use 1-5 scale with text labels"""
         issues = []
+        if facts.section_id != 3:  # Only check Brand/Product Awareness section
+            return issues
         
-        for section in survey_json.get('sections', []):
-            section_id = section.get('id')
-            if section_id != 3:  # Only check Brand/Product Awareness section
-                continue
-                
-            for question in section.get('questions', []):
-                # Check if this is a satisfaction question
-                question_text = question.get('text', '').lower()
-                if 'satisfaction' in question_text or 'satisfied' in question_text:
-                    question_type = question.get('type', '')
-                    options = question.get('options', [])
-                    scale_labels = question.get('scale_labels', {})
-                    
-                    # Check if it's a scale question
-                    if question_type == 'scale':
-                        # Validate 1-5 scale
-                        if options != ['1', '2', '3', '4', '5']:
-                            issues.append(ValidationIssue(
-                                severity=IssueSeverity.ERROR,
-                                section_id=section_id,
-                                label='Satisfaction_Scale_Format',
-                                message=f"Satisfaction question should use 1-5 scale, found: {options}",
-                                suggestion="Use options: ['1', '2', '3', '4', '5'] with scale_labels"
-                            ))
-                        
-                        # Validate scale_labels
-                        expected_labels = {
-                            '1': 'Very Dissatisfied',
-                            '2': 'Dissatisfied',
-                            '3': 'Neutral',
-                            '4': 'Satisfied',
-                            '5': 'Very Satisfied'
-                        }
-                        if scale_labels != expected_labels:
-                            issues.append(ValidationIssue(
-                                severity=IssueSeverity.ERROR,
-                                section_id=section_id,
-                                label='Satisfaction_Scale_Labels',
-                                message=f"Satisfaction question missing correct scale_labels",
-                                suggestion=f"Add scale_labels: {expected_labels}"
-                            ))
+        # Check if this is a satisfaction question
+        if 'satisfaction' not in facts.text and 'satisfied' not in facts.text:
+            return issues
+        
+        # Check if it's a scale question
+        if facts.question_type == 'scale':
+            options = facts.question.get('options', [])
+            scale_labels = facts.question.get('scale_labels', {})
+            
+            # Validate 1-5 scale
+            if options != ['1', '2', '3', '4', '5']:
+                issues.append(ValidationIssue(
+                    severity=IssueSeverity.ERROR,
+                    section_id=facts.section_id,
+                    label='Satisfaction_Scale_Format',
+                    message=f"Satisfaction question should use 1-5 scale, found: {options}",
+                    suggestion="Use options: ['1', '2', '3', '4', '5'] with scale_labels"
+                ))
+            
+            # Validate scale_labels
+            expected_labels = {
+                '1': 'Very Dissatisfied',
+                '2': 'Dissatisfied',
+                '3': 'Neutral',
+                '4': 'Satisfied',
+                '5': 'Very Satisfied'
+            }
+            if scale_labels != expected_labels:
+                issues.append(ValidationIssue(
+                    severity=IssueSeverity.ERROR,
+                    section_id=facts.section_id,
+                    label='Satisfaction_Scale_Labels',
+                    message=f"Satisfaction question missing correct scale_labels",
+                    suggestion=f"Add scale_labels: {expected_labels}"
+                ))
         
         return issues
     
-    def _validate_positioning_exclusion(self, survey_json: Dict) -> List[ValidationIssue]:
+    def _check_positioning_exclusion(self, facts: QuestionFacts) -> List[ValidationIssue]:
         """Validate that positioning questions are NOT in Section 5 (Methodology)"""
-        issues = []
-        
-        for section in survey_json.get('sections', []):
-            section_id = section.get('id')
-            if section_id != 5:  # Only check Methodology section
-                continue
-                
-            for question in section.get('questions', []):
-                question_text = question.get('text', '').lower()
-                # Check for positioning-related keywords
-                positioning_keywords = ['positioning', 'position', 'position statement', 'brand position']
-                if any(keyword in question_text for keyword in positioning_keywords):
-                    issues.append(ValidationIssue(
-                        severity=IssueSeverity.WARNING,
-                        section_id=section_id,
-                        label='Positioning_In_Methodology',
-                        message="Positioning question found in Section 5 (Methodology) - should not be system-generated",
-                        suggestion="Remove positioning questions from Methodology section. Positioning should only come from user-provided content in Concept Reaction (Section 4)"
-                    ))
-        
-        return issues
+        if facts.section_id != 5:  # Only check Methodology section
+            return []
+        
+        # Check for positioning-related keywords
+        positioning_keywords = ['positioning', 'position', 'position statement', 'brand position']
+        if not any(keyword in facts.text for keyword in positioning_keywords):
+            return []
+        
+        return [ValidationIssue(
+            severity=IssueSeverity.WARNING,
+            section_id=facts.section_id,
+            label='Positioning_In_Methodology',
+            message="Positioning question found in Section 5 (Methodology) - should not be system-generated",
+            suggestion="Remove positioning questions from Methodology section. Positioning should only come from user-provided content in Concept Reaction (Section 4)"
+        )]
     
-    def _validate_brand_awareness_funnel(self, survey_json: Dict) -> List[ValidationIssue]:
+    def _check_brand_awareness_funnel(self, facts: QuestionFacts) -> List[ValidationIssue]:
         """Validate that Brand_Awareness_Funnel is a matrix_likert question with proper stages"""
         issues = []
+        if facts.section_id != 3:  # Only check Brand/Product Awareness section
+            return issues
         
-        for section in survey_json.get('sections', []):
-            section_id = section.get('id')
-            if section_id != 3:  # Only check Brand/Product Awareness section
-                continue
-                
-            for question in section.get('questions', []):
-                question_text = question.get('text', '').lower()
-                # Check if this is a brand awareness funnel question
-                if any(keyword in question_text for keyword in ['aware', 'considered', 'purchased', 'continue', 'prefer']):
-                    question_type = question.get('type', '')
-                    
-                    # Should be matrix_likert
-                    if question_type != 'matrix_likert':
-                        issues.append(ValidationIssue(
-                            severity=IssueSeverity.ERROR,
-                            section_id=section_id,
-                            label='Brand_Awareness_Funnel_Format',
-                            message=f"Brand_Awareness_Funnel should be matrix_likert type, found: {question_type}",
-                            suggestion="Change question type to 'matrix_likert' with brands as rows and funnel stages (Aware, Considered, Purchased, Continue, Preferred) as options"
-                        ))
-                    else:
-                        # Check for proper stages
-                        options = question.get('options', [])
-                        required_stages = ['aware', 'considered', 'purchased']
-                        options_lower = [opt.lower() for opt in options]
-                        missing_stages = [stage for stage in required_stages if not any(stage in opt for opt in options_lower)]
-                        
-                        if missing_stages:
-                            issues.append(ValidationIssue(
-                                severity=IssueSeverity.WARNING,
-                                section_id=section_id,
-                                label='Brand_Awareness_Funnel_Stages',
-                                message=f"Brand_Awareness_Funnel missing stages: {', '.join(missing_stages)}",
-                                suggestion="Include all funnel stages: Aware → Considered → Purchased → Continue → Preferred"
-                            ))
+        # Check if this is a brand awareness funnel question
+        if not any(keyword in facts.text for keyword in ['aware', 'considered', 'purchased', 'continue', 'prefer']):
+            return issues
+        
+        # Should be matrix_likert
+        if facts.question_type != 'matrix_likert':
+            issues.append(ValidationIssue(
+                severity=IssueSeverity.ERROR,
+                section_id=facts.section_id,
+                label='Brand_Awareness_Funnel_Format',
+                message=f"Brand_Awareness_Funnel should be matrix_likert type, found: {facts.question_type}",
+                suggestion="Change question type to 'matrix_likert' with brands as rows and funnel stages (Aware, Considered, Purchased, Continue, Preferred) as options"
+            ))
+        else:
+            # Check for proper stages
+            options = facts.question.get('options', [])
+            required_stages = ['aware', 'considered', 'purchased']
+            options_lower = [opt.lower() for opt in options]
+            missing_stages = [stage for stage in required_stages if not any(stage in opt for opt in options_lower)]
+            
+            if missing_stages:
+                issues.append(ValidationIssue(
+                    severity=IssueSeverity.WARNING,
+                    section_id=facts.section_id,
+                    label='Brand_Awareness_Funnel_Stages',
+                    message=f"Brand_Awareness_Funnel missing stages: {', '.join(missing_stages)}",
+                    suggestion="Include all funnel stages: Aware → Considered → Purchased → Continue → Preferred"
+                ))
         
         return issues
     
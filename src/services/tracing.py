@@ -0,0 +1,350 @@
+"""
+Tracing
+Lightweight in-process spans for workflow nodes, DB queries, embedding and LLM calls.
+
+Spans nest through a context variable, so a node span becomes the parent of the
+DB, embedding and LLM spans started while it runs (including inside
+``asyncio.to_thread``). Finished spans go to a bounded ring buffer that backs
+``/admin/perf``. If ``TRACING_EXPORT_PATH`` is set, they are also appended there
+as OTLP/JSON lines (one ``ExportTraceServiceRequest`` per finished trace) so any
+OTLP-capable tool can load them.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import math
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "survey-engine"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation; ended exactly once, then recorded by the tracer"""
+
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent_id", "attributes",
+        "start_time", "end_time", "duration_ms", "error", "_start_perf", "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self._start_perf = time.perf_counter()
+        self._token = _current_span.set(self)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        if self.end_time is not None:
+            return
+        self.duration_ms = (time.perf_counter() - self._start_perf) * 1000
+        self.end_time = self.start_time + self.duration_ms / 1000
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Ended from a different context (e.g. another task); the parent is restored there
+            pass
+        self.tracer.record(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(int(self.start_time * 1e9)),
+            "endTimeUnixNano": str(int((self.end_time or self.start_time) * 1e9)),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            otlp["parentSpanId"] = self.parent_id
+        return otlp
+
+
+class _NoopSpan:
+    """Returned when tracing is disabled or a span is only wanted inside an existing trace"""
+
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class OTLPFileExporter:
+    """Appends finished traces to a file as OTLP/JSON ``ExportTraceServiceRequest`` lines"""
+
+    def __init__(self, path: str, max_pending: int = 512):
+        self.path = path
+        self.max_pending = max_pending
+        self._pending: List[Span] = []
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._pending.append(span)
+            # Flush when a trace finishes, or before the pending list grows unbounded
+            if span.parent_id is not None and len(self._pending) < self.max_pending:
+                return
+            batch, self._pending = self._pending, []
+        self._write(batch)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[Span]) -> None:
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "src.services.tracing"},
+                    "spans": [span.to_otlp() for span in batch],
+                }],
+            }]
+        }
+        try:
+            with open(self.path, "a", encoding="utf-8") as export_file:
+                export_file.write(json.dumps(request, default=str) + "\n")
+        except OSError as e:
+            logger.warning(f"⚠️ [Tracing] Failed to export {len(batch)} spans to {self.path}: {e}")
+
+
+class Tracer:
+    """Creates spans and keeps the most recent finished ones in a ring buffer"""
+
+    def __init__(self, enabled: bool = True, buffer_size: int = 20000, exporter: Optional[OTLPFileExporter] = None):
+        self.enabled = enabled
+        self.exporter = exporter
+        self._spans: Deque[Span] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, require_parent: bool = False, **attributes: Any):
+        """
+        Start a span as a child of the current span (or as a new trace root)
+
+        Args:
+            name: Span name; statistics are grouped by it
+            require_parent: Only trace inside an existing trace (used for high-volume DB spans)
+            **attributes: Span attributes
+
+        Returns:
+            The started span; call ``end()`` on it exactly once
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        parent = _current_span.get()
+        if require_parent and parent is None:
+            return _NOOP_SPAN
+        return Span(self, name, parent, attributes)
+
+    @contextmanager
+    def span(self, name: str, require_parent: bool = False, **attributes: Any) -> Iterator[Any]:
+        span = self.start_span(name, require_parent=require_parent, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            span.end(e)
+            raise
+        else:
+            span.end()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def get_spans(self, window_seconds: Optional[float] = None) -> List[Span]:
+        with self._lock:
+            spans = list(self._spans)
+        if window_seconds is None:
+            return spans
+        cutoff = time.time() - window_seconds
+        return [span for span in spans if span.end_time >= cutoff]
+
+    def get_stats(self, window_seconds: float = 900) -> Dict[str, Dict[str, Any]]:
+        """
+        Latency percentiles per span name over a sliding window
+
+        Args:
+            window_seconds: Only spans that finished within this many seconds are counted
+
+        Returns:
+            Mapping of span name to count, errors, p50/p95/p99/max and total milliseconds,
+            ordered by total time spent (largest first)
+        """
+        durations: Dict[str, List[float]] = {}
+        errors: Dict[str, int] = {}
+        for span in self.get_spans(window_seconds):
+            durations.setdefault(span.name, []).append(span.duration_ms)
+            if span.error:
+                errors[span.name] = errors.get(span.name, 0) + 1
+
+        stats = {}
+        for name, values in durations.items():
+            values.sort()
+            stats[name] = {
+                "count": len(values),
+                "errors": errors.get(name, 0),
+                "p50_ms": round(_percentile(values, 50), 3),
+                "p95_ms": round(_percentile(values, 95), 3),
+                "p99_ms": round(_percentile(values, 99), 3),
+                "max_ms": round(values[-1], 3),
+                "total_ms": round(sum(values), 3),
+            }
+        return dict(sorted(stats.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+    def get_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """All buffered spans of one trace, in start order"""
+        spans = [span for span in self.get_spans() if span.trace_id == trace_id]
+        return [span.to_dict() for span in sorted(spans, key=lambda span: span.start_time)]
+
+    def get_recent_traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent root spans (one per finished trace), newest first"""
+        roots = [span for span in self.get_spans() if span.parent_id is None]
+        return [span.to_dict() for span in reversed(roots[-limit:])]
+
+    def flush(self) -> None:
+        """Write spans of unfinished traces to the exporter (called on shutdown)"""
+        if self.exporter is not None:
+            self.exporter.flush()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """
+    Decorator that runs a sync or async function inside a span
+
+    Args:
+        name: Span name (defaults to ``module.qualname``)
+        **attributes: Static span attributes
+    """
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(span_name, **attributes):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def sync_wrapper(*args, **kwargs):
+            with tracer.span(span_name, **attributes):
+                return fn(*args, **kwargs)
+        return sync_wrapper
+    return decorator
+
+
+def instrument_sqlalchemy(engine) -> None:
+    """
+    Record a ``db.<operation>`` span for every statement executed inside an active trace
+
+    Args:
+        engine: SQLAlchemy engine to attach cursor execution listeners to
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        operation = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else "query"
+        context._trace_span = tracer.start_span(
+            f"db.{operation}", require_parent=True, statement=statement[:200]
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            span.end()
+            context._trace_span = None
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_trace_span", None) if context is not None else None
+        if span is not None:
+            span.end(exception_context.original_exception)
+            context._trace_span = None
+
+
+# Global tracer instance
+tracer = Tracer(
+    enabled=settings.tracing_enabled,
+    buffer_size=settings.tracing_buffer_size,
+    exporter=OTLPFileExporter(settings.tracing_export_path) if settings.tracing_export_path else None,
+)
@@ -3,8 +3,9 @@ Version Service for managing survey versions
 Handles version tracking, current version management, and version history
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import desc, literal, select
+from sqlalchemy.engine import Row
 from typing import List, Optional
 from uuid import UUID
 import logging
@@ -13,6 +14,29 @@ from src.database.models import Survey, RFQ
 
 logger = logging.getLogger(__name__)
 
+# Guards the ancestry CTE against parent_survey_id cycles
+MAX_ANCESTRY_DEPTH = 1000
+
+
+def version_summary_columns(entity=Survey) -> tuple:
+    """
+    Columns for version timelines: identity, lineage and score summary, without the
+    raw_output/final_output JSONB payloads
+    """
+    return (
+        entity.id,
+        entity.rfq_id,
+        entity.version,
+        entity.is_current,
+        entity.status,
+        entity.parent_survey_id,
+        entity.version_notes,
+        entity.created_at,
+        entity.golden_similarity_score,
+        entity.pillar_scores['overall_grade'].astext.label('overall_grade'),
+        entity.pillar_scores['weighted_score'].as_float().label('weighted_score'),
+    )
+
 
 class VersionService:
     """Service for managing survey versions"""
@@ -37,6 +61,23 @@ class VersionService:
             .all()
         )
 
+    def get_version_summaries(self, rfq_id: UUID) -> List[Row]:
+        """
+        Get lightweight rows for all versions of an RFQ, ordered by version number
+
+        Args:
+            rfq_id: The RFQ ID to get versions for
+
+        Returns:
+            Rows with the version_summary_columns fields, without survey payloads
+        """
+        return (
+            self.db.query(*version_summary_columns())
+            .filter(Survey.rfq_id == rfq_id)
+            .order_by(Survey.version.asc())
+            .all()
+        )
+
     def get_current_version(self, rfq_id: UUID) -> Optional[Survey]:
         """
         Get the current version for an RFQ
@@ -99,6 +140,45 @@ class VersionService:
         # Get all versions for the same RFQ
         return self.get_survey_versions(survey.rfq_id)
 
+    def get_version_history_summaries(self, survey_id: UUID) -> List[Row]:
+        """
+        Get lightweight rows for every version of a survey's RFQ (see get_version_history)
+
+        Args:
+            survey_id: The survey ID to get history for
+
+        Returns:
+            Rows with the version_summary_columns fields in version order (oldest to newest)
+        """
+        survey = self.db.query(Survey.rfq_id).filter(Survey.id == survey_id).first()
+        if not survey:
+            raise ValueError(f"Survey not found: {survey_id}")
+
+        return self.get_version_summaries(survey.rfq_id)
+
+    def get_ancestry(self, survey_id: UUID) -> List[Row]:
+        """
+        Get the parent_survey_id chain of a survey in one recursive query
+
+        Args:
+            survey_id: The survey ID to start from
+
+        Returns:
+            Rows with the version_summary_columns fields plus depth (0 for the survey itself),
+            ordered from the root ancestor down to the survey; empty if the survey does not exist
+        """
+        parent = aliased(Survey)
+        ancestry = (
+            select(*version_summary_columns(), literal(0).label('depth'))
+            .where(Survey.id == survey_id)
+            .cte('ancestry', recursive=True)
+        )
+        ancestry = ancestry.union_all(
+            select(*version_summary_columns(parent), (ancestry.c.depth + 1).label('depth'))
+            .where(parent.id == ancestry.c.parent_survey_id, ancestry.c.depth < MAX_ANCESTRY_DEPTH)
+        )
+        return self.db.execute(select(ancestry).order_by(ancestry.c.depth.desc())).all()
+
     def increment_version(self, rfq_id: UUID) -> int:
         """
         Get the next version number for an RFQ
@@ -130,11 +210,16 @@ class VersionService:
         Returns:
             Parent Survey or None if this is v1
         """
-        survey = self.db.query(Survey).filter(Survey.id == survey_id).first()
-        if not survey:
+        # Child id and parent row in one query; the child's payload is never loaded
+        child = aliased(Survey)
+        row = (
+            self.db.query(child.id, Survey)
+            .outerjoin(Survey, Survey.id == child.parent_survey_id)
+            .filter(child.id == survey_id)
+            .first()
+        )
+        if not row:
             raise ValueError(f"Survey not found: {survey_id}")
 
-        if survey.parent_survey_id:
-            return self.db.query(Survey).filter(Survey.id == survey.parent_survey_id).first()
-        return None
+        return row[1]
 
@@ -0,0 +1,142 @@
+"""
+Workflow Checkpoint Service
+Compact per-node checkpoints so failed generation workflows resume from the last completed node
+"""
+
+import logging
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.database.models import GoldenRFQSurveyPair, WorkflowCheckpoint
+from src.workflows.state import SurveyGenerationState
+
+logger = logging.getLogger(__name__)
+
+# Large golden example fields that are reloaded from golden_rfq_survey_pairs on resume
+GOLDEN_CONTENT_FIELDS = ("rfq_text", "survey_json")
+
+# Embeddings are stored in their own binary column, not in the JSON state
+EMBEDDING_FIELDS = {"rfq_embedding", "embedding"}
+
+
+def pack_embedding(values: Optional[List[float]]) -> Optional[bytes]:
+    """Pack an embedding as little-endian float32 (1.5 KB for 384 dimensions)"""
+    if values is None:
+        return None
+    return struct.pack(f"<{len(values)}f", *values)
+
+
+def unpack_embedding(data: Optional[bytes]) -> Optional[List[float]]:
+    if not data:
+        return None
+    return list(struct.unpack(f"<{len(data) // 4}f", data))
+
+
+def encode_state(state: SurveyGenerationState) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """
+    Convert workflow state into the compact checkpoint form
+
+    Args:
+        state: Workflow state after a completed node
+
+    Returns:
+        Tuple of (JSON-safe state without embeddings or golden content, packed RFQ embedding)
+    """
+    state_data = state.model_dump(mode="json", exclude=EMBEDDING_FIELDS)
+    state_data["golden_examples"] = [
+        {key: value for key, value in example.items() if key not in GOLDEN_CONTENT_FIELDS}
+        if example.get("id") else example
+        for example in state_data.get("golden_examples") or []
+    ]
+    # The duplicate embedding field is only kept when it differs from the RFQ embedding
+    state_data["embedding_is_rfq_embedding"] = state.embedding is not None and state.embedding == state.rfq_embedding
+    return state_data, pack_embedding(state.rfq_embedding)
+
+
+class WorkflowCheckpointService:
+    """Save, load and delete per-node workflow checkpoints"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def save_checkpoint(self, state: SurveyGenerationState, node_name: str) -> None:
+        """
+        Upsert the checkpoint for ``state.workflow_id`` after ``node_name`` completed
+
+        Args:
+            state: Workflow state including the node's output and ``completed_nodes``
+            node_name: Node that just completed
+        """
+        state_data, rfq_embedding = encode_state(state)
+        checkpoint = self.db.query(WorkflowCheckpoint).filter(
+            WorkflowCheckpoint.workflow_id == state.workflow_id
+        ).first()
+        if checkpoint is None:
+            checkpoint = WorkflowCheckpoint(workflow_id=state.workflow_id)
+            self.db.add(checkpoint)
+
+        checkpoint.survey_id = state.survey_id
+        checkpoint.last_node = node_name
+        checkpoint.completed_nodes = list(state.completed_nodes)
+        checkpoint.state_data = state_data
+        checkpoint.rfq_embedding = rfq_embedding
+        self.db.commit()
+        logger.info(f"💾 [WorkflowCheckpoint] Saved checkpoint after {node_name} for {state.workflow_id}")
+
+    def get_checkpoint(self, workflow_id: str) -> Optional[WorkflowCheckpoint]:
+        return self.db.query(WorkflowCheckpoint).filter(
+            WorkflowCheckpoint.workflow_id == workflow_id
+        ).first()
+
+    def load_checkpoint(self, workflow_id: str) -> Optional[SurveyGenerationState]:
+        """
+        Rebuild the workflow state from the latest checkpoint
+
+        Args:
+            workflow_id: Workflow to resume
+
+        Returns:
+            Restored state with ``completed_nodes`` set, or None if there is no checkpoint
+        """
+        checkpoint = self.get_checkpoint(workflow_id)
+        if checkpoint is None:
+            return None
+
+        state_data = dict(checkpoint.state_data)
+        embedding_is_rfq_embedding = state_data.pop("embedding_is_rfq_embedding", False)
+        state_data["golden_examples"] = self._rehydrate_golden_examples(state_data.get("golden_examples") or [])
+        state_data["rfq_embedding"] = unpack_embedding(checkpoint.rfq_embedding)
+        if embedding_is_rfq_embedding:
+            state_data["embedding"] = state_data["rfq_embedding"]
+        # Errors belong to the failed attempt, not to the checkpoint being resumed
+        state_data["error_message"] = None
+
+        logger.info(f"📂 [WorkflowCheckpoint] Loaded checkpoint for {workflow_id} (last node: {checkpoint.last_node})")
+        return SurveyGenerationState(**state_data)
+
+    def _rehydrate_golden_examples(self, examples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        ids = [example["id"] for example in examples if example.get("id") and "survey_json" not in example]
+        if not ids:
+            return examples
+
+        rows = self.db.query(
+            GoldenRFQSurveyPair.id, GoldenRFQSurveyPair.rfq_text, GoldenRFQSurveyPair.survey_json
+        ).filter(GoldenRFQSurveyPair.id.in_(ids)).all()
+        content = {str(row.id): {"rfq_text": row.rfq_text, "survey_json": row.survey_json} for row in rows}
+
+        rehydrated = []
+        for example in examples:
+            example_content = content.get(str(example.get("id")))
+            if example_content is None and "survey_json" not in example:
+                logger.warning(f"⚠️ [WorkflowCheckpoint] Golden example {example.get('id')} no longer exists, dropping it")
+                continue
+            rehydrated.append({**example, **(example_content or {})})
+        return rehydrated
+
+    def delete_checkpoint(self, workflow_id: str) -> None:
+        self.db.query(WorkflowCheckpoint).filter(
+            WorkflowCheckpoint.workflow_id == workflow_id
+        ).delete(synchronize_session=False)
+        self.db.commit()
@@ -0,0 +1,324 @@
+"""
+Workflow Queue Service
+Durable Postgres-backed job queue for survey generation workflows
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.database.models import Survey, WorkflowJob
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE_RFQ = "rfq"
+JOB_TYPE_ENHANCED_RFQ = "enhanced_rfq"
+
+# Serialises claim decisions so the global concurrency check can't race
+CLAIM_ADVISORY_LOCK_KEY = 730_031
+
+
+class WorkflowQueueFullError(Exception):
+    """Raised when admission control rejects a new workflow job"""
+
+    def __init__(self, queue_depth: int, max_depth: int):
+        self.queue_depth = queue_depth
+        self.max_depth = max_depth
+        super().__init__(f"Workflow queue is full ({queue_depth}/{max_depth} jobs waiting)")
+
+
+class WorkflowJobActiveError(Exception):
+    """Raised when a workflow that is still queued or running is submitted again"""
+
+    def __init__(self, workflow_id: str, status: str):
+        self.workflow_id = workflow_id
+        self.status = status
+        super().__init__(f"Workflow {workflow_id} is already {status}")
+
+
+class WorkflowQueueService:
+    """
+    Enqueue, claim and settle workflow jobs.
+
+    Workers claim with ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent workers
+    never pick the same job, and keep a heartbeat on running jobs; a running job
+    whose heartbeat is older than the lease is reclaimed by another worker.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    def _stale_before(self) -> datetime:
+        return self._now() - timedelta(seconds=settings.workflow_job_lease_seconds)
+
+    def _live_running_filter(self):
+        return and_(WorkflowJob.status == "running", WorkflowJob.heartbeat_at >= self._stale_before())
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        job_type: str,
+        workflow_id: str,
+        survey_id: Optional[str],
+        payload: Dict[str, Any],
+    ) -> WorkflowJob:
+        """
+        Add a workflow job to the queue
+
+        Args:
+            job_type: JOB_TYPE_RFQ or JOB_TYPE_ENHANCED_RFQ
+            workflow_id: Workflow ID clients subscribe to for progress
+            survey_id: Survey record the workflow fills in
+            payload: JSON-serialisable arguments for the workflow
+
+        Returns:
+            The queued WorkflowJob
+
+        Raises:
+            WorkflowQueueFullError: If ``workflow_queue_max_depth`` jobs are already waiting
+        """
+        queue_depth = self._check_admission(workflow_id)
+
+        job = WorkflowJob(
+            workflow_id=workflow_id,
+            survey_id=survey_id,
+            job_type=job_type,
+            payload=payload,
+            status="queued",
+            max_attempts=settings.workflow_job_max_attempts,
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        logger.info(f"📥 [WorkflowQueue] Enqueued {job_type} job for workflow_id={workflow_id} (queue depth {queue_depth + 1})")
+        return job
+
+    def enqueue_resume(self, workflow_id: str, survey_id: Optional[str]) -> WorkflowJob:
+        """
+        Queue a checkpointed workflow to resume from its last completed node
+
+        The workflow's existing job row is reset and flagged with
+        ``resume_from_checkpoint`` so workflow IDs stay unique.
+
+        Args:
+            workflow_id: Workflow to resume
+            survey_id: Survey record the workflow fills in
+
+        Returns:
+            The queued WorkflowJob
+
+        Raises:
+            WorkflowJobActiveError: If the workflow is still queued or running
+            WorkflowQueueFullError: If ``workflow_queue_max_depth`` jobs are already waiting
+        """
+        job = (
+            self.db.query(WorkflowJob)
+            .filter(WorkflowJob.workflow_id == workflow_id)
+            .with_for_update()
+            .first()
+        )
+        if job is not None and (
+            job.status == "queued"
+            or (job.status == "running" and job.heartbeat_at is not None and job.heartbeat_at >= self._stale_before())
+        ):
+            self.db.rollback()
+            raise WorkflowJobActiveError(workflow_id, job.status)
+
+        try:
+            self._check_admission(workflow_id)
+        except WorkflowQueueFullError:
+            self.db.rollback()
+            raise
+
+        if job is None:
+            job = WorkflowJob(workflow_id=workflow_id, job_type=JOB_TYPE_RFQ, payload={})
+            self.db.add(job)
+        job.survey_id = survey_id
+        job.payload = {**(job.payload or {}), "resume_from_checkpoint": True}
+        job.status = "queued"
+        job.attempts = 0
+        job.max_attempts = settings.workflow_job_max_attempts
+        job.worker_id = None
+        job.last_error = None
+        job.started_at = None
+        job.heartbeat_at = None
+        job.finished_at = None
+        self.db.commit()
+        self.db.refresh(job)
+        logger.info(f"🔁 [WorkflowQueue] Queued resume of workflow_id={workflow_id}")
+        return job
+
+    def _check_admission(self, workflow_id: str) -> int:
+        queue_depth = self.db.execute(
+            select(func.count()).select_from(WorkflowJob).where(WorkflowJob.status == "queued")
+        ).scalar() or 0
+        if queue_depth >= settings.workflow_queue_max_depth:
+            logger.warning(f"⚠️ [WorkflowQueue] Rejecting {workflow_id}: queue depth {queue_depth}")
+            raise WorkflowQueueFullError(queue_depth, settings.workflow_queue_max_depth)
+        return queue_depth
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def claim_next(self, worker_id: str) -> Optional[WorkflowJob]:
+        """
+        Claim the oldest runnable job if the global concurrency limit allows it
+
+        A job that has used up ``max_attempts`` is failed instead (together with its
+        survey) and returned with status ``failed`` so the caller can notify clients.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            The claimed job, a job that was just failed, or None if nothing is runnable
+        """
+        try:
+            self.db.execute(select(func.pg_advisory_xact_lock(CLAIM_ADVISORY_LOCK_KEY)))
+
+            running = self.db.execute(
+                select(func.count()).select_from(WorkflowJob).where(self._live_running_filter())
+            ).scalar() or 0
+            if running >= settings.workflow_max_concurrent:
+                self.db.rollback()
+                return None
+
+            job = (
+                self.db.query(WorkflowJob)
+                .filter(
+                    or_(
+                        WorkflowJob.status == "queued",
+                        and_(WorkflowJob.status == "running", WorkflowJob.heartbeat_at < self._stale_before()),
+                    )
+                )
+                .order_by(WorkflowJob.created_at)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if job is None:
+                self.db.rollback()
+                return None
+
+            if job.status == "running":
+                logger.warning(f"⚠️ [WorkflowQueue] Reclaiming stale job {job.workflow_id} from worker {job.worker_id}")
+            if job.attempts >= job.max_attempts:
+                job.status = "failed"
+                job.finished_at = self._now()
+                job.last_error = job.last_error or "Worker lost the job too many times"
+                if job.survey_id:
+                    self.db.query(Survey).filter(Survey.id == job.survey_id).update(
+                        {Survey.status: "failed"}, synchronize_session=False
+                    )
+                self.db.commit()
+                self.db.refresh(job)
+                logger.error(f"❌ [WorkflowQueue] Job {job.workflow_id} exceeded {job.max_attempts} attempts")
+                return job
+
+            now = self._now()
+            job.status = "running"
+            job.worker_id = worker_id
+            job.attempts += 1
+            job.started_at = now
+            job.heartbeat_at = now
+            self.db.commit()
+            self.db.refresh(job)
+            return job
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def heartbeat(self, job_id: Any, worker_id: str) -> bool:
+        """Extend the lease on a running job; returns False if the job was taken over"""
+        updated = (
+            self.db.query(WorkflowJob)
+            .filter(WorkflowJob.id == job_id, WorkflowJob.worker_id == worker_id, WorkflowJob.status == "running")
+            .update({WorkflowJob.heartbeat_at: self._now()}, synchronize_session=False)
+        )
+        self.db.commit()
+        return bool(updated)
+
+    def release(self, job_id: Any, worker_id: str) -> None:
+        """Hand a running job back to the queue (graceful worker shutdown)"""
+        self.db.query(WorkflowJob).filter(
+            WorkflowJob.id == job_id, WorkflowJob.worker_id == worker_id, WorkflowJob.status == "running"
+        ).update(
+            {WorkflowJob.status: "queued", WorkflowJob.worker_id: None, WorkflowJob.heartbeat_at: None},
+            synchronize_session=False,
+        )
+        self.db.commit()
+
+    def complete(self, job_id: Any) -> None:
+        self._finish(job_id, "completed")
+
+    def fail(self, job_id: Any, error: str) -> None:
+        # Workflow errors are reported to the client and the survey is marked failed; only a
+        # lost worker (stale heartbeat) leads to a retry, so no LLM spend is repeated on errors
+        self._finish(job_id, "failed", error)
+
+    def _finish(self, job_id: Any, status: str, error: Optional[str] = None) -> None:
+        self.db.query(WorkflowJob).filter(WorkflowJob.id == job_id).update(
+            {
+                WorkflowJob.status: status,
+                WorkflowJob.finished_at: self._now(),
+                WorkflowJob.last_error: error[:4000] if error else None,
+            },
+            synchronize_session=False,
+        )
+        self.db.commit()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, running jobs per worker and oldest waiting job age"""
+        status_counts = dict(
+            self.db.execute(
+                select(WorkflowJob.status, func.count()).group_by(WorkflowJob.status)
+            ).all()
+        )
+        oldest_queued = self.db.execute(
+            select(func.min(WorkflowJob.created_at)).where(WorkflowJob.status == "queued")
+        ).scalar()
+        running_by_worker = dict(
+            self.db.execute(
+                select(WorkflowJob.worker_id, func.count())
+                .where(self._live_running_filter())
+                .group_by(WorkflowJob.worker_id)
+            ).all()
+        )
+        stale_running = self.db.execute(
+            select(func.count()).select_from(WorkflowJob).where(
+                WorkflowJob.status == "running", WorkflowJob.heartbeat_at < self._stale_before()
+            )
+        ).scalar() or 0
+
+        oldest_age = None
+        if oldest_queued is not None:
+            if oldest_queued.tzinfo is None:
+                oldest_queued = oldest_queued.replace(tzinfo=timezone.utc)
+            oldest_age = round((self._now() - oldest_queued).total_seconds(), 1)
+
+        return {
+            "queue_depth": int(status_counts.get("queued", 0)),
+            "running": int(sum(running_by_worker.values())),
+            "stale_running": int(stale_running),
+            "completed": int(status_counts.get("completed", 0)),
+            "failed": int(status_counts.get("failed", 0)),
+            "oldest_queued_age_seconds": oldest_age,
+            "running_by_worker": running_by_worker,
+            "max_concurrent": settings.workflow_max_concurrent,
+            "max_queue_depth": settings.workflow_queue_max_depth,
+        }
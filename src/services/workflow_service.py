@@ -1,12 +1,16 @@
 from sqlalchemy.orm import Session
 from src.database import RFQ, Survey
 from src.workflows.state import SurveyGenerationState
-from src.workflows.workflow import create_workflow
+from src.workflows.workflow import build_run_config, get_compiled_workflow
 from src.services.embedding_service import EmbeddingService
 from src.services.websocket_client import WebSocketNotificationService
 from src.services.workflow_state_service import WorkflowStateService
+from src.services.workflow_checkpoint_service import WorkflowCheckpointService
 from src.services.progress_tracker import get_progress_tracker, cleanup_progress_tracker
+from src.services.llm_gateway import llm_deadline
+from src.services.tracing import tracer
 from src.config import settings
+from src.config.logging_config import log_text_preview
 from typing import Optional, List
 from uuid import uuid4
 from pydantic import BaseModel
@@ -24,6 +28,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# LLM calls must finish this long before the workflow timeout, leaving time to record the failure
+LLM_DEADLINE_MARGIN_SECONDS = 30.0
+
 
 class CircuitBreaker:
     """Simple circuit breaker to prevent cascading failures"""
@@ -90,11 +97,10 @@ class WorkflowService:
             self.ws_client = WebSocketNotificationService(connection_manager)
             logger.info("✅ [WorkflowService] WebSocketNotificationService created successfully")
 
-            logger.info("🔧 [WorkflowService] Creating LangGraph workflow")
+            # The compiled graph is shared by the whole process; sessions and the
+            # progress sink are handed to each run through build_run_config
             try:
-                self.workflow = create_workflow(db, connection_manager)
-                logger.info(f"✅ [WorkflowService] LangGraph workflow created successfully: {type(self.workflow)}")
-                logger.info(f"✅ [WorkflowService] Workflow has ainvoke method: {hasattr(self.workflow, 'ainvoke')}")
+                self.workflow = get_compiled_workflow()
             except Exception as workflow_error:
                 logger.error(f"❌ [WorkflowService] Failed to create workflow: {str(workflow_error)}", exc_info=True)
                 raise Exception(f"Workflow creation failed: {str(workflow_error)}")
@@ -111,8 +117,7 @@ class WorkflowService:
         if not hasattr(self, 'workflow') or self.workflow is None:
             logger.warning("⚠️ [WorkflowService] Workflow not initialized, attempting to reinitialize...")
             try:
-                from src.workflows.workflow import create_workflow
-                self.workflow = create_workflow(self.db, None)
+                self.workflow = get_compiled_workflow()
                 logger.info("✅ [WorkflowService] Workflow reinitialized successfully")
             except Exception as e:
                 logger.error(f"❌ [WorkflowService] Failed to reinitialize workflow: {str(e)}")
@@ -160,7 +165,8 @@ class WorkflowService:
         logger.info(f"🔄 [WorkflowService] Workflow {workflow_id} started. Active: {len(self.active_workflows)}")
 
         try:
-            yield
+            with tracer.span("workflow.run", workflow_id=workflow_id):
+                yield
         finally:
             # Always remove from active workflows
             self.active_workflows.discard(workflow_id)
@@ -189,13 +195,14 @@ class WorkflowService:
         async with self._workflow_isolation(workflow_id):
             try:
                 # Set overall timeout for workflow processing
-                return await asyncio.wait_for(
-                    self._execute_workflow_with_circuit_breaker(
-                        title, description, product_category, target_segment,
-                        research_goal, workflow_id, survey_id, custom_prompt
-                    ),
-                    timeout=900.0  # 15 minute timeout
-                )
+                with llm_deadline(900.0 - LLM_DEADLINE_MARGIN_SECONDS):
+                    return await asyncio.wait_for(
+                        self._execute_workflow_with_circuit_breaker(
+                            title, description, product_category, target_segment,
+                            research_goal, workflow_id, survey_id, custom_prompt
+                        ),
+                        timeout=900.0  # 15 minute timeout
+                    )
             except asyncio.TimeoutError:
                 logger.error(f"❌ [WorkflowService] Workflow {workflow_id} timed out after 15 minutes")
                 # Send failure notification
@@ -221,6 +228,48 @@ class WorkflowService:
                     pass
                 raise
 
+    async def resume_from_checkpoint(self, workflow_id: str) -> WorkflowResult:
+        """
+        Resume a failed or timed-out workflow from its last completed node
+
+        Nodes recorded in the checkpoint (embedding, retrieval, context building, ...)
+        are skipped; the run continues with the first node that did not complete.
+
+        Args:
+            workflow_id: Workflow to resume
+
+        Returns:
+            WorkflowResult of the resumed run
+        """
+        restored_state = WorkflowCheckpointService(self.db).load_checkpoint(workflow_id)
+        if restored_state is None:
+            raise Exception(f"No checkpoint found for workflow {workflow_id}")
+
+        logger.info(f"🔁 [WorkflowService] Resuming {workflow_id} after {restored_state.completed_nodes[-1] if restored_state.completed_nodes else 'start'}")
+
+        async with self._workflow_isolation(workflow_id):
+            try:
+                with llm_deadline(900.0 - LLM_DEADLINE_MARGIN_SECONDS):
+                    return await asyncio.wait_for(
+                        self._execute_workflow_with_circuit_breaker(
+                            restored_state.rfq_title, restored_state.rfq_text, restored_state.product_category,
+                            restored_state.target_segment, restored_state.research_goal, workflow_id,
+                            restored_state.survey_id, restored_state.system_prompt, initial_state=restored_state
+                        ),
+                        timeout=900.0  # 15 minute timeout
+                    )
+            except asyncio.TimeoutError:
+                logger.error(f"❌ [WorkflowService] Resumed workflow {workflow_id} timed out after 15 minutes")
+                try:
+                    await self.ws_client.send_progress_update(workflow_id, {
+                        "type": "error",
+                        "message": "Workflow timed out after 15 minutes",
+                        "error": "timeout"
+                    })
+                except Exception:
+                    pass
+                raise Exception("Workflow execution timed out")
+
     async def process_enhanced_rfq(
         self,
         enhanced_rfq: 'EnhancedRFQRequest',
@@ -246,14 +295,15 @@ class WorkflowService:
         async with self._workflow_isolation(workflow_id):
             try:
                 # Set overall timeout for workflow processing
-                return await asyncio.wait_for(
-                    self._execute_enhanced_workflow_with_circuit_breaker(
-                        enhanced_rfq, legacy_title, legacy_description,
-                        legacy_product_category, legacy_target_segment,
-                        legacy_research_goal, workflow_id, survey_id, custom_prompt
-                    ),
-                    timeout=600.0  # 10 minute timeout
-                )
+                with llm_deadline(600.0 - LLM_DEADLINE_MARGIN_SECONDS):
+                    return await asyncio.wait_for(
+                        self._execute_enhanced_workflow_with_circuit_breaker(
+                            enhanced_rfq, legacy_title, legacy_description,
+                            legacy_product_category, legacy_target_segment,
+                            legacy_research_goal, workflow_id, survey_id, custom_prompt
+                        ),
+                        timeout=600.0  # 10 minute timeout
+                    )
             except asyncio.TimeoutError:
                 logger.error(f"❌ [WorkflowService] Enhanced workflow {workflow_id} timed out after 10 minutes")
                 # Send failure notification
@@ -520,12 +570,18 @@ class WorkflowService:
             
             # Execute workflow
             logger.info("🚀 [WorkflowService] Starting LangGraph workflow execution")
-            logger.info(f"🔍 [WorkflowService] Initial state before execution: {str(initial_state.model_dump())[:200]}...")
+            logger.info(f"🔍 [WorkflowService] Initial state before execution: {log_text_preview(initial_state.model_dump())}...")
             
             try:
-                final_state = await self.workflow.ainvoke(initial_state)
+                final_state = await self.workflow.ainvoke(
+                    initial_state,
+                    config=build_run_config(
+                        connection_manager=self.connection_manager,
+                        checkpoints=settings.workflow_checkpoints_enabled
+                    )
+                )
                 logger.info(f"✅ [WorkflowService] Workflow execution completed. Final state keys: {list(final_state.keys()) if isinstance(final_state, dict) else 'not dict'}")
-                logger.info(f"🔍 [WorkflowService] Final state: {str(final_state)[:200]}...")
+                logger.info(f"🔍 [WorkflowService] Final state: {log_text_preview(final_state)}...")
                 
                 # Check if workflow was paused
                 if isinstance(final_state, dict):
@@ -821,6 +877,13 @@ class WorkflowService:
                     str(survey.id),
                     survey.status
                 )
+                
+                # A run that produced a survey no longer needs its checkpoint; failed runs keep it for resume
+                if final_state.get("generated_survey") and not final_state.get("error_message"):
+                    try:
+                        WorkflowCheckpointService(self.db).delete_checkpoint(initial_state.workflow_id)
+                    except Exception as checkpoint_error:
+                        logger.warning(f"⚠️ [WorkflowService] Failed to delete workflow checkpoint: {str(checkpoint_error)}")
             
             logger.info(f"🎉 [WorkflowService] Workflow processing completed successfully: {result.model_dump()}")
             return result
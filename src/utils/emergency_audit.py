@@ -21,6 +21,8 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from src.config.logging_config import log_text_preview
+
 logger = logging.getLogger(__name__)
 
 # Emergency log directory
@@ -120,11 +122,11 @@ async def emergency_log_llm_failure(
     logger.error(
         f"❌ [EmergencyAudit] ALL LOGGING FAILED - Raw response preview (first 500 chars):"
     )
-    logger.error(raw_response[:500])
+    logger.error(log_text_preview(raw_response, 500))
     logger.error(
         f"❌ [EmergencyAudit] Raw response ending (last 500 chars):"
     )
-    logger.error(raw_response[-500:])
+    logger.error(log_text_preview(raw_response, 500, tail=True))
     
     return interaction_id
 
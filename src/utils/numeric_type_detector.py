@@ -7,10 +7,34 @@ rendering and validation for different numeric input scenarios.
 """
 
 import re
-from typing import Dict, Any, Optional, Literal
+from typing import Dict, Any, Optional, Literal, Pattern, Sequence
 from enum import Enum
 
 
+# Whole-word keyword patterns such as r'\bprice\b' or r'\bitems?\b'
+_KEYWORD_PATTERN = re.compile(r'\\b(\w+\??)\\b')
+
+
+def _compile_alternation(patterns: Sequence[str]) -> Pattern:
+    """
+    Compile a pattern family into one case-insensitive alternation regex.
+    
+    Whole-word keyword patterns are folded into a single \\b(?:...)\\b group so
+    the word boundary is checked once per position rather than once per keyword.
+    """
+    keywords = []
+    others = []
+    for pattern in patterns:
+        match = _KEYWORD_PATTERN.fullmatch(pattern)
+        if match:
+            keywords.append(match[1])
+        else:
+            others.append(f'(?:{pattern})')
+    if keywords:
+        others.insert(0, r'\b(?:' + '|'.join(keywords) + r')\b')
+    return re.compile('|'.join(others), re.IGNORECASE)
+
+
 class NumericType(Enum):
     """Enumeration of supported numeric question types."""
     CURRENCY = "currency"
@@ -107,6 +131,31 @@ class NumericTypeDetector:
         r'units?\s+of'
     ]
     
+    # Unit extraction patterns, tried in order (first usable capture wins)
+    UNIT_PATTERNS = [
+        r'per\s+([^,.?]+)',
+        r'in\s+([^,.?]+)',
+        r'measured\s+in\s+([^,.?]+)',
+        r'units?\s+of\s+([^,.?]+)',
+        # The lookbehind only skips retries from inside a word; matches are unchanged
+        r'(?<![a-z])([a-z]+)\s*[?.,]'
+    ]
+    
+    # Common words captured by the unit patterns that are never units
+    NON_UNITS = frozenset(['what', 'how', 'which', 'when', 'where', 'why', 'the', 'a', 'an'])
+    
+    # Each family is compiled once into a single alternation so detection runs
+    # one regex search per type instead of one per pattern
+    AGE_REGEX = _compile_alternation(AGE_PATTERNS)
+    CURRENCY_REGEX = _compile_alternation(CURRENCY_PATTERNS)
+    QUANTITY_REGEX = _compile_alternation(QUANTITY_PATTERNS)
+    RATING_REGEX = _compile_alternation(RATING_PATTERNS)
+    PERCENTAGE_REGEX = _compile_alternation(PERCENTAGE_PATTERNS)
+    MEASUREMENT_REGEX = _compile_alternation(MEASUREMENT_PATTERNS)
+    
+    # Unit patterns keep their priority order, so they are compiled individually
+    UNIT_REGEXES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in UNIT_PATTERNS)
+    
     @classmethod
     def detect_numeric_type(
         cls, 
@@ -143,33 +192,30 @@ class NumericTypeDetector:
         combined_text = f"{text} {label_text}"
         
         # Check each type in order of specificity
-        if cls._matches_patterns(combined_text, cls.AGE_PATTERNS):
+        if cls._matches_patterns(combined_text, cls.AGE_REGEX):
             return NumericType.AGE
         
-        if cls._matches_patterns(combined_text, cls.CURRENCY_PATTERNS):
+        if cls._matches_patterns(combined_text, cls.CURRENCY_REGEX):
             return NumericType.CURRENCY
         
-        if cls._matches_patterns(combined_text, cls.QUANTITY_PATTERNS):
+        if cls._matches_patterns(combined_text, cls.QUANTITY_REGEX):
             return NumericType.QUANTITY
         
-        if cls._matches_patterns(combined_text, cls.RATING_PATTERNS):
+        if cls._matches_patterns(combined_text, cls.RATING_REGEX):
             return NumericType.RATING
         
-        if cls._matches_patterns(combined_text, cls.PERCENTAGE_PATTERNS):
+        if cls._matches_patterns(combined_text, cls.PERCENTAGE_REGEX):
             return NumericType.PERCENTAGE
         
-        if cls._matches_patterns(combined_text, cls.MEASUREMENT_PATTERNS):
+        if cls._matches_patterns(combined_text, cls.MEASUREMENT_REGEX):
             return NumericType.MEASUREMENT
         
         return NumericType.GENERIC
     
     @classmethod
-    def _matches_patterns(cls, text: str, patterns: list) -> bool:
-        """Check if text matches any of the given patterns."""
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        return False
+    def _matches_patterns(cls, text: str, regex: Pattern) -> bool:
+        """Check if text matches any pattern of a precompiled pattern family."""
+        return regex.search(text) is not None
     
     @classmethod
     def get_input_config(cls, numeric_type: NumericType) -> Dict[str, Any]:
@@ -268,21 +314,12 @@ class NumericTypeDetector:
         Returns:
             Extracted unit string or None
         """
-        unit_patterns = [
-            r'per\s+([^,.?]+)',
-            r'in\s+([^,.?]+)',
-            r'measured\s+in\s+([^,.?]+)',
-            r'units?\s+of\s+([^,.?]+)',
-            r'([a-z]+)\s*[?.,]'
-        ]
-        
-        for pattern in unit_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for regex in cls.UNIT_REGEXES:
+            match = regex.search(text)
             if match:
                 unit = match[1].strip()
                 # Filter out common non-unit words
-                non_units = ['what', 'how', 'which', 'when', 'where', 'why', 'the', 'a', 'an']
-                if unit.lower() not in non_units and len(unit) > 1:
+                if unit.lower() not in cls.NON_UNITS and len(unit) > 1:
                     return unit
         
         return None
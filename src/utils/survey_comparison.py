@@ -123,10 +123,18 @@ def compare_surveys(survey1: Dict[str, Any], survey2: Dict[str, Any]) -> float:
         return 0.0
 
 
-def compare_surveys_detailed(survey1: Dict[str, Any], survey2: Dict[str, Any]) -> Dict[str, Any]:
+def compare_surveys_detailed(
+    survey1: Dict[str, Any],
+    survey2: Dict[str, Any],
+    questions1: Optional[List[Dict[str, Any]]] = None,
+    questions2: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
     """
     Detailed comparison returning component scores and question-level match stats.
 
+    ``questions1``/``questions2`` are the already-extracted question lists of the surveys,
+    if the caller has them; otherwise each survey's questions are extracted once here.
+
     Returns dictionary with:
     - semantic_similarity
     - structural_similarity
@@ -158,14 +166,18 @@ def compare_surveys_detailed(survey1: Dict[str, Any], survey2: Dict[str, Any]) -
     # Normalize
     s1 = _extract_actual_survey(survey1)
     s2 = _extract_actual_survey(survey2)
+    if questions1 is None:
+        questions1 = _extract_all_questions(s1)
+    if questions2 is None:
+        questions2 = _extract_all_questions(s2)
 
     text1 = _survey_to_rich_text(s1)
     text2 = _survey_to_rich_text(s2)
 
     semantic = _compute_tfidf_similarity(text1, text2)
-    structural = _compare_structure(s1, s2)
+    structural = _compare_structure(s1, s2, questions1, questions2)
     metadata = _compare_metadata(s1, s2)
-    content = _compare_content(s1, s2)
+    content = _compare_content(s1, s2, questions1, questions2)
 
     overall = round(semantic * 0.50 + structural * 0.20 + metadata * 0.15 + content * 0.15, 3)
 
@@ -180,7 +192,7 @@ def compare_surveys_detailed(survey1: Dict[str, Any], survey2: Dict[str, Any]) -
         methodology_sim = 0.0
 
     # Question-level matching
-    question_match = _compute_question_match_stats(s1, s2)
+    question_match = _compute_question_match_stats(s1, s2, questions1, questions2)
 
     return {
         "semantic_similarity": round(semantic, 3),
@@ -381,7 +393,12 @@ def compute_question_match_across_all_golden_pairs(
     }
 
 
-def _compute_question_match_stats(s1: Dict[str, Any], s2: Dict[str, Any]) -> Dict[str, Any]:
+def _compute_question_match_stats(
+    s1: Dict[str, Any],
+    s2: Dict[str, Any],
+    qs1_raw: Optional[List[Dict[str, Any]]] = None,
+    qs2_raw: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
     """
     Compute question-level matching using TF-IDF similarity across question texts.
     Returns match rate and basic IR-style metrics.
@@ -399,8 +416,10 @@ def _compute_question_match_stats(s1: Dict[str, Any], s2: Dict[str, Any]) -> Dic
         text = " ".join(text.split())
         return text.lower().strip()
     
-    qs1_raw = _extract_all_questions(s1)
-    qs2_raw = _extract_all_questions(s2)
+    if qs1_raw is None:
+        qs1_raw = _extract_all_questions(s1)
+    if qs2_raw is None:
+        qs2_raw = _extract_all_questions(s2)
     
     # Extract texts with normalization
     qs1 = [_normalize_question_text(q.get("text", "")) for q in qs1_raw if isinstance(q.get("text", ""), str) and q.get("text", "").strip()]
@@ -570,9 +589,6 @@ def _survey_to_rich_text(survey: Dict[str, Any]) -> str:
     if "industry_category" in metadata and metadata["industry_category"]:
         parts.append(f"Industry: {metadata['industry_category']}")
     
-    # Extract all questions text
-    all_questions = _extract_all_questions(survey)
-    
     if survey.get("sections"):
         # New sections format
         for section in survey["sections"]:
@@ -695,7 +711,12 @@ def _simple_word_similarity(text1: str, text2: str) -> float:
     return intersection / union
 
 
-def _compare_structure(survey1: Dict[str, Any], survey2: Dict[str, Any]) -> float:
+def _compare_structure(
+    survey1: Dict[str, Any],
+    survey2: Dict[str, Any],
+    questions1: Optional[List[Dict[str, Any]]] = None,
+    questions2: Optional[List[Dict[str, Any]]] = None
+) -> float:
     """
     Compare structural similarity between two surveys.
     
@@ -708,6 +729,8 @@ def _compare_structure(survey1: Dict[str, Any], survey2: Dict[str, Any]) -> floa
     Args:
         survey1: First survey
         survey2: Second survey
+        questions1: Pre-extracted questions of survey1 (extracted here if None)
+        questions2: Pre-extracted questions of survey2 (extracted here if None)
         
     Returns:
         float: Structural similarity (0.0-1.0)
@@ -756,8 +779,10 @@ def _compare_structure(survey1: Dict[str, Any], survey2: Dict[str, Any]) -> floa
             scores.append(type_similarity)
     
     # Compare total question counts
-    questions1 = _extract_all_questions(survey1)
-    questions2 = _extract_all_questions(survey2)
+    if questions1 is None:
+        questions1 = _extract_all_questions(survey1)
+    if questions2 is None:
+        questions2 = _extract_all_questions(survey2)
     
     if questions1 or questions2:
         total1 = len(questions1)
@@ -876,7 +901,12 @@ def _compare_metadata(survey1: Dict[str, Any], survey2: Dict[str, Any]) -> float
     return 0.5  # Neutral if no metadata
 
 
-def _compare_content(survey1: Dict[str, Any], survey2: Dict[str, Any]) -> float:
+def _compare_content(
+    survey1: Dict[str, Any],
+    survey2: Dict[str, Any],
+    questions1: Optional[List[Dict[str, Any]]] = None,
+    questions2: Optional[List[Dict[str, Any]]] = None
+) -> float:
     """
     Compare content similarity between questions.
     
@@ -888,12 +918,16 @@ def _compare_content(survey1: Dict[str, Any], survey2: Dict[str, Any]) -> float:
     Args:
         survey1: First survey
         survey2: Second survey
+        questions1: Pre-extracted questions of survey1 (extracted here if None)
+        questions2: Pre-extracted questions of survey2 (extracted here if None)
         
     Returns:
         float: Content similarity (0.0-1.0)
     """
-    questions1 = _extract_all_questions(survey1)
-    questions2 = _extract_all_questions(survey2)
+    if questions1 is None:
+        questions1 = _extract_all_questions(survey1)
+    if questions2 is None:
+        questions2 = _extract_all_questions(survey2)
     
     if not questions1 or not questions2:
         return 0.5  # Neutral if no questions
@@ -173,4 +173,39 @@ def validate_survey_json(survey: Optional[Dict[str, Any]]) -> tuple[bool, List[s
                 if not question.get("text"):
                     errors.append(f"Question {i} must have text")
     
-    return len(errors) == 0, errors
\ No newline at end of file
+    return len(errors) == 0, errors
+
+def survey_to_text(survey: Optional[Dict[str, Any]]) -> str:
+    """
+    Flatten a survey's title, description, section titles and question texts
+    into one string for embedding and text comparison
+
+    Args:
+        survey: Survey object in either legacy or sectioned format
+
+    Returns:
+        str: Space-joined survey text (empty for an empty survey)
+    """
+    if not isinstance(survey, dict):
+        return ""
+
+    text_parts = []
+    if "title" in survey:
+        text_parts.append(f"Title: {survey['title']}")
+    if "description" in survey:
+        text_parts.append(f"Description: {survey['description']}")
+
+    if "sections" in survey and isinstance(survey["sections"], list):
+        for section in survey["sections"]:
+            if isinstance(section, dict):
+                text_parts.append(f"Section: {section.get('title', '')}")
+                if "questions" in section and isinstance(section["questions"], list):
+                    for question in section["questions"]:
+                        if isinstance(question, dict) and "text" in question:
+                            text_parts.append(f"Q: {question['text']}")
+    elif "questions" in survey and isinstance(survey["questions"], list):
+        for question in survey["questions"]:
+            if isinstance(question, dict) and "text" in question:
+                text_parts.append(f"Q: {question['text']}")
+
+    return " ".join(text_parts)
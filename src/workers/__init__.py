@@ -0,0 +1,3 @@
+"""
+Background worker processes (run separately from the API server).
+"""
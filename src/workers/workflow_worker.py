@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Workflow Worker
+Claims survey generation jobs from the durable queue and runs them concurrently.
+
+Run standalone with ``python -m src.workers.workflow_worker --concurrency 4``; the
+API process can also host a worker (``workflow_embedded_workers``). Standalone
+workers publish progress through the Redis-backed progress bus so clients
+connected to any API worker receive it.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+from uuid import uuid4
+
+from src.config import settings
+from src.database.connection import SessionLocal
+from src.services.tracing import tracer
+from src.services.workflow_queue_service import (
+    JOB_TYPE_ENHANCED_RFQ,
+    JOB_TYPE_RFQ,
+    WorkflowQueueService,
+)
+
+logger = logging.getLogger(__name__)
+
+# Give the client time to open its WebSocket before the first progress message
+WEBSOCKET_CONNECT_GRACE_SECONDS = 2.0
+
+
+@dataclass
+class ClaimedJob:
+    id: Any
+    workflow_id: str
+    survey_id: Optional[str]
+    job_type: str
+    payload: Dict[str, Any]
+    created_at: Optional[datetime]
+    status: str = "running"
+    last_error: Optional[str] = None
+
+
+async def run_workflow_job(job: ClaimedJob, db: Any, connection_manager: Any) -> Any:
+    """
+    Execute one queued workflow with a fresh WorkflowService
+
+    Args:
+        job: The claimed job
+        db: Database session owned by this job
+        connection_manager: Progress bus used for WebSocket updates
+
+    Returns:
+        WorkflowResult from the workflow service
+    """
+    from src.services.workflow_service import WorkflowService
+
+    workflow_service = WorkflowService(db, connection_manager)
+    payload = job.payload
+
+    if payload.get("resume_from_checkpoint"):
+        return await workflow_service.resume_from_checkpoint(job.workflow_id)
+
+    if job.job_type == JOB_TYPE_ENHANCED_RFQ:
+        from src.models.enhanced_rfq import extract_legacy_fields, validate_enhanced_rfq
+
+        enhanced_rfq = validate_enhanced_rfq(payload["enhanced_rfq"])
+        legacy_fields = extract_legacy_fields(enhanced_rfq)
+        return await workflow_service.process_enhanced_rfq(
+            enhanced_rfq=enhanced_rfq,
+            legacy_title=legacy_fields["title"],
+            legacy_description=legacy_fields["description"],
+            legacy_product_category=legacy_fields["product_category"],
+            legacy_target_segment=legacy_fields["target_segment"],
+            legacy_research_goal=legacy_fields["research_goal"],
+            workflow_id=job.workflow_id,
+            survey_id=job.survey_id,
+            custom_prompt=payload.get("custom_prompt"),
+        )
+
+    if job.job_type == JOB_TYPE_RFQ:
+        return await workflow_service.process_rfq(
+            title=payload.get("title"),
+            description=payload["description"],
+            product_category=payload.get("product_category"),
+            target_segment=payload.get("target_segment"),
+            research_goal=payload.get("research_goal"),
+            workflow_id=job.workflow_id,
+            survey_id=job.survey_id,
+            custom_prompt=payload.get("custom_prompt"),
+        )
+
+    raise ValueError(f"Unknown workflow job type: {job.job_type}")
+
+
+class WorkflowWorker:
+    """Polls the workflow queue and keeps up to ``concurrency`` workflows running."""
+
+    def __init__(
+        self,
+        connection_manager: Any,
+        concurrency: Optional[int] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+    ) -> None:
+        self.connection_manager = connection_manager
+        self.concurrency = concurrency or settings.workflow_worker_concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+        self.poll_interval = poll_interval or settings.workflow_worker_poll_seconds
+        self._tasks: Set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        self._loop_task = asyncio.create_task(self.run())
+        logger.info(f"👷 [WorkflowWorker] Started {self.worker_id} with concurrency={self.concurrency}")
+
+    async def stop(self) -> None:
+        """Stop claiming, cancel running workflows and hand them back to the queue."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._loop_task:
+            self._loop_task.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info(f"👋 [WorkflowWorker] Stopped {self.worker_id}")
+
+    def wake(self) -> None:
+        """Poll immediately instead of waiting for the next interval."""
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        while not self._stopping:
+            try:
+                while len(self._tasks) < self.concurrency and not self._stopping:
+                    job = await asyncio.to_thread(self._claim)
+                    if job is None:
+                        break
+                    if job.status == "failed":
+                        await self._notify_exhausted(job)
+                        continue
+                    task = asyncio.create_task(self._execute(job))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._on_task_done)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ [WorkflowWorker] Failed to claim workflow job: {str(e)}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        # A slot freed up; look for more work right away
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Queue operations (blocking, run in threads with short-lived sessions)
+    # ------------------------------------------------------------------
+
+    def _claim(self) -> Optional[ClaimedJob]:
+        with SessionLocal() as db:
+            job = WorkflowQueueService(db).claim_next(self.worker_id)
+            if job is None:
+                return None
+            return ClaimedJob(
+                id=job.id,
+                workflow_id=job.workflow_id,
+                survey_id=job.survey_id,
+                job_type=job.job_type,
+                payload=dict(job.payload or {}),
+                created_at=job.created_at,
+                status=job.status,
+                last_error=job.last_error,
+            )
+
+    def _heartbeat(self, job_id: Any) -> bool:
+        with SessionLocal() as db:
+            return WorkflowQueueService(db).heartbeat(job_id, self.worker_id)
+
+    def _settle(self, job_id: Any, error: Optional[str] = None) -> None:
+        with SessionLocal() as db:
+            queue = WorkflowQueueService(db)
+            if error is None:
+                queue.complete(job_id)
+            else:
+                queue.fail(job_id, error)
+
+    def _release(self, job_id: Any) -> None:
+        with SessionLocal() as db:
+            WorkflowQueueService(db).release(job_id, self.worker_id)
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def _notify_exhausted(self, job: ClaimedJob) -> None:
+        """Tell clients a job that ran out of attempts has failed, as a failing workflow run would"""
+        from src.services.websocket_client import WebSocketNotificationService
+
+        await WebSocketNotificationService(self.connection_manager).notify_workflow_error(
+            job.workflow_id, job.last_error or "Workflow job failed"
+        )
+
+    async def _heartbeat_loop(self, job: ClaimedJob, job_task: asyncio.Task) -> None:
+        """Extend the lease while the job runs; returns (after cancelling the job) if the lease was lost"""
+        while True:
+            await asyncio.sleep(settings.workflow_job_heartbeat_seconds)
+            try:
+                owned = await asyncio.to_thread(self._heartbeat, job.id)
+            except Exception as e:
+                logger.warning(f"⚠️ [WorkflowWorker] Heartbeat failed for {job.workflow_id}: {str(e)}")
+                continue
+            if not owned:
+                # Another worker reclaimed the job; stop before this run duplicates its LLM calls and writes
+                logger.warning(f"⚠️ [WorkflowWorker] Lost lease on {job.workflow_id}, cancelling this run")
+                job_task.cancel()
+                return
+
+    async def _run_job(self, job: ClaimedJob, db: Any) -> Any:
+        if job.created_at is not None:
+            created_at = job.created_at if job.created_at.tzinfo else job.created_at.replace(tzinfo=timezone.utc)
+            age = (datetime.now(timezone.utc) - created_at).total_seconds()
+            if age < WEBSOCKET_CONNECT_GRACE_SECONDS:
+                await asyncio.sleep(WEBSOCKET_CONNECT_GRACE_SECONDS - age)
+
+        with tracer.span("workflow.job", job_type=job.job_type, workflow_id=job.workflow_id):
+            return await run_workflow_job(job, db, self.connection_manager)
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        logger.info(f"🚀 [WorkflowWorker] Running {job.job_type} workflow_id={job.workflow_id}")
+        start_time = time.time()
+        db = SessionLocal()
+        job_task = asyncio.create_task(self._run_job(job, db))
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop(job, job_task))
+        try:
+            result = await job_task
+            await asyncio.to_thread(self._settle, job.id)
+            logger.info(
+                f"✅ [WorkflowWorker] Workflow {job.workflow_id} finished with status "
+                f"{getattr(result, 'status', 'unknown')} in {time.time() - start_time:.1f}s"
+            )
+        except asyncio.CancelledError:
+            if heartbeat_task.done() and not heartbeat_task.cancelled():
+                # Lease lost: the job belongs to another worker now, so neither settle nor release it
+                logger.warning(f"⚠️ [WorkflowWorker] Abandoned {job.workflow_id} after losing its lease")
+                return
+            # Shutting down: put the job back so another worker picks it up immediately
+            try:
+                await asyncio.to_thread(self._release, job.id)
+            finally:
+                raise
+        except Exception as e:
+            logger.error(f"❌ [WorkflowWorker] Workflow {job.workflow_id} failed: {str(e)}", exc_info=True)
+            try:
+                await asyncio.to_thread(self._settle, job.id, str(e) or type(e).__name__)
+            except Exception as settle_error:
+                logger.error(f"❌ [WorkflowWorker] Failed to record failure for {job.workflow_id}: {str(settle_error)}")
+        finally:
+            heartbeat_task.cancel()
+            # Uncommitted work of a cancelled run is rolled back here
+            db.close()
+
+
+async def _run_standalone(concurrency: int) -> None:
+    from src.services.progress_bus import ProgressBus
+
+    progress_bus = ProgressBus()
+    await progress_bus.start()
+    if progress_bus.backend != "redis":
+        logger.warning("⚠️ [WorkflowWorker] Progress bus is in-memory; API clients will not receive progress from this worker")
+
+    worker = WorkflowWorker(progress_bus, concurrency=concurrency)
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop_event.set)
+        except NotImplementedError:
+            pass
+
+    await worker.start()
+    await stop_event.wait()
+    await worker.stop()
+    await progress_bus.stop()
+    tracer.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run survey generation workflow workers")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.workflow_worker_concurrency,
+        help="Number of workflows this process runs at once",
+    )
+    args = parser.parse_args()
+
+    from src.config.logging_config import configure_logging
+
+    configure_logging()
+    asyncio.run(_run_standalone(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
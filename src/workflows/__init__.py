@@ -9,7 +9,7 @@ from .nodes import (
     ResearcherNode,
     HumanPromptReviewNode
 )
-from .workflow import create_workflow
+from .workflow import create_workflow, get_compiled_workflow, build_run_config, WorkflowRunContext
 
 __all__ = [
     "SurveyGenerationState",
@@ -21,5 +21,8 @@ __all__ = [
     "ValidatorAgent",
     "ResearcherNode",
     "HumanPromptReviewNode",
-    "create_workflow"
+    "create_workflow",
+    "get_compiled_workflow",
+    "build_run_config",
+    "WorkflowRunContext"
 ]
\ No newline at end of file
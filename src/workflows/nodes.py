@@ -1,9 +1,10 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 from .state import SurveyGenerationState
 from src.utils.error_messages import UserFriendlyError
 from src.utils.survey_utils import get_questions_count
+from src.config.logging_config import log_text_preview
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,17 +23,18 @@ def get_db():
 
 
 class RFQNode:
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         self.db = db
         # Lazy import to avoid heavy settings init during tests
         from src.services.embedding_service import EmbeddingService
         self.embedding_service = EmbeddingService()
     
-    async def __call__(self, state: SurveyGenerationState) -> Dict[str, Any]:
+    async def __call__(self, state: SurveyGenerationState, db: Optional[Session] = None) -> Dict[str, Any]:
         """
         Parse RFQ, extract research goals and methodologies, generate embedding
         Load enhanced RFQ data from database if available
         """
+        db = db if db is not None else self.db
         try:
             import logging
             logger = logging.getLogger(__name__)
@@ -42,10 +44,16 @@ class RFQNode:
                 logger.info("⚡ [RFQNode] Regeneration mode - reusing existing embedding (skipping generation)")
                 embedding = state.rfq_embedding
             else:
-                # Generate embedding for the RFQ text
-                logger.info("🔄 [RFQNode] Starting embedding generation...")
-                embedding = await self.embedding_service.get_embedding(state.rfq_text)
-                logger.info("✅ [RFQNode] Embedding generation completed")
+                # Reuse the embedding prefetched when the draft was saved, if the RFQ is unchanged
+                from src.services.retrieval_prefetch_service import retrieval_prefetch
+                embedding = retrieval_prefetch.get_embedding(state.rfq_text)
+                if embedding is not None:
+                    logger.info("⚡ [RFQNode] Reusing prefetched embedding from draft save (skipping generation)")
+                else:
+                    # Generate embedding for the RFQ text
+                    logger.info("🔄 [RFQNode] Starting embedding generation...")
+                    embedding = await self.embedding_service.get_embedding(state.rfq_text)
+                    logger.info("✅ [RFQNode] Embedding generation completed")
             
             # Load enhanced RFQ data from database if RFQ ID is available
             enhanced_rfq_data = None
@@ -53,7 +61,7 @@ class RFQNode:
             if state.rfq_id:
                 try:
                     from src.database.models import RFQ
-                    rfq = self.db.query(RFQ).filter(RFQ.id == state.rfq_id).first()
+                    rfq = db.query(RFQ).filter(RFQ.id == state.rfq_id).first()
                     if rfq and rfq.enhanced_rfq_data:
                         enhanced_rfq_data = rfq.enhanced_rfq_data
                         logger.info(f"✅ [RFQNode] Loaded enhanced RFQ data with {len(enhanced_rfq_data)} keys")
@@ -91,7 +99,7 @@ class RFQNode:
 
 
 class GoldenRetrieverNode:
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         self.db = db
         # Defer service import/creation to call-site to avoid heavy imports during tests
         self.retrieval_service = None
@@ -100,19 +108,46 @@ class GoldenRetrieverNode:
         """
         Multi-tier retrieval (golden pairs → methodology blocks → templates)
         """
+        from src.services.retrieval_prefetch_service import (
+            FEEDBACK_DIGEST_LIMIT,
+            GOLDEN_PAIR_LIMIT,
+            GOLDEN_QUESTION_LIMIT,
+            GOLDEN_SECTION_LIMIT,
+            METHODOLOGY_BLOCK_LIMIT,
+            TEMPLATE_QUESTION_LIMIT,
+            retrieval_prefetch,
+        )
         try:
+            # Retrieval tiers prefetched when the draft was saved (not reused for regeneration,
+            # which merges annotation feedback into the digest)
+            prefetched = None
+            if not state.regeneration_mode and state.rfq_embedding is not None:
+                industry = None
+                if state.enhanced_rfq_data and 'industry_category' in state.enhanced_rfq_data:
+                    industry = state.enhanced_rfq_data['industry_category']
+                prefetched = retrieval_prefetch.get_context(
+                    state.rfq_text, industry, state.research_goal, state.product_category
+                )
+
             # Get a fresh database session to avoid transaction issues
             fresh_db = None
             try:
-                fresh_db = next(get_db())
+                if prefetched is None:
+                    fresh_db = next(get_db())
             except Exception:
                 # In test mode without DB, proceed with empty results
                 pass
             fresh_retrieval_service = None
             
             try:
+                if prefetched is not None:
+                    logger.info("⚡ [GoldenRetriever] Reusing retrieval context prefetched on draft save")
+                    golden_examples = prefetched["golden_examples"]
+                    golden_sections = prefetched["golden_sections"]
+                    golden_questions = prefetched["golden_questions"]
+                    feedback_digest = prefetched["feedback_digest"]
                 # Tier 1: Exact golden RFQ-survey pairs
-                if state.rfq_embedding is None:
+                elif state.rfq_embedding is None:
                     golden_examples = []
                     golden_sections = []
                     golden_questions = []
@@ -133,14 +168,14 @@ class GoldenRetrieverNode:
                         embedding=state.rfq_embedding,
                         methodology_tags=None,  # TODO: Extract from RFQ
                         industry=industry,
-                        limit=3
+                        limit=GOLDEN_PAIR_LIMIT
                     )
                     # New: retrieve sections and questions (default ON)
                     golden_sections = await fresh_retrieval_service.retrieve_golden_sections(
                         embedding=state.rfq_embedding,
                         methodology_tags=None,
                         industry=industry,
-                        limit=5
+                        limit=GOLDEN_SECTION_LIMIT
                     )
                     
                     # Retrieve golden questions by similarity only (no label filtering)
@@ -149,7 +184,7 @@ class GoldenRetrieverNode:
                         embedding=state.rfq_embedding,
                         methodology_tags=None,
                         industry=industry,
-                        limit=8  # Increased limit since we're not filtering by labels
+                        limit=GOLDEN_QUESTION_LIMIT  # Increased limit since we're not filtering by labels
                     )
                     logger.info(f"✅ [GoldenRetriever] Retrieved {len(golden_questions)} golden questions by similarity")
                     
@@ -172,7 +207,7 @@ class GoldenRetrieverNode:
                             general_feedback = await fresh_retrieval_service.get_feedback_digest(
                                 methodology_tags=None,
                                 industry=industry,
-                                limit=50
+                                limit=FEEDBACK_DIGEST_LIMIT
                             )
                             
                             # Merge annotation feedback with general feedback
@@ -204,7 +239,7 @@ class GoldenRetrieverNode:
                                 feedback_digest = await fresh_retrieval_service.get_feedback_digest(
                                     methodology_tags=None,
                                     industry=industry,
-                                    limit=50
+                                    limit=FEEDBACK_DIGEST_LIMIT
                                 )
                             except Exception as fallback_error:
                                 logger.warning(f"⚠️ [GoldenRetriever] Failed to generate fallback feedback digest: {str(fallback_error)}")
@@ -215,7 +250,7 @@ class GoldenRetrieverNode:
                             feedback_digest = await fresh_retrieval_service.get_feedback_digest(
                                 methodology_tags=None,
                                 industry=industry,  # Use industry extracted above
-                                limit=50
+                                limit=FEEDBACK_DIGEST_LIMIT
                             )
                             logger.info(f"✅ [GoldenRetriever] Generated feedback digest from {feedback_digest.get('total_feedback_count', 0)} questions with comments")
                         except Exception as e:
@@ -223,7 +258,7 @@ class GoldenRetrieverNode:
                             feedback_digest = None
                 
                 # Tier 2: Methodology blocks
-                methodology_blocks = []
+                methodology_blocks = prefetched["methodology_blocks"] if prefetched is not None else []
                 if fresh_db is not None:
                     # Ensure retrieval service is initialized even if embedding was None above
                     if fresh_retrieval_service is None:
@@ -234,15 +269,15 @@ class GoldenRetrieverNode:
 
                     methodology_blocks = await fresh_retrieval_service.retrieve_methodology_blocks(
                         research_goal=state.research_goal,
-                        limit=5
+                        limit=METHODOLOGY_BLOCK_LIMIT
                     )
                 
                 # Tier 3: Template questions (fallback)
-                template_questions = []
+                template_questions = prefetched["template_questions"] if prefetched is not None else []
                 if fresh_db is not None:
                     template_questions = await fresh_retrieval_service.retrieve_template_questions(
                         category=state.product_category,
-                        limit=10
+                        limit=TEMPLATE_QUESTION_LIMIT
                     )
             finally:
                 if fresh_db is not None:
@@ -287,13 +322,14 @@ class GoldenRetrieverNode:
 
 
 class ContextBuilderNode:
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         self.db = db
     
-    async def __call__(self, state: SurveyGenerationState) -> Dict[str, Any]:
+    async def __call__(self, state: SurveyGenerationState, db: Optional[Session] = None) -> Dict[str, Any]:
         """
         Assemble hierarchical context with golden examples as few-shot prompts
         """
+        db = db if db is not None else self.db
         try:
             logger.info(f"🔍 [ContextBuilderNode] Building context with survey_id: {state.survey_id}")
             logger.info(f"🔍 [ContextBuilderNode] Survey ID type: {type(state.survey_id)}")
@@ -306,7 +342,7 @@ class ContextBuilderNode:
                     from src.database.models import ConceptFile
                     from uuid import UUID
                     rfq_uuid = UUID(str(state.rfq_id)) if not isinstance(state.rfq_id, UUID) else state.rfq_id
-                    concept_files_query = self.db.query(ConceptFile).filter(
+                    concept_files_query = db.query(ConceptFile).filter(
                         ConceptFile.rfq_id == rfq_uuid
                     ).order_by(ConceptFile.display_order, ConceptFile.created_at).all()
                     
@@ -399,28 +435,37 @@ class ContextBuilderNode:
 
 
 class GeneratorAgent:
-    def __init__(self, db: Session, connection_manager=None):
+    def __init__(self, db: Optional[Session] = None, connection_manager=None):
         self.db = db
         self.connection_manager = connection_manager
-        # Defer heavy imports/initialization until first call
+        # Optional fixed service (tests); otherwise one is created per call
         self.generation_service = None
         import logging
         self.logger = logging.getLogger(__name__)
     
-    async def __call__(self, state: SurveyGenerationState) -> Dict[str, Any]:
+    async def __call__(
+        self,
+        state: SurveyGenerationState,
+        db: Optional[Session] = None,
+        connection_manager=None
+    ) -> Dict[str, Any]:
         """
         GPT-4/5 generation with golden-enhanced prompts
         """
+        db = db if db is not None else self.db
+        connection_manager = connection_manager if connection_manager is not None else self.connection_manager
         try:
             self.logger.info("🤖 [GeneratorAgent] Starting survey generation...")
             self.logger.info(f"📊 [GeneratorAgent] State context keys: {list(state.context.keys()) if state.context else 'None'}")
             self.logger.info(f"📊 [GeneratorAgent] Golden examples count: {len(state.golden_examples) if state.golden_examples else 0}")
             self.logger.info(f"📊 [GeneratorAgent] Methodology blocks count: {len(state.methodology_blocks) if state.methodology_blocks else 0}")
             
-            # Initialize generation service on first use to avoid import-time side effects
-            if self.generation_service is None:
+            # The agent is shared by concurrent runs of the compiled graph, so the
+            # generation service (which carries workflow_id and ws_client) is per call
+            generation_service = self.generation_service
+            if generation_service is None:
                 from src.services.generation_service import GenerationService
-                self.generation_service = GenerationService(db_session=self.db)
+                generation_service = GenerationService(db_session=db)
 
             # Get a fresh database session to avoid transaction issues
             fresh_db = None
@@ -434,16 +479,16 @@ class GeneratorAgent:
                 ).all()
                 
                 # Update the existing generation service with fresh database session and workflow info
-                self.generation_service.db_session = fresh_db
-                self.generation_service.workflow_id = state.workflow_id
-                self.generation_service.connection_manager = self.connection_manager
+                generation_service.db_session = fresh_db
+                generation_service.workflow_id = state.workflow_id
+                generation_service.connection_manager = connection_manager
 
                 # Initialize WebSocket client if available
-                if self.connection_manager and state.workflow_id:
+                if connection_manager and state.workflow_id:
                     from src.services.websocket_client import WebSocketNotificationService
-                    self.generation_service.ws_client = WebSocketNotificationService(self.connection_manager)
+                    generation_service.ws_client = WebSocketNotificationService(connection_manager)
                 else:
-                    self.generation_service.ws_client = None
+                    generation_service.ws_client = None
                 
             except Exception as db_error:
                 self.logger.warning(f"⚠️ [GeneratorAgent] Failed to load custom rules: {str(db_error)}")
@@ -454,7 +499,7 @@ class GeneratorAgent:
             }
             
             self.logger.info(f"📋 [GeneratorAgent] Custom rules loaded: {len(custom_rules['rules'])} rules")
-            self.logger.info(f"🔧 [GeneratorAgent] Generation service model: {self.generation_service.model}")
+            self.logger.info(f"🔧 [GeneratorAgent] Generation service model: {generation_service.model}")
             
             # Check API token configuration (optional during tests)
             try:
@@ -475,11 +520,13 @@ class GeneratorAgent:
             self.logger.info(f"🔍 [GeneratorAgent] Context workflow_id: {state.context.get('workflow_id') if state.context else 'None'}")
             
             # Check if we have a custom system prompt from human review
-            if state.system_prompt:
+            if self._use_parallel_sections(state):
+                generation_result = await self._regenerate_sections_in_parallel(state, generation_service)
+            elif state.system_prompt:
                 self.logger.info(f"📝 [GeneratorAgent] Using custom system prompt from user edit (length: {len(state.system_prompt)} chars)")
-                self.logger.info(f"🔍 [GeneratorAgent] Custom prompt preview: {state.system_prompt[:200]}...")
+                self.logger.info(f"🔍 [GeneratorAgent] Custom prompt preview: {log_text_preview(state.system_prompt)}...")
                 # Use the edited system prompt instead of generating a new one
-                generation_result = await self.generation_service.generate_survey_with_custom_prompt(
+                generation_result = await generation_service.generate_survey_with_custom_prompt(
                     context=state.context,
                     golden_examples=state.golden_examples,
                     methodology_blocks=state.methodology_blocks,
@@ -488,7 +535,7 @@ class GeneratorAgent:
                 )
             else:
                 self.logger.info("🚀 [GeneratorAgent] Using default prompt generation...")
-                generation_result = await self.generation_service.generate_survey(
+                generation_result = await generation_service.generate_survey(
                     context=state.context,
                     golden_examples=state.golden_examples,
                     methodology_blocks=state.methodology_blocks,
@@ -524,7 +571,7 @@ class GeneratorAgent:
             # Log the context details for debugging (truncated)
             logger.info(f"🔍 [GeneratorAgent] Context received from state")
             logger.info(f"🔍 [GeneratorAgent] State survey_id: {state.survey_id}")
-            logger.debug(f"🔍 [GeneratorAgent] State context: {str(state.context)[:200]}...")
+            logger.debug(f"🔍 [GeneratorAgent] State context: {log_text_preview(state.context)}...")
             logger.info(f"🔍 [GeneratorAgent] Context audit_survey_id: {state.context.get('audit_survey_id') if state.context else 'None'}")
             logger.info(f"🔍 [GeneratorAgent] Context keys: {list(state.context.keys()) if state.context else 'None'}")
             
@@ -599,9 +646,49 @@ class GeneratorAgent:
             
             return result
 
+    def _use_parallel_sections(self, state: SurveyGenerationState) -> bool:
+        """Surgical/targeted regenerations without a custom prompt get one LLM call per target section"""
+        from src.config import settings
+        from src.workflows.state import RegenerationMode
+
+        return (
+            settings.parallel_section_regeneration_enabled
+            and state.regeneration_mode_type in (RegenerationMode.SURGICAL, RegenerationMode.TARGETED)
+            and not state.system_prompt
+            and bool(state.previous_survey_json)
+            and bool((state.surgical_analysis or {}).get('sections_to_regenerate'))
+        )
+
+    async def _regenerate_sections_in_parallel(self, state: SurveyGenerationState, generation_service) -> Dict[str, Any]:
+        from src.services.progress_tracker import get_progress_tracker
+        from src.services.section_regeneration_service import SectionRegenerationService
+
+        section_ids = state.surgical_analysis['sections_to_regenerate']
+        context = {
+            **(state.context or {}),
+            "surgical_analysis": state.surgical_analysis,
+            "regeneration_mode_type": state.regeneration_mode_type,
+        }
+        self.logger.info(f"🔬 [GeneratorAgent] Parallel section regeneration for sections {section_ids}")
+
+        async def on_section(section: Dict[str, Any], completed: int, total: int) -> None:
+            if not (generation_service.ws_client and state.workflow_id):
+                return
+            try:
+                progress_data = get_progress_tracker(state.workflow_id).get_progress_data("generating_questions")
+                progress_data["message"] = f"Regenerated section {section.get('id')} ({completed}/{total})"
+                await generation_service.ws_client.send_progress_update(state.workflow_id, progress_data)
+            except Exception as e:
+                self.logger.warning(f"⚠️ [GeneratorAgent] Failed to send section progress update: {str(e)}")
+
+        survey = await SectionRegenerationService(generation_service).regenerate_sections(
+            context, section_ids, on_section=on_section
+        )
+        return {"survey": survey}
+
 
 class GoldenValidatorNode:
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         self.db = db
         # Lazy import to avoid heavy settings init during tests
         from src.services.validation_service import ValidationService as _ValidationService
@@ -612,10 +699,14 @@ class GoldenValidatorNode:
         import logging
         self.logger = logging.getLogger(__name__)
     
-    async def __call__(self, state: SurveyGenerationState) -> Dict[str, Any]:
+    async def __call__(self, state: SurveyGenerationState, db: Optional[Session] = None) -> Dict[str, Any]:
         """
         Validate against schema, methodology rules, golden similarity, and structure
         """
+        structure_validator = self.structure_validator
+        if db is not None and db is not self.db:
+            from src.services.survey_structure_validator import SurveyStructureValidator
+            structure_validator = SurveyStructureValidator(db)
         try:
             if state.generated_survey is None:
                 validation_results = {"schema_valid": False, "methodology_compliant": False}
@@ -645,13 +736,14 @@ class GoldenValidatorNode:
                     
                     # NEW: Structure validation (non-blocking)
                     try:
-                        structure_validation = await self.structure_validator.validate_structure(
+                        structure_validation = await structure_validator.validate_structure(
                             survey_json=state.generated_survey,
                             rfq_context={
                                 'methodology_tags': getattr(state, 'methodology_tags', []) or [],
                                 'industry': getattr(state, 'industry_category', None),
                                 'respondent_type': getattr(state, 'respondent_type', None)
-                            }
+                            },
+                            detected_labels=state.detected_labels
                         )
                         self.logger.info(f"🔍 [GoldenValidatorNode] Structure validation completed: {structure_validation.get_summary()}")
                     except Exception as e:
@@ -702,7 +794,7 @@ class GoldenValidatorNode:
 
 
 class HumanPromptReviewNode:
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         self.db = db
         import logging
         self.logger = logging.getLogger(__name__)
@@ -916,7 +1008,7 @@ class HumanPromptReviewNode:
 
 
 class ResearcherNode:
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         self.db = db
 
     async def __call__(self, state: SurveyGenerationState) -> Dict[str, Any]:
@@ -947,7 +1039,7 @@ class ResearcherNode:
 
 
 class LabelDetectionNode:
-    def __init__(self, db: Session, connection_manager=None):
+    def __init__(self, db: Optional[Session] = None, connection_manager=None):
         self.db = db
         self.connection_manager = connection_manager
         import logging
@@ -962,13 +1054,14 @@ class LabelDetectionNode:
         self.QuestionAnnotation = QuestionAnnotation
         self.datetime = datetime
     
-    async def __call__(self, state: SurveyGenerationState) -> Dict[str, Any]:
+    async def __call__(self, state: SurveyGenerationState, db: Optional[Session] = None) -> Dict[str, Any]:
         """
         Automatically detect and assign labels to generated questions.
         Creates question annotations in the database instead of writing to question.labels.
         
         During surgical regeneration, only detects labels for regenerated sections.
         """
+        db = db if db is not None else self.db
         try:
             self.logger.info("🏷️ [LabelDetectionNode] Starting automatic label detection...")
             
@@ -1001,15 +1094,24 @@ class LabelDetectionNode:
             else:
                 self.logger.info(f"🏷️ [LabelDetectionNode] Full mode - processing all {len(sections_to_process)} sections")
             
-            # Detect labels for the sections we're processing
-            detected_labels = self.detector.detect_labels_in_survey({'sections': sections_to_process})
+            # Detect labels once per question; section labels are the union of its
+            # question labels and any labels found in its text blocks
+            detected_labels = {}
+            section_question_labels = []
+            for section in sections_to_process:
+                question_labels = [self.detector.detect_labels_in_question(q) for q in section.get('questions', [])]
+                section_labels = self.detector.detect_labels_in_section_text(section)
+                for labels in question_labels:
+                    section_labels.update(labels)
+                detected_labels[section.get('id')] = section_labels
+                section_question_labels.append(question_labels)
             self.logger.info(f"🏷️ [LabelDetectionNode] Detected labels: {detected_labels}")
             
             # Create annotations in database
             annotations_created = 0
             labels_assigned = 0
             
-            for section in sections_to_process:
+            for section, question_labels_list in zip(sections_to_process, section_question_labels):
                 section_id = section.get('id')
                 section_labels = detected_labels.get(section_id, set())
                 
@@ -1019,7 +1121,7 @@ class LabelDetectionNode:
                 section['metadata']['detected_labels'] = list(section_labels)
                 
                 # Assign labels to individual questions
-                for question in section.get('questions', []):
+                for question, question_labels in zip(section.get('questions', []), question_labels_list):
                     question_id = question.get('id') or question.get('question_id')
                     if not question_id:
                         self.logger.warning(f"⚠️ [LabelDetectionNode] Question missing id: {question.get('text', '')[:50]}")
@@ -1027,10 +1129,9 @@ class LabelDetectionNode:
                     
                     # Make question_id unique by prefixing with survey_id
                     unique_question_id = f"{state.survey_id}_{question_id}"
-                    question_labels = self.detector.detect_labels_in_question(question)
                     
                     # Check if annotation already exists
-                    existing_annotation = self.db.query(self.QuestionAnnotation).filter(
+                    existing_annotation = db.query(self.QuestionAnnotation).filter(
                         self.QuestionAnnotation.question_id == unique_question_id,
                         self.QuestionAnnotation.survey_id == state.survey_id
                     ).first()
@@ -1069,7 +1170,7 @@ class LabelDetectionNode:
                             created_at=self.datetime.now(),
                             updated_at=self.datetime.now()
                         )
-                        self.db.add(annotation)
+                        db.add(annotation)
                         annotations_created += 1
                         self.logger.debug(f"✅ [LabelDetectionNode] Created annotation for question {unique_question_id} with labels: {question_labels}")
                     
@@ -1083,10 +1184,10 @@ class LabelDetectionNode:
             
             # Commit annotations to database
             try:
-                self.db.commit()
+                db.commit()
                 self.logger.info(f"✅ [LabelDetectionNode] Created {annotations_created} new annotations, assigned {labels_assigned} labels across {len(state.generated_survey.get('sections', []))} sections")
             except Exception as e:
-                self.db.rollback()
+                db.rollback()
                 self.logger.error(f"❌ [LabelDetectionNode] Failed to commit annotations: {str(e)}", exc_info=True)
                 raise
             
@@ -1103,8 +1204,8 @@ class LabelDetectionNode:
             
         except Exception as e:
             self.logger.error(f"❌ [LabelDetectionNode] Label detection failed: {str(e)}", exc_info=True)
-            if self.db:
-                self.db.rollback()
+            if db:
+                db.rollback()
             return {
                 "labels_assigned": False,
                 "error_message": f"Label detection failed: {str(e)}"
@@ -1112,7 +1213,7 @@ class LabelDetectionNode:
 
 
 class ValidatorAgent:
-    def __init__(self, db: Session, connection_manager=None):
+    def __init__(self, db: Optional[Session] = None, connection_manager=None):
         self.db = db
         self.connection_manager = connection_manager
         import logging
@@ -1303,16 +1404,17 @@ class ValidatorAgent:
 class SurgicalMergerNode:
     """Merges regenerated sections with preserved sections from previous survey"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         self.db = db
         import logging
         self.logger = logging.getLogger(__name__)
     
-    async def __call__(self, state: SurveyGenerationState) -> Dict[str, Any]:
+    async def __call__(self, state: SurveyGenerationState, db: Optional[Session] = None) -> Dict[str, Any]:
         """
         Merge regenerated sections with preserved sections in surgical mode
         For non-surgical modes, return generated survey as-is
         """
+        db = db if db is not None else self.db
         try:
             from src.workflows.state import RegenerationMode
             
@@ -1333,7 +1435,7 @@ class SurgicalMergerNode:
             from src.database.models import Survey
             from uuid import UUID
             
-            parent_survey = self.db.query(Survey).filter(
+            parent_survey = db.query(Survey).filter(
                 Survey.id == state.parent_survey_id
             ).first()
             
@@ -53,6 +53,9 @@ class SurveyGenerationState(BaseModel):
     generated_survey: Optional[Dict[str, Any]] = None
     pillar_scores: Optional[Dict[str, Any]] = None
     
+    # Section labels from LabelDetectionNode (keyed by str(section_id)), reused by structure validation
+    detected_labels: Optional[Dict[str, List[str]]] = None
+    
     validation_results: Dict[str, Any] = {}
     quality_gate_passed: bool = False
     
@@ -67,6 +70,9 @@ class SurveyGenerationState(BaseModel):
     
     # Workflow timing for loop prevention
     workflow_start_time: Optional[float] = None
+
+    # Nodes restored from a checkpoint are skipped when the workflow is resumed
+    completed_nodes: List[str] = []
     
     # Human review state
     pending_human_review: bool = False
@@ -3,8 +3,13 @@ try:
 except ImportError:
     # Fallback for different langgraph versions
     from langgraph import StateGraph
+from langchain_core.runnables import RunnableConfig
 from sqlalchemy.orm import Session
-from typing import Any, Dict
+import asyncio
+import functools
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
 from .state import SurveyGenerationState
 from .nodes import (
     RFQNode,
@@ -17,17 +22,181 @@ from .nodes import (
     HumanPromptReviewNode,
     LabelDetectionNode
 )
+from src.config.logging_config import log_text_preview
 from src.services.progress_tracker import get_progress_tracker
+from src.services.tracing import tracer
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+RUN_CONTEXT_KEY = "run_context"
 
-def create_workflow(db: Session, connection_manager=None) -> Any:
+_compiled_workflow: Any = None
+_compiled_workflow_lock = threading.Lock()
+
+
+class _NoopWS:
+    async def send_progress_update(self, *args, **kwargs):
+        return None
+
+
+def _default_session_factory() -> Session:
+    from src.database.connection import SessionLocal
+    return SessionLocal()
+
+
+@dataclass
+class WorkflowRunContext:
+    """
+    Per-run dependencies for a compiled workflow.
+
+    Handed to the graph through ``config["configurable"]`` so one compiled graph
+    can serve many concurrent runs. Each node gets its own session from
+    ``session_factory`` for the duration of that node; a fixed ``db`` is used
+    as-is and never closed. With ``checkpoints`` enabled every successfully
+    completed node is persisted so a failed run can be resumed.
+    """
+    connection_manager: Any = None
+    session_factory: Optional[Callable[[], Session]] = None
+    db: Optional[Session] = None
+    checkpoints: bool = False
+    _ws_client: Any = field(default=None, init=False, repr=False)
+
+    @property
+    def ws_client(self) -> Any:
+        if self._ws_client is None:
+            try:
+                from src.services.websocket_client import WebSocketNotificationService
+                self._ws_client = WebSocketNotificationService(self.connection_manager)
+            except Exception:
+                # Graceful fallback if settings/config not available during tests
+                self._ws_client = _NoopWS()
+        return self._ws_client
+
+    @contextmanager
+    def node_session(self) -> Iterator[Session]:
+        if self.db is not None:
+            yield self.db
+            return
+        db = (self.session_factory or _default_session_factory)()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def save_checkpoint(self, node_name: str, state: SurveyGenerationState, result: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Persist the state after ``node_name`` unless the run already failed
+
+        Returns:
+            The updated completed node list, or None if nothing was saved
+        """
+        if not self.checkpoints or not state.workflow_id:
+            return None
+        if state.error_message or result.get("error_message") or result.get("pending_human_review"):
+            return None
+
+        from src.services.workflow_checkpoint_service import WorkflowCheckpointService
+
+        completed_nodes = [*state.completed_nodes, node_name]
+        updates = {key: value for key, value in result.items() if key in SurveyGenerationState.model_fields}
+        snapshot = state.model_copy(update={**updates, "completed_nodes": completed_nodes})
+        try:
+            with self.node_session() as db:
+                WorkflowCheckpointService(db).save_checkpoint(snapshot, node_name)
+        except Exception as e:
+            logger.warning(f"⚠️ [Workflow] Failed to save checkpoint after {node_name}: {str(e)}")
+            return None
+        return completed_nodes
+
+
+def build_run_config(
+    connection_manager=None,
+    session_factory: Optional[Callable[[], Session]] = None,
+    db: Optional[Session] = None,
+    checkpoints: bool = False
+) -> Dict[str, Any]:
+    """
+    Build the ``ainvoke`` config for one workflow run
+
+    Args:
+        connection_manager: Progress sink for WebSocket updates
+        session_factory: Creates the per-node database sessions (defaults to SessionLocal)
+        db: Fixed session to use for every node instead of the factory
+        checkpoints: Persist a checkpoint after every completed node
+
+    Returns:
+        RunnableConfig carrying a WorkflowRunContext
+    """
+    return {
+        "configurable": {
+            RUN_CONTEXT_KEY: WorkflowRunContext(
+                connection_manager=connection_manager,
+                session_factory=session_factory,
+                db=db,
+                checkpoints=checkpoints
+            )
+        }
+    }
+
+
+def get_run_context(config: Optional[RunnableConfig], default: WorkflowRunContext) -> WorkflowRunContext:
+    configurable = (config or {}).get("configurable") or {}
+    return configurable.get(RUN_CONTEXT_KEY) or default
+
+
+def get_compiled_workflow() -> Any:
+    """
+    Return the process-wide compiled workflow, building it on first use
+
+    Nodes hold no request state; pass per-run dependencies with ``build_run_config``.
+    """
+    global _compiled_workflow
+    if _compiled_workflow is None:
+        with _compiled_workflow_lock:
+            if _compiled_workflow is None:
+                _compiled_workflow = create_workflow()
+                logger.info("✅ [Workflow] Compiled shared LangGraph workflow")
+    return _compiled_workflow
+
+
+def create_workflow(db: Optional[Session] = None, connection_manager=None) -> Any:
     """
     Create the LangGraph workflow for survey generation
+
+    ``db`` and ``connection_manager`` are only the defaults for runs invoked
+    without a run context; prefer ``get_compiled_workflow`` with ``build_run_config``.
     """
     workflow = StateGraph(SurveyGenerationState)
+    default_context = WorkflowRunContext(connection_manager=connection_manager, db=db)
+
+    def checkpointed(node_name: str):
+        """Skip nodes restored from a checkpoint and checkpoint nodes that complete"""
+        def decorator(node_fn: Callable[..., Awaitable[Dict[str, Any]]]):
+            @functools.wraps(node_fn)
+            async def run_node(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
+                if node_name in state.completed_nodes:
+                    logger.info(f"⏭️ [Workflow] Skipping {node_name}: restored from checkpoint")
+                    return {}
+                result = await node_fn(state, config)
+                run = get_run_context(config, default_context)
+                completed_nodes = await asyncio.to_thread(run.save_checkpoint, node_name, state, result or {})
+                if completed_nodes is not None:
+                    result = {**(result or {}), "completed_nodes": completed_nodes}
+                return result
+            return run_node
+        return decorator
+
+    def traced_node(node_name: str):
+        """Run a node inside a ``workflow.node.<name>`` span (see /admin/perf)"""
+        def decorator(node_fn: Callable[..., Awaitable[Dict[str, Any]]]):
+            @functools.wraps(node_fn)
+            async def run_node(state: SurveyGenerationState, *args, **kwargs) -> Dict[str, Any]:
+                with tracer.span(f"workflow.node.{node_name}", workflow_id=state.workflow_id):
+                    return await node_fn(state, *args, **kwargs)
+            return run_node
+        return decorator
     
     # Initialize nodes
     rfq_node = RFQNode(db)
@@ -40,20 +209,11 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
     golden_validator = GoldenValidatorNode(db)
     validator = ValidatorAgent(db, connection_manager=connection_manager)
     
-    # Initialize WebSocket client for progress updates
-    try:
-        from src.services.websocket_client import WebSocketNotificationService
-        ws_client = WebSocketNotificationService(connection_manager)
-    except Exception:
-        # Graceful fallback if settings/config not available during tests
-        class _NoopWS:
-            async def send_progress_update(self, *args, **kwargs):
-                return None
-        ws_client = _NoopWS()
-    
     # Create wrapper functions that send progress updates
-    async def initialize_workflow_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def initialize_workflow_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Send initializing workflow progress update"""
+        run = get_run_context(config, default_context)
+        ws_client = run.ws_client
         progress_tracker = get_progress_tracker(state.workflow_id)
         
         try:
@@ -66,8 +226,10 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         
         return {}
     
-    async def parse_rfq_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def parse_rfq_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Parse RFQ with progress update"""
+        run = get_run_context(config, default_context)
+        ws_client = run.ws_client
         progress_tracker = get_progress_tracker(state.workflow_id)
         
         try:
@@ -87,7 +249,8 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         except Exception as e:
             logger.error(f"❌ [Workflow] Failed to send embedding progress update: {str(e)}")
         
-        result = await rfq_node(state)
+        with run.node_session() as db:
+            result = await rfq_node(state, db=db)
         
         # Send completion progress update
         try:
@@ -101,8 +264,10 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         
         return result
     
-    async def retrieve_golden_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def retrieve_golden_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Retrieve golden examples with progress update"""
+        run = get_run_context(config, default_context)
+        ws_client = run.ws_client
         progress_tracker = get_progress_tracker(state.workflow_id)
         
         try:
@@ -115,7 +280,7 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
             logger.error(f"❌ [Workflow] Failed to send progress update: {str(e)}")
         
         # Add detailed logging for golden pairs retrieval
-        logger.info(f"🔍 [Workflow] Starting golden pairs retrieval for RFQ: '{state.rfq_text[:100]}...'")
+        logger.info(f"🔍 [Workflow] Starting golden pairs retrieval for RFQ: '{log_text_preview(state.rfq_text, 100)}...'")
         logger.info(f"🔍 [Workflow] RFQ details - Category: {state.product_category}, Segment: {state.target_segment}, Goal: {state.research_goal}")
         
         try:
@@ -131,8 +296,10 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
             logger.error(f"❌ [Workflow] Golden pairs retrieval failed: {str(e)}", exc_info=True)
             raise
     
-    async def build_context_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def build_context_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Build context with progress update"""
+        run = get_run_context(config, default_context)
+        ws_client = run.ws_client
         progress_tracker = get_progress_tracker(state.workflow_id)
         
         try:
@@ -143,7 +310,8 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         except Exception as e:
             logger.error(f"❌ [Workflow] Failed to send progress update: {str(e)}")
         
-        result = await context_builder(state)
+        with run.node_session() as db:
+            result = await context_builder(state, db=db)
         
         # Send build context completion progress
         try:
@@ -157,8 +325,10 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         
         return result
     
-    async def prompt_review_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def prompt_review_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Human prompt review with progress update"""
+        run = get_run_context(config, default_context)
+        ws_client = run.ws_client
         progress_tracker = get_progress_tracker(state.workflow_id)
         
         logger.info(f"🔍 [Workflow] prompt_review_with_progress called for workflow: {state.workflow_id}")
@@ -257,8 +427,10 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         
         return result
     
-    async def generate_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def generate_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Generate survey with progress update"""
+        run = get_run_context(config, default_context)
+        ws_client = run.ws_client
         progress_tracker = get_progress_tracker(state.workflow_id)
 
         # Step 1: Preparing generation
@@ -274,7 +446,8 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         logger.info("🚀 [Workflow] About to call GeneratorAgent...")
         logger.info(f"📊 [Workflow] State before generation - context: {bool(state.context)}, golden_examples: {len(state.golden_examples) if state.golden_examples else 0}")
 
-        result = await generator(state)
+        with run.node_session() as db:
+            result = await generator(state, db=db, connection_manager=run.connection_manager)
 
         # Step 3: Parsing Output
         try:
@@ -297,8 +470,10 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         
         return result
     
-    async def surgical_merge_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def surgical_merge_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Merge regenerated sections with preserved sections in surgical/targeted mode"""
+        run = get_run_context(config, default_context)
+        ws_client = run.ws_client
         from src.workflows.state import RegenerationMode
         
         # Only run surgical merge in surgical or targeted mode
@@ -318,7 +493,8 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
             logger.error(f"❌ [Workflow] Failed to send progress update: {str(e)}")
         
         # Run surgical merge
-        result = await surgical_merger(state)
+        with run.node_session() as db:
+            result = await surgical_merger(state, db=db)
         
         # Send completion progress update
         try:
@@ -332,8 +508,10 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         
         return result
     
-    async def detect_labels_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def detect_labels_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Detect and assign labels to questions with progress update"""
+        run = get_run_context(config, default_context)
+        ws_client = run.ws_client
         progress_tracker = get_progress_tracker(state.workflow_id)
         
         try:
@@ -345,7 +523,8 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         except Exception as e:
             logger.error(f"❌ [Workflow] Failed to send progress update: {str(e)}")
         
-        result = await label_detector(state)
+        with run.node_session() as db:
+            result = await label_detector(state, db=db)
         
         # Send completion progress update
         try:
@@ -359,16 +538,13 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         
         return result
     
-    async def golden_validation_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def golden_validation_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Run golden validation with progress update"""
+        run = get_run_context(config, default_context)
         progress_tracker = get_progress_tracker(state.workflow_id)
         
         # Initialize WebSocket client if connection_manager is available
-        if connection_manager:
-            from src.services.websocket_client import WebSocketNotificationService
-            ws_client = WebSocketNotificationService(connection_manager)
-        else:
-            ws_client = None
+        ws_client = run.ws_client if run.connection_manager else None
         
         try:
             if ws_client:
@@ -380,7 +556,8 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         except Exception as e:
             logger.error(f"❌ [Workflow] Failed to send progress update: {str(e)}")
         
-        result = await golden_validator(state)
+        with run.node_session() as db:
+            result = await golden_validator(state, db=db)
         
         # Send finalizing progress update (since we skip AI evaluation now)
         try:
@@ -396,8 +573,10 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         logger.info(f"✅ [Workflow] Golden validation completed")
         return result
     
-    async def validate_with_progress(state: SurveyGenerationState) -> Dict[str, Any]:
+    async def validate_with_progress(state: SurveyGenerationState, config: RunnableConfig) -> Dict[str, Any]:
         """Validate survey with progress update"""
+        run = get_run_context(config, default_context)
+        ws_client = run.ws_client
         progress_tracker = get_progress_tracker(state.workflow_id)
         
         try:
@@ -433,16 +612,16 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
     
     
     # Add nodes to workflow
-    workflow.add_node("initialize_workflow", initialize_workflow_with_progress)
-    workflow.add_node("parse_rfq", parse_rfq_with_progress)
-    workflow.add_node("retrieve_golden", retrieve_golden_with_progress)
-    workflow.add_node("build_context", build_context_with_progress)
-    workflow.add_node("prompt_review", prompt_review_with_progress)
-    workflow.add_node("generate", generate_with_progress)
-    workflow.add_node("surgical_merge", surgical_merge_with_progress)
-    workflow.add_node("detect_labels", detect_labels_with_progress)
-    workflow.add_node("golden_validation", golden_validation_with_progress)
-    workflow.add_node("validate", validate_with_progress)
+    workflow.add_node("initialize_workflow", traced_node("initialize_workflow")(initialize_workflow_with_progress))
+    workflow.add_node("parse_rfq", traced_node("parse_rfq")(checkpointed("parse_rfq")(parse_rfq_with_progress)))
+    workflow.add_node("retrieve_golden", traced_node("retrieve_golden")(checkpointed("retrieve_golden")(retrieve_golden_with_progress)))
+    workflow.add_node("build_context", traced_node("build_context")(checkpointed("build_context")(build_context_with_progress)))
+    workflow.add_node("prompt_review", traced_node("prompt_review")(checkpointed("prompt_review")(prompt_review_with_progress)))
+    workflow.add_node("generate", traced_node("generate")(checkpointed("generate")(generate_with_progress)))
+    workflow.add_node("surgical_merge", traced_node("surgical_merge")(checkpointed("surgical_merge")(surgical_merge_with_progress)))
+    workflow.add_node("detect_labels", traced_node("detect_labels")(checkpointed("detect_labels")(detect_labels_with_progress)))
+    workflow.add_node("golden_validation", traced_node("golden_validation")(checkpointed("golden_validation")(golden_validation_with_progress)))
+    workflow.add_node("validate", traced_node("validate")(validate_with_progress))
     
     # Set entry point to initialization
     workflow.set_entry_point("initialize_workflow")
@@ -524,7 +703,7 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
         # We need to raise an exception to actually stop execution
         raise Exception("WORKFLOW_PAUSED_FOR_HUMAN_REVIEW")
     
-    workflow.add_node("pause_for_review", pause_for_review)
+    workflow.add_node("pause_for_review", traced_node("pause_for_review")(pause_for_review))
     
     # Conditional edge for prompt review - determines if workflow should pause or continue
     def should_continue_after_review(state: SurveyGenerationState) -> str:
@@ -623,7 +802,7 @@ def create_workflow(db: Session, connection_manager=None) -> Any:
             logger.error(f"❌ [Workflow] Error in completion handler: {str(e)}")
             return {"workflow_completed": True, "workflow_paused": False, "error": True}
 
-    workflow.add_node("completion_handler", completion_handler)
+    workflow.add_node("completion_handler", traced_node("completion_handler")(completion_handler))
 
     # pause_for_review should not have outgoing edges - workflow pauses here
     # The workflow will be resumed externally when human review is completed
@@ -453,6 +453,10 @@ main() {
         "nginx")
             start_nginx
             ;;
+        "worker")
+            log_info "Starting workflow worker (concurrency: ${WORKFLOW_WORKER_CONCURRENCY:-4})"
+            $UV_CMD run --no-project python -m src.workers.workflow_worker --concurrency "${WORKFLOW_WORKER_CONCURRENCY:-4}"
+            ;;
         "websocket")
             log_warning "WebSocket server is now integrated into FastAPI. Starting consolidated server instead."
             start_consolidated
@@ -0,0 +1,116 @@
+"""
+Unit tests for the annotation RAG sync service.
+Covers the batched upsert of golden questions and sections for one survey.
+"""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.services.annotation_rag_sync_service import AnnotationRAGSyncService
+
+SURVEY_ID = str(uuid.uuid4())
+
+SURVEY_DATA = {
+    "sections": [
+        {
+            "id": 1,
+            "title": "Usage habits",
+            "description": "How often respondents use the product",
+            "questions": [
+                {"id": "q1", "text": "How often do you shop online?", "type": "single_choice"},
+                {"id": "q2", "text": "Why do you prefer this store?", "type": "open_text"},
+            ],
+        },
+        {"id": 2, "title": "Pricing", "description": "Price perception", "questions": []},
+    ]
+}
+
+
+def make_annotation(annotation_id, question_id=None, section_id=None, labels=None):
+    return SimpleNamespace(
+        id=annotation_id, question_id=question_id, section_id=section_id, survey_id=SURVEY_ID,
+        quality=5, relevant=4, human_verified=True, labels=labels,
+    )
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    query = db.query.return_value
+    query.filter.return_value = query
+    query.order_by.return_value = query
+    query.first.return_value = SimpleNamespace(final_output=SURVEY_DATA)
+    return db
+
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestSyncAnnotationsBatch:
+    """Test suite for AnnotationRAGSyncService.sync_annotations_batch"""
+
+    @pytest.mark.asyncio
+    async def test_questions_upserted_in_one_statement_and_one_commit(self, mock_db):
+        golden_id = uuid.uuid4()
+        mock_db.query.return_value.all.return_value = [
+            make_annotation(10, question_id="q1", labels=["high_quality"]),
+            make_annotation(11, question_id=f"{SURVEY_ID}_q2", labels={}),
+            make_annotation(12, question_id="q1"),  # Second annotator on q1
+            make_annotation(13, question_id="q9"),
+        ]
+        mock_db.execute.return_value = [
+            SimpleNamespace(id=golden_id, question_id="q1", inserted=False),
+            SimpleNamespace(id=uuid.uuid4(), question_id=f"{SURVEY_ID}_q2", inserted=True),
+        ]
+
+        result = await AnnotationRAGSyncService(mock_db).sync_annotations_batch(
+            SURVEY_ID, question_annotation_ids=[10, 11, 12, 13, 14]
+        )
+
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_called_once()
+        statement = mock_db.execute.call_args.args[0]
+        sql = compiled(statement)
+        assert "ON CONFLICT (survey_id, question_id) DO UPDATE" in sql
+        # One row per question key; the newest annotation (12) wins for q1
+        rows = statement.compile(dialect=postgresql.dialect()).params
+        assert rows["annotation_id_m0"] == 12 and rows["question_text_m1"] == "Why do you prefer this store?"
+        assert "annotation_id_m2" not in rows
+
+        outcomes = {item["annotation_id"]: item for item in result["questions"]}
+        assert outcomes[10]["action"] == outcomes[12]["action"] == "updated"
+        assert outcomes[10]["golden_question_id"] == str(golden_id)
+        assert outcomes[11]["action"] == "created"
+        assert outcomes[13]["error"] == "Question not found in survey"
+        assert outcomes[14]["error"] == "Annotation not found"
+        assert result["success"] and result["questions_synced"] == 3
+
+    @pytest.mark.asyncio
+    async def test_sections_upserted_on_survey_section_key(self, mock_db):
+        mock_db.query.return_value.all.return_value = [make_annotation(20, section_id=1)]
+        mock_db.execute.return_value = [SimpleNamespace(id=uuid.uuid4(), section_id="1", inserted=True)]
+
+        result = await AnnotationRAGSyncService(mock_db).sync_annotations_batch(
+            SURVEY_ID, section_annotation_ids=[20]
+        )
+
+        assert "ON CONFLICT (survey_id, section_id) DO UPDATE" in compiled(mock_db.execute.call_args.args[0])
+        assert result["sections"][0]["action"] == "created"
+        assert result["sections_synced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_survey_fails_without_writing(self, mock_db):
+        mock_db.query.return_value.first.return_value = None
+
+        result = await AnnotationRAGSyncService(mock_db).sync_annotations_batch(
+            SURVEY_ID, question_annotation_ids=[1]
+        )
+
+        assert not result["success"]
+        assert result["error"] == "Survey data not available"
+        mock_db.execute.assert_not_called()
+        mock_db.commit.assert_not_called()
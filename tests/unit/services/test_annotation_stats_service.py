@@ -0,0 +1,78 @@
+"""
+Unit tests for annotation statistics service.
+Covers single-pass FILTER aggregates and the TTL cache.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import QuestionAnnotation
+from src.services.annotation_stats_service import (
+    AnnotationStatsService,
+    invalidate_annotation_stats,
+)
+
+
+def _row(**values):
+    row = MagicMock()
+    row._mapping = values
+    return row
+
+
+@pytest.fixture(autouse=True)
+def clear_stats_cache():
+    invalidate_annotation_stats()
+    yield
+    invalidate_annotation_stats()
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    breakdown = _row(total=10, ai_generated=6, human_created=4, overridden=1, verified=2)
+    db.execute.return_value.one.return_value = breakdown
+    db.execute.return_value.scalar.return_value = 3
+    return db
+
+
+class TestAnnotationStatsService:
+    """Test suite for AnnotationStatsService"""
+
+    def test_breakdown_uses_single_filtered_aggregate(self):
+        statement = AnnotationStatsService._breakdown_statement(QuestionAnnotation)
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+
+        assert sql.count("FILTER (WHERE") == 4
+        assert sql.count("FROM question_annotations") == 1
+
+    def test_breakdown_is_cached_until_invalidated(self, mock_db):
+        service = AnnotationStatsService(mock_db)
+
+        first = service.get_human_vs_ai_breakdown()
+        calls_after_first = mock_db.execute.call_count
+        second = service.get_human_vs_ai_breakdown()
+
+        assert first == second
+        assert first["question_annotations"]["ai_generated"] == 6
+        assert first["survey_annotations"]["total"] == 3
+        assert mock_db.execute.call_count == calls_after_first
+
+        invalidate_annotation_stats()
+        service.get_human_vs_ai_breakdown()
+        assert mock_db.execute.call_count > calls_after_first
+
+    def test_averages_are_rounded_and_empty_tables_are_zeroed(self):
+        db = MagicMock()
+        db.execute.return_value.one.side_effect = [
+            _row(count=2, avg_quality=3.333, avg_relevant=4, methodological_rigor=4, content_validity=3,
+                 respondent_experience=5, analytical_value=2, business_impact=1),
+            _row(count=0, avg_quality=None, avg_relevant=None, methodological_rigor=None, content_validity=None,
+                 respondent_experience=None, analytical_value=None, business_impact=None),
+        ]
+
+        stats = AnnotationStatsService(db).get_annotation_averages()
+
+        assert stats["question_annotations"]["avg_quality"] == 3.33
+        assert stats["question_annotations"]["avg_pillars"]["respondent_experience"] == 5.0
+        assert stats["section_annotations"] == {"count": 0, "avg_quality": 0, "avg_relevant": 0, "avg_pillars": {}}
@@ -0,0 +1,132 @@
+"""
+Unit tests for the survey export service.
+Covers cache keying, cache reuse, streamed ZIP output, render fan-out and missing bulk export IDs.
+"""
+import asyncio
+import io
+import sys
+import types
+import uuid
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+import src
+from src.services.export import export_service as export_module
+from src.services.export.export_service import (
+    BulkExportEntry,
+    SurveyExportService,
+    build_export_filename,
+)
+
+
+# Import the export router on its own; src.api's __init__ imports every other router
+_api_package = types.ModuleType("src.api")
+_api_package.__path__ = [str(Path(src.__file__).parent / "api")]
+with patch.dict(sys.modules, {"src.api": _api_package}):
+    from src.api import export as export_api
+
+
+SURVEY = {"title": "Brand Tracker", "sections": [{"id": 1, "questions": [{"id": "q1", "type": "text", "text": "Why?"}]}]}
+
+
+@pytest.fixture
+def fake_renderer(monkeypatch):
+    calls = []
+
+    def _fake_render(format_name, survey_data):
+        calls.append((format_name, survey_data.get("title")))
+        if survey_data.get("title") == "Broken":
+            raise ValueError("cannot render")
+        return f"{format_name}:{survey_data.get('title')}".encode()
+
+    monkeypatch.setattr(export_module, "_render_export", _fake_render)
+    monkeypatch.setattr(export_module.export_registry, "get_renderer_version", lambda format_name: "1")
+    return calls
+
+
+@pytest.fixture
+def service():
+    return SurveyExportService(use_process_pool=False)
+
+
+class TestSurveyExportService:
+    """Test suite for SurveyExportService"""
+
+    def test_survey_hash_ignores_key_order(self):
+        reordered = {"sections": SURVEY["sections"], "title": "Brand Tracker"}
+        assert SurveyExportService.hash_survey(SURVEY) == SurveyExportService.hash_survey(reordered)
+
+    def test_cache_key_includes_format_and_version(self, service, monkeypatch):
+        monkeypatch.setattr(export_module.export_registry, "get_renderer_version", lambda format_name: "7")
+        key = service.build_cache_key("pdf", SURVEY)
+        assert key.startswith("survey_export:pdf:7:")
+
+    @pytest.mark.asyncio
+    async def test_repeated_export_is_served_from_cache(self, service, fake_renderer):
+        first = await service.render("docx", SURVEY)
+        second = await service.render("docx", dict(SURVEY))
+
+        assert first == second == b"docx:Brand Tracker"
+        assert len(fake_renderer) == 1
+        assert service.cache_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_zip_contains_all_entries_and_errors(self, service, fake_renderer):
+        entries = [
+            BulkExportEntry(name="Brand_Tracker_v1", survey_data=SURVEY),
+            BulkExportEntry(name="Brand_Tracker_v1", survey_data={**SURVEY, "title": "Other"}),
+            BulkExportEntry(name="Broken_v1", survey_data={"title": "Broken"}),
+        ]
+
+        chunks = [chunk async for chunk in service.stream_zip("pdf", entries)]
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+        assert sorted(archive.namelist()) == ["Brand_Tracker_v1.pdf", "Brand_Tracker_v1_2.pdf", "Broken_v1.error.txt"]
+        assert b"cannot render" in archive.read("Broken_v1.error.txt")
+        assert len([chunk for chunk in chunks if chunk]) >= 3
+
+    @pytest.mark.asyncio
+    async def test_stream_zip_renders_at_most_one_survey_per_worker(self, fake_renderer):
+        service = SurveyExportService(max_workers=2, use_process_pool=False)
+        in_flight, peak = 0, 0
+
+        async def slow_render(format_name, survey_data):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return b"rendered"
+
+        service._render_uncached = slow_render
+        entries = [BulkExportEntry(name=f"survey_{i}", survey_data={**SURVEY, "title": f"Survey {i}"}) for i in range(6)]
+
+        chunks = [chunk async for chunk in service.stream_zip("pdf", entries)]
+
+        assert len(zipfile.ZipFile(io.BytesIO(b"".join(chunks))).namelist()) == 6
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_export_rejects_missing_survey_ids(self):
+        found, missing = uuid.uuid4(), uuid.uuid4()
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [
+            MagicMock(id=found, rfq_id=None, version=1, final_output=SURVEY)
+        ]
+        request = export_api.BulkSurveyExportRequest(survey_ids=[str(found), str(missing)], format="pdf")
+
+        with patch.object(export_api.export_registry, "get_available_formats", return_value=["pdf"]):
+            with pytest.raises(HTTPException) as exc_info:
+                await export_api.export_surveys_bulk(request, db=db)
+
+        assert exc_info.value.status_code == 404
+        assert str(missing) in exc_info.value.detail
+        assert str(found) not in exc_info.value.detail
+
+    def test_build_export_filename(self):
+        assert build_export_filename(SURVEY, "docx") == "Brand_Tracker.docx"
+        assert build_export_filename(SURVEY, "pdf", "custom") == "custom.pdf"
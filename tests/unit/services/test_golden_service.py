@@ -0,0 +1,189 @@
+"""
+Unit tests for bulk golden pair creation.
+Covers the single-transaction write, per-id content dedup, input ordering, rollback and the bulk endpoint size limit.
+"""
+import sys
+import types
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+
+import src
+from src.database import GoldenRFQSurveyPair
+
+# Mock external dependencies before importing the service. The embedding service stub is
+# only kept for the import so later tests still get the real module.
+sys.modules['replicate'] = MagicMock()
+_embedding_service_module = sys.modules.get('src.services.embedding_service')
+sys.modules['src.services.embedding_service'] = MagicMock()
+from src.services import golden_service
+from src.services.golden_service import GoldenService, _first_per_key
+
+# Import the golden router on its own; src.api's __init__ imports every other router
+_api_package = types.ModuleType("src.api")
+_api_package.__path__ = [str(Path(src.__file__).parent / "api")]
+with patch.dict(sys.modules, {"src.api": _api_package}):
+    from src.api import golden as golden_api
+
+if _embedding_service_module is None:
+    del sys.modules['src.services.embedding_service']
+else:
+    sys.modules['src.services.embedding_service'] = _embedding_service_module
+
+
+def make_pair(title: str) -> dict:
+    return {
+        "title": title,
+        "rfq_text": f"RFQ for {title}",
+        "survey_json": {"title": title, "questions": [{"id": "q1", "text": "How old are you?"}]},
+        "methodology_tags": ["van_westendorp"],
+        "industry_category": "retail",
+        "research_goal": "pricing",
+    }
+
+
+def make_service(db: MagicMock) -> GoldenService:
+    with patch.object(golden_service, "settings", MagicMock(replicate_api_token="token")), \
+            patch.object(golden_service, "EmbeddingService"):
+        service = GoldenService(db)
+    service.embedding_service.get_embeddings_batch = AsyncMock(
+        side_effect=lambda texts: [[float(i)] * 3 for i in range(len(texts))]
+    )
+    service._sync_annotations_to_rag = AsyncMock()
+    return service
+
+
+def row(**fields) -> MagicMock:
+    return MagicMock(**fields)
+
+
+class TestCreateGoldenPairs:
+    """Test suite for GoldenService.create_golden_pairs"""
+
+    @pytest.fixture
+    def populator(self, document_parser):
+        populator = MagicMock()
+        populator.build_golden_sections.return_value = [row(section_id=1), row(section_id=2), row(section_id=1)]
+        populator.build_golden_questions.return_value = [row(question_id="q1"), row(question_id="q1")]
+        with patch.object(golden_service, "RuleBasedRAGPopulator", return_value=populator):
+            yield populator
+
+    @pytest.fixture
+    def document_parser(self):
+        with patch("src.services.document_parser.document_parser") as parser:
+            parser.build_question_annotations.side_effect = lambda survey_id, questions: [
+                row(id=7, question_id="q1", annotator_id="docx_parser")
+            ]
+            yield parser
+
+    @pytest.mark.asyncio
+    async def test_pairs_written_in_one_transaction_in_input_order(self, populator):
+        db = MagicMock()
+        service = make_service(db)
+        titles = ["Pricing study", "Brand tracker", "Concept test"]
+
+        golden_pairs = await service.create_golden_pairs([make_pair(title) for title in titles])
+
+        assert [pair.title for pair in golden_pairs] == titles
+        assert [pair.rfq_embedding for pair in golden_pairs] == [[0.0] * 3, [1.0] * 3, [2.0] * 3]
+        service.embedding_service.get_embeddings_batch.assert_awaited_once_with([f"RFQ for {t}" for t in titles])
+        db.commit.assert_called_once()
+        db.rollback.assert_not_called()
+        added = [call.args[0] for call in db.add.call_args_list]
+        assert [obj for obj in added if isinstance(obj, GoldenRFQSurveyPair)] == golden_pairs
+        assert service._sync_annotations_to_rag.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_golden_content_deduplicated_per_id(self, populator):
+        db = MagicMock()
+        service = make_service(db)
+
+        await service.create_golden_pairs([make_pair("Pricing study")])
+
+        content = db.add_all.call_args.args[0]
+        sections, questions = populator.build_golden_sections.return_value, populator.build_golden_questions.return_value
+        assert content[:3] == [sections[0], sections[1], questions[0]]
+        assert len(content) == 4  # Two sections, one question, one annotation
+
+    @pytest.mark.asyncio
+    async def test_annotations_deduplicated_per_question_and_annotator(self, populator, document_parser):
+        db = MagicMock()
+        service = make_service(db)
+        annotations = [
+            row(id=1, question_id="q1", annotator_id="docx_parser"),
+            row(id=2, question_id="q1", annotator_id="docx_parser"),  # Repeated question id
+            row(id=3, question_id="q1", annotator_id="reviewer"),
+            row(id=4, question_id="q_2", annotator_id="docx_parser"),
+        ]
+        document_parser.build_question_annotations.side_effect = lambda survey_id, questions: annotations
+
+        await service.create_golden_pairs([make_pair("Pricing study")])
+
+        content = db.add_all.call_args.args[0]
+        assert content[3:] == [annotations[0], annotations[2], annotations[3]]
+        db.commit.assert_called_once()
+        service._sync_annotations_to_rag.assert_awaited_once()
+        assert service._sync_annotations_to_rag.await_args.args[1] == [1, 3, 4]
+
+    def test_first_per_key_keeps_first_row_in_order(self):
+        rows = [("b", 1), ("a", 2), ("b", 3), ("c", 4), ("a", 5)]
+
+        assert _first_per_key(rows, lambda r: r[0]) == [("b", 1), ("a", 2), ("c", 4)]
+
+    @pytest.mark.asyncio
+    async def test_failure_in_one_pair_rolls_back_all(self, populator):
+        db = MagicMock()
+        service = make_service(db)
+
+        def add(obj):
+            if isinstance(obj, GoldenRFQSurveyPair) and obj.title == "Brand tracker":
+                raise ValueError("value too long for type character varying(255)")
+        db.add.side_effect = add
+
+        with pytest.raises(Exception, match="Failed to create golden pair: value too long"):
+            await service.create_golden_pairs([make_pair("Pricing study"), make_pair("Brand tracker")])
+
+        db.rollback.assert_called_once()
+        db.commit.assert_not_called()
+        service._sync_annotations_to_rag.assert_not_awaited()
+
+
+class TestBulkGoldenPairsEndpoint:
+    """Test suite for POST /golden-pairs/bulk"""
+
+    @pytest.mark.asyncio
+    async def test_rejects_more_than_the_bulk_limit(self):
+        request = golden_api.BulkCreateGoldenPairsRequest(
+            pairs=[golden_api.CreateGoldenPairRequest(**make_pair(str(i))) for i in range(golden_api.MAX_BULK_GOLDEN_PAIRS + 1)]
+        )
+
+        with patch.object(golden_api, "GoldenService") as service_cls:
+            with pytest.raises(HTTPException) as exc_info:
+                await golden_api.create_golden_pairs(request, BackgroundTasks(), db=MagicMock())
+
+        assert exc_info.value.status_code == 400
+        service_cls.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_creates_pairs_and_schedules_similarity_refresh(self):
+        request = golden_api.BulkCreateGoldenPairsRequest(
+            pairs=[golden_api.CreateGoldenPairRequest(**make_pair(title)) for title in ("Pricing study", "Brand tracker")]
+        )
+        created = [
+            MagicMock(id=f"id-{i}", title=pair.title, rfq_text=pair.rfq_text, survey_json=pair.survey_json,
+                      methodology_tags=pair.methodology_tags, industry_category=pair.industry_category,
+                      research_goal=pair.research_goal, quality_score=1.0, usage_count=0)
+            for i, pair in enumerate(request.pairs)
+        ]
+        background_tasks = BackgroundTasks()
+
+        with patch.object(golden_api, "GoldenService") as service_cls:
+            service_cls.return_value.create_golden_pairs = AsyncMock(return_value=created)
+            responses = await golden_api.create_golden_pairs(request, background_tasks, db=MagicMock())
+
+        submitted = service_cls.return_value.create_golden_pairs.await_args.args[0]
+        assert [pair["title"] for pair in submitted] == ["Pricing study", "Brand tracker"]
+        assert [response.id for response in responses] == ["id-0", "id-1"]
+        assert len(background_tasks.tasks) == 1
@@ -0,0 +1,105 @@
+"""
+Unit tests for the golden similarity index service.
+Covers top-k selection, incremental merging of changed golden pairs and re-embedding edited surveys.
+"""
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import GoldenSetChange, SurveyGoldenTopMatches
+from src.services.golden_similarity_index_service import (
+    GoldenSimilarityIndexService,
+    merge_top_matches,
+    normalize_rows,
+    top_matches,
+)
+
+
+def matches(*pairs):
+    return [{"golden_id": golden_id, "similarity": similarity} for golden_id, similarity in pairs]
+
+
+class TestGoldenSimilarityIndex:
+    """Test suite for GoldenSimilarityIndexService"""
+
+    def test_top_matches_sorted_and_truncated(self):
+        similarities = np.array([[0.1, 0.9, 0.5, 0.7], [0.4, 0.2, 0.8, 0.3]], dtype=np.float32)
+
+        result = top_matches(similarities, ["a", "b", "c", "d"], k=3)
+
+        assert [[m["golden_id"] for m in row] for row in result] == [["b", "d", "c"], ["c", "a", "d"]]
+        assert top_matches(np.zeros((2, 0)), [], k=3) == [[], []]
+
+    def test_normalized_product_is_cosine_similarity(self):
+        surveys = normalize_rows([[3.0, 4.0], [0.0, 0.0]])
+        goldens = normalize_rows([[1.0, 0.0]])
+
+        assert np.allclose(surveys @ goldens.T, [[0.6], [0.0]])
+
+    def test_merge_adds_and_rescored_pairs(self):
+        cached = matches(("a", 0.9), ("b", 0.8), ("c", 0.7))
+
+        # New pair enters the list and pushes out the lowest match
+        assert merge_top_matches(cached, {"d"}, {"d": 0.85}, k=3) == matches(("a", 0.9), ("d", 0.85), ("b", 0.8))
+        # Unaffected list is returned as is
+        assert merge_top_matches(cached, {"d"}, {"d": 0.1}, k=3) is cached
+        # An edited pair that scores higher stays exact
+        assert merge_top_matches(cached, {"c"}, {"c": 0.95}, k=3)[0] == {"golden_id": "c", "similarity": 0.95}
+
+    def test_merge_falls_back_when_a_full_list_shrinks(self):
+        cached = matches(("a", 0.9), ("b", 0.8), ("c", 0.7))
+
+        # Deleted or lowered pairs may let an uncached golden pair into the list
+        assert merge_top_matches(cached, {"b"}, {}, k=3) is None
+        assert merge_top_matches(cached, {"a"}, {"a": 0.5}, k=3) is None
+        # A list shorter than k already covered every golden pair
+        assert merge_top_matches(cached[:2], {"b"}, {}, k=3) == matches(("a", 0.9))
+
+    def test_golden_change_added_to_callers_session(self):
+        db = MagicMock()
+        golden_id = uuid.uuid4()
+
+        GoldenSimilarityIndexService.record_golden_change(db, golden_id, "delete")
+
+        change = db.add.call_args.args[0]
+        assert type(change) is GoldenSetChange
+        assert change.golden_pair_id == golden_id and change.change_type == "delete"
+        db.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_edited_surveys_reembedded_and_cached_matches_dropped(self):
+        db = MagicMock()
+        new_id, edited_id = uuid.uuid4(), uuid.uuid4()
+        db.query.return_value.outerjoin.return_value.filter.return_value.all.return_value = [
+            MagicMock(id=new_id, final_output={"title": "New"}, content_hash="h1", embedded_id=None),
+            MagicMock(id=edited_id, final_output={"title": "Edited"}, content_hash="h2", embedded_id=edited_id),
+        ]
+        embedding_service = MagicMock(get_embeddings_batch=AsyncMock(return_value=[[1.0], [2.0]]))
+        service = GoldenSimilarityIndexService(db, embedding_service=embedding_service)
+
+        assert await service.embed_surveys() == 2
+
+        upsert = db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (survey_id) DO UPDATE" in str(upsert)
+        assert {"h1", "h2"} <= {value for value in upsert.params.values() if isinstance(value, str)}
+        assert any(call.args[0] is SurveyGoldenTopMatches for call in db.query.call_args_list)
+        dropped = db.query.return_value.filter.call_args.args[0]
+        assert dropped.right.value == [edited_id]  # Only the edited survey's cached matches
+        db.commit.assert_called_once()
+
+    def test_top_matches_not_current_after_survey_edit(self):
+        db = MagicMock()
+        service = GoldenSimilarityIndexService(db, embedding_service=MagicMock())
+        service.current_version = MagicMock(return_value=5)
+        cached = db.query.return_value.join.return_value.join.return_value.filter.return_value.first
+        matches = [{"golden_id": "a", "similarity": 0.9}]
+
+        cached.return_value = MagicMock(golden_set_version=5, matches=matches, survey_unchanged=True)
+        assert service.get_top_matches("s1") == {"golden_set_version": 5, "is_current": True, "matches": matches}
+        cached.return_value = MagicMock(golden_set_version=5, matches=matches, survey_unchanged=False)
+        assert service.get_top_matches("s1")["is_current"] is False
+        cached.return_value = MagicMock(golden_set_version=4, matches=matches, survey_unchanged=True)
+        assert service.get_top_matches("s1")["is_current"] is False
@@ -0,0 +1,87 @@
+"""
+Unit tests for the LLM audit summary listing.
+Covers the metadata-only projection and keyset cursor pagination on a (created_at, id) row comparison.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import LLMAudit
+from src.services.llm_audit_service import (
+    AUDIT_SUMMARY_COLUMNS,
+    LLMAuditService,
+    decode_audit_cursor,
+    encode_audit_cursor,
+)
+
+
+def make_rows(count):
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [MagicMock(id=uuid.uuid4(), created_at=now - timedelta(seconds=i)) for i in range(count)]
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    query = db.query.return_value
+    query.filter.return_value = query
+    query.order_by.return_value = query
+    query.limit.return_value = query
+    query.count.return_value = 120
+    return db
+
+
+class TestAuditSummaryListing:
+    """Test suite for LLMAuditService.get_audit_summaries"""
+
+    @pytest.mark.asyncio
+    async def test_first_page_projects_metadata_and_returns_cursor(self, mock_db):
+        rows = make_rows(4)
+        mock_db.query.return_value.all.return_value = rows
+
+        page, next_cursor, total = await LLMAuditService(mock_db).get_audit_summaries(limit=3)
+
+        selected = mock_db.query.call_args.args
+        assert selected == AUDIT_SUMMARY_COLUMNS
+        assert LLMAudit.input_prompt not in selected and LLMAudit.output_content not in selected
+        assert page == rows[:3]
+        assert total == 120
+        assert decode_audit_cursor(next_cursor) == (rows[2].created_at, rows[2].id)
+        mock_db.query.return_value.limit.assert_called_once_with(4)
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_skips_count_and_ends_without_cursor(self, mock_db):
+        rows = make_rows(2)
+        mock_db.query.return_value.all.return_value = rows
+        cursor = encode_audit_cursor(datetime(2026, 1, 2, tzinfo=timezone.utc), uuid.uuid4())
+
+        page, next_cursor, total = await LLMAuditService(mock_db).get_audit_summaries(
+            purpose="evaluation", limit=3, cursor=cursor
+        )
+
+        assert page == rows
+        assert next_cursor is None
+        assert total is None
+        mock_db.query.return_value.count.assert_not_called()
+        assert mock_db.query.return_value.filter.call_count == 3  # created_at set + purpose + keyset position
+
+    @pytest.mark.asyncio
+    async def test_keyset_position_is_a_row_comparison(self, mock_db):
+        mock_db.query.return_value.all.return_value = []
+        cursor = encode_audit_cursor(datetime(2026, 1, 2, tzinfo=timezone.utc), uuid.uuid4())
+
+        await LLMAuditService(mock_db).get_audit_summaries(cursor=cursor)
+
+        not_null, keyset = [call.args[0] for call in mock_db.query.return_value.filter.call_args_list]
+        assert str(not_null.compile(dialect=postgresql.dialect())) == "llm_audit.created_at IS NOT NULL"
+        sql = str(keyset.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("(llm_audit.created_at, llm_audit.id) < (")
+        assert " OR " not in sql
+
+    @pytest.mark.asyncio
+    async def test_malformed_cursor_is_rejected(self, mock_db):
+        with pytest.raises(ValueError, match="Invalid audit cursor"):
+            await LLMAuditService(mock_db).get_audit_summaries(cursor="not-a-cursor")
@@ -0,0 +1,249 @@
+"""
+Unit tests for the LLM provider gateway.
+Covers priority admission, 429 retry/backoff with AIMD decrease, token buckets and audit metrics.
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.llm_audit_service import LLMAuditContext
+from src.services.llm_gateway import (
+    LLMDeadlineExceeded, LLMGateway, Priority, TokenBucket, classify_error, llm_deadline, llm_priority,
+    parse_model_limits, start_metrics_capture, stop_metrics_capture,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def make_gateway(**overrides) -> LLMGateway:
+    values = {
+        "llm_gateway_enabled": True,
+        "llm_gateway_model_limits": "",
+        "llm_gateway_requests_per_minute": 0,
+        "llm_gateway_tokens_per_minute": 0,
+        "llm_gateway_max_concurrency": 2,
+        "llm_gateway_min_concurrency": 1,
+        "llm_gateway_max_retries": 3,
+        "llm_gateway_backoff_base_seconds": 0.0,
+        "llm_gateway_backoff_max_seconds": 0.0,
+        "llm_hedging_enabled": False,
+        "llm_hedge_purposes": "survey_generation",
+        "llm_hedge_percentile": 0.95,
+        "llm_hedge_min_samples": 20,
+        "llm_hedge_refresh_seconds": 600,
+        **overrides,
+    }
+    with patch("src.services.llm_gateway.settings", MagicMock(**values)):
+        return LLMGateway()
+
+
+class TestLLMGateway:
+    """Test suite for LLMGateway"""
+
+    @pytest.mark.asyncio
+    async def test_interactive_calls_are_admitted_before_background(self):
+        gateway = make_gateway(llm_gateway_max_concurrency=2)  # Initial AIMD limit: 1 in flight
+        release = asyncio.Event()
+        order = []
+
+        async def blocker():
+            await release.wait()
+
+        def call(name):
+            async def run():
+                order.append(name)
+            return run
+
+        first = asyncio.create_task(gateway.call(blocker, "replicate", "model-a"))
+        await asyncio.sleep(0)
+        background = asyncio.create_task(gateway.call(call("background"), "replicate", "model-a", priority=Priority.BACKGROUND))
+        await asyncio.sleep(0)
+        with llm_priority(Priority.INTERACTIVE):
+            interactive = asyncio.create_task(gateway.call(call("interactive"), "replicate", "model-a"))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, background, interactive)
+
+        assert order == ["interactive", "background"]
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_calls_are_retried_and_shrink_concurrency(self):
+        gateway = make_gateway(llm_gateway_max_concurrency=8)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RateLimitError("Too Many Requests")
+            return "ok"
+
+        result = await gateway.call(flaky, "openai", "gpt-4o")
+
+        metrics = gateway.get_metrics()["openai/gpt-4o"]
+        assert result == "ok"
+        assert len(attempts) == 3
+        assert metrics["rate_limited"] == 2
+        assert metrics["retries"] == 2
+        assert metrics["concurrency_limit"] < 4  # 4 -> 2 -> 1, then additive increase
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_errors_fail_immediately(self):
+        gateway = make_gateway()
+        attempts = []
+
+        async def broken():
+            attempts.append(1)
+            raise ValueError("invalid model input")
+
+        with pytest.raises(ValueError):
+            await gateway.call(broken, "replicate", "model-a")
+
+        assert len(attempts) == 1
+        assert gateway.get_metrics()["replicate/model-a"]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_audit_context_records_gateway_metrics(self):
+        gateway = make_gateway()
+        audit_service = MagicMock()
+
+        async def log_llm_interaction(**kwargs):
+            audit_service.logged = kwargs
+
+        async def generate():
+            return "{}"
+
+        audit_service.log_llm_interaction = log_llm_interaction
+        async with LLMAuditContext(
+            audit_service, "interaction-1", "model-a", "replicate", "evaluation", "prompt"
+        ):
+            await gateway.call(generate, "replicate", "model-a")
+
+        gateway_metrics = audit_service.logged["metadata"]["gateway"]
+        assert gateway_metrics["priority"] == "background"
+        assert gateway_metrics["attempts"] == 1
+        assert gateway_metrics["model"] == "replicate/model-a"
+
+
+class TestDeadlinesAndHedging:
+    """Test suite for deadline propagation and hedged requests"""
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_stalled_provider_call(self):
+        gateway = make_gateway()
+
+        async def stalled():
+            await asyncio.sleep(10)
+
+        with llm_deadline(0.05):
+            with pytest.raises(LLMDeadlineExceeded, match="timed out"):
+                await gateway.call(stalled, "replicate", "model-a")
+
+        assert gateway.get_metrics()["replicate/model-a"]["deadline_exceeded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_stop_when_backoff_would_pass_the_deadline(self):
+        gateway = make_gateway(llm_gateway_backoff_base_seconds=5.0, llm_gateway_backoff_max_seconds=5.0)
+        attempts = []
+
+        async def rate_limited():
+            attempts.append(1)
+            error = RateLimitError("Too Many Requests")
+            error.response = MagicMock(headers={"retry-after": "5"})
+            raise error
+
+        with llm_deadline(1.0):
+            with pytest.raises(RateLimitError):
+                await gateway.call(rate_limited, "replicate", "model-a")
+
+        assert len(attempts) == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_call_is_hedged_and_loser_cancelled(self):
+        gateway = make_gateway(llm_hedging_enabled=True)
+        gateway._hedge_thresholds_ms[("model-a", "survey_generation")] = 20.0
+        calls = []
+        cancelled = []
+
+        async def generate():
+            calls.append(1)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(10)  # Long-tail stall
+                except asyncio.CancelledError:
+                    cancelled.append(1)
+                    raise
+            return "hedged result"
+
+        capture = start_metrics_capture("survey_generation")
+        result = await gateway.call(generate, "replicate", "model-a")
+        await asyncio.sleep(0)
+        metrics = stop_metrics_capture(capture)[0]
+
+        assert result == "hedged result"
+        assert len(calls) == 2
+        assert cancelled == [1]
+        assert metrics["hedged"] is True and metrics["hedge_won"] is True
+
+    @pytest.mark.asyncio
+    async def test_calls_outside_hedge_purposes_are_not_hedged(self):
+        gateway = make_gateway(llm_hedging_enabled=True)
+        gateway._hedge_thresholds_ms[("model-a", "survey_generation")] = 1.0
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        capture = start_metrics_capture("field_extraction")
+        await gateway.call(generate, "replicate", "model-a")
+        stop_metrics_capture(capture)
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_threshold_refresh_runs_off_the_event_loop(self):
+        gateway = make_gateway(llm_hedging_enabled=True)
+        started, release = asyncio.Event(), asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def slow_load():
+            loop.call_soon_threadsafe(started.set)
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            gateway._hedge_thresholds_ms = {("model-a", "survey_generation"): 1500.0}
+
+        with patch.object(gateway, "_load_hedge_thresholds", side_effect=slow_load) as load:
+            gateway.refresh_hedge_thresholds()  # Returns while the query is still running
+            await started.wait()
+            gateway.refresh_hedge_thresholds()  # Not due again yet
+            assert gateway._hedge_thresholds_ms == {}
+
+            release.set()
+            await gateway._hedge_refresh_task
+
+        load.assert_called_once()
+        assert gateway._hedge_thresholds_ms == {("model-a", "survey_generation"): 1500.0}
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket and limit parsing"""
+
+    def test_wait_time_reflects_refill_rate(self):
+        bucket = TokenBucket(rate_per_minute=60)
+        now = bucket.updated_at
+        bucket.take(60)
+
+        assert bucket.wait_time(1, now) == pytest.approx(1.0)
+        assert bucket.wait_time(1, now + 1.0) == 0.0
+        assert bucket.wait_time(500, now + 1.0) == pytest.approx(59.0)  # Oversized requests wait for a full bucket
+
+    def test_classify_and_parse_helpers(self):
+        assert classify_error(RateLimitError("slow down")) == (True, True, None)
+        assert classify_error(ValueError("bad input"))[0] is False
+        assert parse_model_limits("openai/gpt-4o=rpm:500,tpm:30000;owner/model:abc123=rpm:60") == {
+            "openai/gpt-4o": {"rpm": 500, "tpm": 30000},
+            "owner/model:abc123": {"rpm": 60},
+        }
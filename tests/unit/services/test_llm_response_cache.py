@@ -0,0 +1,139 @@
+"""
+Unit tests for the LLM response cache.
+Covers key construction, per-purpose enablement, store-after-parse and disk eviction.
+"""
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.config.settings import settings
+from src.services.llm_response_cache import (
+    CachedLLMProvider,
+    LLMResponseCache,
+    _DiskBackend,
+    build_llm_cache_key,
+    store_parsed_response,
+    with_response_cache,
+)
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "llm_cache_enabled_purposes", "field_extraction")
+    cache = LLMResponseCache(backend="disk")
+    cache._backend = _DiskBackend(str(tmp_path), ttl_seconds=60, max_bytes=1024 * 1024)
+    return cache
+
+
+def _provider(output="{}"):
+    provider = MagicMock()
+    provider.get_provider_name.return_value = "replicate"
+    provider.generate = AsyncMock(return_value={"output": output, "metadata": {"provider": "replicate"}})
+    return provider
+
+
+class TestLLMResponseCache:
+    """Test suite for LLMResponseCache and CachedLLMProvider"""
+
+    def test_key_depends_on_model_prompt_and_hyperparameters(self):
+        base = build_llm_cache_key("m", "prompt", "system", {"temperature": 0.1})
+        assert base == build_llm_cache_key("m", "prompt", "system", {"temperature": 0.1})
+        assert base != build_llm_cache_key("other", "prompt", "system", {"temperature": 0.1})
+        assert base != build_llm_cache_key("m", "prompt!", "system", {"temperature": 0.1})
+        assert base != build_llm_cache_key("m", "prompt", "system", {"temperature": 0.2})
+
+    @pytest.mark.asyncio
+    async def test_identical_call_is_served_from_cache(self, disk_cache):
+        provider = _provider('{"a": 1}')
+        cached = CachedLLMProvider(provider, "field_extraction", cache=disk_cache)
+
+        first = await cached.generate("prompt", system_prompt="s", model="m", temperature=0.1, max_tokens=100)
+        await store_parsed_response(cached, first)
+        second = await cached.generate("prompt", system_prompt="s", model="m", temperature=0.1, max_tokens=100)
+
+        assert first["output"] == second["output"] == '{"a": 1}'
+        assert first["metadata"]["cache_hit"] is False
+        assert second["metadata"]["cache_hit"] is True
+        assert second["metadata"]["provider"] == "replicate"
+        assert provider.generate.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_response_not_stored_until_caller_parses_it(self, disk_cache):
+        provider = _provider("not json")
+        cached = CachedLLMProvider(provider, "field_extraction", cache=disk_cache)
+
+        first = await cached.generate("prompt", model="m")  # Caller fails to parse, never stores
+        second = await cached.generate("prompt", model="m")
+
+        assert second["metadata"]["cache_hit"] is False
+        assert provider.generate.await_count == 2
+        await store_parsed_response(provider, first)  # Uncached providers are ignored
+
+    @pytest.mark.asyncio
+    async def test_get_or_generate_skips_rejected_outputs(self, disk_cache):
+        generate = AsyncMock(side_effect=["  ", "RFQ text"])
+
+        def non_empty(output):
+            return bool(output.strip())
+
+        assert await disk_cache.get_or_generate("field_extraction", "k", generate, validate=non_empty) == ("  ", False)
+        assert await disk_cache.get_or_generate("field_extraction", "k", generate, validate=non_empty) == ("RFQ text", False)
+        assert await disk_cache.get_or_generate("field_extraction", "k", generate, validate=non_empty) == ("RFQ text", True)
+        assert generate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_evaluation_output_cached_only_when_it_parses(self, disk_cache, monkeypatch):
+        from evaluations.llm_client import EvaluationLLMClient
+
+        monkeypatch.setattr(settings, "llm_cache_enabled_purposes", "evaluation")
+        monkeypatch.setattr("src.services.llm_response_cache.llm_response_cache", disk_cache)
+        monkeypatch.setattr("src.services.llm_audit_service.LLMAuditService", MagicMock(side_effect=RuntimeError("no db")))
+        client = EvaluationLLMClient.__new__(EvaluationLLMClient)
+        client.replicate_available, client.replicate_token, client.replicate_client = True, "token", MagicMock()
+        client.model = "m"
+        client._run_replicate = AsyncMock(side_effect=["Sorry, I cannot help", '{"score": 0.8}'])
+
+        first = await client.generate_evaluation("evaluate", max_tokens=100)
+        second = await client.generate_evaluation("evaluate", max_tokens=100)
+        third = await client.generate_evaluation("evaluate", max_tokens=100)
+
+        assert first.content == "Sorry, I cannot help"
+        assert second.content == third.content == '{"score": 0.8}'
+        assert client._run_replicate.await_count == 2
+
+    def test_only_enabled_purposes_are_wrapped(self, monkeypatch):
+        monkeypatch.setattr(settings, "llm_cache_enabled_purposes", "evaluation, field_extraction")
+        provider = _provider()
+
+        assert isinstance(with_response_cache(provider, "field_extraction"), CachedLLMProvider)
+        assert with_response_cache(provider, "survey_generation") is provider
+        assert with_response_cache(provider, None) is provider
+
+    def test_disk_backend_evicts_least_recently_used(self, tmp_path):
+        backend = _DiskBackend(str(tmp_path), ttl_seconds=60, max_bytes=250)
+        backend.set("a", b"x" * 100)
+        backend.set("b", b"y" * 100)
+        past = time.time() - 30
+        os.utime(backend._path("a"), (past, past))
+        backend.set("c", b"z" * 100)
+
+        assert backend.get("a") is None
+        assert backend.get("b") == b"y" * 100
+        assert backend.get("c") == b"z" * 100
+
+    def test_disk_backend_tracks_size_without_rescanning(self, tmp_path, monkeypatch):
+        backend = _DiskBackend(str(tmp_path), ttl_seconds=60, max_bytes=1000)
+        backend.set("a", b"x" * 100)
+        scans = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or real_scandir(path))
+
+        backend.set("b", b"y" * 100)
+        backend.set("a", b"x" * 50)  # Overwrite replaces the old entry's size
+
+        assert scans == []
+        assert backend._total_bytes == 150
+        backend.set("c", b"z" * 900)
+        assert len(scans) == 1 and backend._total_bytes <= 1000
@@ -0,0 +1,106 @@
+"""
+Unit tests for rule-based pillar scoring.
+Covers the one-pass feature table and the cached pillar rules.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.pillar_scoring_service import (
+    PillarScoringService,
+    extract_survey_features,
+    invalidate_pillar_rules_cache,
+)
+
+
+def _rule(category, description):
+    return MagicMock(id=description, category=category, rule_description=description, rule_content={"priority": "high"})
+
+
+@pytest.fixture(autouse=True)
+def clear_rules_cache():
+    invalidate_pillar_rules_cache()
+    yield
+    invalidate_pillar_rules_cache()
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    db.query.return_value.filter.return_value.all.return_value = [
+        _rule("content_validity", "Questions must address the research objective"),
+        _rule("clarity_comprehensibility", "Avoid technical jargon"),
+        _rule("deployment_readiness", "Survey must have an appropriate length"),
+    ]
+    return db
+
+
+@pytest.fixture
+def sectioned_survey():
+    return {
+        "sections": [
+            {"id": 1, "questions": [
+                {"text": "Are you eligible to take part?", "type": "single_choice", "options": ["Yes", "No"]},
+                {"text": "What is your main goal when shopping?", "type": "open_ended"},
+            ]},
+            {"id": 2, "questions": [
+                {"text": "How does our API compare, on a scale of 1-5?", "type": "scale"},
+                {"text": "Do you like price and quality?", "type": "multiple_choice", "options": ["A", "B", "C"]},
+            ]},
+        ]
+    }
+
+
+class TestSurveyFeatures:
+    """Test suite for extract_survey_features"""
+
+    def test_single_pass_extracts_layout_types_and_keywords(self, sectioned_survey):
+        features = extract_survey_features(sectioned_survey)
+
+        assert features.question_count == 4
+        assert features.section_count == 2
+        assert features.question_types == {"single_choice", "open_ended", "scale", "multiple_choice"}
+        assert features.option_counts == [2, 3]
+        assert features.response_types == {"multiple_choice", "scale"}
+        assert features.double_barreled_count == 1
+        assert features.keyword_hits["eligible"] == 1
+        assert features.keyword_hits["api"] == 1
+        assert features.has_keyword("goal")
+        assert not features.has_keyword("privacy")
+
+    def test_legacy_questions_and_empty_surveys(self):
+        assert extract_survey_features({"questions": [{"text": "Q", "type": "text"}]}).question_count == 1
+        assert extract_survey_features(None).question_count == 0
+
+
+class TestPillarScoringService:
+    """Test suite for PillarScoringService"""
+
+    def test_rules_for_all_pillars_load_with_one_query(self, mock_db, sectioned_survey):
+        service = PillarScoringService(mock_db)
+
+        service.evaluate_survey_pillars(sectioned_survey)
+        service.evaluate_survey_pillars(sectioned_survey)
+
+        assert mock_db.query.call_count == 1
+
+    def test_rules_are_evaluated_against_features(self, mock_db, sectioned_survey):
+        result = PillarScoringService(mock_db).evaluate_survey_pillars(sectioned_survey)
+        scores = {pillar.pillar_name: pillar for pillar in result.pillar_scores}
+
+        assert scores["content_validity"].criteria_met == 1
+        assert scores["clarity_comprehensibility"].criteria_met == 0  # "API" is jargon
+        assert "Replace technical jargon with simple, clear language" in scores["clarity_comprehensibility"].recommendations
+        assert scores["deployment_readiness"].recommendations == [
+            "Adjust survey length (current: 4 questions, recommended: 5-25)"
+        ]
+        assert scores["methodological_rigor"].total_criteria == 0
+
+    def test_invalidation_reloads_rules(self, mock_db, sectioned_survey):
+        service = PillarScoringService(mock_db)
+        service.evaluate_survey_pillars(sectioned_survey)
+
+        invalidate_pillar_rules_cache()
+        service.evaluate_survey_pillars(sectioned_survey)
+
+        assert mock_db.query.call_count == 2
@@ -0,0 +1,126 @@
+"""
+Unit tests for the WebSocket progress bus.
+Covers per-connection writers, slow-client isolation, progress coalescing and full-queue eviction.
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.services.progress_bus import ProgressBus
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.release = asyncio.Event()
+        if delay == 0:
+            self.release.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        await self.release.wait()
+        self.sent.append(json.loads(payload))
+
+
+async def _drain():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestProgressBus:
+    """Test suite for ProgressBus in-memory delivery"""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_fast_client(self):
+        bus = ProgressBus(max_pending=10, send_timeout=5)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=1)
+        await bus.connect(fast, "wf")
+        await bus.connect(slow, "wf")
+
+        await bus.send_progress("wf", {"type": "progress", "percent": 10})
+        await _drain()
+
+        assert fast.sent == [{"type": "progress", "percent": 10}]
+        assert slow.sent == []
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_pending_progress_is_coalesced_but_terminal_messages_kept(self):
+        bus = ProgressBus(max_pending=10, send_timeout=5)
+        slow = FakeWebSocket(delay=1)
+        await bus.connect(slow, "wf")
+
+        await bus.send_progress("wf", {"type": "progress", "percent": 10})
+        await _drain()  # first message is now in-flight on the blocked socket
+        for percent in (20, 30, 40):
+            await bus.send_progress("wf", {"type": "progress", "percent": percent})
+        await bus.send_progress("wf", {"type": "completed", "survey_id": "s1"})
+
+        slow.release.set()
+        await _drain()
+
+        assert [m.get("percent") for m in slow.sent] == [10, 40, None]
+        assert slow.sent[-1]["type"] == "completed"
+        assert bus.get_stats()["coalesced_messages"] == 2
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_coalescing_is_per_message_type(self):
+        bus = ProgressBus(max_pending=10, send_timeout=5)
+        slow = FakeWebSocket(delay=1)
+        await bus.connect(slow, "wf")
+
+        await bus.send_progress("wf", {"type": "progress", "percent": 10})
+        await _drain()
+        await bus.send_progress("wf", {"type": "llm_content_update", "streamingStats": {"chars": 100}})
+        await bus.send_progress("wf", {"type": "progress", "percent": 20})
+        await bus.send_progress("wf", {"type": "llm_content_update", "streamingStats": {"chars": 200}})
+
+        slow.release.set()
+        await _drain()
+
+        assert [m["type"] for m in slow.sent] == ["progress", "progress", "llm_content_update"]
+        assert slow.sent[1]["percent"] == 20
+        assert slow.sent[2]["streamingStats"] == {"chars": 200}
+        assert bus.get_stats()["coalesced_messages"] == 1
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_evicts_snapshots_and_keeps_terminal_messages(self):
+        bus = ProgressBus(max_pending=2, send_timeout=5)
+        slow = FakeWebSocket(delay=1)
+        await bus.connect(slow, "wf")
+
+        await bus.send_progress("wf", {"type": "progress", "percent": 10})
+        await _drain()  # first message is now in-flight on the blocked socket
+        await bus.send_progress("wf", {"type": "error", "message": "step failed"})
+        await bus.send_progress("wf", {"type": "progress", "percent": 20})
+        await bus.send_progress("wf", {"type": "completed", "survey_id": "s1"})  # Evicts the pending progress
+        await bus.send_progress("wf", {"type": "llm_content_update", "streamingStats": {"chars": 100}})  # Nothing evictable
+
+        slow.release.set()
+        await _drain()
+
+        assert [m["type"] for m in slow.sent] == ["progress", "error", "completed"]
+        assert bus.get_stats()["dropped_messages"] == 2
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_socket_is_disconnected(self):
+        bus = ProgressBus(max_pending=10, send_timeout=5)
+        broken = FakeWebSocket(fail=True)
+        await bus.connect(broken, "wf")
+
+        await bus.send_progress("wf", {"type": "error", "message": "boom"})
+        await _drain()
+
+        assert "wf" not in bus.active_connections
+        assert bus.get_stats()["connections"] == 0
+        await bus.stop()
@@ -0,0 +1,59 @@
+"""
+Unit tests for prompt token budgeting.
+Covers priority-ordered trimming, minimum shares and per-module usage reporting.
+"""
+from src.services.prompt_builder import ExampleModule, PromptModule, PromptSection
+from src.services.prompt_token_budget import PromptTokenBudgeter, TokenCounter
+
+
+def make_modules():
+    golden_questions = [
+        {"question_text": f"How satisfied are you with feature {i}? " * 5, "question_type": "scale", "quality_score": 0.9}
+        for i in range(8)
+    ]
+    inputs = PromptModule("MODULE 2: INPUTS", 2, [PromptSection("rfq_input", ["# 2.1 RFQ", "x" * 2000], order=2.1)])
+    instructions = PromptModule("MODULE 3: INSTRUCTIONS", 3, [
+        PromptSection("mandatory_quality", ["# 3.1 MANDATORY", "y" * 1200], order=3.1),
+        PromptSection("3.5 Additional Feedback from Reviews", ["# 3.5 FEEDBACK", ""] + ["z" * 200] * 10, order=3.5),
+    ])
+    examples = ExampleModule.build([], None, golden_questions)
+    return [inputs, instructions, examples]
+
+
+class TestPromptTokenBudgeter:
+    """Test suite for PromptTokenBudgeter"""
+
+    def test_under_budget_prompt_is_unchanged_and_reported(self):
+        modules = make_modules()
+        counter = TokenCounter("test/model")
+
+        report = PromptTokenBudgeter(counter, budget_tokens=100000).fit(modules)
+
+        assert report["tokens_after"] == report["tokens_before"]
+        assert report["tokenizer"] == "estimate"
+        assert all(not usage["trimmed_sections"] for usage in report["modules"].values())
+
+    def test_examples_are_trimmed_before_instructions(self):
+        modules = make_modules()
+        counter = TokenCounter("test/model")
+        total = sum(counter.count(module.format_output()) for module in modules)
+
+        report = PromptTokenBudgeter(counter, budget_tokens=total - 200).fit(modules)
+
+        examples = report["modules"][modules[2].name]
+        assert examples["trimmed_sections"] == ["golden_questions"]
+        assert report["modules"][modules[1].name]["trimmed_sections"] == []
+        assert report["tokens_after"] <= total - 200
+        golden_questions = next(s for s in modules[2].sections if s.title == "golden_questions")
+        assert golden_questions.content[0] == "# 4.2 EXPERT QUESTION EXAMPLES"
+        assert "omitted to fit the prompt token budget" in golden_questions.content[-1]
+
+    def test_feedback_digest_trimmed_once_examples_reach_minimum_share(self):
+        modules = make_modules()
+        counter = TokenCounter("test/model")
+
+        report = PromptTokenBudgeter(counter, budget_tokens=1500).fit(modules)
+
+        assert "3.5 Additional Feedback from Reviews" in report["modules"][modules[1].name]["trimmed_sections"]
+        # Inputs have no trimmable sections and are never cut
+        assert report["modules"][modules[0].name]["tokens_after"] == report["modules"][modules[0].name]["tokens"]
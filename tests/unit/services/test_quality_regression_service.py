@@ -0,0 +1,107 @@
+"""
+Unit tests for the quality regression service.
+Covers streaming (Welford) baselines and regression detection from SQL window aggregates.
+"""
+import uuid
+from datetime import datetime, timedelta
+from statistics import mean, stdev
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database.quality_models import QualityBaselines, QualityMetrics as QualityMetricsDB
+from src.services.quality_regression_service import QualityRegressionService, welford_update
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    query = db.query.return_value
+    query.filter.return_value = query
+    query.order_by.return_value = query
+    query.limit.return_value = query
+    query.with_for_update.return_value = query
+    return db
+
+
+def make_survey_data(score):
+    return {
+        "survey_id": str(uuid.uuid4()),
+        "pillar_scores": {"overall_grade": "B", "weighted_score": score, "pillar_breakdown": []},
+        "survey": {"confidence_score": 0.0, "sections": []},
+    }
+
+
+class TestWelfordUpdate:
+    """Test suite for welford_update"""
+
+    def test_streaming_matches_full_recompute(self):
+        values = [0.72, 0.81, 0.64, 0.9, 0.77, 0.85, 0.7]
+
+        running = (0.0, 0.0, 0)
+        for value in values:
+            running = welford_update(*running, value)
+
+        assert running[0] == pytest.approx(mean(values))
+        assert running[1] == pytest.approx(stdev(values))
+        assert running[2] == len(values)
+
+
+class TestQualityRegressionService:
+    """Test suite for QualityRegressionService"""
+
+    @pytest.mark.asyncio
+    async def test_recording_persists_row_and_updates_baseline_in_place(self, mock_db):
+        started = datetime.utcnow() - timedelta(days=3)
+        baseline = QualityBaselines(
+            metric_name="overall_score", baseline_value=0.8, baseline_std=0.1, sample_size=10,
+            period_days=3, period_start=started, period_end=started, is_active=True
+        )
+        mock_db.query.return_value.all.return_value = [baseline]
+        # error_rate had no active baseline yet, so the seeding insert creates it from this sample
+        mock_db.execute.return_value.scalars.return_value = ["error_rate"]
+
+        await QualityRegressionService(mock_db).record_quality_metrics(
+            make_survey_data(0.69), {"generation_time_seconds": 0.0, "workflow_id": "wf-1"}
+        )
+
+        stored = [call.args[0] for call in mock_db.add.call_args_list]
+        assert len(stored) == 1 and isinstance(stored[0], QualityMetricsDB) and stored[0].weighted_score == 0.69
+        seed = mock_db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (metric_name) WHERE is_active DO NOTHING" in str(seed)
+        assert {seed.params["metric_name_m0"], seed.params["metric_name_m1"]} == {"overall_score", "error_rate"}
+        expected = welford_update(0.8, 0.1, 10, 0.69)
+        assert (baseline.baseline_value, baseline.baseline_std, baseline.sample_size) == pytest.approx(expected)
+        # Runs in a savepoint of the caller's session and leaves commit/rollback to the caller
+        mock_db.begin_nested.assert_called_once()
+        mock_db.commit.assert_not_called()
+        mock_db.rollback.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_detection_uses_window_aggregates_not_raw_rows(self, mock_db):
+        mock_db.query.return_value.one.return_value = SimpleNamespace(
+            total=12,
+            overall_score_mean=0.6, overall_score_count=12,
+            generation_time_mean=None, generation_time_count=0,
+            golden_similarity_mean=None, golden_similarity_count=0,
+            confidence_score_mean=None, confidence_score_count=0,
+            error_rate_mean=0.0, error_rate_count=12,
+        )
+        baseline_rows = [
+            SimpleNamespace(metric_name="overall_score", baseline_value=0.85, baseline_std=0.05,
+                            sample_size=200, created_at=datetime.utcnow(), period_days=30),
+            SimpleNamespace(metric_name="error_rate", baseline_value=0.0, baseline_std=0.0,
+                            sample_size=200, created_at=datetime.utcnow(), period_days=30),
+        ]
+        survey_ids = [SimpleNamespace(survey_id=uuid.uuid4()) for _ in range(3)]
+        mock_db.query.return_value.all.side_effect = [baseline_rows, survey_ids]
+
+        alerts = await QualityRegressionService(mock_db).detect_regressions(lookback_hours=6)
+
+        assert [(a.metric_name, a.regression_severity) for a in alerts] == [("overall_score", "severe")]
+        assert alerts[0].current_value == pytest.approx(0.6)
+        assert alerts[0].survey_ids == [str(row.survey_id) for row in survey_ids]
+        # No full quality_metrics rows are loaded
+        assert not any(call.args[0] is QualityMetricsDB for call in mock_db.query.call_args_list)
@@ -0,0 +1,85 @@
+"""
+Unit tests for the quality trend rollup.
+Covers SQL-side bucketing and the incremental rollup into QualityTrendAggregates.
+"""
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from src.database.quality_models import QualityTrendAggregates
+from src.services.quality_rollup_service import (
+    AGGREGATION_LEVELS,
+    METRIC_COLUMNS,
+    QualityRollupService,
+    aggregate_metric_buckets,
+    truncate_to_bucket,
+)
+
+
+def make_bucket(hour):
+    return {
+        "bucket": datetime(2026, 3, 1, hour), "avg": 0.8, "min": 0.7, "max": 0.9, "std": 0.05,
+        "count": 4, "p50": 0.8, "p90": 0.88, "p95": 0.89, "p99": 0.9,
+    }
+
+
+class TestAggregateMetricBuckets:
+    """Test suite for aggregate_metric_buckets"""
+
+    def test_bucketing_and_percentiles_run_in_sql(self):
+        db = MagicMock()
+        db.execute.return_value = []
+
+        aggregate_metric_buckets(db, "overall_score", datetime(2026, 3, 1), "hour", end=datetime(2026, 3, 2))
+
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "date_trunc" in sql
+        assert "percentile_cont" in sql and "WITHIN GROUP" in sql
+        assert "GROUP BY" in sql
+        assert "quality_metrics.weighted_score" in sql
+
+    def test_unknown_metric_or_level_returns_nothing(self):
+        db = MagicMock()
+
+        assert aggregate_metric_buckets(db, "unknown_metric", datetime(2026, 3, 1)) == []
+        assert aggregate_metric_buckets(db, "overall_score", datetime(2026, 3, 1), "minute") == []
+        db.execute.assert_not_called()
+
+
+class TestQualityRollupService:
+    """Test suite for QualityRollupService"""
+
+    def test_rollup_resumes_from_newest_stored_bucket(self):
+        db = MagicMock()
+        db.execute.return_value.scalar.return_value = True  # Advisory lock acquired
+        db.query.return_value.filter.return_value.scalar.return_value = datetime(2026, 3, 1, 10)
+        now = datetime(2026, 3, 1, 12, 30)
+
+        with patch(
+            "src.services.quality_rollup_service.aggregate_metric_buckets",
+            return_value=[make_bucket(10), make_bucket(11), make_bucket(12)],
+        ) as aggregate:
+            written = QualityRollupService(db).rollup(now=now, backfill_days=30)
+
+        assert written == 3 * len(METRIC_COLUMNS) * len(AGGREGATION_LEVELS)
+        first_call = aggregate.call_args_list[0]
+        assert first_call.args[2] == datetime(2026, 3, 1, 10)  # Partial bucket is recomputed
+        assert first_call.kwargs["end"] == now
+        added = db.add_all.call_args_list[0].args[0]
+        assert all(isinstance(row, QualityTrendAggregates) for row in added)
+        assert [row.date.hour for row in added] == [10, 11, 12]
+        db.commit.assert_called_once()
+
+    def test_rollup_skips_when_another_process_holds_the_lock(self):
+        db = MagicMock()
+        db.execute.return_value.scalar.return_value = False
+
+        assert QualityRollupService(db).rollup(now=datetime(2026, 3, 1)) == 0
+        db.add_all.assert_not_called()
+
+    def test_backfill_start_is_aligned_to_bucket(self):
+        moment = datetime(2026, 3, 1, 10, 42, 7)
+
+        assert truncate_to_bucket(moment, "hour") == datetime(2026, 3, 1, 10)
+        assert truncate_to_bucket(moment, "day") == datetime(2026, 3, 1)
@@ -0,0 +1,87 @@
+"""
+Unit tests for the retrieval prefetch service.
+Covers content-hash lookups, reuse of cached context and replacement of in-flight draft prefetches.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.services.retrieval_prefetch_service import RetrievalPrefetchService
+
+
+@pytest.fixture
+def mock_retrieval():
+    retrieval = MagicMock()
+    retrieval.retrieve_golden_pairs = AsyncMock(return_value=[{"id": "11111111-1111-1111-1111-111111111111"}])
+    retrieval.retrieve_golden_sections = AsyncMock(return_value=[])
+    retrieval.retrieve_golden_questions = AsyncMock(return_value=[{"id": "22222222-2222-2222-2222-222222222222"}])
+    retrieval.get_feedback_digest = AsyncMock(return_value={"feedback_digest": "Keep questions short", "total_feedback_count": 1})
+    retrieval.retrieve_methodology_blocks = AsyncMock(return_value=[{"methodology": "conjoint"}])
+    retrieval.retrieve_template_questions = AsyncMock(return_value=[])
+    return retrieval
+
+
+@pytest.fixture
+def service(mock_retrieval):
+    service = RetrievalPrefetchService()
+    service.enabled = True
+    service.embedding_service = MagicMock(get_embedding=AsyncMock(return_value=[0.1, 0.2, 0.3]))
+    with patch("src.services.cache_service.cache_service", MagicMock(get=MagicMock(return_value=None))), \
+         patch("src.database.get_db", side_effect=lambda: iter([MagicMock()])), \
+         patch("src.services.retrieval_service.RetrievalService", return_value=mock_retrieval):
+        yield service
+
+
+class TestRetrievalPrefetchService:
+    """Test suite for RetrievalPrefetchService"""
+
+    @pytest.mark.asyncio
+    async def test_prefetched_context_is_reused_for_matching_rfq(self, service, mock_retrieval):
+        await service.prefetch("Survey of EV buyers", industry="automotive", research_goal="pricing", product_category="cars")
+
+        assert service.get_embedding("Survey of EV buyers") == [0.1, 0.2, 0.3]
+        context = service.get_context("Survey of EV buyers", "automotive", "pricing", "cars")
+        assert context["golden_examples"] == [{"id": "11111111-1111-1111-1111-111111111111"}]
+        assert context["feedback_digest"]["feedback_digest"] == "Keep questions short"
+        assert context["methodology_blocks"] == [{"methodology": "conjoint"}]
+        mock_retrieval.retrieve_golden_pairs.assert_awaited_once_with(
+            embedding=[0.1, 0.2, 0.3], methodology_tags=None, industry="automotive", limit=3
+        )
+
+    @pytest.mark.asyncio
+    async def test_changed_rfq_fields_miss_the_cache(self, service):
+        await service.prefetch("Survey of EV buyers", industry="automotive", research_goal="pricing")
+
+        assert service.get_embedding("Survey of EV buyers, revised") is None
+        assert service.get_context("Survey of EV buyers", "energy", "pricing", None) is None
+        assert service.get_context("Survey of EV buyers", "automotive", "awareness", None) is None
+
+    @pytest.mark.asyncio
+    async def test_unchanged_draft_is_not_recomputed(self, service, mock_retrieval):
+        await service.prefetch("Survey of EV buyers", research_goal="pricing")
+        await service.prefetch("Survey of EV buyers", research_goal="pricing")
+        await service.prefetch("Survey of EV buyers", research_goal="awareness")
+
+        service.embedding_service.get_embedding.assert_awaited_once()
+        assert mock_retrieval.retrieve_golden_pairs.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_new_draft_save_replaces_running_prefetch(self, service):
+        release = asyncio.Event()
+
+        async def slow_embedding(text):
+            await release.wait()
+            return [0.5]
+
+        service.embedding_service.get_embedding = slow_embedding
+        first = service.schedule("rfq-1", rfq_text="First draft")
+        await asyncio.sleep(0)
+        second = service.schedule("rfq-1", rfq_text="Second draft")
+        release.set()
+        await asyncio.gather(first, second, return_exceptions=True)
+
+        assert first.cancelled()
+        assert service.get_context("Second draft", None, None, None) is not None
+        assert service.get_metrics()["cancelled"] == 1
+        assert service.get_metrics()["inflight"] == 0
@@ -0,0 +1,126 @@
+"""
+Unit tests for parallel section-level regeneration.
+Covers concurrency limits, streaming splices, failure handling and per-section prompts.
+"""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.prompt_builder import PromptBuilder
+from src.services.section_regeneration_service import SectionRegenerationService
+from src.workflows.state import RegenerationMode
+
+
+def _previous_survey():
+    return {
+        "title": "Pricing Study",
+        "sections": [
+            {"id": section_id, "title": f"Section {section_id}", "questions": [{"id": f"S{section_id}Q01", "text": "Old"}]}
+            for section_id in range(1, 6)
+        ],
+    }
+
+
+class FakeGenerationService:
+    """Returns a regenerated section after a per-section delay and tracks concurrency"""
+
+    def __init__(self, delays, fail_section=None):
+        self.delays = delays
+        self.fail_section = fail_section
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_section(self, context, section_id):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays[section_id])
+            if section_id == self.fail_section:
+                raise RuntimeError(f"section {section_id} failed")
+            return {
+                "section": {"id": section_id, "title": f"New {section_id}", "questions": [{"id": "x", "text": "New"}]},
+                "comments_addressed": [f"COMMENT-S{section_id}-V1"],
+            }
+        finally:
+            self.active -= 1
+
+
+class TestSectionRegenerationService:
+    """Test suite for SectionRegenerationService"""
+
+    @pytest.mark.asyncio
+    async def test_sections_are_spliced_in_completion_order(self):
+        generation_service = FakeGenerationService({2: 0.03, 4: 0.01, 5: 0.02})
+        on_section = AsyncMock()
+
+        survey = await SectionRegenerationService(generation_service, max_concurrency=3).regenerate_sections(
+            {"previous_survey_json": _previous_survey()}, [2, 4, 5], on_section=on_section
+        )
+
+        assert [call.args[0]["id"] for call in on_section.await_args_list] == [4, 5, 2]
+        assert [call.args[1:] for call in on_section.await_args_list] == [(1, 3), (2, 3), (3, 3)]
+        assert [s["title"] for s in survey["sections"]] == ["Section 1", "New 2", "Section 3", "New 4", "New 5"]
+        assert sorted(survey["comments_addressed"]) == ["COMMENT-S2-V1", "COMMENT-S4-V1", "COMMENT-S5-V1"]
+        assert generation_service.max_active == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        generation_service = FakeGenerationService({1: 0.01, 2: 0.01, 3: 0.01, 4: 0.01})
+
+        await SectionRegenerationService(generation_service, max_concurrency=2).regenerate_sections(
+            {"previous_survey_json": _previous_survey()}, [1, 2, 3, 4]
+        )
+
+        assert generation_service.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_section_fails_regeneration(self):
+        generation_service = FakeGenerationService({1: 0.01, 2: 0.5}, fail_section=1)
+
+        with pytest.raises(RuntimeError, match="section 1 failed"):
+            await SectionRegenerationService(generation_service, max_concurrency=2).regenerate_sections(
+                {"previous_survey_json": _previous_survey()}, [1, 2]
+            )
+
+        await asyncio.sleep(0)
+        assert generation_service.active == 0
+
+
+class TestSectionRegenerationPrompt:
+    """Test suite for PromptBuilder.build_section_regeneration_prompt"""
+
+    def test_prompt_only_carries_feedback_for_its_section(self):
+        previous = _previous_survey()
+        context = {
+            "rfq_details": {"text": "Pricing study RFQ"},
+            "previous_survey_json": previous,
+            "previous_survey_encoded": {"summary": "Survey with 5 sections", "sections": []},
+            "regeneration_mode_type": RegenerationMode.SURGICAL,
+            "surgical_analysis": {
+                "sections_to_regenerate": [2, 4],
+                "sections_to_preserve": [1, 3, 5],
+                "regeneration_rationale": {2: ["Screener too long"], 4: ["Concept unclear"]},
+                "regeneration_percentage": 40.0,
+            },
+            "annotation_feedback_summary": {
+                "section_feedback": {"sections_with_feedback": [
+                    {"section_id": 2, "comments": [{"comment": "Shorten screener", "quality": 2, "version": 1}]},
+                    {"section_id": 4, "comments": [{"comment": "Clarify concept", "quality": 2, "version": 1}]},
+                ]},
+                "question_feedback": {"questions_with_feedback": [
+                    {"question_id": "S2Q01", "comments": [{"comment": "Ambiguous age bands", "quality": 2, "version": 1}]},
+                    {"question_id": "S4Q01", "comments": [{"comment": "Missing price point", "quality": 2, "version": 1}]},
+                ]},
+            },
+        }
+
+        prompt = PromptBuilder().build_section_regeneration_prompt(context, 2)
+
+        assert "Screener too long" in prompt
+        assert "Shorten screener" in prompt
+        assert "Ambiguous age bands" in prompt
+        assert "Concept unclear" not in prompt
+        assert "Clarify concept" not in prompt
+        assert "Missing price point" not in prompt
+        assert "Survey with 5 sections" in prompt
@@ -273,3 +273,66 @@ class TestSurveyDiffService:
         assert len(preserved_questions) == 2, \
             f"Should have 2 preserved questions, got {len(preserved_questions)}"
 
+
+    def test_survey_index_maps_questions_to_sections(self):
+        """
+        Test that the per-survey index assigns section IDs by question position
+        and keeps the first section for a duplicated section ID.
+        """
+        survey = {
+            "sections": [
+                {"id": 1, "title": "Intro", "questions": [{"id": "q1", "text": "A"}, {"id": "q2", "text": "B"}]},
+                {"id": 2, "title": "Empty", "questions": []},
+                {"id": 3, "title": "Usage", "questions": [{"id": "q3", "text": "C"}]},
+                {"id": 3, "title": "Usage (duplicate)", "questions": []}
+            ]
+        }
+        legacy_survey = {"questions": [{"id": "q1", "text": "A"}, {"id": "q2", "text": "B"}]}
+
+        diff_service = SurveyDiffService()
+        index = diff_service._build_survey_index(survey)
+        legacy_index = diff_service._build_survey_index(legacy_survey)
+
+        assert [q["id"] for q in index["questions"]] == ["q1", "q2", "q3"]
+        assert index["question_section_ids"] == [1, 1, 3]
+        assert index["sections_by_id"][3]["title"] == "Usage"
+        assert legacy_index["question_section_ids"] == [None, None]
+        assert legacy_index["sections_by_id"] == {}
+
+    def test_large_diff_extracts_questions_once_per_survey(self, monkeypatch):
+        """
+        Test that diffing two 300-question versions indexes each survey once
+        and passes the extracted questions through to the comparison.
+        """
+        import src.services.survey_diff_service as survey_diff_module
+
+        def build(revision):
+            return {
+                "sections": [
+                    {
+                        "id": section_id,
+                        "title": f"Section {section_id}",
+                        "questions": [
+                            {"id": f"q{i}", "text": f"How do you rate feature {i} {'now' if revision and i % 3 == 0 else ''}", "type": "rating"}
+                            for i in range(section_id * 30, section_id * 30 + 30)
+                        ]
+                    }
+                    for section_id in range(10)
+                ]
+            }
+
+        extract_calls = []
+        original_extract = survey_diff_module.extract_all_questions
+        monkeypatch.setattr(
+            survey_diff_module, "extract_all_questions",
+            lambda survey: extract_calls.append(1) or original_extract(survey)
+        )
+
+        diff_result = SurveyDiffService().compute_diff(build(1), build(0))
+
+        assert len(extract_calls) == 2
+        assert diff_result["summary"]["total_questions_1"] == 300
+        assert len(diff_result["sections"]) == 10
+        by_id = {q["id"]: q for q in diff_result["questions"] if q["status"] != "removed"}
+        assert by_id["q45"]["section_id"] == 1
+        assert by_id["q299"]["section_id"] == 9
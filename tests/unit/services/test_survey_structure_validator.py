@@ -0,0 +1,81 @@
+"""
+Unit tests for the survey structure validator.
+Covers the single-pass traversal and reuse of labels detected earlier in the workflow.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.survey_structure_validator import SurveyStructureValidator
+
+SURVEY = {
+    "id": "survey-1",
+    "sections": [
+        {
+            "id": 3,
+            "title": "Brand/Product Awareness",
+            "questions": [
+                {"id": "q1", "text": "How satisfied are you with the brand?", "type": "scale", "options": ["1", "2", "3"]},
+                {"id": "q2", "text": "Which brands are you aware of?", "type": "multiple_choice", "options": ["A", "B"]},
+            ],
+        },
+        {
+            "id": 5,
+            "title": "Methodology",
+            "questions": [
+                {"id": "q3", "text": "Which brand position fits best?", "type": "single_choice"},
+            ],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def validator():
+    validator = SurveyStructureValidator(MagicMock())
+    validator.qnr_service = MagicMock()
+    validator.qnr_service.get_required_labels.return_value = [
+        {"name": "Brand_Awareness_Funnel", "description": "Funnel grid"},
+        {"name": "Product_Satisfaction", "description": "Satisfaction rating"},
+    ]
+    return validator
+
+
+class TestSurveyStructureValidator:
+    """Test suite for SurveyStructureValidator"""
+
+    @pytest.mark.asyncio
+    async def test_precomputed_labels_skip_detection(self, validator):
+        with patch.object(validator.detector, "detect_labels_in_question") as detect_question, \
+                patch.object(validator.detector, "detect_labels_in_section_text") as detect_text:
+            report = await validator.validate_structure(
+                SURVEY, {"methodology_tags": []},
+                detected_labels={"3": ["Brand_Awareness_Funnel"], "5": []}
+            )
+
+        detect_question.assert_not_called()
+        detect_text.assert_not_called()
+        assert report.detected_labels == {3: {"Brand_Awareness_Funnel"}, 5: set()}
+        assert report.missing_required_labels[3] == ["Product_Satisfaction"]
+
+    @pytest.mark.asyncio
+    async def test_sections_missing_from_precomputed_labels_are_detected(self, validator):
+        report = await validator.validate_structure(
+            SURVEY, {"methodology_tags": []}, detected_labels={"5": []}
+        )
+
+        expected = validator.detector.detect_labels_in_section(SURVEY["sections"][0])
+        assert report.detected_labels[3] == expected
+        assert report.detected_labels[5] == set()
+
+    @pytest.mark.asyncio
+    async def test_rule_issues_keep_their_order(self, validator):
+        report = await validator.validate_structure(SURVEY, {"methodology_tags": []}, detected_labels={})
+
+        rule_labels = [issue.label for issue in report.issues if issue.label not in ("Brand_Awareness_Funnel", "Product_Satisfaction")]
+        assert rule_labels == [
+            "Satisfaction_Scale_Format",
+            "Satisfaction_Scale_Labels",
+            "Positioning_In_Methodology",
+            "Brand_Awareness_Funnel_Format",
+        ]
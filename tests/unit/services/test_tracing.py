@@ -0,0 +1,95 @@
+"""
+Unit tests for in-process tracing.
+Covers span nesting, percentile stats, the OTLP file exporter and DB instrumentation.
+"""
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.services.tracing import OTLPFileExporter, Tracer, instrument_sqlalchemy, traced, tracer
+
+
+class TestTracer:
+    """Test suite for Tracer"""
+
+    @pytest.mark.asyncio
+    async def test_spans_nest_across_threads(self):
+        local_tracer = Tracer()
+
+        def db_work():
+            with local_tracer.span("db.select"):
+                pass
+
+        with local_tracer.span("workflow.run") as root:
+            with local_tracer.span("workflow.node.generate") as node:
+                await asyncio.to_thread(db_work)
+
+        spans = {span.name: span for span in local_tracer.get_spans()}
+        assert spans["db.select"].parent_id == node.span_id
+        assert spans["workflow.node.generate"].parent_id == root.span_id
+        assert {span.trace_id for span in spans.values()} == {root.trace_id}
+        assert [span["name"] for span in local_tracer.get_recent_traces()] == ["workflow.run"]
+
+    def test_stats_report_percentiles_per_name(self):
+        local_tracer = Tracer()
+        for duration_ms in range(1, 101):
+            with local_tracer.span("llm.survey_generation") as span:
+                pass
+            span.duration_ms = float(duration_ms)
+
+        stats = local_tracer.get_stats(window_seconds=60)["llm.survey_generation"]
+
+        assert stats["count"] == 100
+        assert (stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["max_ms"]) == (50.0, 95.0, 99.0, 100.0)
+
+    def test_require_parent_skips_spans_outside_a_trace(self):
+        local_tracer = Tracer()
+
+        local_tracer.start_span("db.select", require_parent=True).end()
+
+        assert local_tracer.get_spans() == []
+
+    @pytest.mark.asyncio
+    async def test_traced_decorator_records_errors(self):
+        @traced("embedding.get_embedding")
+        async def failing():
+            raise RuntimeError("model not loaded")
+
+        tracer.clear()
+        with pytest.raises(RuntimeError):
+            await failing()
+
+        span = tracer.get_spans()[-1]
+        assert span.name == "embedding.get_embedding"
+        assert span.error == "RuntimeError: model not loaded"
+
+    def test_exporter_writes_otlp_request_per_finished_trace(self, tmp_path):
+        export_path = tmp_path / "traces.jsonl"
+        local_tracer = Tracer(exporter=OTLPFileExporter(str(export_path)))
+
+        with local_tracer.span("workflow.run", workflow_id="wf-1"):
+            with local_tracer.span("workflow.node.parse_rfq"):
+                pass
+
+        lines = export_path.read_text().splitlines()
+        assert len(lines) == 1
+        spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [span["name"] for span in spans] == ["workflow.node.parse_rfq", "workflow.run"]
+        assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+        assert {"key": "workflow_id", "value": {"stringValue": "wf-1"}} in spans[1]["attributes"]
+
+    def test_sqlalchemy_statements_become_child_spans(self):
+        engine = create_engine("sqlite://")
+        instrument_sqlalchemy(engine)
+        tracer.clear()
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            with tracer.span("workflow.node.retrieve_golden") as node:
+                connection.execute(text("SELECT 2"))
+
+        db_spans = [span for span in tracer.get_spans() if span.name == "db.select"]
+        assert len(db_spans) == 1
+        assert db_spans[0].parent_id == node.span_id
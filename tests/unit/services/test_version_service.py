@@ -0,0 +1,72 @@
+"""
+Unit tests for the version service.
+Covers payload-free version projections and the recursive ancestry query.
+"""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import Survey
+from src.services.version_service import VersionService
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    query = db.query.return_value
+    query.filter.return_value = query
+    query.order_by.return_value = query
+    query.outerjoin.return_value = query
+    return db
+
+
+def selected_column_names(db):
+    return {getattr(column, "key", None) for column in db.query.call_args.args}
+
+
+class TestVersionService:
+    """Test suite for VersionService"""
+
+    def test_version_summaries_skip_survey_payloads(self, mock_db):
+        rfq_id = uuid.uuid4()
+
+        VersionService(mock_db).get_version_summaries(rfq_id)
+
+        names = selected_column_names(mock_db)
+        assert {"id", "version", "is_current", "parent_survey_id", "created_at", "overall_grade", "weighted_score"} <= names
+        assert "raw_output" not in names and "final_output" not in names
+        assert not any(column is Survey for column in mock_db.query.call_args.args)
+
+    def test_history_summaries_raise_for_unknown_survey(self, mock_db):
+        mock_db.query.return_value.first.return_value = None
+
+        with pytest.raises(ValueError, match="Survey not found"):
+            VersionService(mock_db).get_version_history_summaries(uuid.uuid4())
+
+    def test_ancestry_is_one_recursive_query(self, mock_db):
+        rows = [SimpleNamespace(version=1, depth=2), SimpleNamespace(version=2, depth=1), SimpleNamespace(version=3, depth=0)]
+        mock_db.execute.return_value.all.return_value = rows
+
+        ancestry = VersionService(mock_db).get_ancestry(uuid.uuid4())
+
+        assert ancestry == rows
+        mock_db.execute.assert_called_once()
+        mock_db.query.assert_not_called()
+        sql = str(mock_db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("WITH RECURSIVE ancestry")
+        assert "ancestry.parent_survey_id" in sql
+        assert "raw_output" not in sql and "final_output" not in sql
+
+    def test_parent_survey_loaded_with_single_join(self, mock_db):
+        parent = MagicMock(spec=Survey)
+        mock_db.query.return_value.first.return_value = (uuid.uuid4(), parent)
+
+        assert VersionService(mock_db).get_parent_survey(uuid.uuid4()) is parent
+        mock_db.query.assert_called_once()
+
+        mock_db.query.return_value.first.return_value = None
+        with pytest.raises(ValueError, match="Survey not found"):
+            VersionService(mock_db).get_parent_survey(uuid.uuid4())
@@ -0,0 +1,77 @@
+"""
+Unit tests for compact workflow checkpoints.
+Covers embedding packing, golden content stripping and rehydration on load.
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.workflow_checkpoint_service import (
+    WorkflowCheckpointService,
+    encode_state,
+    pack_embedding,
+    unpack_embedding,
+)
+from src.workflows.state import SurveyGenerationState
+
+GOLDEN_ID = "5f0c7e8a-3a43-4a4e-9a4e-2f4b3c1d0e9f"
+
+
+@pytest.fixture
+def state():
+    return SurveyGenerationState(
+        rfq_text="Pricing study for a new smartphone",
+        workflow_id="wf-1",
+        survey_id="s-1",
+        rfq_embedding=[0.25, -0.5, 1.0],
+        golden_examples=[{
+            "id": GOLDEN_ID,
+            "title": "Pricing",
+            "rfq_text": "Long RFQ text",
+            "survey_json": {"sections": [{"questions": [{"id": "q1"}]}]},
+            "similarity": 0.91,
+        }],
+        context={"survey_id": "s-1"},
+        completed_nodes=["parse_rfq", "retrieve_golden"],
+    )
+
+
+class TestWorkflowCheckpointService:
+    """Test suite for WorkflowCheckpointService"""
+
+    def test_embedding_round_trips_as_float32(self):
+        packed = pack_embedding([0.25, -0.5, 1.0])
+
+        assert len(packed) == 12
+        assert unpack_embedding(packed) == [0.25, -0.5, 1.0]
+
+    def test_encode_state_strips_embeddings_and_golden_content(self, state):
+        state_data, packed = encode_state(state)
+
+        assert "rfq_embedding" not in state_data
+        assert unpack_embedding(packed) == [0.25, -0.5, 1.0]
+        example = state_data["golden_examples"][0]
+        assert example == {"id": GOLDEN_ID, "title": "Pricing", "similarity": 0.91}
+        assert state_data["completed_nodes"] == ["parse_rfq", "retrieve_golden"]
+
+    def test_load_checkpoint_rehydrates_golden_content(self, state):
+        state_data, packed = encode_state(state)
+        checkpoint = SimpleNamespace(state_data=state_data, rfq_embedding=packed, last_node="retrieve_golden")
+        row = SimpleNamespace(id=GOLDEN_ID, rfq_text="Long RFQ text", survey_json={"sections": []})
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = checkpoint
+        db.query.return_value.filter.return_value.all.return_value = [row]
+
+        restored = WorkflowCheckpointService(db).load_checkpoint("wf-1")
+
+        assert restored.rfq_embedding == [0.25, -0.5, 1.0]
+        assert restored.golden_examples[0]["survey_json"] == {"sections": []}
+        assert restored.golden_examples[0]["similarity"] == 0.91
+        assert restored.completed_nodes == ["parse_rfq", "retrieve_golden"]
+
+    def test_load_checkpoint_returns_none_without_checkpoint(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = None
+
+        assert WorkflowCheckpointService(db).load_checkpoint("wf-missing") is None
@@ -0,0 +1,180 @@
+"""
+Unit tests for the durable workflow queue and worker dispatch.
+Covers admission control, the global concurrency limit, job execution and lease loss.
+"""
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.config import settings
+from src.database.models import Survey
+from src.services.workflow_queue_service import (
+    JOB_TYPE_RFQ,
+    WorkflowQueueFullError,
+    WorkflowQueueService,
+)
+from src.workers.workflow_worker import ClaimedJob, WorkflowWorker
+
+
+class TestWorkflowQueueService:
+    """Test suite for WorkflowQueueService"""
+
+    def test_enqueue_rejects_when_queue_is_full(self, monkeypatch):
+        monkeypatch.setattr(settings, "workflow_queue_max_depth", 5)
+        db = MagicMock()
+        db.execute.return_value.scalar.return_value = 5
+
+        with pytest.raises(WorkflowQueueFullError) as exc_info:
+            WorkflowQueueService(db).enqueue(JOB_TYPE_RFQ, "wf-1", "s-1", {"description": "d"})
+
+        assert exc_info.value.queue_depth == 5
+        db.add.assert_not_called()
+
+    def test_enqueue_adds_queued_job(self, monkeypatch):
+        monkeypatch.setattr(settings, "workflow_queue_max_depth", 5)
+        db = MagicMock()
+        db.execute.return_value.scalar.return_value = 1
+
+        job = WorkflowQueueService(db).enqueue(JOB_TYPE_RFQ, "wf-1", "s-1", {"description": "d"})
+
+        assert job.status == "queued"
+        assert job.workflow_id == "wf-1"
+        db.add.assert_called_once_with(job)
+        db.commit.assert_called_once()
+
+    def test_claim_returns_none_at_global_concurrency_limit(self, monkeypatch):
+        monkeypatch.setattr(settings, "workflow_max_concurrent", 2)
+        db = MagicMock()
+        db.execute.return_value.scalar.return_value = 2
+
+        assert WorkflowQueueService(db).claim_next("worker-a") is None
+        db.query.assert_not_called()
+        db.rollback.assert_called_once()
+
+    def test_claim_fails_job_and_survey_after_max_attempts(self, monkeypatch):
+        monkeypatch.setattr(settings, "workflow_max_concurrent", 2)
+        db = MagicMock()
+        db.execute.return_value.scalar.return_value = 0
+        job = MagicMock(workflow_id="wf-1", survey_id="s-1", status="running", attempts=3, max_attempts=3, last_error=None)
+        db.query.return_value.filter.return_value.order_by.return_value.with_for_update.return_value.first.return_value = job
+
+        claimed = WorkflowQueueService(db).claim_next("worker-a")
+
+        assert claimed is job
+        assert job.status == "failed"
+        assert job.last_error == "Worker lost the job too many times"
+        assert any(call.args[0] is Survey for call in db.query.call_args_list)
+        assert db.query.return_value.filter.return_value.update.call_args.args[0] == {Survey.status: "failed"}
+        db.commit.assert_called_once()
+
+
+class TestWorkflowWorker:
+    """Test suite for WorkflowWorker job execution"""
+
+    @pytest.mark.asyncio
+    async def test_execute_runs_job_and_marks_complete(self):
+        worker = WorkflowWorker(MagicMock(), concurrency=1, worker_id="worker-a")
+        job = ClaimedJob(
+            id="job-1",
+            workflow_id="wf-1",
+            survey_id="s-1",
+            job_type=JOB_TYPE_RFQ,
+            payload={"description": "d"},
+            created_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        )
+        worker._settle = MagicMock()
+
+        with patch("src.workers.workflow_worker.SessionLocal"), patch(
+            "src.workers.workflow_worker.run_workflow_job", new=AsyncMock(return_value=MagicMock(status="completed"))
+        ) as run_job:
+            await worker._execute(job)
+
+        run_job.assert_awaited_once()
+        worker._settle.assert_called_once_with("job-1")
+
+    @pytest.mark.asyncio
+    async def test_execute_records_workflow_failure(self):
+        worker = WorkflowWorker(MagicMock(), concurrency=1, worker_id="worker-a")
+        job = ClaimedJob(
+            id="job-1",
+            workflow_id="wf-1",
+            survey_id="s-1",
+            job_type=JOB_TYPE_RFQ,
+            payload={"description": "d"},
+            created_at=None,
+        )
+        worker._settle = MagicMock()
+
+        with patch("src.workers.workflow_worker.SessionLocal"), patch(
+            "src.workers.workflow_worker.run_workflow_job", new=AsyncMock(side_effect=RuntimeError("boom"))
+        ):
+            await worker._execute(job)
+
+        worker._settle.assert_called_once_with("job-1", "boom")
+
+    @pytest.mark.asyncio
+    async def test_exhausted_job_publishes_failure_without_running(self):
+        connection_manager = MagicMock()
+        connection_manager.broadcast_to_workflow = AsyncMock()
+        worker = WorkflowWorker(connection_manager, concurrency=1, worker_id="worker-a", poll_interval=0.01)
+        job = ClaimedJob(
+            id="job-1",
+            workflow_id="wf-1",
+            survey_id="s-1",
+            job_type=JOB_TYPE_RFQ,
+            payload={"description": "d"},
+            created_at=None,
+            status="failed",
+            last_error="Worker lost the job too many times",
+        )
+        claims = iter([job])
+
+        def claim():
+            worker._stopping = True
+            return next(claims, None)
+
+        worker._claim = claim
+        worker._execute = AsyncMock()
+
+        await asyncio.wait_for(worker.run(), timeout=2)
+
+        worker._execute.assert_not_called()
+        workflow_id, message = connection_manager.broadcast_to_workflow.await_args.args
+        assert workflow_id == "wf-1"
+        assert message["type"] == "error"
+        assert "too many times" in message["message"]
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_cancels_running_job(self, monkeypatch):
+        monkeypatch.setattr(settings, "workflow_job_heartbeat_seconds", 0.01)
+        worker = WorkflowWorker(MagicMock(), concurrency=1, worker_id="worker-a")
+        job = ClaimedJob(
+            id="job-1",
+            workflow_id="wf-1",
+            survey_id="s-1",
+            job_type=JOB_TYPE_RFQ,
+            payload={"description": "d"},
+            created_at=None,
+        )
+        worker._heartbeat = MagicMock(return_value=False)
+        worker._settle = MagicMock()
+        worker._release = MagicMock()
+        cancelled = asyncio.Event()
+
+        async def long_running_job(*args):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch("src.workers.workflow_worker.SessionLocal"), patch(
+            "src.workers.workflow_worker.run_workflow_job", new=long_running_job
+        ):
+            await asyncio.wait_for(worker._execute(job), timeout=2)
+
+        assert cancelled.is_set()
+        worker._settle.assert_not_called()
+        worker._release.assert_not_called()
@@ -0,0 +1,68 @@
+"""
+Unit tests for the logging pipeline.
+Covers JSON formatting, hot-path sampling/rate limiting and prompt redaction.
+"""
+import json
+import logging
+
+from src.config.logging_config import (
+    HotPathFilter,
+    JsonLogFormatter,
+    log_text_preview,
+    parse_sample_rates,
+)
+from src.config.settings import Settings, settings
+
+
+def _record(name="src.services.retrieval_service", level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestLoggingConfig:
+    """Test suite for the queue-based logging pipeline helpers"""
+
+    def test_json_formatter_includes_extra_fields(self):
+        entry = json.loads(JsonLogFormatter().format(_record(event="golden_retrieval_start", details={"limit": 3})))
+
+        assert entry["message"] == "hello world"
+        assert entry["logger"] == "src.services.retrieval_service"
+        assert entry["event"] == "golden_retrieval_start"
+        assert entry["details"] == {"limit": 3}
+
+    def test_sampling_keeps_every_nth_record_and_all_warnings(self):
+        hot_path = HotPathFilter(parse_sample_rates("src.services.retrieval_service=0.25"), rate_limit_per_second=0)
+
+        kept = [hot_path.filter(_record()) for _ in range(8)]
+
+        assert kept.count(True) == 2
+        assert hot_path.sampled_out == 6
+        assert hot_path.filter(_record(level=logging.WARNING))
+        assert hot_path.filter(_record(name="src.services.other"))
+
+    def test_rate_limit_is_per_logger(self):
+        hot_path = HotPathFilter({}, rate_limit_per_second=3)
+
+        kept = [hot_path.filter(_record()) for _ in range(5)]
+
+        assert kept == [True, True, True, False, False]
+        assert hot_path.filter(_record(name="src.services.embedding_service"))
+        assert hot_path.rate_limited == 2
+
+    def test_prompt_preview_is_redacted_when_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "log_prompt_bodies", True)
+        assert log_text_preview("secret prompt", 6) == "secret"
+        assert log_text_preview("secret prompt", 6, tail=True) == "prompt"
+
+        monkeypatch.setattr(settings, "log_prompt_bodies", False)
+        assert log_text_preview("secret prompt") == "<redacted 13 chars>"
+        assert log_text_preview("secret prompt", 6, tail=True) == "<redacted 13 chars>"
+
+    def test_text_format_without_sampling_by_default(self):
+        defaults = Settings.model_fields
+
+        assert defaults["log_format"].default == "text"
+        assert defaults["log_rate_limit_per_second"].default == 0
+        assert defaults["log_sample_rates"].default == ""
+        assert HotPathFilter({}, rate_limit_per_second=0).filter(_record())
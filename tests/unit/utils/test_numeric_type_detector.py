@@ -0,0 +1,65 @@
+"""
+Unit tests for numeric question type detection.
+Covers the precompiled pattern families and ordered unit extraction.
+"""
+import re
+
+import pytest
+
+from src.utils.numeric_type_detector import NumericType, NumericTypeDetector
+
+FAMILIES = [
+    ("AGE_PATTERNS", "AGE_REGEX"),
+    ("CURRENCY_PATTERNS", "CURRENCY_REGEX"),
+    ("QUANTITY_PATTERNS", "QUANTITY_REGEX"),
+    ("RATING_PATTERNS", "RATING_REGEX"),
+    ("PERCENTAGE_PATTERNS", "PERCENTAGE_REGEX"),
+    ("MEASUREMENT_PATTERNS", "MEASUREMENT_REGEX"),
+]
+
+SAMPLE_TEXTS = [
+    "What is your age?",
+    "How much would you pay, in local currency, for this product?",
+    "How many items did you purchase last month?",
+    "On a scale of 1-10, how would you rate the service?",
+    "What percentage of your budget goes to groceries?",
+    "What is your height in centimetres?",
+    "Which brands have you heard of?",
+    "How long have you used the app (in months)?",
+    "Roughly how far do you commute per day?",
+    "Is the pageant part of your itemized plan?",
+]
+
+
+class TestNumericTypeDetector:
+    """Test suite for NumericTypeDetector"""
+
+    @pytest.mark.parametrize("patterns_attr,regex_attr", FAMILIES)
+    def test_compiled_family_matches_like_pattern_loop(self, patterns_attr, regex_attr):
+        patterns = getattr(NumericTypeDetector, patterns_attr)
+        regex = getattr(NumericTypeDetector, regex_attr)
+
+        for text in SAMPLE_TEXTS:
+            expected = any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns)
+            assert (regex.search(text) is not None) == expected, text
+
+    def test_detection_keeps_type_precedence(self):
+        detect = NumericTypeDetector.detect_numeric_type
+
+        assert detect("How old are you, in years?") == NumericType.AGE
+        assert detect("What price would you expect to pay?") == NumericType.CURRENCY
+        assert detect("How many units do you own?") == NumericType.QUANTITY
+        assert detect("Please rate the checkout, 1-5") == NumericType.RATING
+        assert detect("What share of purchases are online?") == NumericType.PERCENTAGE
+        assert detect("What is the weight of the package?") == NumericType.MEASUREMENT
+        assert detect("Anything else?", labels=["Price"]) == NumericType.CURRENCY
+        assert detect("Anything else to add") == NumericType.GENERIC
+
+    def test_unit_extraction_tries_patterns_in_order(self):
+        extract = NumericTypeDetector.extract_unit_from_text
+
+        assert extract("How many cups do you drink per day?") == "day"
+        assert extract("What is your commute distance in kilometres?") == "kilometres"
+        # The trailing-word pattern captures the whole word before the question mark
+        assert extract("What is your best time over 5km?") == "km"
+        assert extract("Why?") is None
@@ -0,0 +1,92 @@
+"""
+Tests for the shared compiled workflow and its per-run context.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Mock langgraph before importing workflow modules
+with patch.dict('sys.modules', {'langgraph': MagicMock(), 'langgraph.graph': MagicMock()}):
+    from src.workflows import workflow as workflow_module
+    from src.workflows.workflow import (
+        WorkflowRunContext,
+        build_run_config,
+        get_compiled_workflow,
+        get_run_context,
+    )
+    from src.workflows.state import SurveyGenerationState
+
+
+class TestCompiledWorkflow:
+    """Test suite for the process-wide compiled workflow"""
+
+    def test_graph_is_compiled_once(self, monkeypatch):
+        monkeypatch.setattr(workflow_module, "_compiled_workflow", None)
+        create = MagicMock(return_value=MagicMock(name="graph"))
+        monkeypatch.setattr(workflow_module, "create_workflow", create)
+
+        first = get_compiled_workflow()
+        second = get_compiled_workflow()
+
+        assert first is second
+        create.assert_called_once_with()
+
+    def test_run_config_carries_context_and_falls_back_to_default(self):
+        connection_manager = MagicMock()
+        default = WorkflowRunContext()
+
+        config = build_run_config(connection_manager=connection_manager)
+
+        assert get_run_context(config, default).connection_manager is connection_manager
+        assert get_run_context(None, default) is default
+
+
+class TestWorkflowRunContext:
+    """Test suite for session-per-node handling"""
+
+    def test_node_session_opens_and_closes_factory_session(self):
+        sessions = []
+
+        def factory():
+            sessions.append(MagicMock())
+            return sessions[-1]
+
+        context = WorkflowRunContext(session_factory=factory)
+        with context.node_session() as first:
+            pass
+        with context.node_session() as second:
+            pass
+
+        assert first is not second
+        assert all(session.close.called for session in sessions)
+
+    def test_fixed_session_is_reused_and_not_closed(self):
+        db = MagicMock()
+        context = WorkflowRunContext(db=db)
+
+        with context.node_session() as session:
+            assert session is db
+
+        db.close.assert_not_called()
+
+    def test_checkpoint_saved_with_completed_nodes(self):
+        state = SurveyGenerationState(rfq_text="RFQ", workflow_id="wf-1", completed_nodes=["parse_rfq"])
+        context = WorkflowRunContext(db=MagicMock(), checkpoints=True)
+
+        with patch("src.services.workflow_checkpoint_service.WorkflowCheckpointService") as service_class:
+            completed = context.save_checkpoint("retrieve_golden", state, {"golden_examples": [], "error_message": None})
+
+        assert completed == ["parse_rfq", "retrieve_golden"]
+        snapshot, node_name = service_class.return_value.save_checkpoint.call_args.args
+        assert node_name == "retrieve_golden"
+        assert snapshot.completed_nodes == ["parse_rfq", "retrieve_golden"]
+
+    @pytest.mark.parametrize("result", [
+        {"error_message": "Survey generation failed"},
+        {"pending_human_review": True},
+    ])
+    def test_checkpoint_skipped_for_failed_or_paused_nodes(self, result):
+        state = SurveyGenerationState(rfq_text="RFQ", workflow_id="wf-1")
+        context = WorkflowRunContext(db=MagicMock(), checkpoints=True)
+
+        assert context.save_checkpoint("generate", state, result) is None